@@ -1,35 +1,66 @@
 import getopt
+import importlib
 import os
 import sys
+import time
 import logging
 
+# Taken as early as possible so the startup profile covers imports of pcs.
+_STARTUP_TIME = time.perf_counter()
+
+# pylint: disable=wrong-import-position
 from pcs import (
-    acl,
-    alert,
-    booth,
-    client,
-    cluster,
-    config,
-    constraint,
-    host,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
     settings,
-    status,
-    stonith,
     usage,
-    utils,
 )
 
-from pcs.cli.common import (
-    capabilities,
-    completion,
-    parse_args,
-)
+from pcs.cli.common import completion
+
+
+# Command modules are imported only when their command is run. Importing all
+# of them takes a considerable part of pcs startup time.
+_COMMAND_MAP = {
+    "resource": ("pcs.resource", "resource_cmd"),
+    "cluster": ("pcs.cluster", "cluster_cmd"),
+    "stonith": ("pcs.stonith", "stonith_cmd"),
+    "property": ("pcs.prop", "property_cmd"),
+    "constraint": ("pcs.constraint", "constraint_cmd"),
+    "acl": ("pcs.acl", "acl_cmd"),
+    "status": ("pcs.status", "status_cmd"),
+    "config": ("pcs.config", "config_cmd"),
+    "pcsd": ("pcs.pcsd", "pcsd_cmd"),
+    "node": ("pcs.node", "node_cmd"),
+    "quorum": ("pcs.quorum", "quorum_cmd"),
+    "qdevice": ("pcs.qdevice", "qdevice_cmd"),
+    "alert": ("pcs.alert", "alert_cmd"),
+    "booth": ("pcs.booth", "booth_cmd"),
+    "host": ("pcs.host", "host_cmd"),
+    "client": ("pcs.client", "client_cmd"),
+    "batch": ("pcs.batch", "batch_cmd"),
+}
+
+def get_command(command):
+    module_name, function_name = _COMMAND_MAP[command]
+    return getattr(importlib.import_module(module_name), function_name)
+
+def _print_startup_profile():
+    pcs_module_list = sorted(
+        name for name in sys.modules
+        if name == "pcs" or name.startswith("pcs.")
+    )
+    sys.stderr.write(
+        "Startup profile:\n"
+        "  time to command dispatch: {time:.1f} ms\n"
+        "  modules loaded: {modules_count} (pcs modules: {pcs_count})\n"
+        "{pcs_modules}\n".format(
+            time=(time.perf_counter() - _STARTUP_TIME) * 1000,
+            modules_count=len(sys.modules),
+            pcs_count=len(pcs_module_list),
+            pcs_modules="\n".join(
+                "    {0}".format(name) for name in pcs_module_list
+            ),
+        )
+    )
 
 
 logging.basicConfig()
@@ -40,10 +71,18 @@ def main(argv=None):
     if completion.has_applicable_environment(os.environ):
         print(completion.make_suggestions(
             os.environ,
-            usage.generate_completion_tree_from_usage()
+            completion.load_tree(
+                settings.pcs_completion_tree_file,
+                usage.__file__,
+                usage.generate_completion_tree_from_usage
+            )
         ))
         sys.exit()
 
+    # Not needed for the completion, which is run on each TAB press.
+    from pcs import utils
+    from pcs.cli.common import capabilities, parse_args
+
     argv = argv if argv else sys.argv[1:]
     utils.subprocess_setup()
     global filename, usefile
@@ -81,7 +120,15 @@ def main(argv=None):
             full = True
             break
 
+    profile_startup = False
     for opt, val in pcs_options:
+        if opt == "--profile-startup":
+            # This is not an option of commands, they must not see it.
+            profile_startup = True
+            orig_argv = parse_args.filter_out_long_option(
+                orig_argv, "profile-startup"
+            )
+            continue
         if not opt in utils.pcs_options:
             utils.pcs_options[opt] = val
         else:
@@ -148,31 +195,19 @@ def main(argv=None):
     if command in ("-h", "help"):
         usage.main()
         return
-    cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": acl.acl_cmd,
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": node.node_cmd,
-        "quorum": quorum.quorum_cmd,
-        "qdevice": qdevice.qdevice_cmd,
-        "alert": alert.alert_cmd,
-        "booth": booth.booth_cmd,
-        "host": host.host_cmd,
-        "client": client.client_cmd,
-    }
-    if command not in cmd_map:
+    if command not in _COMMAND_MAP:
         usage.main()
         sys.exit(1)
+    if os.getuid() == 0:
+        # the cache directory is accessible by root only
+        utils.enable_agent_metadata_cache()
     # root can run everything directly, also help can be displayed,
     # working on a local file also do not need to run under root
     if (os.getuid() == 0) or (argv and argv[0] == "help") or usefile:
-        cmd_map[command](
+        run_command = get_command(command)
+        if profile_startup:
+            _print_startup_profile()
+        run_command(
             utils.get_library_wrapper(),
             argv,
             utils.get_input_modifiers(),
@@ -237,7 +272,10 @@ def main(argv=None):
                 sys.stderr.write(std_err)
             sys.exit(exitcode)
             return
-    cmd_map[command](
+    run_command = get_command(command)
+    if profile_startup:
+        _print_startup_profile()
+    run_command(
         utils.get_library_wrapper(),
         argv,
         utils.get_input_modifiers(),
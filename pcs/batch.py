@@ -0,0 +1,251 @@
+import getopt
+import shlex
+import sys
+import tempfile
+
+from pcs import (
+    app,
+    usage,
+    utils,
+)
+from pcs.cli.common import parse_args
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.live import (
+    diff_cibs_xml,
+    push_cib_diff_xml,
+    wait_for_idle,
+)
+
+
+# Commands working only with the CIB can be run in a batch.
+BATCH_COMMANDS = (
+    "acl",
+    "alert",
+    "constraint",
+    "node",
+    "property",
+    "resource",
+    "stonith",
+)
+# Options which are given to the whole batch, not to its commands.
+_BATCH_ONLY_OPTIONS = ("-f", "--wait", "--all-or-nothing")
+# Options of the batch passed to each of its commands.
+_INHERITED_OPTIONS = ("--debug",)
+
+
+class _LineError(Exception):
+    pass
+
+
+def batch_cmd(lib, argv, modifiers):
+    if not argv:
+        utils.exit_on_cmdline_input_errror(None, "batch", "")
+    else:
+        sub_cmd, argv_next = argv[0], argv[1:]
+
+    try:
+        if sub_cmd == "help":
+            usage.batch([" ".join(argv_next)] if argv_next else [])
+        elif sub_cmd == "run":
+            batch_run(lib, argv_next, modifiers)
+        else:
+            raise CmdLineInputError()
+    except LibraryError as e:
+        utils.process_library_reports(e.args)
+    except CmdLineInputError as e:
+        utils.exit_on_cmdline_input_errror(e, "batch", sub_cmd)
+
+
+def batch_run(lib, argv, modifiers):
+    """
+    Options:
+      * -f - CIB file
+      * --wait - wait for the cluster to settle after the push
+      * --all-or-nothing - do not push anything if any command fails
+      * --debug - passed to all commands
+    """
+    del lib
+    modifiers.ensure_only_supported(*(_BATCH_ONLY_OPTIONS + _INHERITED_OPTIONS))
+    if len(argv) > 1:
+        raise CmdLineInputError()
+    wait = modifiers.is_specified("--wait")
+    wait_timeout = utils.validate_wait_get_timeout() if wait else None
+    all_or_nothing = modifiers.get("--all-or-nothing")
+    line_list = _read_lines(argv[0] if argv else "-")
+
+    cib_file = modifiers.get("-f")
+    if cib_file:
+        utils.touch_cib_file(cib_file)
+        original_cib = _read_file(cib_file)
+    else:
+        original_cib = utils.get_cib()
+
+    failed_line_list = []
+    inherited_options = {
+        option: value for option, value in utils.pcs_options.items()
+        if option in _INHERITED_OPTIONS
+    }
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".xml", prefix="pcs_batch."
+    ) as snapshot_file:
+        snapshot_file.write(original_cib)
+        snapshot_file.flush()
+        # Commands work with the snapshot the same way they do with -f.
+        saved_globals = (utils.usefile, utils.filename, utils.pcs_options)
+        utils.usefile, utils.filename = True, snapshot_file.name
+        try:
+            for line_number, line in line_list:
+                cib_before_line = _read_file(snapshot_file.name)
+                if _run_line(line, inherited_options):
+                    continue
+                failed_line_list.append(line_number)
+                utils.err(
+                    "Command on line {0} failed: {1}".format(
+                        line_number, line.strip()
+                    ),
+                    exit_after_error=False
+                )
+                # Changes of a failed command must not be pushed.
+                _write_file(snapshot_file.name, cib_before_line)
+                if all_or_nothing:
+                    break
+        finally:
+            utils.usefile, utils.filename, utils.pcs_options = saved_globals
+            utils.invalidate_cib_snapshot()
+        new_cib = _read_file(snapshot_file.name)
+
+    if failed_line_list and all_or_nothing:
+        utils.err("No changes have been pushed")
+
+    if new_cib != original_cib:
+        if cib_file:
+            _write_file(cib_file, new_cib)
+        else:
+            _push_cib(original_cib, new_cib)
+    if wait:
+        try:
+            wait_for_idle(utils.cmd_runner(), wait_timeout)
+        except LibraryError as e:
+            utils.process_library_reports(e.args)
+
+    if failed_line_list:
+        utils.err(
+            "{0} of {1} commands failed".format(
+                len(failed_line_list), len(line_list)
+            )
+        )
+
+
+def _read_lines(path):
+    """
+    Return a list of (line number, line) of all non-empty lines of the input
+
+    string path -- file to read commands from, '-' for stdin
+    """
+    # All the commands are read before running them, so commands asking for
+    # an input do not consume the batch.
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        text = _read_file(path)
+    return [
+        (line_number, line)
+        for line_number, line in enumerate(text.splitlines(), start=1)
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def _read_file(path):
+    try:
+        with open(path, mode="r") as file:
+            return file.read()
+    except EnvironmentError as e:
+        utils.err("Unable to read file '{0}': {1}".format(path, e.strerror))
+
+
+def _write_file(path, content):
+    try:
+        with open(path, mode="w") as file:
+            file.write(content)
+    except EnvironmentError as e:
+        utils.err("Unable to write file '{0}': {1}".format(path, e.strerror))
+
+
+def _parse_line(line, inherited_options):
+    try:
+        argv = shlex.split(line, comments=True)
+    except ValueError as e:
+        raise _LineError("Unable to parse the command: {0}".format(e))
+    if argv and argv[0] == "pcs":
+        argv = argv[1:]
+    try:
+        option_list, dummy_argv = getopt.gnu_getopt(
+            parse_args.filter_out_non_option_negative_numbers(argv),
+            parse_args.PCS_SHORT_OPTIONS,
+            parse_args.PCS_LONG_OPTIONS,
+        )
+    except getopt.GetoptError as e:
+        raise _LineError(str(e))
+    argv = parse_args.filter_out_options(argv)
+
+    options = {}
+    for option, value in option_list:
+        if option in _BATCH_ONLY_OPTIONS:
+            raise _LineError(
+                "Option '{0}' is not allowed in a batch command, specify it "
+                "for the whole batch".format(option)
+            )
+        if option in options:
+            raise _LineError("{0} can only be used once".format(option))
+        options[option] = value
+    if not argv or argv[0] not in BATCH_COMMANDS:
+        raise _LineError(
+            "Only commands {0} can be run in a batch".format(
+                ", ".join(BATCH_COMMANDS)
+            )
+        )
+    return argv[0], argv[1:], {**inherited_options, **options}
+
+
+def _run_line(line, inherited_options):
+    """
+    Run one command of a batch, return True on success
+
+    string line -- the command
+    dict inherited_options -- options of the batch passed to the command
+    """
+    try:
+        command, argv, options = _parse_line(line, inherited_options)
+    except _LineError as e:
+        utils.err(str(e), exit_after_error=False)
+        return False
+    options["-f"] = utils.filename
+    utils.pcs_options = options
+    # Library commands write the file directly, the next command must not
+    # get a CIB loaded before.
+    utils.invalidate_cib_snapshot()
+    try:
+        app.get_command(command)(
+            utils.get_library_wrapper(),
+            argv,
+            utils.get_input_modifiers(),
+        )
+    except SystemExit as e:
+        return e.code in (None, 0)
+    finally:
+        utils.invalidate_cib_snapshot()
+    return True
+
+
+def _push_cib(original_cib, new_cib):
+    # All changes are pushed as one diff, so they are applied at once.
+    runner = utils.cmd_runner()
+    try:
+        cib_diff = diff_cibs_xml(
+            runner, utils.get_report_processor(), original_cib, new_cib
+        )
+        if cib_diff:
+            push_cib_diff_xml(runner, cib_diff)
+    except LibraryError as e:
+        utils.process_library_reports(e.args)
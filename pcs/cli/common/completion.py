@@ -1,3 +1,8 @@
+import json
+import os
+import os.path
+
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -14,6 +19,39 @@ def has_applicable_environment(environment):
         environment['COMP_CWORD'].isdigit()
     )
 
+def load_tree(cache_file, source_file, build_tree):
+    """
+    Return a suggestion tree stored in a file, build and store it if needed
+
+    Building the tree from pcs usage takes a while and it is needed on each
+    TAB press. So the tree is built only when the file is missing or when it
+    is older than the source of the tree.
+
+    string cache_file -- path to a file with the stored tree
+    string source_file -- path to a file the tree is built from
+    callable build_tree -- return a freshly built suggestion tree
+    """
+    try:
+        if os.path.getmtime(cache_file) >= os.path.getmtime(source_file):
+            with open(cache_file, "r") as cache:
+                return json.load(cache)
+    except (EnvironmentError, ValueError):
+        pass
+
+    suggestion_tree = build_tree()
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        # Write to a temporary file first, so a concurrent completion never
+        # reads a partially written tree.
+        tmp_file = "{0}.{1}".format(cache_file, os.getpid())
+        with open(tmp_file, "w") as cache:
+            json.dump(suggestion_tree, cache)
+        os.replace(tmp_file, cache_file)
+    except EnvironmentError:
+        # The completion works without the stored tree, only slower.
+        pass
+    return suggestion_tree
+
 def make_suggestions(environment, suggestion_tree):
     """
     dict environment - very likely os.environ
@@ -31,6 +31,7 @@ _type_articles = {
     "ACL permission": "an",
 }
 _file_role_translation = {
+    "AGENT_METADATA_CACHE": "Agent metadata cache",
     "BOOTH_CONFIG": "Booth configuration",
     "BOOTH_KEY": "Booth key",
     "COROSYNC_AUTHKEY": "Corosync authkey",
@@ -1169,6 +1170,11 @@ CODE_TO_MESSAGE_BUILDER_MAP = {
         )
     ,
 
+    codes.NODE_ATTRIBUTE_DOES_NOT_EXIST: lambda info:
+        "Attribute '{attribute_name}' does not exist for node '{node}'"
+        .format(**info)
+    ,
+
     codes.NODE_NOT_FOUND: lambda info:
         "{desc} '{node}' does not appear to exist in configuration".format(
             desc=build_node_description(info["searched_types"]),
@@ -4,29 +4,6 @@ from collections import namedtuple
 
 from pcs.cli.common import middleware
 from pcs.cli.common.reports import process_library_reports
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    cib_options,
-    cluster,
-    fencing_topology,
-    node,
-    pcsd,
-    qdevice,
-    quorum,
-    remote_node,
-    resource,
-    resource_agent,
-    sbd,
-    stonith,
-    stonith_agent,
-)
-from pcs.lib.commands.constraint import (
-    colocation as constraint_colocation,
-    order as constraint_order,
-    ticket as constraint_ticket
-)
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryEnvError
 
@@ -105,8 +82,11 @@ def get_module(env, middleware_factory, name):
 
 
 def load_module(env, middleware_factory, name):
+    # Library commands are imported only when they are needed. Importing all of
+    # them takes a considerable part of pcs startup time.
     # pylint: disable=too-many-return-statements, too-many-branches
     if name == "acl":
+        from pcs.lib.commands import acl
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -130,6 +110,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "alert":
+        from pcs.lib.commands import alert
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -145,6 +126,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "booth":
+        from pcs.lib.commands import booth
         return bind_all(
             env,
             middleware.build(
@@ -173,6 +155,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cluster":
+        from pcs.lib.commands import cluster
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -187,6 +170,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "remote_node":
+        from pcs.lib.commands import remote_node
         return bind_all(
             env,
             middleware.build(
@@ -202,6 +186,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_colocation':
+        from pcs.lib.commands.constraint import (
+            colocation as constraint_colocation
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -212,6 +199,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_order':
+        from pcs.lib.commands.constraint import (
+            order as constraint_order
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -222,6 +212,9 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == 'constraint_ticket':
+        from pcs.lib.commands.constraint import (
+            ticket as constraint_ticket
+        )
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -234,6 +227,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "fencing_topology":
+        from pcs.lib.commands import fencing_topology
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -248,6 +242,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "node":
+        from pcs.lib.commands import node
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -261,10 +256,12 @@ def load_module(env, middleware_factory, name):
                 "standby_unstandby_all": node.standby_unstandby_all,
                 "standby_unstandby_list": node.standby_unstandby_list,
                 "standby_unstandby_local": node.standby_unstandby_local,
+                "update_attributes": node.update_attributes,
             }
         )
 
     if name == "pcsd":
+        from pcs.lib.commands import pcsd
         return bind_all(
             env,
             middleware.build(),
@@ -274,6 +271,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "qdevice":
+        from pcs.lib.commands import qdevice
         return bind_all(
             env,
             middleware.build(),
@@ -297,6 +295,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "quorum":
+        from pcs.lib.commands import quorum
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -314,20 +313,25 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource_agent":
+        from pcs.lib.commands import resource_agent
         return bind_all(
             env,
             middleware.build(),
             {
+                "clear_metadata_cache": resource_agent.clear_metadata_cache,
                 "describe_agent": resource_agent.describe_agent,
                 "list_agents": resource_agent.list_agents,
                 "list_agents_for_standard_and_provider":
                     resource_agent.list_agents_for_standard_and_provider,
                 "list_ocf_providers": resource_agent.list_ocf_providers,
                 "list_standards": resource_agent.list_standards,
+                "warm_up_metadata_cache":
+                    resource_agent.warm_up_metadata_cache,
             }
         )
 
     if name == "resource":
+        from pcs.lib.commands import resource
         return bind_all(
             env,
             middleware.build(
@@ -340,6 +344,7 @@ def load_module(env, middleware_factory, name):
                 "bundle_update": resource.bundle_update,
                 "create": resource.create,
                 "create_as_clone": resource.create_as_clone,
+                "create_bulk": resource.create_bulk,
                 "create_in_group": resource.create_in_group,
                 "create_into_bundle": resource.create_into_bundle,
                 "disable": resource.disable,
@@ -352,6 +357,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cib_options":
+        from pcs.lib.commands import cib_options
         return bind_all(
             env,
             middleware.build(
@@ -364,6 +370,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith":
+        from pcs.lib.commands import stonith
         return bind_all(
             env,
             middleware.build(
@@ -381,6 +388,7 @@ def load_module(env, middleware_factory, name):
 
 
     if name == "sbd":
+        from pcs.lib.commands import sbd
         return bind_all(
             env,
             middleware.build(),
@@ -400,6 +408,7 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith_agent":
+        from pcs.lib.commands import stonith_agent
         return bind_all(
             env,
             middleware.build(),
@@ -25,6 +25,12 @@ PCS_LONG_OPTIONS = [
     # TODO remove
     # used only in deprecated 'pcs resource|stonith show'
     "groups",
+    # print time and modules loaded before running a command
+    "profile-startup",
+    # pcs batch run - do not push anything if any command fails
+    "all-or-nothing",
+    # pcs resource|stonith list - number of agents described at once
+    "jobs=",
 ]
 
 def split_list(arg_list, separator):
@@ -305,6 +311,34 @@ def filter_out_options(arg_list):
             args_without_options.append(arg)
     return args_without_options
 
+def filter_out_long_option(arg_list, option_name):
+    """
+    Return arg_list without a long option not expecting a value.
+    Unambiguous abbreviations of the option are removed as well, getopt
+    accepts them.
+
+    list arg_list contains command line arguments
+    string option_name -- name of the option without leading dashes
+    """
+    def is_the_option(arg):
+        if len(arg) <= 2 or arg[0:2] != "--":
+            return False
+        matching_names = [
+            name for name in PCS_LONG_OPTIONS if name.startswith(arg[2:])
+        ]
+        return (
+            arg[2:] == option_name
+            or
+            matching_names == [option_name]
+        )
+
+    return [
+        arg for i, arg in enumerate(arg_list)
+        if not is_the_option(arg)
+            or
+            (i > 0 and is_option_expecting_value(arg_list[i-1]))
+    ]
+
 
 class InputModifiers():
     def __init__(self, options):
@@ -313,6 +347,7 @@ class InputModifiers():
         self._options.update({
             # boolean values
             "--all": "--all" in options,
+            "--all-or-nothing": "--all-or-nothing" in options,
             "--autodelete": "--autodelete" in options,
             "--config": "--config" in options,
             "--corosync": "--corosync" in options,
@@ -346,6 +381,7 @@ class InputModifiers():
             "--corosync_conf": options.get("--corosync_conf", None),
             "--from": options.get("--from", None),
             "--group": options.get("--group", None),
+            "--jobs": options.get("--jobs", None),
             "--name": options.get("--name", None),
             "--node": options.get("--node", None),
             "--request-timeout": options.get("--request-timeout", None),
@@ -1,8 +1,12 @@
-from unittest import TestCase
+import json
+import os
+import tempfile
+from unittest import mock, TestCase
 
 from pcs.cli.common.completion import (
     _find_suggestions,
     has_applicable_environment,
+    load_tree,
     make_suggestions,
     _split_words,
 )
@@ -157,3 +161,66 @@ class SplitWordsTest(TestCase):
             EnvironmentError,
             lambda: _split_words("pcs resource op a ", ["3", "8", "2", "1"])
         )
+
+class LoadTreeTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_file = os.path.join(
+            self.tmp_dir.name, "cache", "completion_tree.json"
+        )
+        self.source_file = os.path.join(self.tmp_dir.name, "usage.py")
+        with open(self.source_file, "w"):
+            pass
+        self.build_tree = mock.Mock(return_value=tree)
+
+    def set_source_newer(self):
+        cache_mtime = os.path.getmtime(self.cache_file)
+        os.utime(self.source_file, (cache_mtime + 10, cache_mtime + 10))
+
+    def test_build_and_store(self):
+        self.assertEqual(
+            tree,
+            load_tree(self.cache_file, self.source_file, self.build_tree)
+        )
+        self.build_tree.assert_called_once_with()
+        with open(self.cache_file) as cache:
+            self.assertEqual(tree, json.load(cache))
+
+    def test_load_stored(self):
+        load_tree(self.cache_file, self.source_file, self.build_tree)
+        self.assertEqual(
+            tree,
+            load_tree(self.cache_file, self.source_file, self.build_tree)
+        )
+        self.build_tree.assert_called_once_with()
+
+    def test_rebuild_outdated(self):
+        load_tree(self.cache_file, self.source_file, self.build_tree)
+        self.set_source_newer()
+        new_tree = {"new": {}}
+        self.build_tree.return_value = new_tree
+        self.assertEqual(
+            new_tree,
+            load_tree(self.cache_file, self.source_file, self.build_tree)
+        )
+        self.assertEqual(2, self.build_tree.call_count)
+
+    def test_rebuild_invalid(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as cache:
+            cache.write("not json")
+        os.utime(self.source_file, (0, 0))
+        self.assertEqual(
+            tree,
+            load_tree(self.cache_file, self.source_file, self.build_tree)
+        )
+        self.build_tree.assert_called_once_with()
+
+    def test_cannot_store(self):
+        cache_file = os.path.join(self.source_file, "completion_tree.json")
+        self.assertEqual(
+            tree,
+            load_tree(cache_file, self.source_file, self.build_tree)
+        )
+        self.build_tree.assert_called_once_with()
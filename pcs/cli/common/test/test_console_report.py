@@ -1384,6 +1384,17 @@ class NodeAddressesUnresolvable(NameBuildTest):
         )
 
 
+class NodeAttributeDoesNotExist(NameBuildTest):
+    code = codes.NODE_ATTRIBUTE_DOES_NOT_EXIST
+    def test_build_message(self):
+        self.assert_message_from_info(
+            "Attribute 'attr' does not exist for node 'node1'",
+            {
+                "node": "node1",
+                "attribute_name": "attr",
+            }
+        )
+
 class NodeNotFound(NameBuildTest):
     code = codes.NODE_NOT_FOUND
     def test_build_messages(self):
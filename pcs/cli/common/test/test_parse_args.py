@@ -7,6 +7,7 @@ from pcs.cli.common.parse_args import(
     split_list,
     filter_out_non_option_negative_numbers,
     filter_out_options,
+    filter_out_long_option,
     is_num,
     is_negative_num,
     is_short_option_expecting_value,
@@ -388,6 +389,46 @@ class FilterOutOptions(TestCase):
             filter_out_options(["first", "--"])
         )
 
+class FilterOutLongOption(TestCase):
+    def test_remove_option(self):
+        self.assertEqual(
+            ["first", "second"],
+            filter_out_long_option(
+                ["first", "--profile-startup", "second"], "profile-startup"
+            )
+        )
+
+    def test_remove_abbreviated_option(self):
+        self.assertEqual(
+            ["first", "second"],
+            filter_out_long_option(
+                ["first", "--profile", "--pro", "second"], "profile-startup"
+            )
+        )
+
+    def test_keep_ambiguous_abbreviation(self):
+        self.assertEqual(
+            ["first", "--p"],
+            filter_out_long_option(["first", "--p"], "profile-startup")
+        )
+
+    def test_keep_other_options(self):
+        self.assertEqual(
+            ["first", "--pacemaker", "--profile-startupx", "--"],
+            filter_out_long_option(
+                ["first", "--pacemaker", "--profile-startupx", "--"],
+                "profile-startup"
+            )
+        )
+
+    def test_keep_value_of_option(self):
+        self.assertEqual(
+            ["first", "--name", "--profile"],
+            filter_out_long_option(
+                ["first", "--name", "--profile"], "profile-startup"
+            )
+        )
+
 class IsNum(TestCase):
     def test_returns_true_on_number(self):
         self.assertTrue(is_num("10"))
@@ -487,6 +528,7 @@ class InputModifiersTest(TestCase):
         self.supported = ["a", "b", "c"]
         self.bool_opts = [
             "--all",
+            "--all-or-nothing",
             "--autodelete",
             "--config",
             "--corosync",
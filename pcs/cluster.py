@@ -327,7 +327,6 @@ def start_cluster_nodes(nodes):
     timeout = int(
         settings.default_request_timeout * math.ceil(len(nodes) / 8.0)
     )
-    utils.read_known_hosts_file() # cache known hosts
     node_errors = parallel_for_nodes(
         utils.startCluster, nodes, quiet=True, timeout=timeout
     )
@@ -365,28 +364,51 @@ def wait_for_local_node_started(stop_at, interval):
             "\n".join([build_report_message(item) for item in e.args])
         )
 
-def wait_for_remote_node_started(node, stop_at, interval):
+def wait_for_remote_nodes_started(node_list, stop_at, interval):
     """
+    Return messages of nodes which have not started keyed by node names
+
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    while True:
-        time.sleep(interval)
-        code, output = utils.getPacemakerNodeStatus(node)
+    node_errors = dict()
+    pending_nodes = list(node_list)
+
+    def finish(node, returncode, output):
+        message = "{0}: {1}".format(node, output.strip())
+        print(message)
+        if returncode != 0:
+            node_errors[node] = message
+
+    def report(node, code, output):
         # HTTP error, permission denied or unable to auth
         # there is no point in trying again as it won't get magically fixed
         if code in [1, 3, 4]:
-            return 1, output
+            finish(node, 1, output)
+            return
         if code == 0:
             try:
                 node_status = json.loads(output)
                 if is_node_fully_started(node_status):
-                    return 0, "Started"
+                    finish(node, 0, "Started")
+                    return
             except (ValueError, KeyError):
                 # this won't get fixed either
-                return 1, "Unable to get node status"
-        if datetime.datetime.now() > stop_at:
-            return 1, "Waiting timeout"
+                finish(node, 1, "Unable to get node status")
+                return
+        pending_nodes.append(node)
+
+    while pending_nodes:
+        time.sleep(interval)
+        # all pending nodes are asked at once in each round
+        node_round = pending_nodes[:]
+        del pending_nodes[:]
+        utils.run_for_nodes(report, utils.getPacemakerNodeStatus, node_round)
+        if pending_nodes and datetime.datetime.now() > stop_at:
+            for node in pending_nodes:
+                finish(node, 1, "Waiting timeout")
+            break
+    return node_errors
 
 def wait_for_nodes_started(node_list, timeout=None):
     """
@@ -405,9 +427,8 @@ def wait_for_nodes_started(node_list, timeout=None):
         else:
             print(output)
     else:
-        utils.read_known_hosts_file() # cache known hosts
-        node_errors = parallel_for_nodes(
-            wait_for_remote_node_started, node_list, stop_at, interval
+        node_errors = wait_for_remote_nodes_started(
+            node_list, stop_at, interval
         )
         if node_errors:
             utils.err("unable to verify all nodes have started")
@@ -434,7 +455,6 @@ def stop_cluster_nodes(nodes):
             % "', '".join(unknown_nodes)
         )
 
-    utils.read_known_hosts_file() # cache known hosts
     stopping_all = set(nodes) >= set(all_nodes)
     if "--force" not in utils.pcs_options and not stopping_all:
         error_list = []
@@ -570,7 +590,6 @@ def destroy_cluster(argv):
       * --request-timeout - timeout for HTTP requests
     """
     if argv:
-        utils.read_known_hosts_file() # cache known hosts
         # stop pacemaker and resources while cluster is still quorate
         nodes = argv
         node_errors = parallel_for_nodes(
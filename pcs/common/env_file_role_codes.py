@@ -1,3 +1,4 @@
+AGENT_METADATA_CACHE = "AGENT_METADATA_CACHE"
 BOOTH_CONFIG = "BOOTH_CONFIG"
 BOOTH_KEY = "BOOTH_KEY"
 COROSYNC_AUTHKEY = "COROSYNC_AUTHKEY"
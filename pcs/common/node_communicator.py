@@ -1,7 +1,8 @@
+import asyncio
 import base64
 import io
 import re
-from collections import namedtuple
+from collections import deque, namedtuple
 from urllib.parse import urlencode
 
 # We should ignore SIGPIPE when using pycurl.NOSIGNAL - see the libcurl tutorial
@@ -176,6 +177,14 @@ class Response():
         self._was_connected = was_connected
         self._errno = errno
         self._error_msg = error_msg
+        # Curl handles are reused for other requests once a response is
+        # created, so everything needed is taken from the handle right away.
+        self._request = handle.request_obj
+        self._raw_data = handle.output_buffer.getvalue()
+        self._raw_debug = handle.debug_buffer.getvalue()
+        self._response_code = (
+            handle.getinfo(pycurl.RESPONSE_CODE) if was_connected else None
+        )
         self._data = None
         self._debug = None
 
@@ -201,7 +210,7 @@ class Response():
 
     @property
     def request(self):
-        return self._handle.request_obj
+        return self._request
 
     @property
     def handle(self):
@@ -222,20 +231,18 @@ class Response():
     @property
     def data(self):
         if self._data is None:
-            self._data = self._handle.output_buffer.getvalue().decode("utf-8")
+            self._data = self._raw_data.decode("utf-8")
         return self._data
 
     @property
     def debug(self):
         if self._debug is None:
-            self._debug = self._handle.debug_buffer.getvalue().decode("utf-8")
+            self._debug = self._raw_debug.decode("utf-8")
         return self._debug
 
     @property
     def response_code(self):
-        if not self.was_connected:
-            return None
-        return self._handle.getinfo(pycurl.RESPONSE_CODE)
+        return self._response_code
 
     def __repr__(self):
         return str(
@@ -250,12 +257,71 @@ class Response():
             self.response_code,
         )
 
+class CurlHandlePool():
+    """
+    Curl easy handles for reuse and data shared by them: TLS sessions, DNS
+    cache and open connections. Requests to the same host are made over an
+    already open connection without going through a TCP and TLS handshake
+    again.
+
+    Like Communicator, the pool is intended to be used only in a single thread.
+    """
+    def __init__(self):
+        self._share = pycurl.CurlShare()
+        for lock_data in (
+            pycurl.LOCK_DATA_SSL_SESSION,
+            pycurl.LOCK_DATA_DNS,
+            # not present in old versions of pycurl
+            getattr(pycurl, "LOCK_DATA_CONNECT", None),
+        ):
+            if lock_data is not None:
+                self._share.setopt(pycurl.SH_SHARE, lock_data)
+        self._idle_handle_list = []
+
+    def get_handle(self):
+        """
+        Return an easy handle with no options set except the sharing
+        """
+        if self._idle_handle_list:
+            handle = self._idle_handle_list.pop()
+            # reset keeps the handle sharing data
+            handle.reset()
+        else:
+            handle = pycurl.Curl()
+            handle.setopt(pycurl.SHARE, self._share)
+        return handle
+
+    def release_handle(self, handle):
+        """
+        Put a handle which is not used anymore back to the pool
+        """
+        self._idle_handle_list.append(handle)
+
+
 class NodeCommunicatorFactory():
-    def __init__(self, communicator_logger, user, groups, request_timeout):
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout, debug=True
+    ):
+        """
+        CommunicatorLoggerInterface communicator_logger
+        string user -- CIB user
+        list groups -- CIB user groups
+        int request_timeout -- default timeout of requests in seconds
+        bool debug -- collect debug info of requests for the logger
+        """
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._debug = debug
+        # All communicators share connections, create them when they are
+        # needed, many commands do not communicate with nodes at all.
+        self._handle_pool = None
+
+    def _get_handle_pool(self):
+        if self._handle_pool is None:
+            self._handle_pool = CurlHandlePool()
+        return self._handle_pool
 
     def get_communicator(self, request_timeout=None):
         return self.get_simple_communicator(request_timeout=request_timeout)
@@ -263,14 +329,35 @@ class NodeCommunicatorFactory():
     def get_simple_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            handle_pool=self._get_handle_pool(), debug=self._debug,
         )
 
     def get_multiaddress_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            handle_pool=self._get_handle_pool(), debug=self._debug,
+        )
+
+    def get_async_communicator(
+        self, request_timeout=None, max_parallel_requests=None
+    ):
+        timeout = request_timeout if request_timeout else self._request_timeout
+        return AsyncCommunicator(
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            handle_pool=self._get_handle_pool(), debug=self._debug,
+            max_parallel_requests=max_parallel_requests,
+        )
 
+    def get_async_multiaddress_communicator(
+        self, request_timeout=None, max_parallel_requests=None
+    ):
+        timeout = request_timeout if request_timeout else self._request_timeout
+        return AsyncMultiaddressCommunicator(
+            self._logger, self._user, self._groups, request_timeout=timeout,
+            handle_pool=self._get_handle_pool(), debug=self._debug,
+            max_parallel_requests=max_parallel_requests,
         )
 
 
@@ -282,7 +369,20 @@ class Communicator():
     """
     curl_multi_select_timeout_default = 0.8 # in seconds
 
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout=None,
+        handle_pool=None, debug=True
+    ):
+        """
+        CommunicatorLoggerInterface communicator_logger
+        string user -- CIB user
+        list groups -- CIB user groups
+        int request_timeout -- timeout of each request in seconds
+        CurlHandlePool handle_pool -- pool to take curl handles from, allows to
+            share connections with other communicators, new handles are
+            created for each request if None
+        bool debug -- collect debug info of requests, it is expensive
+        """
         self._logger = communicator_logger
         self._auth_cookies = _get_auth_cookies(user, groups)
         self._request_timeout = (
@@ -290,6 +390,8 @@ class Communicator():
             if request_timeout is not None
             else settings.default_request_timeout
         )
+        self._handle_pool = handle_pool
+        self._debug = debug
         self._multi_handle = pycurl.CurlMulti()
         self._is_running = False
         # This is used just for storing references of curl easy handles.
@@ -310,7 +412,14 @@ class Communicator():
         """
         for request in request_list:
             handle = _create_request_handle(
-                request, self._auth_cookies, self._request_timeout,
+                request,
+                self._auth_cookies,
+                self._request_timeout,
+                handle=(
+                    self._handle_pool.get_handle() if self._handle_pool
+                    else None
+                ),
+                debug=self._debug,
             )
             self._easy_handle_list.append(handle)
             self._multi_handle.add_handle(handle)
@@ -354,6 +463,9 @@ class Communicator():
             for response in response_list:
                 # free up memory for next usage of this Communicator instance
                 self._multi_handle.remove_handle(response.handle)
+                if self._handle_pool:
+                    # the response does not need its handle anymore
+                    self._handle_pool.release_handle(response.handle)
                 self._logger.log_response(response)
                 yield response
                 # if something was added to the queue in the meantime, run it
@@ -416,16 +528,215 @@ class MultiaddressCommunicator(Communicator):
     """
     def start_loop(self):
         for response in super(MultiaddressCommunicator, self).start_loop():
-            if response.was_connected:
+            if not _retry_with_next_dest(self, self._logger, response):
+                yield response
+
+
+class AsyncCommunicator():
+    """
+    This class provides the same interface as Communicator for use in an
+    asyncio event loop. Method start_loop returns an asynchronous generator,
+    waiting for responses does not block the event loop.
+
+    Sockets of running requests are watched by the event loop, libcurl is only
+    told what happened to them. Number of requests running at once may be
+    limited, other requests wait until some running request finishes.
+
+    The instances of this class are not thread-safe! It is intended to use it
+    only in the thread running the event loop which was the current event loop
+    when the instance was created.
+    """
+    def __init__(
+        self, communicator_logger, user, groups, request_timeout=None,
+        handle_pool=None, debug=True, max_parallel_requests=None
+    ):
+        """
+        CommunicatorLoggerInterface communicator_logger
+        string user -- CIB user
+        list groups -- CIB user groups
+        int request_timeout -- timeout of each request in seconds
+        CurlHandlePool handle_pool -- pool to take curl handles from, allows to
+            share connections with other communicators, new handles are
+            created for each request if None
+        bool debug -- collect debug info of requests, it is expensive
+        int max_parallel_requests -- how many requests may run at once, 0 means
+            no limit, taken from settings if None
+        """
+        self._logger = communicator_logger
+        self._auth_cookies = _get_auth_cookies(user, groups)
+        self._request_timeout = (
+            request_timeout
+            if request_timeout is not None
+            else settings.default_request_timeout
+        )
+        self._handle_pool = handle_pool
+        self._debug = debug
+        self._max_parallel_requests = (
+            max_parallel_requests
+            if max_parallel_requests is not None
+            else settings.node_communication_max_parallel_requests
+        )
+        self._loop = asyncio.get_event_loop()
+        self._multi_handle = pycurl.CurlMulti()
+        self._multi_handle.setopt(
+            pycurl.M_SOCKETFUNCTION, self.__on_socket_change
+        )
+        self._multi_handle.setopt(
+            pycurl.M_TIMERFUNCTION, self.__on_timer_change
+        )
+        self._is_running = False
+        # handles of requests which have not been started yet
+        self._waiting_handle_list = deque()
+        self._running_count = 0
+        self._response_list = deque()
+        self._response_ready = asyncio.Event()
+        self._socket_events = {}
+        self._timer = None
+
+    def add_requests(self, request_list):
+        """
+        Add requests to queue to be processed. Requests are performed only when
+        the generator returned by start_loop is in progress.
+
+        list request_list -- Request objects to add to the queue
+        """
+        for request in request_list:
+            self._waiting_handle_list.append(_create_request_handle(
+                request,
+                self._auth_cookies,
+                self._request_timeout,
+                handle=(
+                    self._handle_pool.get_handle() if self._handle_pool
+                    else None
+                ),
+                debug=self._debug,
+            ))
+        if self._is_running:
+            self.__start_waiting_requests()
+
+    async def start_loop(self):
+        """
+        Returns asynchronous generator. All requests in queue are invoked in
+        parallel and the generator returns responses for them. It is possible
+        to add new requests to the queue while the generator is in progress.
+        The generator stops after all requests are processed.
+
+        USAGE:
+        com = AsyncCommunicator(...)
+        com.add_requests([
+            Request(...), ...
+        ])
+        async for response in com.start_loop():
+            # do something with response
+            # if needed, add some new requests to the queue
+            com.add_requests([Request(...)])
+        """
+        if self._is_running:
+            raise AssertionError("Method start_loop already running")
+        self._is_running = True
+        try:
+            self.__start_waiting_requests()
+            while self._running_count or self._response_list:
+                if not self._response_list:
+                    self._response_ready.clear()
+                    await self._response_ready.wait()
+                    continue
+                response = self._response_list.popleft()
+                self._logger.log_response(response)
                 yield response
-                continue
-            try:
-                previous_dest = response.request.dest
-                response.request.next_dest()
-                self._logger.log_retry(response, previous_dest)
-                self.add_requests([response.request])
-            except StopIteration:
-                self._logger.log_no_more_addresses(response)
+        finally:
+            self._is_running = False
+
+    def __start_waiting_requests(self):
+        while self._waiting_handle_list and (
+            self._max_parallel_requests < 1
+            or
+            self._running_count < self._max_parallel_requests
+        ):
+            handle = self._waiting_handle_list.popleft()
+            self._logger.log_request_start(handle.request_obj)
+            # libcurl sets a timer to start processing the request
+            self._multi_handle.add_handle(handle)
+            self._running_count += 1
+
+    def __on_socket_change(self, event, socket_fd, multi, data):
+        # pylint: disable=unused-argument
+        # libcurl tells which events of a socket it is interested in
+        registered_event = self._socket_events.pop(socket_fd, pycurl.POLL_NONE)
+        if registered_event & pycurl.POLL_IN:
+            self._loop.remove_reader(socket_fd)
+        if registered_event & pycurl.POLL_OUT:
+            self._loop.remove_writer(socket_fd)
+        if event == pycurl.POLL_REMOVE:
+            return
+        if event & pycurl.POLL_IN:
+            self._loop.add_reader(
+                socket_fd, self.__socket_action, socket_fd, pycurl.CSELECT_IN
+            )
+        if event & pycurl.POLL_OUT:
+            self._loop.add_writer(
+                socket_fd, self.__socket_action, socket_fd, pycurl.CSELECT_OUT
+            )
+        self._socket_events[socket_fd] = event
+
+    def __on_timer_change(self, timeout_ms):
+        # libcurl wants to be called after the timeout, -1 cancels the timer
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if timeout_ms >= 0:
+            self._timer = self._loop.call_later(
+                timeout_ms / 1000.0,
+                self.__socket_action,
+                pycurl.SOCKET_TIMEOUT,
+                0
+            )
+
+    def __socket_action(self, socket_fd, event):
+        status, dummy_running = self._multi_handle.socket_action(
+            socket_fd, event
+        )
+        while status == pycurl.E_CALL_MULTI_PERFORM:
+            status, dummy_running = self._multi_handle.socket_action(
+                socket_fd, event
+            )
+        self.__read_finished_requests()
+
+    def __read_finished_requests(self):
+        repeat = True
+        while repeat:
+            num_queued, ok_list, err_list = self._multi_handle.info_read()
+            response_list = (
+                [Response.connection_successful(handle) for handle in ok_list]
+                +
+                [
+                    Response.connection_failure(handle, errno, error_msg)
+                    for handle, errno, error_msg in err_list
+                ]
+            )
+            for response in response_list:
+                self._multi_handle.remove_handle(response.handle)
+                if self._handle_pool:
+                    # the response does not need its handle anymore
+                    self._handle_pool.release_handle(response.handle)
+                self._running_count -= 1
+                self._response_list.append(response)
+                self._response_ready.set()
+            repeat = num_queued > 0
+        self.__start_waiting_requests()
+
+
+class AsyncMultiaddressCommunicator(AsyncCommunicator):
+    """
+    Class with same interface as AsyncCommunicator. It tries next addresses of
+    a target when it is not possible to connect to the target, the same way
+    MultiaddressCommunicator does.
+    """
+    async def start_loop(self):
+        async for response in super(
+            AsyncMultiaddressCommunicator, self
+        ).start_loop():
+            if not _retry_with_next_dest(self, self._logger, response):
                 yield response
 
 
@@ -443,6 +754,29 @@ class CommunicatorLoggerInterface():
         raise NotImplementedError()
 
 
+def _retry_with_next_dest(communicator, communicator_logger, response):
+    """
+    Add a request of a not connected response to the communicator again to be
+    sent to the next address of its target. Returns True if the request has
+    been added.
+
+    Communicator|AsyncCommunicator communicator -- where to add the request
+    CommunicatorLoggerInterface communicator_logger
+    Response response -- response to the request
+    """
+    if response.was_connected:
+        return False
+    try:
+        previous_dest = response.request.dest
+        response.request.next_dest()
+        communicator_logger.log_retry(response, previous_dest)
+        communicator.add_requests([response.request])
+        return True
+    except StopIteration:
+        communicator_logger.log_no_more_addresses(response)
+        return False
+
+
 def _get_auth_cookies(user, group_list):
     """
     Returns input parameters in a dictionary which is prepared to be converted
@@ -466,13 +800,15 @@ def _get_auth_cookies(user, group_list):
     return cookies
 
 
-def _create_request_handle(request, cookies, timeout):
+def _create_request_handle(request, cookies, timeout, handle=None, debug=True):
     """
     Returns Curl object (easy handle) which is set up witc specified parameters.
 
     Request request -- request specification
     dict cookies -- cookies to add to request
     int timeot -- request timeout
+    pycurl.Curl handle -- handle to set up, a new one is created if None
+    bool debug -- collect debug info of the request
     """
     # it is not possible to take this callback out of this function, because of
     # curl API
@@ -493,14 +829,17 @@ def _create_request_handle(request, cookies, timeout):
 
     output = io.BytesIO()
     debug_output = io.BytesIO()
-    cookies.update(request.cookies)
-    handle = pycurl.Curl()
+    # do not put request's cookies (token) to cookies shared by all requests
+    cookies = dict(cookies, **request.cookies)
+    if handle is None:
+        handle = pycurl.Curl()
     handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
-    handle.setopt(pycurl.VERBOSE, 1)
-    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if debug:
+        handle.setopt(pycurl.VERBOSE, 1)
+        handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handle.setopt(pycurl.SSL_VERIFYHOST, 0)
     handle.setopt(pycurl.SSL_VERIFYPEER, 0)
     handle.setopt(pycurl.NOSIGNAL, 1) # required for multi-threading
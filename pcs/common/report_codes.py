@@ -184,6 +184,7 @@ NODE_COMMUNICATION_NO_MORE_ADDRESSES = "NODE_COMMUNICATION_NO_MORE_ADDRESSES"
 NODE_COMMUNICATION_PROXY_IS_SET = "NODE_COMMUNICATION_PROXY_IS_SET"
 NODE_COMMUNICATION_RETRYING = "NODE_COMMUNICATION_RETRYING"
 NODE_COMMUNICATION_STARTED = "NODE_COMMUNICATION_STARTED"
+NODE_ATTRIBUTE_DOES_NOT_EXIST = "NODE_ATTRIBUTE_DOES_NOT_EXIST"
 NODE_NAMES_ALREADY_EXIST = "NODE_NAMES_ALREADY_EXIST"
 NODE_NAMES_DUPLICATION = "NODE_NAMES_DUPLICATION"
 NODE_NOT_FOUND = "NODE_NOT_FOUND"
@@ -1,9 +1,12 @@
+import asyncio
 import io
+import socket
 from unittest import mock, TestCase
 
 from pcs.test.tools.custom_mock import (
     MockCurl,
     MockCurlMulti,
+    MockCurlMultiSocket,
 )
 
 from pcs import settings
@@ -346,6 +349,97 @@ class CreateRequestHandleTest(TestCase):
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
 
+    def test_no_debug(self, mock_curl):
+        mock_curl.return_value = MockCurl(
+            None, b"output", [(pycurl.DEBUG_TEXT, b"debug")]
+        )
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        handle = lib._create_request_handle(request, {}, 10, debug=False)
+        self.assertFalse(pycurl.VERBOSE in handle.opts)
+        self.assertFalse(pycurl.DEBUGFUNCTION in handle.opts)
+        handle.perform()
+        self.assertEqual(
+            "output", handle.output_buffer.getvalue().decode("utf-8")
+        )
+        self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
+
+    def test_use_handle(self, mock_curl):
+        handle = MockCurl(None)
+        request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+        self.assertIs(
+            handle,
+            lib._create_request_handle(request, {}, 10, handle=handle)
+        )
+        mock_curl.assert_not_called()
+        self.assertEqual(10, handle.opts[pycurl.TIMEOUT])
+        self.assertIs(request, handle.request_obj)
+
+    def test_request_cookies_not_shared(self, mock_curl):
+        mock_curl.side_effect = lambda: MockCurl(None)
+        cookies = {"name": "val"}
+        handle = lib._create_request_handle(
+            lib.Request(
+                lib.RequestTarget("label", token="token_val"),
+                lib.RequestData("action")
+            ),
+            cookies,
+            10
+        )
+        self.assertEqual(
+            "name=val;token=token_val".encode("utf-8"),
+            handle.opts[pycurl.COOKIE]
+        )
+        self.assertEqual({"name": "val"}, cookies)
+        handle = lib._create_request_handle(
+            lib.Request(lib.RequestTarget("label"), lib.RequestData("action")),
+            cookies,
+            10
+        )
+        self.assertEqual("name=val".encode("utf-8"), handle.opts[pycurl.COOKIE])
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.CurlShare")
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.Curl",
+    side_effect=lambda: MockCurl(None)
+)
+class CurlHandlePool(TestCase):
+    def test_share_data(self, _, mock_share):
+        lib.CurlHandlePool()
+        mock_share.return_value.setopt.assert_has_calls(
+            [
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION),
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS),
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT),
+            ],
+            any_order=True
+        )
+
+    def test_new_handle(self, mock_curl, mock_share):
+        pool = lib.CurlHandlePool()
+        handle1 = pool.get_handle()
+        handle2 = pool.get_handle()
+        self.assertIsNot(handle1, handle2)
+        self.assertEqual(2, mock_curl.call_count)
+        for handle in (handle1, handle2):
+            self.assertEqual(
+                {pycurl.SHARE: mock_share.return_value}, handle.opts
+            )
+
+    def test_reuse_released_handle(self, mock_curl, _):
+        pool = lib.CurlHandlePool()
+        handle = pool.get_handle()
+        handle.setopt(pycurl.TIMEOUT, 10)
+        pool.release_handle(handle)
+        self.assertIs(handle, pool.get_handle())
+        self.assertEqual(1, mock_curl.call_count)
+        # MockCurl.reset removes all options, real curl keeps the sharing
+        self.assertEqual({}, handle.opts)
+
 
 def fixture_request(host_id=1, action="action"):
     return lib.Request(
@@ -384,7 +478,8 @@ class CommunicatorSimpleTest(CommunicatorBaseTest):
         self.assertIs(handle, response.handle)
         self.assertIs(request, response.request)
         mock_create_handle.assert_called_once_with(
-            request, {}, settings.default_request_timeout
+            request, {}, settings.default_request_timeout, handle=None,
+            debug=True
         )
         return response
 
@@ -424,7 +519,7 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
     )
     def test_call_start_loop_multiple_times(self, _, mock_create_handle):
         com = self.get_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, _, __, **___: MockCurl(
             request=request
         )
         com.add_requests([fixture_request(i) for i in range(2)])
@@ -487,6 +582,77 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
         com._multi_handle.assert_no_handle_left()
 
 
+class CommunicatorHandlePoolTest(CommunicatorBaseTest):
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1])
+    )
+    def test_handles_reused(self, _):
+        handle_list = [MockCurl(), MockCurl()]
+        handle_pool = mock.Mock(spec_set=lib.CurlHandlePool)
+        handle_pool.get_handle.side_effect = handle_list
+        com = lib.Communicator(
+            self.mock_com_log, None, None, handle_pool=handle_pool, debug=False
+        )
+        request_list = [fixture_request(i) for i in range(2)]
+        com.add_requests(request_list)
+        response_list = list(com.start_loop())
+        self.assertEqual(
+            [mock.call.get_handle()] * 2
+            +
+            [mock.call.release_handle(handle) for handle in handle_list],
+            handle_pool.mock_calls
+        )
+        self.assertEqual(request_list, [r.request for r in response_list])
+        for handle in handle_list:
+            self.assertFalse(pycurl.VERBOSE in handle.opts)
+
+    def test_response_independent_of_handle(self):
+        # pylint: disable=protected-access
+        request = fixture_request()
+        handle = MockCurl(info={pycurl.RESPONSE_CODE: 200}, request=request)
+        handle.output_buffer.write(b"output")
+        handle.debug_buffer.write(b"debug")
+        response = lib.Response.connection_successful(handle)
+        # the handle is reused for another request
+        handle.request_obj = fixture_request(2)
+        handle.output_buffer = io.BytesIO()
+        handle.debug_buffer = io.BytesIO()
+        handle._info = {}
+        self.assertIs(request, response.request)
+        self.assertEqual("output", response.data)
+        self.assertEqual("debug", response.debug)
+        self.assertEqual(200, response.response_code)
+
+
+@mock.patch("pcs.common.node_communicator.CurlHandlePool")
+class NodeCommunicatorFactoryTest(TestCase):
+    def setUp(self):
+        self.com_logger = mock.Mock(spec_set=lib.CommunicatorLoggerInterface)
+
+    def test_pool_shared(self, mock_pool):
+        factory = lib.NodeCommunicatorFactory(self.com_logger, None, None, 10)
+        mock_pool.assert_not_called()
+        # pylint: disable=protected-access
+        com_list = [
+            factory.get_communicator(),
+            factory.get_simple_communicator(),
+            factory.get_multiaddress_communicator(),
+        ]
+        mock_pool.assert_called_once_with()
+        for com in com_list:
+            self.assertIs(mock_pool.return_value, com._handle_pool)
+            self.assertTrue(com._debug)
+
+    def test_debug_disabled(self, _):
+        factory = lib.NodeCommunicatorFactory(
+            self.com_logger, None, None, 10, debug=False
+        )
+        # pylint: disable=protected-access
+        self.assertFalse(factory.get_communicator()._debug)
+        self.assertFalse(factory.get_multiaddress_communicator()._debug)
+
+
 def fixture_logger_request_retry_calls(response, hostname):
     return [
         mock.call.log_request_start(response.request),
@@ -519,7 +685,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
             expected_response_list.append(response)
             return response
 
-        def _mock_create_request_handle(request, _, __):
+        def _mock_create_request_handle(request, _, __, **___):
             counter["counter"] += 1
             return(
                 MockCurl(request=request)
@@ -552,7 +718,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(3, mock_create_handle.call_count)
         self.assertEqual(3, len(expected_response_list))
         mock_create_handle.assert_has_calls([
-            mock.call(request, {}, settings.default_request_timeout)
+            mock.call(
+                request, {}, settings.default_request_timeout, handle=None,
+                debug=True
+            )
             for _ in range(3)
         ])
         logger_calls = (
@@ -584,7 +753,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
 
         mock_con_failure.side_effect = _con_failure
         com = self.get_multiaddress_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, _, __, **___: MockCurl(
             error=(pycurl.E_SEND_ERROR, "reason"), request=request,
         )
         request = lib.Request(
@@ -607,7 +776,10 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         mock_con_successful.assert_not_called()
         self.assertEqual(4, len(expected_response_list))
         mock_create_handle.assert_has_calls([
-            mock.call(request, {}, settings.default_request_timeout)
+            mock.call(
+                request, {}, settings.default_request_timeout, handle=None,
+                debug=True
+            )
             for _ in range(3)
         ])
         logger_calls = (
@@ -632,3 +804,325 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
         # pylint: disable=no-member, protected-access
         com._multi_handle.assert_no_handle_left()
+
+
+class AsyncCommunicatorBaseTest(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.mock_com_log = mock.MagicMock(
+            spec_set=lib.CommunicatorLoggerInterface
+        )
+
+    def get_communicator(self, **kwargs):
+        return lib.AsyncCommunicator(self.mock_com_log, None, None, **kwargs)
+
+    def get_multiaddress_communicator(self):
+        return lib.AsyncMultiaddressCommunicator(self.mock_com_log, None, None)
+
+    def collect_responses(self, com, on_response=None):
+        async def _collect():
+            response_list = []
+            async for response in com.start_loop():
+                response_list.append(response)
+                if on_response:
+                    on_response(response)
+            return response_list
+        return self.loop.run_until_complete(_collect())
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class AsyncCommunicatorTest(AsyncCommunicatorBaseTest):
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiSocket([1])
+    )
+    def test_simple(self, _, mock_create_handle):
+        com = self.get_communicator()
+        request = fixture_request()
+        handle = MockCurl(request=request)
+        mock_create_handle.return_value = handle
+        com.add_requests([request])
+        self.assertEqual([], self.mock_com_log.mock_calls)
+        response_list = self.collect_responses(com)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertIs(handle, response.handle)
+        self.assertIs(request, response.request)
+        self.assertTrue(response.was_connected)
+        mock_create_handle.assert_called_once_with(
+            request, {}, settings.default_request_timeout, handle=None,
+            debug=True
+        )
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request),
+                mock.call.log_response(response),
+            ],
+            self.mock_com_log.mock_calls
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiSocket([2, 1, 1, 1])
+    )
+    def test_multiple(self, _, mock_create_handle):
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, _, __, **___: (
+            MockCurl(
+                request=request,
+                error=(
+                    (pycurl.E_SEND_ERROR, "reason")
+                    if request.host_label == "host1" else None
+                ),
+            )
+        )
+        request_list = [fixture_request(i) for i in range(3)]
+        com.add_requests(request_list)
+        def on_response(response):
+            if response.request.host_label in ("host0", "host2"):
+                request = fixture_request(len(request_list))
+                request_list.append(request)
+                com.add_requests([request])
+        response_list = self.collect_responses(com, on_response)
+        self.assertEqual(request_list, [r.request for r in response_list])
+        self.assertEqual(
+            [True, False, True, True, True],
+            [r.was_connected for r in response_list]
+        )
+        self.assertEqual(
+            request_list,
+            [
+                call[1][0] for call in self.mock_com_log.mock_calls
+                if call[0] == "log_request_start"
+            ]
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+    def test_max_parallel_requests(self, mock_create_handle):
+        multi_handle = MockCurlMultiSocket([1, 1, 1])
+        running_count_list = []
+        def add_handle(handle):
+            MockCurlMultiSocket.add_handle(multi_handle, handle)
+            # pylint: disable=protected-access
+            running_count_list.append(len(multi_handle._handle_list))
+        multi_handle.add_handle = add_handle
+        mock_create_handle.side_effect = lambda request, _, __, **___: (
+            MockCurl(request=request)
+        )
+        with mock.patch(
+            "pcs.common.node_communicator.pycurl.CurlMulti",
+            return_value=multi_handle
+        ):
+            com = self.get_communicator(max_parallel_requests=1)
+        request_list = [fixture_request(i) for i in range(3)]
+        com.add_requests(request_list)
+        response_list = self.collect_responses(com)
+        self.assertEqual(request_list, [r.request for r in response_list])
+        self.assertEqual([1, 1, 1], running_count_list)
+        multi_handle.assert_no_handle_left()
+
+    @mock.patch.object(settings, "node_communication_max_parallel_requests", 2)
+    @mock.patch("pcs.common.node_communicator.pycurl.CurlMulti")
+    def test_max_parallel_requests_default(self, *_):
+        # pylint: disable=protected-access
+        self.assertEqual(2, self.get_communicator()._max_parallel_requests)
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiSocket([1, 1])
+    )
+    def test_handle_pool(self, _, mock_create_handle):
+        handle_list = [MockCurl(), MockCurl()]
+        handle_pool = mock.Mock(spec_set=lib.CurlHandlePool)
+        handle_pool.get_handle.side_effect = handle_list
+        def create_handle(request, _, __, handle=None, **___):
+            handle.request_obj = request
+            return handle
+        mock_create_handle.side_effect = create_handle
+        com = self.get_communicator(handle_pool=handle_pool)
+        com.add_requests([fixture_request(i) for i in range(2)])
+        self.collect_responses(com)
+        self.assertEqual(
+            [mock.call.get_handle()] * 2
+            +
+            [mock.call.release_handle(handle) for handle in handle_list],
+            handle_pool.mock_calls
+        )
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiSocket([1, 1])
+    )
+    def test_call_start_loop_multiple_times(self, _, mock_create_handle):
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, _, __, **___: (
+            MockCurl(request=request)
+        )
+        com.add_requests([fixture_request(i) for i in range(2)])
+        async def start_twice():
+            loop1 = com.start_loop()
+            await loop1.__anext__()
+            with self.assertRaises(AssertionError):
+                await com.start_loop().__anext__()
+            await loop1.aclose()
+        self.loop.run_until_complete(start_twice())
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.CurlMulti")
+class AsyncCommunicatorEventLoop(AsyncCommunicatorBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.socket_pair = socket.socketpair()
+        for a_socket in self.socket_pair:
+            self.addCleanup(a_socket.close)
+
+    def get_callback(self, mock_multi, option):
+        for call in mock_multi.return_value.setopt.mock_calls:
+            if call[1][0] == option:
+                return call[1][1]
+        raise AssertionError("Option {0} not set".format(option))
+
+    def run_loop(self):
+        self.loop.run_until_complete(asyncio.sleep(0.01))
+
+    def test_socket_readable(self, mock_multi):
+        mock_multi.return_value.socket_action.return_value = (0, 1)
+        mock_multi.return_value.info_read.return_value = (0, [], [])
+        self.get_communicator()
+        on_socket = self.get_callback(mock_multi, pycurl.M_SOCKETFUNCTION)
+        socket_fd = self.socket_pair[0].fileno()
+
+        on_socket(pycurl.POLL_IN, socket_fd, None, None)
+        self.run_loop()
+        mock_multi.return_value.socket_action.assert_not_called()
+
+        self.socket_pair[1].send(b"data")
+        self.run_loop()
+        mock_multi.return_value.socket_action.assert_called_with(
+            socket_fd, pycurl.CSELECT_IN
+        )
+
+        on_socket(pycurl.POLL_REMOVE, socket_fd, None, None)
+        self.assertFalse(self.loop.remove_reader(socket_fd))
+
+    def test_socket_writable(self, mock_multi):
+        mock_multi.return_value.socket_action.return_value = (0, 1)
+        mock_multi.return_value.info_read.return_value = (0, [], [])
+        self.get_communicator()
+        on_socket = self.get_callback(mock_multi, pycurl.M_SOCKETFUNCTION)
+        socket_fd = self.socket_pair[0].fileno()
+
+        on_socket(pycurl.POLL_INOUT, socket_fd, None, None)
+        self.run_loop()
+        mock_multi.return_value.socket_action.assert_called_with(
+            socket_fd, pycurl.CSELECT_OUT
+        )
+
+        on_socket(pycurl.POLL_IN, socket_fd, None, None)
+        self.assertFalse(self.loop.remove_writer(socket_fd))
+        self.assertTrue(self.loop.remove_reader(socket_fd))
+
+    def test_timer(self, mock_multi):
+        mock_multi.return_value.socket_action.return_value = (0, 0)
+        mock_multi.return_value.info_read.return_value = (0, [], [])
+        self.get_communicator()
+        on_timer = self.get_callback(mock_multi, pycurl.M_TIMERFUNCTION)
+
+        on_timer(0)
+        self.run_loop()
+        mock_multi.return_value.socket_action.assert_called_once_with(
+            pycurl.SOCKET_TIMEOUT, 0
+        )
+
+        on_timer(0)
+        on_timer(-1)
+        self.run_loop()
+        self.assertEqual(1, mock_multi.return_value.socket_action.call_count)
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMultiSocket([1, 1, 1])
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class AsyncMultiaddressCommunicatorTest(AsyncCommunicatorBaseTest):
+    def test_success(self, mock_create_handle, _):
+        com = self.get_multiaddress_communicator()
+        counter = {"counter": 0}
+        def _mock_create_request_handle(request, _, __, **___):
+            counter["counter"] += 1
+            return(
+                MockCurl(request=request)
+                if counter["counter"] > 2
+                else MockCurl(
+                    error=(pycurl.E_SEND_ERROR, "reason"),
+                    request=request,
+                )
+            )
+        mock_create_handle.side_effect = _mock_create_request_handle
+        request = lib.Request(
+            lib.RequestTarget(
+                "label",
+                dest_list=_addr_list_to_dest(
+                    ["host{0}".format(i) for i in range(4)]
+                )
+            ),
+            lib.RequestData("action")
+        )
+        com.add_requests([request])
+        response_list = self.collect_responses(com)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertIs(request, response.request)
+        self.assertEqual(Destination("host2", None), request.dest)
+        self.assertEqual(3, mock_create_handle.call_count)
+        self.assertEqual(
+            [
+                Destination("host0", None),
+                Destination("host1", None),
+            ],
+            [
+                call[1][1] for call in self.mock_com_log.mock_calls
+                if call[0] == "log_retry"
+            ]
+        )
+        self.assertEqual(
+            [mock.call.log_response(response)],
+            self.mock_com_log.mock_calls[-1:]
+        )
+
+    def test_failure(self, mock_create_handle, _):
+        com = self.get_multiaddress_communicator()
+        mock_create_handle.side_effect = lambda request, _, __, **___: (
+            MockCurl(error=(pycurl.E_SEND_ERROR, "reason"), request=request)
+        )
+        request = lib.Request(
+            lib.RequestTarget(
+                "label",
+                dest_list=_addr_list_to_dest(
+                    ["host{0}".format(i) for i in range(3)]
+                ),
+            ),
+            lib.RequestData("action")
+        )
+        com.add_requests([request])
+        response_list = self.collect_responses(com)
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertFalse(response.was_connected)
+        self.assertEqual(Destination("host2", None), request.dest)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request),
+                mock.call.log_response(response),
+                mock.call.log_no_more_addresses(response),
+            ],
+            self.mock_com_log.mock_calls[-3:]
+        )
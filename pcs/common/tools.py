@@ -1,5 +1,6 @@
 import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from lxml import etree
 
 def run_parallel(worker, data_list):
@@ -13,6 +14,22 @@ def run_parallel(worker, data_list):
     for thread in thread_list:
         thread.join()
 
+def map_parallel(worker, item_list, max_workers):
+    """
+    Return a list of worker's results for all items, keep items' order
+
+    callable worker -- function called with an item, run in a thread
+    iterable item_list -- items to process
+    int max_workers -- maximal number of items processed at once
+    """
+    item_list = list(item_list)
+    if max_workers <= 1 or len(item_list) <= 1:
+        return [worker(item) for item in item_list]
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(item_list))
+    ) as executor:
+        return list(executor.map(worker, item_list))
+
 def format_environment_error(e):
     if e.filename:
         return "{0}: '{1}'".format(e.strerror, e.filename)
@@ -48,6 +48,7 @@ from pcs.cli.constraint_colocation import (
 from pcs.cli.constraint_order import console_report as order_console_report
 from pcs.cli.constraint_ticket import console_report as ticket_console_report
 from pcs.lib.errors import LibraryError
+from pcs.lib.external import get_services_state
 from pcs.lib.commands import quorum as lib_quorum
 
 # pylint: disable=too-many-branches, too-many-locals, too-many-statements
@@ -131,9 +132,7 @@ def _config_show_cib_lines(lib):
     utils.pcs_options["--full"] = 1
     # get latest modifiers object after updating pcs_options
     modifiers = utils.get_input_modifiers()
-    cib_xml = utils.get_cib()
-    cib_etree = utils.get_cib_etree(cib_xml=cib_xml)
-    cib_dom = utils.get_cib_dom(cib_xml=cib_xml)
+    cib_etree = utils.get_cib_etree()
 
     resource_lines = []
     stonith_lines = []
@@ -164,10 +163,9 @@ def _config_show_cib_lines(lib):
         all_lines.extend(indent(levels_lines, indent_step=2))
 
     all_lines.append("")
-    constraints_element = cib_dom.getElementsByTagName('constraints')[0]
-    all_lines.extend(
-        constraint.location_lines(constraints_element, showDetail=True)
-    )
+    all_lines.extend(constraint.location_lines(
+        constraint.get_constraints_element(cib_etree), showDetail=True
+    ))
     all_lines.extend(constraint_command.show(
         "Ordering Constraints:",
         lib.constraint_order.show,
@@ -193,12 +191,12 @@ def _config_show_cib_lines(lib):
     all_lines.append("")
     all_lines.append("Resources Defaults:")
     all_lines.extend(indent(
-        resource.show_defaults(cib_dom, "rsc_defaults"),
+        resource.show_defaults(cib_etree, "rsc_defaults"),
         indent_step=1
     ))
     all_lines.append("Operations Defaults:")
     all_lines.extend(indent(
-        resource.show_defaults(cib_dom, "op_defaults"),
+        resource.show_defaults(cib_etree, "op_defaults"),
         indent_step=1
     ))
 
@@ -401,13 +399,13 @@ def config_restore_local(infile_name, infile_obj):
     """
     Commandline options: no options
     """
-    if (
-        status.is_service_running("corosync")
-        or
-        status.is_service_running("pacemaker")
-        or
-        status.is_service_running("pacemaker_remote")
-    ):
+    try:
+        services_state = get_services_state(
+            utils.cmd_runner(), ["corosync", "pacemaker", "pacemaker_remote"]
+        )
+    except LibraryError as e:
+        utils.process_library_reports(e.args)
+    if any(state.running for state in services_state.values()):
         utils.err(
             "Cluster is currently running on this node. You need to stop "
                 "the cluster in order to restore the configuration."
@@ -3,6 +3,8 @@ from collections import defaultdict
 import xml.dom.minidom
 from xml.dom.minidom import parseString
 
+from lxml import etree
+
 from pcs import (
     rule as rule_utils,
     usage,
@@ -19,6 +21,7 @@ import pcs.cli.constraint_colocation.command as colocation_command
 import pcs.cli.constraint_order.command as order_command
 from pcs.cli.constraint_ticket import command as ticket_command
 from pcs.lib.cib.constraint import resource_set
+from pcs.lib.cib.constraint.index import ConstraintIndex
 from pcs.lib.cib.constraint.order import ATTRIB as order_attrib
 from pcs.lib.env_tools import get_existing_nodes_names
 from pcs.lib.errors import LibraryError
@@ -262,13 +265,13 @@ def colocation_add(lib, argv, modifiers):
     score, nv_pairs = parse_score_options(argv)
 
 
-    cib_dom = utils.get_cib_dom()
+    cib = utils.get_cib_etree()
     resource_valid, resource_error, dummy_correct_id \
-        = utils.validate_constraint_resource(cib_dom, resource1)
+        = utils.validate_constraint_resource(cib, resource1)
     if not resource_valid:
         utils.err(resource_error)
     resource_valid, resource_error, dummy_correct_id \
-        = utils.validate_constraint_resource(cib_dom, resource2)
+        = utils.validate_constraint_resource(cib, resource2)
     if not resource_valid:
         utils.err(resource_error)
 
@@ -278,7 +281,7 @@ def colocation_add(lib, argv, modifiers):
             id_valid, id_error = utils.validate_xml_id(value, 'constraint id')
             if not id_valid:
                 utils.err(id_error)
-            if utils.does_id_exist(cib_dom, value):
+            if utils.does_id_exist(cib, value):
                 utils.err(
                     "id '%s' is already in use, please specify another one"
                     % value
@@ -288,30 +291,30 @@ def colocation_add(lib, argv, modifiers):
         nv_pairs.append((
             "id",
             utils.find_unique_id(
-                cib_dom,
+                cib,
                 "colocation-%s-%s-%s" % (resource1, resource2, score)
             )
         ))
 
-    (dom, constraintsElement) = getCurrentConstraints(cib_dom)
+    constraints_el = get_constraints_element(cib)
 
     # If one role is specified, the other should default to "started"
     if role1 != "" and role2 == "":
         role2 = DEFAULT_ROLE
     if role2 != "" and role1 == "":
         role1 = DEFAULT_ROLE
-    element = dom.createElement("rsc_colocation")
-    element.setAttribute("rsc", resource1)
-    element.setAttribute("with-rsc", resource2)
-    element.setAttribute("score", score)
+    element = etree.Element("rsc_colocation")
+    element.set("rsc", resource1)
+    element.set("with-rsc", resource2)
+    element.set("score", score)
     if role1 != "":
-        element.setAttribute("rsc-role", role1)
+        element.set("rsc-role", role1)
     if role2 != "":
-        element.setAttribute("with-rsc-role", role2)
+        element.set("with-rsc-role", role2)
     for nv_pair in nv_pairs:
-        element.setAttribute(nv_pair[0], nv_pair[1])
+        element.set(nv_pair[0], nv_pair[1])
     if not modifiers.get("--force"):
-        duplicates = colocation_find_duplicates(constraintsElement, element)
+        duplicates = colocation_find_duplicates(constraints_el, element)
         if duplicates:
             utils.err(
                 "duplicate constraint already exists, use --force to override\n"
@@ -319,14 +322,14 @@ def colocation_add(lib, argv, modifiers):
                     "  "
                     +
                     constraint_colocation.console_report.constraint_plain(
-                        {"options": dict(dup.attributes.items())},
+                        {"options": dict(dup.attrib)},
                         True
                     )
                     for dup in duplicates
                 ])
             )
-    constraintsElement.appendChild(element)
-    utils.replace_cib_configuration(dom)
+    constraints_el.append(element)
+    utils.replace_cib_configuration(cib)
 
 def colocation_find_duplicates(dom, constraint_el):
     """
@@ -334,17 +337,17 @@ def colocation_find_duplicates(dom, constraint_el):
     """
     def normalize(const_el):
         return (
-            const_el.getAttribute("rsc"),
-            const_el.getAttribute("with-rsc"),
-            const_el.getAttribute("rsc-role").capitalize() or DEFAULT_ROLE,
-            const_el.getAttribute("with-rsc-role").capitalize() or DEFAULT_ROLE,
+            const_el.get("rsc", ""),
+            const_el.get("with-rsc", ""),
+            const_el.get("rsc-role", "").capitalize() or DEFAULT_ROLE,
+            const_el.get("with-rsc-role", "").capitalize() or DEFAULT_ROLE,
         )
 
     normalized_el = normalize(constraint_el)
     return [
         other_el
-        for other_el in dom.getElementsByTagName("rsc_colocation")
-        if not other_el.getElementsByTagName("resource_set")
+        for other_el in dom.iter("rsc_colocation")
+        if other_el.find(".//resource_set") is None
             and constraint_el is not other_el
             and normalized_el == normalize(other_el)
     ]
@@ -447,13 +450,13 @@ def order_add(argv, modifiers):
     resource1 = argv.pop(0)
     resource2 = argv.pop(0)
 
-    cib_dom = utils.get_cib_dom()
+    cib = utils.get_cib_etree()
     resource_valid, resource_error, dummy_correct_id \
-        = utils.validate_constraint_resource(cib_dom, resource1)
+        = utils.validate_constraint_resource(cib, resource1)
     if not resource_valid:
         utils.err(resource_error)
     resource_valid, resource_error, dummy_correct_id \
-        = utils.validate_constraint_resource(cib_dom, resource2)
+        = utils.validate_constraint_resource(cib, resource2)
     if not resource_valid:
         utils.err(resource_error)
 
@@ -474,7 +477,7 @@ def order_add(argv, modifiers):
                 )
                 if not id_valid:
                     utils.err(id_error)
-                if utils.does_id_exist(cib_dom, value):
+                if utils.does_id_exist(cib, value):
                     utils.err(
                         "id '%s' is already in use, please specify another one"
                         % value
@@ -516,24 +519,23 @@ def order_add(argv, modifiers):
 
     if not id_specified:
         order_id = "order-" + resource1 + "-" + resource2 + "-" + id_suffix
-        order_id = utils.find_unique_id(cib_dom, order_id)
+        order_id = utils.find_unique_id(cib, order_id)
         order_options.append(("id", order_id))
 
-    (dom, constraintsElement) = getCurrentConstraints()
-    element = dom.createElement("rsc_order")
-    element.setAttribute("first", resource1)
-    element.setAttribute("then", resource2)
+    constraints_el = get_constraints_element(cib)
+    element = etree.SubElement(constraints_el, "rsc_order")
+    element.set("first", resource1)
+    element.set("then", resource2)
     for order_opt in order_options:
-        element.setAttribute(order_opt[0], order_opt[1])
-    constraintsElement.appendChild(element)
+        element.set(order_opt[0], order_opt[1])
     if not modifiers.get("--force"):
-        duplicates = order_find_duplicates(constraintsElement, element)
+        duplicates = order_find_duplicates(constraints_el, element)
         if duplicates:
             utils.err(
                 "duplicate constraint already exists, use --force to override\n"
                 + "\n".join([
                     "  " + constraint_order.console_report.constraint_plain(
-                            {"options": dict(dup.attributes.items())},
+                            {"options": dict(dup.attrib)},
                             True
                         ) for dup in duplicates
                 ])
@@ -542,26 +544,25 @@ def order_add(argv, modifiers):
         "Adding " + resource1 + " " + resource2 + " ("+scorekind+")" + options
     )
 
-    utils.replace_cib_configuration(dom)
+    utils.replace_cib_configuration(cib)
 
 def order_find_duplicates(dom, constraint_el):
     """
     Commandline options: no options
     """
     def normalize(constraint_el):
-        # pylint: disable=line-too-long
         return (
-            constraint_el.getAttribute("first"),
-            constraint_el.getAttribute("then"),
-            constraint_el.getAttribute("first-action").lower() or DEFAULT_ACTION,
-            constraint_el.getAttribute("then-action").lower() or DEFAULT_ACTION,
+            constraint_el.get("first", ""),
+            constraint_el.get("then", ""),
+            constraint_el.get("first-action", "").lower() or DEFAULT_ACTION,
+            constraint_el.get("then-action", "").lower() or DEFAULT_ACTION,
         )
 
     normalized_el = normalize(constraint_el)
     return [
         other_el
-        for other_el in dom.getElementsByTagName("rsc_order")
-        if not other_el.getElementsByTagName("resource_set")
+        for other_el in dom.iter("rsc_order")
+        if other_el.find(".//resource_set") is None
             and constraint_el is not other_el
             and normalized_el == normalize(other_el)
     ]
@@ -600,9 +601,8 @@ def location_show(lib, argv, modifiers):
     else:
         valid_noderes = []
 
-    (dummy_dom, constraintsElement) = getCurrentConstraints()
     print("\n".join(location_lines(
-        constraintsElement,
+        get_constraints_element(utils.get_cib_etree()),
         showDetail=showDetail,
         byNode=byNode,
         valid_noderes=valid_noderes
@@ -620,30 +620,27 @@ def location_lines(
     rschashon = {}
     rschashoff = {}
     ruleshash = defaultdict(list)
-    all_loc_constraints = constraintsElement.getElementsByTagName(
-        'rsc_location'
-    )
+    all_loc_constraints = constraintsElement.findall(".//rsc_location")
 
     all_lines.append("Location Constraints:")
     for rsc_loc in all_loc_constraints:
-        if rsc_loc.hasAttribute("rsc-pattern"):
+        if "rsc-pattern" in rsc_loc.attrib:
             lc_rsc_type = RESOURCE_TYPE_REGEXP
-            lc_rsc_value = rsc_loc.getAttribute("rsc-pattern")
+            lc_rsc_value = rsc_loc.get("rsc-pattern")
             lc_name = "Resource pattern: {0}".format(lc_rsc_value)
         else:
             lc_rsc_type = RESOURCE_TYPE_RESOURCE
-            lc_rsc_value = rsc_loc.getAttribute("rsc")
+            lc_rsc_value = rsc_loc.get("rsc", "")
             lc_name = "Resource: {0}".format(lc_rsc_value)
         lc_rsc = lc_rsc_type, lc_rsc_value, lc_name
-        lc_id = rsc_loc.getAttribute("id")
-        lc_node = rsc_loc.getAttribute("node")
-        lc_score = rsc_loc.getAttribute("score")
-        lc_role = rsc_loc.getAttribute("role")
-        lc_resource_discovery = rsc_loc.getAttribute("resource-discovery")
+        lc_id = rsc_loc.get("id", "")
+        lc_node = rsc_loc.get("node", "")
+        lc_score = rsc_loc.get("score", "")
+        lc_role = rsc_loc.get("role", "")
+        lc_resource_discovery = rsc_loc.get("resource-discovery", "")
 
-        for child in rsc_loc.childNodes:
-            if child.nodeType == child.ELEMENT_NODE and child.tagName == "rule":
-                ruleshash[lc_rsc].append(child)
+        for rule in rsc_loc.iterchildren("rule"):
+            ruleshash[lc_rsc].append(rule)
 
 # NEED TO FIX FOR GROUP LOCATION CONSTRAINTS (where there are children of
 # rsc_location)
@@ -787,14 +784,14 @@ def _show_location_rules(ruleshash, showDetail, noheader=False):
         if not noheader:
             all_lines.append("  {0}".format(rsc[2]))
         for rule in ruleshash[rsc]:
-            constraint_id = rule.parentNode.getAttribute("id")
+            constraint_el = rule.getparent()
+            constraint_id = constraint_el.get("id", "")
             constrainthash[constraint_id].append(rule)
             constraint_options[constraint_id] = []
-            if rule.parentNode.getAttribute("resource-discovery"):
+            if constraint_el.get("resource-discovery"):
                 constraint_options[constraint_id].append(
-                    "resource-discovery=%s" % rule.parentNode.getAttribute(
-                        "resource-discovery"
-                    )
+                    "resource-discovery=%s"
+                    % constraint_el.get("resource-discovery")
                 )
 
         for constraint_id in sorted(constrainthash.keys()):
@@ -1112,20 +1109,26 @@ def location_rule(lib, argv, modifiers):
         lc.setAttribute("rsc-pattern", rsc_value)
 
     rule_utils.dom_rule_add(lc, options, rule_argv)
-    location_rule_check_duplicates(constraints, lc, modifiers.get("--force"))
+    location_rule_check_duplicates(lc, modifiers.get("--force"))
     utils.replace_cib_configuration(cib)
 
-def location_rule_check_duplicates(dom, constraint_el, force):
+def location_rule_check_duplicates(constraint_el, force):
     """
-    Commandline options: no options
+    Commandline options:
+      * -f - CIB file
     """
     if not force:
-        duplicates = location_rule_find_duplicates(dom, constraint_el)
+        # Rules are built in a minidom document. The other constraints are
+        # taken from the loaded CIB, only the new constraint is copied to lxml.
+        duplicates = location_rule_find_duplicates(
+            get_constraints_element(utils.get_cib_etree()),
+            _dom_element_to_etree(constraint_el)
+        )
         if duplicates:
             lines = []
             for dup in duplicates:
-                lines.append("  Constraint: %s" % dup.getAttribute("id"))
-                for dup_rule in utils.dom_get_children_by_tag_name(dup, "rule"):
+                lines.append("  Constraint: %s" % dup.get("id"))
+                for dup_rule in dup.findall("rule"):
                     lines.append(rule_utils.ExportDetailed().get_string(
                         dup_rule, True, "    "
                     ))
@@ -1139,33 +1142,36 @@ def location_rule_find_duplicates(dom, constraint_el):
     Commandline options: no options
     """
     def normalize(constraint_el):
-        if constraint_el.hasAttribute("rsc-pattern"):
-            rsc = (
-                RESOURCE_TYPE_REGEXP,
-                constraint_el.getAttribute("rsc-pattern")
-            )
+        if "rsc-pattern" in constraint_el.attrib:
+            rsc = (RESOURCE_TYPE_REGEXP, constraint_el.get("rsc-pattern"))
         else:
-            rsc = (
-                RESOURCE_TYPE_RESOURCE,
-                constraint_el.getAttribute("rsc")
-            )
+            rsc = (RESOURCE_TYPE_RESOURCE, constraint_el.get("rsc", ""))
         return (
             rsc,
             [
                 rule_utils.ExportAsExpression().get_string(rule_el, True)
-                for rule_el in constraint_el.getElementsByTagName("rule")
+                for rule_el in constraint_el.iterfind(".//rule")
             ]
         )
 
     normalized_el = normalize(constraint_el)
     return [
         other_el
-        for other_el in dom.getElementsByTagName("rsc_location")
-        if other_el.getElementsByTagName("rule")
-            and constraint_el is not other_el
+        for other_el in dom.iter("rsc_location")
+        if other_el.find(".//rule") is not None
+            and constraint_el.get("id") != other_el.get("id")
             and normalized_el == normalize(other_el)
     ]
 
+def _dom_element_to_etree(dom_element):
+    element = etree.Element(
+        dom_element.tagName, attrib=dict(dom_element.attributes.items())
+    )
+    for child in dom_element.childNodes:
+        if child.nodeType == xml.dom.minidom.Node.ELEMENT_NODE:
+            element.append(_dom_element_to_etree(child))
+    return element
+
 # Grabs the current constraints and returns the dom and constraint element
 def getCurrentConstraints(passed_dom=None):
     """
@@ -1185,6 +1191,15 @@ def getCurrentConstraints(passed_dom=None):
     constraintsElement = dom.getElementsByTagName('constraints')[0]
     return (dom, constraintsElement)
 
+def get_constraints_element(cib):
+    """
+    Commandline options: no options
+    """
+    constraints_el = cib.find(".//constraints")
+    if constraints_el is None:
+        utils.err("unable to process cib")
+    return constraints_el
+
 # If returnStatus is set, then we don't error out, we just print the error
 # and return false
 def constraint_rm(
@@ -1261,16 +1276,27 @@ def constraint_ref(lib, argv, modifiers):
     if not argv:
         raise CmdLineInputError()
 
+    # one index serves all the resources
+    constraint_index = ConstraintIndex(utils.get_cib_etree())
     for arg in argv:
         print("Resource: %s" % arg)
-        constraints, set_constraints = find_constraints_containing(arg)
-        if not constraints and not set_constraints:
+        constraints, set_constraints = _find_constraints_in_index(
+            constraint_index, arg
+        )
+        pattern_constraints = [
+            constraint_el.get("id", "")
+            for constraint_el
+            in constraint_index.find_pattern_constraints(arg)
+        ]
+        if not constraints and not set_constraints and not pattern_constraints:
             print("  No Matches.")
         else:
             for constraint in constraints:
                 print("  " + constraint)
             for constraint in sorted(set_constraints):
                 print("  " + constraint)
+            for constraint in pattern_constraints:
+                print("  " + constraint)
 
 def remove_constraints_containing(
     resource_id, output=False, constraints_element=None, passed_dom=None
@@ -1279,103 +1305,130 @@ def remove_constraints_containing(
     Commandline options:
       * -f - CIB file, effective only if passed_dom is None
     """
-    lib = utils.get_library_wrapper()
-    modifiers = utils.get_input_modifiers()
-    constraints, set_constraints = find_constraints_containing(
-        resource_id,
-        passed_dom
+    return remove_constraints_containing_resources(
+        [resource_id], output, constraints_element, passed_dom
     )
-    for c in constraints:
-        if output:
-            print("Removing Constraint - " + c)
-        if constraints_element is not None:
-            constraint_rm(
-                lib, [c], modifiers, True, constraints_element,
-                passed_dom=passed_dom
-            )
-        else:
-            constraint_rm(lib, [c], modifiers, passed_dom=passed_dom)
 
-    if set_constraints:
-        (dom, constraintsElement) = getCurrentConstraints(passed_dom)
-        for c in constraintsElement.getElementsByTagName("resource_ref")[:]:
+def remove_constraints_containing_resources(
+    resource_id_list, output=False, constraints_element=None, passed_dom=None
+):
+    """
+    Remove constraints of all the resources using one index of the CIB
+
+    Commandline options:
+      * -f - CIB file, effective only if passed_dom is None
+    """
+    dom = passed_dom if passed_dom else utils.get_cib_dom()
+    if constraints_element is None:
+        constraints_element_list = dom.getElementsByTagName("constraints")
+        if not constraints_element_list:
+            return None
+        constraints_element = constraints_element_list[0]
+
+    # The constraints are edited as a minidom document. They are looked up in
+    # an index built from a copy of the document and mapped back to minidom
+    # elements by their ids.
+    constraint_index = ConstraintIndex(
+        _dom_element_to_etree(dom.documentElement)
+    )
+    constraint_dict = {
+        constraint_el.getAttribute("id"): constraint_el
+        for constraint_el in constraints_element.childNodes
+        if constraint_el.nodeType == xml.dom.minidom.Node.ELEMENT_NODE
+    }
+    # resource sets are processed in the document order
+    position_dict = {
+        constraint_id: position
+        for position, constraint_id in enumerate(constraint_dict)
+    }
+
+    cib_changed = False
+    for resource_id in resource_id_list:
+        for constraint_id in [
+            constraint_el.get("id", "")
+            for constraint_el in constraint_index.find_constraints(resource_id)
+        ]:
+            constraint_el = constraint_dict.pop(constraint_id, None)
+            if constraint_el is None:
+                # already removed as a constraint of another resource
+                continue
+            if output:
+                print("Removing Constraint - " + constraint_id)
+            constraints_element.removeChild(constraint_el)
+            cib_changed = True
+
+        set_constraint_id_list = sorted(
+            [
+                constraint_el.get("id", "")
+                for constraint_el
+                in constraint_index.find_set_constraints(resource_id)
+                if constraint_el.get("id", "") in constraint_dict
+            ],
+            key=position_dict.get
+        )
+        resource_ref_list = [
+            resource_ref
+            for constraint_id in set_constraint_id_list
+            for resource_ref in constraint_dict[
+                constraint_id
+            ].getElementsByTagName("resource_ref")
+            if resource_ref.getAttribute("id") == resource_id
+        ]
+
+        for c in resource_ref_list:
             # If resource id is in a set, remove it from the set, if the set
             # is empty, then we remove the set, if the parent of the set
             # is empty then we remove it
-            if c.getAttribute("id") == resource_id:
-                pn = c.parentNode
-                pn.removeChild(c)
-                if output:
-                    print(
-                        "Removing %s from set %s"
-                        % (resource_id, pn.getAttribute("id"))
-                    )
-                if pn.getElementsByTagName("resource_ref").length == 0:
-                    print("Removing set %s" % pn.getAttribute("id"))
-                    pn2 = pn.parentNode
-                    pn2.removeChild(pn)
-                    if pn2.getElementsByTagName("resource_set").length == 0:
-                        pn2.parentNode.removeChild(pn2)
-                        print("Removing constraint %s" % pn2.getAttribute("id"))
-        if passed_dom:
-            return dom
+            cib_changed = True
+            pn = c.parentNode
+            pn.removeChild(c)
+            if output:
+                print(
+                    "Removing %s from set %s"
+                    % (resource_id, pn.getAttribute("id"))
+                )
+            if pn.getElementsByTagName("resource_ref").length == 0:
+                print("Removing set %s" % pn.getAttribute("id"))
+                pn2 = pn.parentNode
+                pn2.removeChild(pn)
+                if pn2.getElementsByTagName("resource_set").length == 0:
+                    pn2.parentNode.removeChild(pn2)
+                    del constraint_dict[pn2.getAttribute("id")]
+                    print("Removing constraint %s" % pn2.getAttribute("id"))
+
+    if passed_dom:
+        return dom
+    if cib_changed:
         utils.replace_cib_configuration(dom)
     return None
 
-def find_constraints_containing(resource_id, passed_dom=None):
+def find_constraints_containing(resource_id, cib=None):
     """
     Commandline options:
-      * -f - CIB file, effective only if passed_dom is None
+      * -f - CIB file, effective only if cib is None
     """
-    if passed_dom:
-        dom = passed_dom
-    else:
-        dom = utils.get_cib_dom()
-    constraints_found = []
-    set_constraints = []
-
-    resources = dom.getElementsByTagName("primitive")
-    resource_match = None
-    for res in resources:
-        if res.getAttribute("id") == resource_id:
-            resource_match = res
-            break
-
-    if resource_match:
-        if (
-            resource_match.parentNode.tagName == "master"
-            or
-            resource_match.parentNode.tagName == "clone"
-        ):
-            constraints_found, set_constraints = find_constraints_containing(
-                resource_match.parentNode.getAttribute("id"),
-                dom
-            )
-
-    constraints = dom.getElementsByTagName("constraints")
-    if not constraints:
-        return [], []
-
-    constraints = constraints[0]
-    myConstraints = constraints.getElementsByTagName("rsc_colocation")
-    myConstraints += constraints.getElementsByTagName("rsc_location")
-    myConstraints += constraints.getElementsByTagName("rsc_order")
-    myConstraints += constraints.getElementsByTagName("rsc_ticket")
-    attr_to_match = ["rsc", "first", "then", "with-rsc", "first", "then"]
-    for c in myConstraints:
-        for attr in attr_to_match:
-            if c.getAttribute(attr) == resource_id:
-                constraints_found.append(c.getAttribute("id"))
-                break
+    if cib is None:
+        cib = utils.get_cib_etree()
+    return _find_constraints_in_index(ConstraintIndex(cib), resource_id)
 
-    setConstraints = constraints.getElementsByTagName("resource_ref")
-    for c in setConstraints:
-        if c.getAttribute("id") == resource_id:
-            set_constraints.append(c.parentNode.parentNode.getAttribute("id"))
+def _find_constraints_in_index(constraint_index, resource_id):
+    """
+    Return ids of constraints and set constraints referencing the resource
 
-    # Remove duplicates
-    set_constraints = list(set(set_constraints))
-    return constraints_found, set_constraints
+    ConstraintIndex constraint_index -- constraints of a CIB
+    string resource_id -- id of the resource
+    """
+    return (
+        [
+            constraint_el.get("id", "")
+            for constraint_el in constraint_index.find_constraints(resource_id)
+        ],
+        [
+            constraint_el.get("id", "")
+            for constraint_el
+            in constraint_index.find_set_constraints(resource_id)
+        ],
+    )
 
 def remove_constraints_containing_node(dom, node, output=False):
     """
@@ -1450,11 +1503,7 @@ def constraint_rule(lib, argv, modifiers):
             utils.err("Unable to find constraint: " + constraint_id)
         options, rule_argv = rule_utils.parse_argv(argv)
         rule_utils.dom_rule_add(constraint, options, rule_argv)
-        location_rule_check_duplicates(
-            cib,
-            constraint,
-            modifiers.get("--force")
-        )
+        location_rule_check_duplicates(constraint, modifiers.get("--force"))
         utils.replace_cib_configuration(cib)
 
     elif command in ["remove", "delete"]:
@@ -1,5 +1,10 @@
+import json
+
+from tornado.gen import sleep
+from tornado.ioloop import IOLoop
 from tornado.locks import Lock
 
+from pcs import settings
 from pcs.daemon import ruby_pcsd
 from pcs.daemon.app_common import Sinatra
 from pcs.daemon.http_server import HttpsServerManage
@@ -62,6 +67,64 @@ class SetCerts(SinatraRemote):
             self.__https_server_manage.reload_certs()
         self.send_sinatra_result(result)
 
+class PacemakerNodeStatusWait(SinatraRemote):
+    """
+    PacemakerNodeStatusWait responds once pacemaker is started on the local
+    node or a timeout expires. The waiting is done here, ruby is asked only for
+    the current status of the node. So a waiting request occupies a ruby worker
+    just for a moment in each check instead of the whole timeout.
+    """
+    def initialize(self, ruby_pcsd_wrapper: ruby_pcsd.Wrapper):
+        #pylint: disable=arguments-differ
+        super().initialize(ruby_pcsd_wrapper)
+        self.__connection_closed = False
+
+    def on_connection_close(self):
+        self.__connection_closed = True
+
+    async def handle_sinatra_request(self):
+        max_timeout = settings.pcsd_pacemaker_start_wait_max_timeout
+        try:
+            timeout = int(self.get_argument("timeout", ""))
+        except ValueError:
+            timeout = max_timeout
+        if timeout < 1 or timeout > max_timeout:
+            timeout = max_timeout
+        stop_at = IOLoop.current().time() + timeout
+        while True:
+            # Ruby takes care of the authentication, permissions and of getting
+            # the status.
+            result = await self.ruby_pcsd_wrapper.request_remote(
+                self.request, path="/remote/pacemaker_node_status"
+            )
+            remaining = stop_at - IOLoop.current().time()
+            if (
+                result.status != 200
+                or
+                _is_pacemaker_started(result.body)
+                or
+                remaining <= 0
+            ):
+                break
+            await sleep(
+                min(settings.pcsd_pacemaker_start_check_interval, remaining)
+            )
+            if self.__connection_closed:
+                return
+        self.send_sinatra_result(result)
+
+def _is_pacemaker_started(node_status_json):
+    try:
+        node_status = json.loads(node_status_json)
+    except ValueError:
+        # Not a status, the client has to deal with it.
+        return True
+    return (
+        node_status.get("online", False)
+        and
+        not node_status.get("pending", True)
+    )
+
 class Auth(SinatraRemote):
     async def auth(self):
         user_auth_info = await authorize_user(
@@ -96,5 +159,10 @@ def get_routes(
             {**ruby_wrapper, **lock}
         ),
         (r"/remote/auth", Auth, ruby_wrapper),
+        (
+            r"/remote/pacemaker_node_status_wait",
+            PacemakerNodeStatusWait,
+            ruby_wrapper
+        ),
         (r"/remote/.*", SinatraRemote, ruby_wrapper),
     ]
@@ -1,13 +1,16 @@
 from collections import namedtuple
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import byref, cast, CDLL, CFUNCTYPE, POINTER, sizeof, Structure
 from ctypes import c_char, c_char_p, c_int, c_uint, c_void_p
 from ctypes.util import find_library
 import grp
 import pwd
+from time import time as now
 
 from tornado.gen import coroutine
 
+from pcs import settings
 from pcs.daemon import log
 
 # pylint: disable=invalid-name, too-few-public-methods
@@ -144,13 +147,7 @@ class PlainLogger:
     def success(self, username):
         pass
 
-def check_user_groups_sync(username, logger) -> UserAuthInfo:
-    try:
-        groups = get_user_groups_sync(username)
-    except KeyError as e:
-        logger.unable_determine_groups(username, e)
-        return UserAuthInfo(username, [], is_authorized=False)
-
+def check_groups(username, groups, logger) -> UserAuthInfo:
     if HA_ADM_GROUP not in groups:
         logger.not_ha_adm_member(username, HA_ADM_GROUP)
         return UserAuthInfo(username, groups, is_authorized=False)
@@ -158,6 +155,14 @@ def check_user_groups_sync(username, logger) -> UserAuthInfo:
     logger.success(username)
     return UserAuthInfo(username, groups, is_authorized=True)
 
+def check_user_groups_sync(username, logger) -> UserAuthInfo:
+    try:
+        groups = get_user_groups_sync(username)
+    except KeyError as e:
+        logger.unable_determine_groups(username, e)
+        return UserAuthInfo(username, [], is_authorized=False)
+    return check_groups(username, groups, logger)
+
 def authorize_user_sync(username, password) -> UserAuthInfo:
     log.pcsd.info("Attempting login by '%s'", username)
 
@@ -169,24 +174,151 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 
     return check_user_groups_sync(username, LoginLogger())
 
+class GroupsCache:
+    """
+    Keeps groups of users for a short time so a burst of requests of the same
+    user does not need to look the groups up again and again.
+    """
+    def __init__(self, ttl):
+        """
+        int ttl -- how many seconds the groups of a user are valid
+        """
+        self.__ttl = ttl
+        self.__groups = {}
+
+    def get(self, username):
+        if username not in self.__groups:
+            return None
+        expiration, groups = self.__groups[username]
+        if expiration <= now():
+            del self.__groups[username]
+            return None
+        return groups
+
+    def set(self, username, groups):
+        if self.__ttl > 0:
+            self.__groups[username] = (now() + self.__ttl, groups)
+
+    def clear(self):
+        self.__groups = {}
+
+class WorkerPool:
+    # pylint: disable=too-few-public-methods
+    executor = None
+    max_workers = 1
+    groups_cache = GroupsCache(ttl=0)
+
+def start_worker_pool(
+    max_workers=settings.pcsd_auth_workers,
+    groups_cache_ttl=settings.pcsd_auth_groups_cache_ttl_seconds
+):
+    """
+    Create a long-lived pool of processes for authentication and group lookups.
+
+    Without the pool, a new process is started for each call.
+    """
+    WorkerPool.max_workers = max_workers
+    WorkerPool.executor = ProcessPoolExecutor(max_workers=max_workers)
+    WorkerPool.groups_cache = GroupsCache(groups_cache_ttl)
+
+def stop_worker_pool():
+    if WorkerPool.executor is not None:
+        WorkerPool.executor.shutdown(wait=False)
+    WorkerPool.executor = None
+    WorkerPool.groups_cache.clear()
+
 # TODO async/await version - how to do it?
 # When async/await is used then the problem is:
 # "TypeError: object Future can't be used in 'await' expression" is raised even
 # if the function "convert_yielded" is used according to
 # http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
 @coroutine
-def run_in_process(sync_fn, *args):
-    pool = ProcessPoolExecutor(max_workers=1)
-    result = yield pool.submit(sync_fn, *args)
-    pool.shutdown()
+def run_in_process(sync_fn, *args, retry_on_broken_pool=False):
+    """
+    Run sync_fn in a worker process
+
+    callable sync_fn -- function to run
+    bool retry_on_broken_pool -- run sync_fn once more when the pool broke
+        down, only safe for functions without side effects
+    """
+    if WorkerPool.executor is None:
+        pool = ProcessPoolExecutor(max_workers=1)
+        result = yield pool.submit(sync_fn, *args)
+        pool.shutdown()
+        return result
+
+    executor = WorkerPool.executor
+    try:
+        result = yield executor.submit(sync_fn, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. a pam module crashed). The pool is not usable
+        # anymore so it is replaced.
+        _replace_broken_executor(executor)
+        if not retry_on_broken_pool:
+            raise
+        result = yield WorkerPool.executor.submit(sync_fn, *args)
     return result
 
+def _replace_broken_executor(executor):
+    # All the calls running in a broken pool fail, the pool is replaced only
+    # by the first of them.
+    if WorkerPool.executor is not executor:
+        return
+    log.pcsd.warning("Authentication worker pool broken, restarting it")
+    WorkerPool.executor = ProcessPoolExecutor(
+        max_workers=WorkerPool.max_workers
+    )
+    executor.shutdown(wait=False)
+
+@coroutine
+def get_user_groups(username):
+    """
+    Return groups of the user, use cached groups when possible
+
+    Raise KeyError when the user does not exist.
+    """
+    groups = WorkerPool.groups_cache.get(username)
+    if groups is None:
+        groups = yield run_in_process(
+            get_user_groups_sync, username, retry_on_broken_pool=True
+        )
+        WorkerPool.groups_cache.set(username, groups)
+    return groups
+
+@coroutine
+def check_user_groups_with_logger(username, logger) -> UserAuthInfo:
+    try:
+        groups = yield get_user_groups(username)
+    except KeyError as e:
+        logger.unable_determine_groups(username, e)
+        return UserAuthInfo(username, [], is_authorized=False)
+    return check_groups(username, groups, logger)
+
 @coroutine
 def authorize_user(username, password) -> UserAuthInfo:
-    user = yield run_in_process(authorize_user_sync, username, password)
+    log.pcsd.info("Attempting login by '%s'", username)
+
+    try:
+        # Authentication is not retried when the pool breaks down, it would
+        # count as another failed attempt e.g. for pam_faillock.
+        is_authenticated = yield run_in_process(
+            authenticate_by_pam, username, password
+        )
+    except BrokenProcessPool:
+        log.pcsd.error(
+            "Failed login by '%s' (authentication worker terminated)", username
+        )
+        return UserAuthInfo(username, [], is_authorized=False)
+    if not is_authenticated:
+        log.pcsd.info(
+            "Failed login by '%s' (bad username or password)", username
+        )
+        return UserAuthInfo(username, [], is_authorized=False)
+
+    user = yield check_user_groups_with_logger(username, LoginLogger())
     return user
 
 @coroutine
 def check_user_groups(username) -> UserAuthInfo:
-    user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
+    user = yield check_user_groups_with_logger(username, PlainLogger())
     return user
@@ -32,6 +32,9 @@ PCSD_CMDLINE_ENTRY = "PCSD_CMDLINE_ENTRY"
 PCSD_STATIC_FILES_DIR = "PCSD_STATIC_FILES_DIR"
 HTTPS_PROXY = "HTTPS_PROXY"
 NO_PROXY = "NO_PROXY"
+PCSD_RUBY_WORKERS = "PCSD_RUBY_WORKERS"
+PCSD_RUBY_WORKER_MAX_REQUESTS = "PCSD_RUBY_WORKER_MAX_REQUESTS"
+PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS = "PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS"
 
 Env = namedtuple("Env", [
     PCSD_PORT,
@@ -48,6 +51,9 @@ Env = namedtuple("Env", [
     HTTPS_PROXY,
     NO_PROXY,
     PCSD_DEV,
+    PCSD_RUBY_WORKERS,
+    PCSD_RUBY_WORKER_MAX_REQUESTS,
+    PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS,
     "has_errors",
 ])
 
@@ -68,6 +74,9 @@ def prepare_env(environ, logger=None):
         loader.https_proxy(),
         loader.no_proxy(),
         loader.pcsd_dev(),
+        loader.ruby_workers(),
+        loader.ruby_worker_max_requests(),
+        loader.ruby_worker_max_waiting_requests(),
         loader.has_errors(),
     )
     if logger:
@@ -203,6 +212,24 @@ class EnvLoader:
     def no_proxy(self):
         return self.environ.get("no_proxy", self.environ.get(NO_PROXY, None))
 
+    def ruby_workers(self):
+        return self.__non_negative_int(
+            PCSD_RUBY_WORKERS,
+            settings.pcsd_ruby_workers
+        )
+
+    def ruby_worker_max_requests(self):
+        return self.__non_negative_int(
+            PCSD_RUBY_WORKER_MAX_REQUESTS,
+            settings.pcsd_ruby_worker_max_requests
+        )
+
+    def ruby_worker_max_waiting_requests(self):
+        return self.__non_negative_int(
+            PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS,
+            settings.pcsd_ruby_worker_max_waiting_requests
+        )
+
     @lru_cache()
     def pcsd_dev(self):
         return self.__has_true_in_environ(PCSD_DEV)
@@ -217,5 +244,19 @@ class EnvLoader:
             self.errors.append(f"{description} '{in_pcsd_path}' does not exist")
         return in_pcsd_path
 
+    def __non_negative_int(self, environ_key, default):
+        value = self.environ.get(environ_key, default)
+        try:
+            int_value = int(value)
+        except ValueError:
+            int_value = -1
+        if int_value < 0:
+            self.errors.append(
+                f"Invalid {environ_key} value '{value}'"
+                " (it must be a non-negative integer)"
+            )
+            return value
+        return int_value
+
     def __has_true_in_environ(self, environ_key):
         return self.environ.get(environ_key, "").lower() == "true"
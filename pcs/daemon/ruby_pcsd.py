@@ -11,6 +11,7 @@ from tornado.httputil import split_host_and_port, HTTPServerRequest
 from tornado.process import Subprocess
 
 from pcs.daemon import log
+from pcs.daemon.ruby_worker_pool import WorkerPool
 
 
 SINATRA_GUI = "sinatra_gui"
@@ -67,8 +68,16 @@ class Wrapper:
     # pylint: disable=too-many-instance-attributes
     def __init__(
         self, pcsd_cmdline_entry, gem_home=None, debug=False,
-        ruby_executable="ruby", https_proxy=None, no_proxy=None
+        ruby_executable="ruby", https_proxy=None, no_proxy=None,
+        workers=0, worker_max_requests=0, worker_max_waiting_requests=0,
     ):
+        """
+        int workers -- number of long-lived ruby workers, 0 means to run
+            a new ruby process for each request
+        int worker_max_requests -- recycle a worker after so many requests
+        int worker_max_waiting_requests -- refuse requests when so many
+            requests are waiting for a free worker
+        """
         self.__gem_home = gem_home
         self.__pcsd_cmdline_entry = pcsd_cmdline_entry
         self.__pcsd_dir = os.path.dirname(pcsd_cmdline_entry)
@@ -76,6 +85,15 @@ class Wrapper:
         self.__debug = debug
         self.__https_proxy = https_proxy
         self.__no_proxy = no_proxy
+        self.__worker_pool = None
+        if workers > 0:
+            self.__worker_pool = WorkerPool(
+                self.__get_ruby_command(),
+                self.__get_ruby_env(),
+                size=workers,
+                max_requests=worker_max_requests,
+                max_waiting_requests=worker_max_waiting_requests,
+            )
 
     @staticmethod
     def get_sinatra_request(request: HTTPServerRequest):
@@ -102,7 +120,14 @@ class Wrapper:
             "rack.input": request.body.decode("utf8"),
         }}
 
-    async def send_to_ruby(self, request_json):
+    def __get_ruby_command(self):
+        return [
+            self.__ruby_executable, "-I",
+            self.__pcsd_dir,
+            self.__pcsd_cmdline_entry
+        ]
+
+    def __get_ruby_env(self):
         env = {
             "PCSD_DEBUG": "true" if self.__debug else "false"
         }
@@ -113,17 +138,22 @@ class Wrapper:
             env["NO_PROXY"] = self.__no_proxy
         if self.__https_proxy is not None:
             env["HTTPS_PROXY"] = self.__https_proxy
+        return env
+
+    def stop(self):
+        if self.__worker_pool is not None:
+            self.__worker_pool.stop()
+
+    async def send_to_ruby(self, request_json):
+        if self.__worker_pool is not None:
+            return await self.__worker_pool.process(request_json)
 
         pcsd_ruby = Subprocess(
-            [
-                self.__ruby_executable, "-I",
-                self.__pcsd_dir,
-                self.__pcsd_cmdline_entry
-            ],
+            self.__get_ruby_command(),
             stdin=Subprocess.STREAM,
             stdout=Subprocess.STREAM,
             stderr=Subprocess.STREAM,
-            env=env
+            env=self.__get_ruby_env()
         )
         await Task(pcsd_ruby.stdin.write, str.encode(request_json))
         pcsd_ruby.stdin.close()
@@ -146,11 +176,16 @@ class Wrapper:
                 request_json, stdout, stderr
             )
             raise HTTPError(500)
-        else:
-            if self.__debug:
-                log_communication(request_json, stdout, stderr)
-            process_response_logs(response["logs"])
-            return response
+        process_response_logs(response.get("logs"))
+        if "error" in response:
+            self.__log_bad_response(
+                f"Ruby pcsd wrapper failed: '{response['error']}'",
+                request_json, stdout, stderr
+            )
+            raise HTTPError(500)
+        if self.__debug:
+            log_communication(request_json, stdout, stderr)
+        return response
 
     async def request_gui(
         self, request: HTTPServerRequest, user, groups, is_authenticated
@@ -172,10 +207,23 @@ class Wrapper:
         ))
         return SinatraResult.from_response(response)
 
-    async def request_remote(self, request: HTTPServerRequest) -> SinatraResult:
+    async def request_remote(
+        self, request: HTTPServerRequest, path=None
+    ) -> SinatraResult:
+        """
+        string path -- pass the request to ruby as if it was sent to this path
+        """
+        sinatra_request = self.get_sinatra_request(request)
+        if path is not None:
+            sinatra_request["env"].update({
+                "PATH_INFO": path,
+                "QUERY_STRING": "",
+                "REQUEST_PATH": path,
+                "REQUEST_URI": f"{request.protocol}://{request.host}{path}",
+            })
         response = await convert_yielded(self.run_ruby(
             SINATRA_REMOTE,
-            self.get_sinatra_request(request)
+            sinatra_request
         ))
         return SinatraResult.from_response(response)
 
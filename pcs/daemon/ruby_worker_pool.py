@@ -0,0 +1,242 @@
+from collections import deque
+
+from tornado.iostream import StreamClosedError
+from tornado.locks import Event, Semaphore
+from tornado.process import Subprocess
+from tornado.web import HTTPError
+
+from pcs.daemon import log
+
+
+WORKER_MODE_ARG = "--worker"
+# Only the tail of worker's stderr is kept for the debug logging.
+STDERR_BUFFER_MAX_BYTES = 64 * 1024
+# The worker writes this to its stderr when it finishes a request, before it
+# writes the response. Keep in sync with pcsd/sinatra_cmdline_wrapper.rb.
+STDERR_BOUNDARY = b"\0PCSD_WORKER_REQUEST_END\0"
+
+class Worker:
+    """
+    Long-lived ruby process serving requests one by one.
+
+    Requests and responses are framed as one json document per line: a json
+    serialization never contains an unescaped newline. Stderr is read
+    continuously and split into requests by STDERR_BOUNDARY.
+    """
+    def __init__(self, command, env):
+        self.served_requests = 0
+        self.__alive = True
+        self.__stderr = deque()
+        self.__stderr_size = 0
+        # a part of stderr which may be the beginning of a boundary
+        self.__stderr_tail = b""
+        self.__request_stderr = b""
+        self.__request_stderr_ready = Event()
+        self.__process = Subprocess(
+            command + [WORKER_MODE_ARG],
+            stdin=Subprocess.STREAM,
+            stdout=Subprocess.STREAM,
+            stderr=Subprocess.STREAM,
+            env=env
+        )
+        self.__process.set_exit_callback(self.__on_exit)
+        self.__drain_stderr()
+        log.pcsd.debug(
+            "Ruby pcsd worker started, pid: %s", self.__process.pid
+        )
+
+    @property
+    def alive(self):
+        return self.__alive
+
+    async def process(self, request_json):
+        """
+        Send a request to the worker and return stdout, stderr and exit status
+        in the same way the one-shot ruby process does.
+
+        string request_json -- serialized request without a trailing newline
+        """
+        self.__request_stderr_ready.clear()
+        try:
+            await self.__process.stdin.write(str.encode(request_json + "\n"))
+            stdout = await self.__process.stdout.read_until(b"\n")
+        except StreamClosedError:
+            self.__alive = False
+            self.__close_streams()
+            log.pcsd.error(
+                "Ruby pcsd worker (pid: %s) terminated while processing"
+                    " a request"
+                ,
+                self.__process.pid
+            )
+            stderr = (
+                self.__request_stderr if self.__request_stderr_ready.is_set()
+                else self.__get_stderr()
+            )
+            return b"", stderr, self.__process.returncode
+        self.served_requests += 1
+        # Stderr comes through another pipe, it may not have been read yet.
+        await self.__request_stderr_ready.wait()
+        return stdout, self.__request_stderr, 0
+
+    def stop(self):
+        # The worker finishes its loop on the end of its input.
+        self.__alive = False
+        self.__close_streams()
+
+    def __close_streams(self):
+        for stream in (
+            self.__process.stdin,
+            self.__process.stdout,
+            self.__process.stderr,
+        ):
+            if not stream.closed():
+                stream.close()
+
+    def __on_exit(self, returncode):
+        if self.__alive:
+            log.pcsd.warning(
+                "Ruby pcsd worker (pid: %s) exited unexpectedly with code %s",
+                self.__process.pid,
+                returncode,
+            )
+        self.__alive = False
+
+    def __drain_stderr(self):
+        # The worker must never block on a full stderr pipe.
+        def on_chunk(chunk):
+            data = self.__stderr_tail + chunk
+            request_stderr, boundary, data = data.partition(STDERR_BOUNDARY)
+            while boundary:
+                self.__append_stderr(request_stderr)
+                self.__finish_request_stderr()
+                request_stderr, boundary, data = data.partition(
+                    STDERR_BOUNDARY
+                )
+            tail_size = len(STDERR_BOUNDARY) - 1
+            self.__append_stderr(data[:-tail_size])
+            self.__stderr_tail = data[-tail_size:]
+
+        def on_close(future):
+            # The stream is closed when the worker ends. There is nothing to
+            # do about that here, the exit callback takes care of it. A request
+            # must not wait for the rest of its stderr anymore, though.
+            future.exception()
+            self.__append_stderr(self.__stderr_tail)
+            self.__stderr_tail = b""
+            self.__finish_request_stderr()
+
+        future = self.__process.stderr.read_until_close(
+            streaming_callback=on_chunk
+        )
+        future.add_done_callback(on_close)
+
+    def __append_stderr(self, chunk):
+        if not chunk:
+            return
+        self.__stderr.append(chunk)
+        self.__stderr_size += len(chunk)
+        while (
+            self.__stderr_size > STDERR_BUFFER_MAX_BYTES
+            and
+            len(self.__stderr) > 1
+        ):
+            self.__stderr_size -= len(self.__stderr.popleft())
+
+    def __finish_request_stderr(self):
+        self.__request_stderr = self.__get_stderr()
+        self.__stderr.clear()
+        self.__stderr_size = 0
+        self.__request_stderr_ready.set()
+
+    def __get_stderr(self):
+        return b"".join(self.__stderr)
+
+class WorkerPool:
+    """
+    Bounded pool of long-lived ruby pcsd workers.
+
+    Workers are started on demand up to the pool size. A crashed worker is
+    replaced by a new one and a worker is recycled after serving
+    max_requests requests. When all workers are busy, requests wait for a free
+    worker. When too many requests are waiting, new ones are refused.
+    """
+    def __init__(
+        self, command, env, size, max_requests=0, max_waiting_requests=0
+    ):
+        """
+        list command -- command starting a ruby pcsd wrapper
+        dict env -- environment of workers
+        int size -- maximal number of running workers
+        int max_requests -- recycle a worker after so many requests, 0 means
+            never
+        int max_waiting_requests -- refuse requests when so many requests are
+            waiting for a free worker, 0 means never
+        """
+        self.__command = command
+        self.__env = env
+        self.__max_requests = max_requests
+        self.__max_waiting_requests = max_waiting_requests
+        self.__semaphore = Semaphore(size)
+        self.__idle_workers = []
+        self.__waiting_requests = 0
+
+    async def process(self, request_json):
+        if (
+            self.__max_waiting_requests
+            and
+            self.__waiting_requests >= self.__max_waiting_requests
+        ):
+            log.pcsd.warning(
+                "All ruby pcsd workers are busy and %s requests are waiting,"
+                    " refusing a request"
+                ,
+                self.__waiting_requests
+            )
+            raise HTTPError(503)
+
+        self.__waiting_requests += 1
+        try:
+            await self.__semaphore.acquire()
+        finally:
+            self.__waiting_requests -= 1
+
+        try:
+            worker = self.__get_worker()
+            try:
+                result = await worker.process(request_json)
+            except BaseException:
+                # The worker is in an unknown state, e.g. a part of its
+                # response may still be waiting in the pipe. It must not serve
+                # another request.
+                worker.stop()
+                raise
+            self.__release_worker(worker)
+            return result
+        finally:
+            self.__semaphore.release()
+
+    def stop(self):
+        for worker in self.__idle_workers:
+            worker.stop()
+        self.__idle_workers = []
+
+    def __get_worker(self):
+        while self.__idle_workers:
+            worker = self.__idle_workers.pop()
+            if worker.alive:
+                return worker
+            worker.stop()
+        return Worker(self.__command, self.__env)
+
+    def __release_worker(self, worker):
+        if not worker.alive:
+            return
+        if (
+            self.__max_requests
+            and
+            worker.served_requests >= self.__max_requests
+        ):
+            worker.stop()
+            return
+        self.__idle_workers.append(worker)
@@ -12,6 +12,7 @@ from pcs.common.system import is_systemd
 from pcs.daemon import (
     app_gui,
     app_remote,
+    auth,
     log,
     ruby_pcsd,
     session,
@@ -24,6 +25,7 @@ from pcs.daemon.http_server import HttpsServerManage
 class SignalInfo:
     #pylint: disable=too-few-public-methods
     server_manage = None
+    ruby_pcsd_wrapper = None
     ioloop_started = False
 
 def handle_signal(incomming_signal, frame):
@@ -31,6 +33,9 @@ def handle_signal(incomming_signal, frame):
     log.pcsd.warning('Caught signal: %s, shutting down', incomming_signal)
     if SignalInfo.server_manage:
         SignalInfo.server_manage.stop()
+    if SignalInfo.ruby_pcsd_wrapper:
+        SignalInfo.ruby_pcsd_wrapper.stop()
+    auth.stop_worker_pool()
     if SignalInfo.ioloop_started:
         IOLoop.current().stop()
     raise SystemExit(0)
@@ -93,6 +98,7 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
+    auth.start_worker_pool()
     sync_config_lock = Lock()
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         pcsd_cmdline_entry=env.PCSD_CMDLINE_ENTRY,
@@ -101,7 +107,11 @@ def main():
         ruby_executable=settings.ruby_executable,
         https_proxy=env.HTTPS_PROXY,
         no_proxy=env.NO_PROXY,
+        workers=env.PCSD_RUBY_WORKERS,
+        worker_max_requests=env.PCSD_RUBY_WORKER_MAX_REQUESTS,
+        worker_max_waiting_requests=env.PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS,
     )
+    SignalInfo.ruby_pcsd_wrapper = ruby_pcsd_wrapper
     make_app = configure_app(
         session.Storage(env.PCSD_SESSION_LIFETIME),
         ruby_pcsd_wrapper,
@@ -65,6 +65,55 @@ class Auth(
         self.assert_wrappers_response(self.make_auth_request())
 
 
+@mock.patch("pcs.settings.pcsd_pacemaker_start_check_interval", 0.01)
+@mock.patch("pcs.settings.pcsd_pacemaker_start_wait_max_timeout", 0.1)
+class PacemakerNodeStatusWait(AppTest):
+    # pylint: disable=too-many-ancestors
+    started = b'{"offline": false, "online": true, "pending": false}'
+    not_running = b'{"pacemaker_not_running": true}'
+
+    def setUp(self):
+        super().setUp()
+        self.body_list = []
+        self.path_list = []
+        request_remote = self.wrapper.request_remote
+
+        async def record_request(request, path=None):
+            self.path_list.append(path)
+            if self.body_list:
+                self.wrapper.body = self.body_list.pop(0)
+            return await request_remote(request, path)
+
+        self.wrapper.request_remote = record_request
+
+    def request_wait(self, timeout="1"):
+        return self.post(
+            "/remote/pacemaker_node_status_wait", body={"timeout": timeout}
+        )
+
+    def test_started(self):
+        self.body_list = [self.not_running, self.not_running, self.started]
+        self.assert_wrappers_response(self.request_wait())
+        self.assertEqual(
+            ["/remote/pacemaker_node_status"] * 3, self.path_list
+        )
+
+    def test_timeout(self):
+        self.wrapper.body = self.not_running
+        self.assert_wrappers_response(self.request_wait(timeout="100"))
+        self.assertGreater(len(self.path_list), 1)
+
+    def test_error_returned_immediately(self):
+        self.wrapper.status_code = 403
+        self.wrapper.body = b"Permission denied"
+        self.assert_wrappers_response(self.request_wait())
+        self.assertEqual(1, len(self.path_list))
+
+    def test_not_json_returned_immediately(self):
+        self.wrapper.body = b"error"
+        self.assert_wrappers_response(self.request_wait())
+        self.assertEqual(1, len(self.path_list))
+
 class SinatraRemote(AppTest):
     def test_take_result_from_ruby(self):
         self.assert_wrappers_response(self.get("/remote/"))
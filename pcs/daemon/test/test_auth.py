@@ -1,6 +1,10 @@
-from unittest import TestCase
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock, TestCase
 import logging
 
+from tornado.testing import AsyncTestCase, gen_test
+
 from pcs.daemon import auth
 from pcs.test.tools.misc import create_setup_patch_mixin
 
@@ -37,3 +41,121 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+class GroupsCache(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.now = self.setup_patch("now", return_value=100)
+
+    def test_returns_cached_groups_before_expiration(self):
+        cache = auth.GroupsCache(ttl=10)
+        cache.set(USER, ("group",))
+        self.now.return_value = 109
+        self.assertEqual(cache.get(USER), ("group",))
+
+    def test_forgets_groups_after_expiration(self):
+        cache = auth.GroupsCache(ttl=10)
+        cache.set(USER, ("group",))
+        self.now.return_value = 110
+        self.assertIsNone(cache.get(USER))
+
+    def test_does_not_cache_with_zero_ttl(self):
+        cache = auth.GroupsCache(ttl=0)
+        cache.set(USER, ("group",))
+        self.assertIsNone(cache.get(USER))
+
+class CheckUserGroups(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.get_user_groups_sync = self.setup_patch(
+            "get_user_groups_sync",
+            return_value=(auth.HA_ADM_GROUP,)
+        )
+        self.setup_patch("run_in_process", self.run_in_process)
+        self.setup_patch(
+            "WorkerPool.groups_cache",
+            auth.GroupsCache(ttl=10)
+        )
+
+    @staticmethod
+    async def run_in_process(sync_fn, *args, **kwargs):
+        return sync_fn(*args)
+
+    @gen_test
+    def test_groups_are_looked_up_once(self):
+        first = yield auth.check_user_groups(USER)
+        second = yield auth.check_user_groups(USER)
+        self.assertTrue(first.is_authorized)
+        self.assertTrue(second.is_authorized)
+        self.get_user_groups_sync.assert_called_once_with(USER)
+
+    @gen_test
+    def test_unknown_user_is_not_cached(self):
+        self.get_user_groups_sync.side_effect = KeyError(USER)
+        first = yield auth.check_user_groups(USER)
+        second = yield auth.check_user_groups(USER)
+        self.assertFalse(first.is_authorized)
+        self.assertFalse(second.is_authorized)
+        self.assertEqual(self.get_user_groups_sync.call_count, 2)
+
+def fixture_executor(result=None):
+    executor = mock.Mock(spec_set=["submit", "shutdown"])
+    if result is None:
+        executor.submit.side_effect = BrokenProcessPool()
+    else:
+        future = Future()
+        future.set_result(result)
+        executor.submit.return_value = future
+    return executor
+
+class RunInProcess(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.broken_executor = fixture_executor()
+        self.new_executor = fixture_executor(result="result")
+        self.setup_patch("WorkerPool.executor", self.broken_executor)
+        self.ProcessPoolExecutor = self.setup_patch(
+            "ProcessPoolExecutor", return_value=self.new_executor
+        )
+
+    @gen_test
+    def test_broken_pool_replaced_and_call_retried(self):
+        result = yield auth.run_in_process(
+            len, "abc", retry_on_broken_pool=True
+        )
+        self.assertEqual(result, "result")
+        self.assertIs(auth.WorkerPool.executor, self.new_executor)
+        self.broken_executor.shutdown.assert_called_once_with(wait=False)
+        self.new_executor.submit.assert_called_once_with(len, "abc")
+
+    @gen_test
+    def test_broken_pool_replaced_and_call_failed(self):
+        with self.assertRaises(BrokenProcessPool):
+            yield auth.run_in_process(len, "abc")
+        self.assertIs(auth.WorkerPool.executor, self.new_executor)
+        self.broken_executor.shutdown.assert_called_once_with(wait=False)
+        self.new_executor.submit.assert_not_called()
+
+    @gen_test
+    def test_broken_pool_replaced_only_once(self):
+        other_executor = fixture_executor(result="other")
+        def replaced_meanwhile(*args):
+            auth.WorkerPool.executor = other_executor
+            raise BrokenProcessPool()
+        self.broken_executor.submit.side_effect = replaced_meanwhile
+
+        result = yield auth.run_in_process(
+            len, "abc", retry_on_broken_pool=True
+        )
+        self.assertEqual(result, "other")
+        self.ProcessPoolExecutor.assert_not_called()
+        self.broken_executor.shutdown.assert_not_called()
+
+    @gen_test
+    def test_authentication_not_retried(self):
+        authenticate_by_pam = self.setup_patch("authenticate_by_pam")
+        user = yield auth.authorize_user(USER, PASSWORD)
+        self.assertFalse(user.is_authorized)
+        self.broken_executor.submit.assert_called_once_with(
+            authenticate_by_pam, USER, PASSWORD
+        )
+        self.new_executor.submit.assert_not_called()
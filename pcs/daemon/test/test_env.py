@@ -46,6 +46,13 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.HTTPS_PROXY: None,
             env.NO_PROXY: None,
             env.PCSD_DEV: False,
+            env.PCSD_RUBY_WORKERS: settings.pcsd_ruby_workers,
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS:
+                settings.pcsd_ruby_worker_max_requests
+            ,
+            env.PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS:
+                settings.pcsd_ruby_worker_max_waiting_requests
+            ,
             "has_errors": False,
         }
         if specific_env_values is None:
@@ -79,6 +86,9 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.HTTPS_PROXY: "proxy1",
             env.NO_PROXY: "host",
             env.PCSD_DEV: "true",
+            env.PCSD_RUBY_WORKERS: "2",
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS: "0",
+            env.PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS: "10",
         }
         self.assert_environ_produces_modified_pcsd_env(
             environ=environ,
@@ -101,6 +111,9 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
                 env.HTTPS_PROXY: environ[env.HTTPS_PROXY],
                 env.NO_PROXY: environ[env.NO_PROXY],
                 env.PCSD_DEV: True,
+                env.PCSD_RUBY_WORKERS: 2,
+                env.PCSD_RUBY_WORKER_MAX_REQUESTS: 0,
+                env.PCSD_RUBY_WORKER_MAX_WAITING_REQUESTS: 10,
             },
         )
 
@@ -115,6 +128,23 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             ]
         )
 
+    def test_error_on_invalid_ruby_workers(self):
+        environ = {
+            env.PCSD_RUBY_WORKERS: "-1",
+            env.PCSD_RUBY_WORKER_MAX_REQUESTS: "many",
+        }
+        self.assert_environ_produces_modified_pcsd_env(
+            environ,
+            specific_env_values={**environ, "has_errors": True},
+            errors=[
+                "Invalid PCSD_RUBY_WORKERS value '-1'"
+                    " (it must be a non-negative integer)"
+                ,
+                "Invalid PCSD_RUBY_WORKER_MAX_REQUESTS value 'many'"
+                    " (it must be a non-negative integer)"
+                ,
+            ]
+        )
 
     def test_report_invalid_ssl_ciphers(self):
         environ = {env.PCSD_SSL_CIPHERS: "invalid ;@{}+ ciphers"}
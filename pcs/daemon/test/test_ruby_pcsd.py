@@ -1,5 +1,6 @@
 import json
 import logging
+import sys
 from base64 import b64encode
 from unittest import TestCase, mock
 from urllib.parse import urlencode
@@ -9,6 +10,7 @@ from tornado.testing import AsyncTestCase, gen_test
 from tornado.web import HTTPError
 
 from pcs.daemon import ruby_pcsd
+from pcs.daemon.ruby_worker_pool import STDERR_BOUNDARY, WORKER_MODE_ARG
 from pcs.test.tools.misc import create_patcher, get_test_resource as rc
 
 # Don't write errors to test output.
@@ -104,6 +106,13 @@ class RunRuby(AsyncTestCase):
         with self.assertRaises(HTTPError):
             yield self.wrapper.run_ruby(ruby_pcsd.SYNC_CONFIGS)
 
+    @gen_test
+    def test_error_response_from_ruby(self):
+        self.stdout = json.dumps({"error": "Unknown type: 'sync_configs'"})
+        with self.assertRaises(HTTPError) as cm:
+            yield self.wrapper.run_ruby(ruby_pcsd.SYNC_CONFIGS)
+        self.assertEqual(cm.exception.status_code, 500)
+
     @gen_test
     def test_sync_config_shortcut_success(self):
         _next = 10
@@ -136,6 +145,30 @@ class RunRuby(AsyncTestCase):
         result = yield self.wrapper.request_remote(http_request)
         self.assert_sinatra_result(result, headers, status, body)
 
+    @gen_test
+    def test_request_remote_other_path(self):
+        self.set_run_result({
+            "headers": {},
+            "status": 200,
+            "body": b64encode(b"content").decode(),
+        })
+        http_request = create_http_request()
+        sinatra_request = self.wrapper.get_sinatra_request(http_request)
+        sinatra_request["env"].update({
+            "PATH_INFO": "/remote/other",
+            "QUERY_STRING": "",
+            "REQUEST_PATH": "/remote/other",
+            "REQUEST_URI": "http://{0}/remote/other".format(http_request.host),
+        })
+        self.request = {
+            **self.create_request(ruby_pcsd.SINATRA_REMOTE),
+            **sinatra_request,
+        }
+        result = yield self.wrapper.request_remote(
+            http_request, path="/remote/other"
+        )
+        self.assert_sinatra_result(result, {}, 200, "content")
+
     @gen_test
     def test_request_gui(self):
         headers = {"some": "header"}
@@ -169,6 +202,47 @@ class RunRuby(AsyncTestCase):
         )
         self.assert_sinatra_result(result, headers, status, body)
 
+# Emulates the worker mode of the ruby pcsd wrapper failing on each request.
+FAKE_FAILING_WORKER = """
+import json, sys
+assert sys.argv[1] == "{worker_mode_arg}"
+for line in sys.stdin:
+    sys.stderr.buffer.write(b"NameError: undefined variable" + {boundary})
+    sys.stderr.flush()
+    sys.stdout.write(json.dumps({{"error": "undefined variable"}}) + "\\n")
+    sys.stdout.flush()
+""".format(worker_mode_arg=WORKER_MODE_ARG, boundary=repr(STDERR_BOUNDARY))
+
+class RunRubyWorker(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        with mock.patch.object(
+            ruby_pcsd.Wrapper,
+            "_Wrapper__get_ruby_command",
+            lambda self: [sys.executable, "-c", FAKE_FAILING_WORKER],
+        ):
+            self.wrapper = ruby_pcsd.Wrapper(
+                rc("/path/to/pcsd/cmdline/entry"),
+                workers=1,
+            )
+
+    def tearDown(self):
+        self.wrapper.stop()
+        super().tearDown()
+
+    @gen_test
+    def test_error_response(self):
+        with self.assertRaises(HTTPError) as cm:
+            yield self.wrapper.run_ruby(ruby_pcsd.SINATRA_REMOTE)
+        self.assertEqual(cm.exception.status_code, 500)
+
+    @patch_ruby_pcsd("now", return_value=0)
+    @gen_test
+    def test_sync_configs_is_rescheduled(self, now):
+        # pylint: disable=unused-argument
+        result = yield self.wrapper.sync_configs()
+        self.assertEqual(result, ruby_pcsd.DEFAULT_SYNC_CONFIG_DELAY)
+
 class ProcessResponseLog(TestCase):
     @patch_ruby_pcsd("log.from_external_source")
     @patch_ruby_pcsd("next", mock.Mock(return_value=1))
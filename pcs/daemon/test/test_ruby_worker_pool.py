@@ -0,0 +1,147 @@
+import json
+import logging
+import sys
+from unittest import mock
+
+from tornado.gen import multi
+from tornado.iostream import StreamBufferFullError
+from tornado.locks import Event
+from tornado.testing import AsyncTestCase, gen_test
+from tornado.web import HTTPError
+
+from pcs.daemon.ruby_worker_pool import (
+    STDERR_BOUNDARY,
+    Worker,
+    WorkerPool,
+    WORKER_MODE_ARG,
+)
+
+# Don't write errors to test output.
+logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+
+# Emulates the worker mode of the ruby pcsd wrapper. The response contains pid
+# of the worker so it is possible to check which worker served a request.
+# A request of the type "late_stderr" gets its stderr written after its
+# response.
+FAKE_WORKER = """
+import json, os, sys, time
+assert sys.argv[1] == "{worker_mode_arg}"
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["type"] == "crash":
+        sys.exit(1)
+    response = json.dumps(dict(request, pid=os.getpid())) + "\\n"
+    if request["type"] == "late_stderr":
+        sys.stdout.write(response)
+        sys.stdout.flush()
+        time.sleep(0.2)
+    sys.stderr.buffer.write(b"stderr of " + request["type"].encode())
+    sys.stderr.buffer.write({boundary})
+    sys.stderr.flush()
+    if request["type"] != "late_stderr":
+        sys.stdout.write(response)
+        sys.stdout.flush()
+""".format(worker_mode_arg=WORKER_MODE_ARG, boundary=repr(STDERR_BOUNDARY))
+
+def create_pool(size=1, max_requests=0, max_waiting_requests=0):
+    return WorkerPool(
+        [sys.executable, "-c", FAKE_WORKER],
+        {},
+        size=size,
+        max_requests=max_requests,
+        max_waiting_requests=max_waiting_requests,
+    )
+
+def request(request_type):
+    return json.dumps({"type": request_type})
+
+class WorkerPoolTest(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = None
+
+    def tearDown(self):
+        if self.pool:
+            self.pool.stop()
+        super().tearDown()
+
+    async def send(self, request_type):
+        stdout, stderr, status = await self.pool.process(request(request_type))
+        self.assertEqual(status, 0)
+        response = json.loads(stdout)
+        self.assertEqual(response["type"], request_type)
+        return response["pid"], stderr
+
+    @gen_test
+    def test_worker_is_reused(self):
+        self.pool = create_pool()
+        first_pid, dummy_stderr = yield self.send("first")
+        second_pid, dummy_stderr = yield self.send("second")
+        self.assertEqual(first_pid, second_pid)
+
+    @gen_test
+    def test_worker_is_recycled(self):
+        self.pool = create_pool(max_requests=2)
+        first_pid, dummy_stderr = yield self.send("first")
+        second_pid, dummy_stderr = yield self.send("second")
+        third_pid, dummy_stderr = yield self.send("third")
+        self.assertEqual(first_pid, second_pid)
+        self.assertNotEqual(second_pid, third_pid)
+
+    @gen_test
+    def test_stderr_belongs_to_its_request(self):
+        self.pool = create_pool()
+        dummy_pid, stderr = yield self.send("late_stderr")
+        self.assertEqual(stderr, b"stderr of late_stderr")
+        dummy_pid, stderr = yield self.send("second")
+        self.assertEqual(stderr, b"stderr of second")
+
+    @gen_test
+    def test_crashed_worker_is_replaced(self):
+        self.pool = create_pool()
+        first_pid, dummy_stderr = yield self.send("first")
+        stdout, dummy_stderr, dummy_status = yield self.pool.process(
+            request("crash")
+        )
+        self.assertEqual(stdout, b"")
+        second_pid, dummy_stderr = yield self.send("second")
+        self.assertNotEqual(first_pid, second_pid)
+
+    @gen_test
+    def test_pool_size_is_respected(self):
+        self.pool = create_pool(size=2)
+        pid_list = yield multi([self.send(str(i)) for i in range(6)])
+        self.assertEqual(len({pid for pid, dummy_stderr in pid_list}), 2)
+
+    @gen_test
+    def test_refuse_when_too_many_requests_wait(self):
+        self.pool = create_pool(size=1, max_waiting_requests=1)
+        finished = Event()
+
+        async def refused():
+            with self.assertRaises(HTTPError) as cm:
+                await self.pool.process(request("refused"))
+            self.assertEqual(cm.exception.status_code, 503)
+            finished.set()
+
+        # The first request occupies the only worker, the second one waits and
+        # the third one is refused.
+        yield multi([self.send("first"), self.send("second"), refused()])
+        self.assertTrue(finished.is_set())
+
+    @gen_test
+    def test_failed_worker_is_replaced(self):
+        self.pool = create_pool()
+        first_pid, dummy_stderr = yield self.send("first")
+        failed_workers = []
+
+        async def fail(worker, request_json):
+            failed_workers.append(worker)
+            raise StreamBufferFullError("Reached maximum read buffer size")
+
+        with mock.patch.object(Worker, "process", fail):
+            with self.assertRaises(StreamBufferFullError):
+                yield self.pool.process(request("failed"))
+        self.assertFalse(failed_workers[0].alive)
+        second_pid, dummy_stderr = yield self.send("second")
+        self.assertNotEqual(first_pid, second_pid)
@@ -0,0 +1,86 @@
+import json
+import os
+from urllib.parse import quote
+
+
+class AgentMetadataCache:
+    """
+    On-disk cache of agents' metadata
+
+    Getting metadata of an agent means running the agent through crm_resource,
+    which takes a while. Metadata are stored in one file per agent together
+    with a fingerprint of the agent. Stored metadata are used only while the
+    fingerprint matches, so an updated agent or pacemaker makes them stale.
+    """
+    _FILE_SUFFIX = ".json"
+
+    def __init__(self, cache_dir):
+        """
+        string cache_dir -- directory to store metadata in
+        """
+        self._cache_dir = cache_dir
+
+    def get(self, agent_name, fingerprint):
+        """
+        Return stored metadata of an agent or None if there are none usable
+
+        string agent_name -- full name of the agent
+        list fingerprint -- json serializable identification of the agent
+            version, e.g. mtime and size of the agent's file
+        """
+        try:
+            with open(self._get_file_path(agent_name), "r") as cache_file:
+                cached = json.load(cache_file)
+        except (EnvironmentError, ValueError):
+            return None
+        if (
+            not isinstance(cached, dict)
+            or
+            cached.get("fingerprint") != fingerprint
+        ):
+            return None
+        return cached.get("metadata")
+
+    def put(self, agent_name, fingerprint, metadata):
+        """
+        Store metadata of an agent
+
+        string agent_name -- full name of the agent
+        list fingerprint -- json serializable identification of the agent
+        string metadata -- metadata of the agent
+        """
+        file_path = self._get_file_path(agent_name)
+        # Write to a temporary file first, so a concurrent pcs process never
+        # reads partially written metadata.
+        tmp_file_path = "{0}.{1}".format(file_path, os.getpid())
+        try:
+            os.makedirs(self._cache_dir, mode=0o700, exist_ok=True)
+            with open(tmp_file_path, "w") as cache_file:
+                json.dump(
+                    {"fingerprint": fingerprint, "metadata": metadata},
+                    cache_file
+                )
+            os.replace(tmp_file_path, file_path)
+        except EnvironmentError:
+            # Agents work without the cache, only slower.
+            try:
+                os.remove(tmp_file_path)
+            except EnvironmentError:
+                pass
+
+    def clear(self):
+        """
+        Remove all stored metadata
+        """
+        try:
+            file_name_list = os.listdir(self._cache_dir)
+        except FileNotFoundError:
+            return
+        for file_name in file_name_list:
+            if file_name.endswith(self._FILE_SUFFIX):
+                os.remove(os.path.join(self._cache_dir, file_name))
+
+    def _get_file_path(self, agent_name):
+        return os.path.join(
+            self._cache_dir, quote(agent_name, safe="") + self._FILE_SUFFIX
+        )
@@ -0,0 +1,108 @@
+from collections import defaultdict
+import re
+
+
+TAG_LIST = ("rsc_colocation", "rsc_location", "rsc_order", "rsc_ticket")
+# attributes of constraints which hold an id of a resource
+REFERENCE_ATTRIBUTE_LIST = ("rsc", "with-rsc", "first", "then")
+
+
+class ConstraintIndex:
+    """
+    Constraints referencing resources collected by one pass through the CIB
+
+    Constraints of a clone or a master apply to its primitive as well. The
+    index does not follow changes of the CIB, build a new one after modifying
+    constraints or resources.
+    """
+    def __init__(self, cib):
+        """
+        etree cib -- the whole CIB or any element containing resources and
+            constraints
+        """
+        self._constraint_dict = defaultdict(list)
+        self._set_constraint_dict = defaultdict(list)
+        self._pattern_list = []
+        self._clone_dict = {
+            primitive_el.get("id"): primitive_el.getparent().get("id")
+            for primitive_el in cib.xpath(
+                ".//*[self::clone or self::master]/primitive"
+            )
+        }
+        constraints_el = cib.find(".//constraints")
+        if constraints_el is None:
+            return
+        # Constraints are grouped by their type, each group in document order.
+        for tag in TAG_LIST:
+            for constraint_el in constraints_el.iter(tag):
+                self._add_constraint(constraint_el)
+
+    def _add_constraint(self, constraint_el):
+        for resource_id in _unique(
+            constraint_el.get(attribute)
+            for attribute in REFERENCE_ATTRIBUTE_LIST
+            if constraint_el.get(attribute)
+        ):
+            self._constraint_dict[resource_id].append(constraint_el)
+
+        for resource_id in _unique(
+            resource_ref_el.get("id")
+            for resource_ref_el in constraint_el.iterfind(
+                "./resource_set/resource_ref"
+            )
+        ):
+            self._set_constraint_dict[resource_id].append(constraint_el)
+
+        pattern = constraint_el.get("rsc-pattern")
+        if pattern:
+            try:
+                self._pattern_list.append((re.compile(pattern), constraint_el))
+            except re.error:
+                # pacemaker ignores constraints with an invalid pattern
+                pass
+
+    def _get_referenced_ids(self, resource_id):
+        if resource_id in self._clone_dict:
+            return [self._clone_dict[resource_id], resource_id]
+        return [resource_id]
+
+    def find_constraints(self, resource_id):
+        """
+        Return constraints referencing a resource in their attributes
+
+        string resource_id -- id of the resource
+        """
+        return _unique(
+            constraint_el
+            for referenced_id in self._get_referenced_ids(resource_id)
+            for constraint_el in self._constraint_dict.get(referenced_id, [])
+        )
+
+    def find_set_constraints(self, resource_id):
+        """
+        Return constraints referencing a resource in their resource sets
+
+        string resource_id -- id of the resource
+        """
+        return _unique(
+            constraint_el
+            for referenced_id in self._get_referenced_ids(resource_id)
+            for constraint_el
+            in self._set_constraint_dict.get(referenced_id, [])
+        )
+
+    def find_pattern_constraints(self, resource_id):
+        """
+        Return location constraints whose rsc-pattern matches a resource
+
+        string resource_id -- id of the resource
+        """
+        referenced_ids = self._get_referenced_ids(resource_id)
+        return [
+            constraint_el for pattern, constraint_el in self._pattern_list
+            if any(pattern.search(_id) for _id in referenced_ids)
+        ]
+
+
+def _unique(item_iterable):
+    return list(dict.fromkeys(item_iterable))
@@ -1,6 +1,7 @@
 from collections import namedtuple
 from lxml import etree
 
+from pcs.common import report_codes
 from pcs.lib import reports
 from pcs.lib.cib.nvpair import update_nvset
 from pcs.lib.cib.tools import get_nodes
@@ -58,6 +59,106 @@ def update_node_instance_attrs(
     append_when_useful(node_el, attrs_el)
     append_when_useful(cib_nodes, node_el)
 
+def update_nodes_nvsets(
+    cib, id_provider, attrs_by_node, utilization_by_node, state_nodes=None,
+    allow_remove_nonexistent=False
+):
+    """
+    Update instance_attributes and utilization of several nodes at once
+
+    Nvsets are created if needed. If a node has more than one nvset of a kind,
+    the first one is modified. A node missing in the CIB is created if its
+    state is provided in state_nodes and it gets any nvpairs. Nodes are looked
+    up in the CIB only once, all missing nodes and attributes are reported
+    together.
+
+    etree cib -- cib
+    IdProvider id_provider -- elements' ids generator
+    dict attrs_by_node -- node name: attrs to update, e.g. {'A': 'a', 'B': ''}
+    dict utilization_by_node -- node name: utilization attrs to update
+    iterable state_nodes -- optional list of node state objects
+    bool allow_remove_nonexistent -- do not report removing attrs which do not
+        exist, utilization attrs are never reported
+    """
+    # See update_node_instance_attrs for why empty nvsets and nodes are never
+    # removed.
+    cib_nodes = get_nodes(cib)
+    node_el_dict = {
+        node_el.get("uname"): node_el
+        for node_el in cib_nodes.iterfind("./node")
+    }
+    node_state_dict = {
+        node_state.attrs.name: node_state for node_state in (state_nodes or [])
+    }
+    node_name_list = sorted(set(attrs_by_node) | set(utilization_by_node))
+    report_list = [
+        reports.node_not_found(node_name) for node_name in node_name_list
+        if node_name not in node_el_dict and node_name not in node_state_dict
+    ]
+    if not allow_remove_nonexistent:
+        report_list.extend(
+            _report_nonexistent_attrs_removal(node_el_dict, attrs_by_node)
+        )
+    if report_list:
+        raise LibraryError(*report_list)
+
+    for node_name in node_name_list:
+        node_el = node_el_dict.get(node_name)
+        if node_el is None:
+            node_state = node_state_dict[node_name]
+            node_el = _create_node(
+                node_state.attrs.id,
+                node_state.attrs.name,
+                node_state.attrs.type
+            )
+        _update_node_nvset(
+            node_el,
+            "instance_attributes",
+            "nodes-{0}".format(node_el.get("id")),
+            attrs_by_node.get(node_name, {}),
+            id_provider
+        )
+        _update_node_nvset(
+            node_el,
+            "utilization",
+            "nodes-{0}-utilization".format(node_el.get("id")),
+            utilization_by_node.get(node_name, {}),
+            id_provider
+        )
+        # Do not create a node only to remove nvpairs from it.
+        append_when_useful(cib_nodes, node_el, attribs_important=False)
+
+def _report_nonexistent_attrs_removal(node_el_dict, attrs_by_node):
+    report_list = []
+    for node_name, attrs in sorted(attrs_by_node.items()):
+        # Only the first nvset is modified, same as by crm_attribute.
+        node_el = node_el_dict.get(node_name)
+        nvset_el = (
+            None if node_el is None else node_el.find("./instance_attributes")
+        )
+        existing_names = set() if nvset_el is None else {
+            nvpair_el.get("name") for nvpair_el in nvset_el.iterfind("./nvpair")
+        }
+        report_list.extend(
+            reports.node_attribute_does_not_exist(
+                node_name, name, forceable=report_codes.FORCE_OPTIONS
+            )
+            for name, value in sorted(attrs.items())
+            if value == "" and name not in existing_names
+        )
+    return report_list
+
+def _update_node_nvset(node_el, tag_name, proposed_id, attrs, id_provider):
+    if not attrs:
+        return
+    nvset_el = node_el.find("./{0}".format(tag_name))
+    if nvset_el is None:
+        nvset_el = etree.Element(
+            tag_name, id=id_provider.allocate_id(proposed_id)
+        )
+    update_nvset(nvset_el, attrs, id_provider)
+    append_when_useful(node_el, nvset_el)
+
 def _ensure_node_exists(tree, node_name, state_nodes=None):
     """
     Make sure node with specified name exists
@@ -0,0 +1,79 @@
+from unittest import TestCase
+from lxml import etree
+
+from pcs.lib.cib.constraint.index import ConstraintIndex
+
+
+class ConstraintIndexTest(TestCase):
+    def setUp(self):
+        self.index = ConstraintIndex(etree.fromstring("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="A"/>
+                        <clone id="B-clone"><primitive id="B"/></clone>
+                        <master id="C-master"><primitive id="C"/></master>
+                    </resources>
+                    <constraints>
+                        <rsc_ticket id="T1" rsc="B" ticket="T"/>
+                        <rsc_order id="O1" first="B-clone" then="A"/>
+                        <rsc_colocation id="C1" rsc="A" with-rsc="A"
+                            score="INFINITY"
+                        />
+                        <rsc_location id="L1" rsc="A" node="node1" score="1"/>
+                        <rsc_order id="O2">
+                            <resource_set id="O2-set1">
+                                <resource_ref id="A"/>
+                                <resource_ref id="C-master"/>
+                            </resource_set>
+                            <resource_set id="O2-set2">
+                                <resource_ref id="A"/>
+                            </resource_set>
+                        </rsc_order>
+                        <rsc_location id="L2" rsc-pattern="^[AB]$"
+                            node="node1" score="1"
+                        />
+                        <rsc_location id="L3" rsc-pattern="clone"
+                            node="node1" score="1"
+                        />
+                        <rsc_location id="L4" rsc-pattern="[" node="node1"
+                            score="1"
+                        />
+                    </constraints>
+                </configuration>
+            </cib>
+        """))
+
+    def assert_ids(self, expected_ids, element_list):
+        self.assertEqual(
+            expected_ids, [element.get("id") for element in element_list]
+        )
+
+    def test_constraints_grouped_by_type(self):
+        self.assert_ids(
+            ["C1", "L1", "O1"], self.index.find_constraints("A")
+        )
+
+    def test_constraints_of_clone_first(self):
+        self.assert_ids(["O1", "T1"], self.index.find_constraints("B"))
+        self.assert_ids(["O1"], self.index.find_constraints("B-clone"))
+
+    def test_set_constraints(self):
+        self.assert_ids(["O2"], self.index.find_set_constraints("A"))
+        self.assert_ids(["O2"], self.index.find_set_constraints("C"))
+        self.assert_ids([], self.index.find_set_constraints("B"))
+
+    def test_pattern_constraints(self):
+        self.assert_ids(["L2"], self.index.find_pattern_constraints("A"))
+        self.assert_ids(["L2", "L3"], self.index.find_pattern_constraints("B"))
+        self.assert_ids([], self.index.find_pattern_constraints("C"))
+
+    def test_unknown_resource(self):
+        self.assert_ids([], self.index.find_constraints("X"))
+        self.assert_ids([], self.index.find_set_constraints("X"))
+        self.assert_ids([], self.index.find_pattern_constraints("X"))
+
+    def test_no_constraints(self):
+        index = ConstraintIndex(etree.fromstring("<cib><resources/></cib>"))
+        self.assert_ids([], index.find_constraints("A"))
+        self.assert_ids([], index.find_set_constraints("A"))
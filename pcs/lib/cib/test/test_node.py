@@ -188,6 +188,162 @@ class UpdateNodeInstanceAttrs(TestCase):
         )
 
 
+class UpdateNodesNvsets(TestCase):
+    def setUp(self):
+        self.cib = etree.fromstring("""
+            <cib><configuration><nodes>
+                <node id="1" uname="node1"/>
+                <node id="2" uname="node2">
+                    <instance_attributes id="nodes-2">
+                        <nvpair id="nodes-2-a" name="a" value="A" />
+                    </instance_attributes>
+                    <utilization id="nodes-2-utilization">
+                        <nvpair id="nodes-2-utilization-cpu" name="cpu"
+                            value="1"
+                        />
+                    </utilization>
+                </node>
+            </nodes></configuration></cib>
+        """)
+        self.state = ClusterState("""
+            <crm_mon version="1.1.15">
+                <summary>
+                    <current_dc present="true" />
+                    <nodes_configured number="1" />
+                    <resources_configured number="0" />
+                </summary>
+                <nodes>
+                    <node name="node3" id="3" online="true" standby="false"
+                        standby_onfail="false" maintenance="false"
+                        pending="false" unclean="false" shutdown="false"
+                        expected_up="true" is_dc="true" resources_running="0"
+                        type="member"
+                    />
+                </nodes>
+            </crm_mon>
+        """).node_section.nodes
+
+    def update(
+        self, attrs_by_node, utilization_by_node, allow_remove_nonexistent=False
+    ):
+        node.update_nodes_nvsets(
+            self.cib,
+            IdProvider(self.cib),
+            attrs_by_node,
+            utilization_by_node,
+            state_nodes=self.state,
+            allow_remove_nonexistent=allow_remove_nonexistent,
+        )
+
+    def test_update_all_nodes(self):
+        self.update(
+            {
+                "node1": {"a": "1"},
+                "node2": {"a": "", "b": "2"},
+                "node3": {"a": "3"},
+            },
+            {
+                "node1": {"cpu": "4"},
+                "node2": {"cpu": "", "ram": "8"},
+            }
+        )
+        assert_xml_equal(
+            """
+            <cib><configuration><nodes>
+                <node id="1" uname="node1">
+                    <instance_attributes id="nodes-1">
+                        <nvpair id="nodes-1-a" name="a" value="1" />
+                    </instance_attributes>
+                    <utilization id="nodes-1-utilization">
+                        <nvpair id="nodes-1-utilization-cpu" name="cpu"
+                            value="4"
+                        />
+                    </utilization>
+                </node>
+                <node id="2" uname="node2">
+                    <instance_attributes id="nodes-2">
+                        <nvpair id="nodes-2-b" name="b" value="2" />
+                    </instance_attributes>
+                    <utilization id="nodes-2-utilization">
+                        <nvpair id="nodes-2-utilization-ram" name="ram"
+                            value="8"
+                        />
+                    </utilization>
+                </node>
+                <node id="3" uname="node3" type="member">
+                    <instance_attributes id="nodes-3">
+                        <nvpair id="nodes-3-a" name="a" value="3" />
+                    </instance_attributes>
+                </node>
+            </nodes></configuration></cib>
+            """,
+            etree_to_str(self.cib)
+        )
+
+    def test_dont_create_node_if_deleting(self):
+        original_cib = etree_to_str(self.cib)
+        self.update(
+            {"node1": {"x": ""}, "node3": {"x": ""}},
+            {},
+            allow_remove_nonexistent=True
+        )
+        assert_xml_equal(original_cib, etree_to_str(self.cib))
+
+    def test_removing_nonexistent_attrs_reported(self):
+        original_cib = etree_to_str(self.cib)
+        assert_raise_library_error(
+            lambda: self.update(
+                {
+                    "node1": {"x": ""},
+                    "node2": {"a": "", "y": ""},
+                    "node3": {"z": ""},
+                },
+                {"node1": {"cpu": ""}}
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_ATTRIBUTE_DOES_NOT_EXIST,
+                {"node": "node1", "attribute_name": "x"},
+                report_codes.FORCE_OPTIONS
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_ATTRIBUTE_DOES_NOT_EXIST,
+                {"node": "node2", "attribute_name": "y"},
+                report_codes.FORCE_OPTIONS
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_ATTRIBUTE_DOES_NOT_EXIST,
+                {"node": "node3", "attribute_name": "z"},
+                report_codes.FORCE_OPTIONS
+            ),
+        )
+        assert_xml_equal(original_cib, etree_to_str(self.cib))
+
+    def test_missing_nodes_reported_together(self):
+        original_cib = etree_to_str(self.cib)
+        assert_raise_library_error(
+            lambda: self.update(
+                {"node1": {"a": "1"}, "nodeX": {"a": "1"}},
+                {"nodeY": {"cpu": "1"}}
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_NOT_FOUND,
+                {"node": "nodeX"},
+                None
+            ),
+            (
+                severity.ERROR,
+                report_codes.NODE_NOT_FOUND,
+                {"node": "nodeY"},
+                None
+            ),
+        )
+        assert_xml_equal(original_cib, etree_to_str(self.cib))
+
+
 class EnsureNodeExists(TestCase):
     def setUp(self):
         self.node1 = etree.fromstring("""
@@ -4,6 +4,7 @@ from lxml import etree
 
 from pcs.common import report_codes
 from pcs.lib.cib.resource import operations
+from pcs.lib.cib.tools import IdProvider
 from pcs.lib.errors import ReportItemSeverity as severities
 from pcs.lib.validate import ValuePair
 from pcs.test.tools.assertions import assert_report_item_list_equal
@@ -408,3 +409,31 @@ class GetResourceOperations(TestCase):
             operations.get_resource_operations(self.resource_noop_el),
             []
         )
+
+class CreateOperations(TestCase):
+    def test_explicit_id_is_not_allocated_again(self):
+        cib = etree.fromstring("""
+            <cib>
+                <configuration>
+                    <resources><primitive id="R"/></resources>
+                </configuration>
+            </cib>
+        """)
+        primitive_el = cib.find(".//primitive")
+        operations.create_operations(
+            primitive_el,
+            IdProvider(primitive_el),
+            [
+                {"name": "monitor", "interval": "10s"},
+                {"name": "start", "interval": "0s", "id": "R-stop-interval-0s"},
+                {"name": "stop", "interval": "0s"},
+            ]
+        )
+        self.assertEqual(
+            [op.get("id") for op in primitive_el.iterfind("operations/op")],
+            [
+                "R-monitor-interval-10s",
+                "R-stop-interval-0s",
+                "R-stop-interval-0s-1",
+            ]
+        )
@@ -216,6 +216,83 @@ class DoesIdExistTest(CibToolsTest):
         """)
         self.assertTrue(lib.does_id_exist(tree, "a"))
 
+class IdIndexTest(CibToolsTest):
+    def test_existing_id(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue("myId" in lib.IdIndex(self.cib.tree))
+
+    def test_nonexisting_id(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertFalse("otherId" in lib.IdIndex(self.cib.tree))
+
+    def test_ignore_status_section(self):
+        self.cib.append_to_first_tag_name(
+            "status", '<elem1 id="status-1"><elem1a id="status-1a"/></elem1>'
+        )
+        id_index = lib.IdIndex(self.cib.tree)
+        self.assertFalse("status-1" in id_index)
+        self.assertFalse("status-1a" in id_index)
+
+    def test_ignore_acl_target_and_role(self):
+        self.cib.append_to_first_tag_name(
+            "configuration",
+            '<acls><acl_target id="target1"/><role id="role1"/></acls>'
+        )
+        id_index = lib.IdIndex(self.cib.tree)
+        self.assertFalse("target1" in id_index)
+        self.assertFalse("role1" in id_index)
+
+    def test_find_id_when_cib_is_not_root_element(self):
+        tree = etree.fromstring('<root><direct id="a"/></root>')
+        self.assertTrue("a" in lib.IdIndex(tree))
+
+    def test_find_remote_node_pacemaker_internal_id(self):
+        tree = etree.fromstring("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="b">
+                            <meta_attributes>
+                                <nvpair name="remote-node" value="a"/>
+                            </meta_attributes>
+                        </primitive>
+                    </resources>
+                </configuration>
+            </cib>
+        """)
+        id_index = lib.IdIndex(tree)
+        self.assertTrue("a" in id_index)
+        tree.find(".//nvpair").set("value", "c")
+        self.assertFalse("a" in id_index)
+
+    def test_removed_element_frees_its_id(self):
+        self.fixture_add_primitive_with_id("myId")
+        id_index = lib.IdIndex(self.cib.tree)
+        self.assertTrue("myId" in id_index)
+        primitive = self.cib.tree.find(".//primitive[@id='myId']")
+        primitive.getparent().remove(primitive)
+        self.assertFalse("myId" in id_index)
+
+    def test_index_is_built_on_first_lookup(self):
+        id_index = lib.IdIndex(self.cib.tree)
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue("myId" in id_index)
+
+    def test_element_added_after_build(self):
+        id_index = lib.IdIndex(self.cib.tree)
+        self.assertFalse("myId" in id_index)
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue("myId" in id_index)
+
+    def test_element_replaced_after_build(self):
+        self.fixture_add_primitive_with_id("myId")
+        id_index = lib.IdIndex(self.cib.tree)
+        self.assertTrue("myId" in id_index)
+        primitive = self.cib.tree.find(".//primitive[@id='myId']")
+        primitive.getparent().remove(primitive)
+        self.fixture_add_primitive_with_id("myId")
+        self.assertTrue("myId" in id_index)
+
 class FindUniqueIdTest(CibToolsTest):
     def test_already_unique(self):
         self.fixture_add_primitive_with_id("myId")
@@ -13,6 +13,115 @@ from pcs.lib.xml_tools import get_root, get_sub_element
 
 VERSION_FORMAT = r"(?P<major>\d+)\.(?P<minor>\d+)(\.(?P<rev>\d+))?$"
 
+class IdIndex:
+    """
+    Ids used in the CIB collected by one pass through the document
+
+    The index is built on the first lookup. Elements removed from the document
+    since then are recognized and their ids are considered free again. Elements
+    added to the document since then are not in the index, so an id not found
+    in it is confirmed against the document before it is reported as free.
+    """
+    # do not search in /cib/status, it may contain references to previously
+    # existing and deleted resources and thus preventing creating them again
+    _SEARCH_ROOTS = """
+        (
+            /cib/*[name()!="status"]
+            |
+            /*[name()!="cib"]
+        )
+    """
+    _ID_ELEMENTS_XPATH = _SEARCH_ROOTS + """
+        //*[name()!="acl_target" and name()!="role" and @id]
+    """
+    #pacemaker creates an implicit resource for the pacemaker_remote connection,
+    #which will be named the same as the value of the remote-node attribute of
+    #the explicit resource. So the value of nvpair named "remote-node" is
+    #considered to be id
+    _REMOTE_NODE_NVPAIRS_XPATH = _SEARCH_ROOTS + """
+        //primitive/meta_attributes/nvpair[@name="remote-node"]
+    """
+    _ID_LOOKUP_XPATH = _SEARCH_ROOTS + """
+        //*[name()!="acl_target" and name()!="role" and @id=$check_id]
+        |
+    """ + _SEARCH_ROOTS + """
+        //primitive/meta_attributes/nvpair[
+            @name="remote-node" and @value=$check_id
+        ]
+    """
+
+    def __init__(self, cib_element):
+        """
+        etree cib_element -- any element of the xml to being check against
+        """
+        self._cib = get_root(cib_element)
+        self._root_element = (
+            cib_element if hasattr(cib_element, "getroot")
+            else cib_element.getroottree()
+        ).getroot()
+        self._element_map = None
+
+    def __contains__(self, check_id):
+        if self._element_map is None:
+            self._element_map = self._build_element_map()
+        if check_id not in self._element_map:
+            return self._lookup_added_elements(check_id)
+        current_elements = [
+            element for element in self._element_map[check_id]
+            if self._defines_id(element, check_id)
+        ]
+        if current_elements:
+            self._element_map[check_id] = current_elements
+            return True
+        del self._element_map[check_id]
+        return self._lookup_added_elements(check_id)
+
+    def _lookup_added_elements(self, check_id):
+        element_list = self._cib.xpath(
+            self._ID_LOOKUP_XPATH, check_id=check_id
+        )
+        if element_list:
+            self._element_map[check_id] = element_list
+            return True
+        return False
+
+    def _build_element_map(self):
+        element_map = {}
+        for element in self._cib.xpath(self._ID_ELEMENTS_XPATH):
+            element_map.setdefault(element.get("id"), []).append(element)
+        for nvpair in self._cib.xpath(self._REMOTE_NODE_NVPAIRS_XPATH):
+            element_map.setdefault(nvpair.get("value"), []).append(nvpair)
+        return element_map
+
+    def _defines_id(self, element, check_id):
+        if element.tag == "nvpair":
+            meta_attributes = element.getparent()
+            if (
+                element.get("name") != "remote-node"
+                or
+                element.get("value") != check_id
+                or
+                meta_attributes is None
+                or
+                meta_attributes.getparent() is None
+                or
+                meta_attributes.getparent().tag != "primitive"
+            ):
+                return False
+        elif element.get("id") != check_id:
+            return False
+        return self._is_in_searched_part(element)
+
+    def _is_in_searched_part(self, element):
+        child, parent = element, element.getparent()
+        while parent is not None and parent.getparent() is not None:
+            child, parent = parent, parent.getparent()
+        if parent is not self._root_element:
+            # the element has been removed from the document
+            return False
+        return parent.tag != "cib" or child.tag != "status"
+
+
 class IdProvider:
     """
     Book ids for future use in the CIB and generate new ids accordingly
@@ -21,7 +130,7 @@ class IdProvider:
         """
         etree cib_element -- any element of the xml to being check against
         """
-        self._cib = get_root(cib_element)
+        self._id_index = IdIndex(cib_element)
         self._booked_ids = set()
 
     def allocate_id(self, proposed_id):
@@ -29,7 +138,11 @@ class IdProvider:
         Generate a new unique id based on the proposal and keep track of it
         string proposed_id -- requested id
         """
-        final_id = find_unique_id(self._cib, proposed_id, self._booked_ids)
+        final_id = _find_unique_id_in_index(
+            self._id_index,
+            proposed_id,
+            self._booked_ids
+        )
         self._booked_ids.add(final_id)
         return final_id
 
@@ -43,7 +156,7 @@ class IdProvider:
         for _id in id_list:
             if _id in reported_ids:
                 continue
-            if _id in self._booked_ids or does_id_exist(self._cib, _id):
+            if _id in self._booked_ids or _id in self._id_index:
                 report_list.append(reports.id_already_exists(_id))
                 reported_ids.add(_id)
                 continue
@@ -233,9 +346,16 @@ def find_unique_id(tree, check_id, reserved_ids=None):
     """
     if not reserved_ids:
         reserved_ids = set()
+    if check_id not in reserved_ids and not does_id_exist(tree, check_id):
+        return check_id
+    # The proposed id is taken. Index all ids at once instead of searching
+    # the whole document for each candidate.
+    return _find_unique_id_in_index(IdIndex(tree), check_id, reserved_ids)
+
+def _find_unique_id_in_index(id_index, check_id, reserved_ids):
     counter = 1
     temp_id = check_id
-    while temp_id in reserved_ids or does_id_exist(tree, temp_id):
+    while temp_id in reserved_ids or temp_id in id_index:
         temp_id = "{0}-{1}".format(check_id, counter)
         counter += 1
     return temp_id
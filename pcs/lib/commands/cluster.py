@@ -40,6 +40,7 @@ from pcs.lib.communication.nodes import (
     SendPcsdSslCertAndKey,
     StartCluster,
     UpdateKnownHosts,
+    WaitForPacemakerStarted,
 )
 from pcs.lib.communication.sbd import (
     CheckSbd,
@@ -904,7 +905,7 @@ def _start_cluster(
     if wait_timeout is not False:
         report_processor.process_list(
             _wait_for_pacemaker_to_start(
-                communicator_factory.get_communicator(),
+                communicator_factory,
                 report_processor,
                 target_list,
                 timeout=wait_timeout, # wait_timeout is either None or a timeout
@@ -912,10 +913,13 @@ def _start_cluster(
         )
 
 def _wait_for_pacemaker_to_start(
-    node_communicator, report_processor, target_list, timeout=None
+    communicator_factory, report_processor, target_list, timeout=None
 ):
     timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
+    wait_timeout = int(
+        min(settings.pacemaker_start_wait_request_timeout, timeout)
+    )
+    interval = settings.pacemaker_start_check_interval
     stop_at = time.time() + timeout
     report_processor.process(
         reports.wait_for_node_startup_started(
@@ -923,15 +927,45 @@ def _wait_for_pacemaker_to_start(
         )
     )
     error_report_list = []
-    while target_list:
+    # Pcsd responds once pacemaker is started, so the targets are asked again
+    # right after they respond. Targets with an old pcsd which cannot wait and
+    # unreachable targets are asked less and less often.
+    wait_target_list = target_list
+    check_target_list = []
+    check_later = False
+    while wait_target_list or check_target_list:
         if time.time() > stop_at:
             error_report_list.append(reports.wait_for_node_startup_timed_out())
             break
-        time.sleep(interval)
-        com_cmd = CheckPacemakerStarted(report_processor)
-        com_cmd.set_targets(target_list)
-        target_list = run_com(node_communicator, com_cmd)
-        error_report_list.extend(com_cmd.error_list)
+        if check_later:
+            time.sleep(interval)
+            interval = min(
+                2 * interval, settings.pacemaker_start_check_max_interval
+            )
+        check_later = False
+        if wait_target_list:
+            com_cmd = WaitForPacemakerStarted(report_processor, wait_timeout)
+            com_cmd.set_targets(wait_target_list)
+            wait_target_list = run_com(
+                communicator_factory.get_communicator(
+                    request_timeout=(
+                        wait_timeout + settings.default_request_timeout
+                    )
+                ),
+                com_cmd
+            )
+            error_report_list.extend(com_cmd.error_list)
+            check_target_list.extend(com_cmd.not_supported_target_list)
+            # pcsd responded right away, the targets are not reachable
+            check_later = bool(wait_target_list) and not com_cmd.waited
+        if check_target_list:
+            com_cmd = CheckPacemakerStarted(report_processor)
+            com_cmd.set_targets(check_target_list)
+            check_target_list = run_com(
+                communicator_factory.get_communicator(), com_cmd
+            )
+            error_report_list.extend(com_cmd.error_list)
+            check_later = check_later or bool(check_target_list)
 
     if error_report_list:
         error_report_list.append(reports.wait_for_node_startup_error())
@@ -1,7 +1,10 @@
 from contextlib import contextmanager
 
 from pcs.lib import reports
-from pcs.lib.cib.node import update_node_instance_attrs
+from pcs.lib.cib.node import (
+    update_node_instance_attrs,
+    update_nodes_nvsets,
+)
 from pcs.lib.cib.tools import IdProvider
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.live import (
@@ -9,6 +12,7 @@ from pcs.lib.pacemaker.live import (
     get_local_node_name,
 )
 from pcs.lib.pacemaker.state import ClusterState
+from pcs.lib.validate import is_integer
 
 
 @contextmanager
@@ -120,6 +124,44 @@ def maintenance_unmaintenance_all(lib_env, maintenance, wait=False):
         wait
     )
 
+def update_attributes(
+    lib_env, attributes=None, utilization=None, wait=False,
+    allow_remove_nonexistent=False
+):
+    """
+    Update attributes and utilization of several nodes in one CIB push
+
+    LibraryEnvironment lib_env
+    dict attributes -- node name: {attribute name: value}, an empty value
+        removes the attribute
+    dict utilization -- node name: {utilization attribute name: value}, an
+        empty value removes the attribute
+    mixed wait -- False: no wait, None: wait with default timeout, str or int:
+        wait with specified timeout
+    bool allow_remove_nonexistent -- do not fail when removing attributes
+        which do not exist
+    """
+    attributes = attributes or {}
+    utilization = utilization or {}
+    report_list = [
+        reports.invalid_option_value(name, value, "an integer")
+        for node_utilization in utilization.values()
+        for name, value in sorted(node_utilization.items())
+        if value != "" and not is_integer(value)
+    ]
+    if report_list:
+        raise LibraryError(*report_list)
+
+    with cib_runner_nodes(lib_env, wait) as (cib, dummy_runner, state_nodes):
+        update_nodes_nvsets(
+            cib,
+            IdProvider(cib),
+            attributes,
+            utilization,
+            state_nodes=state_nodes,
+            allow_remove_nonexistent=allow_remove_nonexistent,
+        )
+
 def _create_standby_unstandby_dict(standby):
     return {"standby": "on" if standby else ""}
 
@@ -519,6 +519,208 @@ def create_into_bundle(
             )
         resource.bundle.add_resource(bundle_el, primitive_element)
 
+def create_bulk(
+    env, resource_spec_list,
+    allow_absent_agent=False,
+    allow_invalid_operation=False,
+    allow_invalid_instance_attributes=False,
+    use_default_operations=True,
+    wait=False,
+    allow_not_suitable_command=False,
+    allow_not_accessible_resource=False,
+):
+    # pylint: disable=too-many-arguments, too-many-locals
+    """
+    Create several resources in one CIB push
+
+    LibraryEnvironment env provides all for communication with externals
+    list of dict resource_spec_list -- resources to create, each described by:
+        string resource_id -- identifier of the resource
+        string resource_agent_name -- name of the resource's agent
+        list of dict operation_list -- attributes for each entered operation
+        dict meta_attributes -- attributes for primitive/meta_attributes
+        dict instance_attributes -- attributes for
+            primitive/instance_attributes
+        bool ensure_disabled -- keep the resource in target-role "Stopped"
+        and optionally one of:
+        dict clone_meta_options -- put the resource into a new clone with the
+            meta attributes
+        string group_id -- put the resource into an existing or a new group,
+            optionally specify its position in the group by
+            string adjacent_resource_id and bool put_after_adjacent
+        string bundle_id -- put the resource into an existing bundle
+    bool allow_absent_agent is a flag for allowing agent that is not installed
+        in a system
+    bool allow_invalid_operation is a flag for allowing to use operations that
+        are not listed in a resource agent metadata
+    bool allow_invalid_instance_attributes is a flag for allowing to use
+        instance attributes that are not listed in a resource agent metadata
+        or for allowing to not use the instance_attributes that are required in
+        resource agent metadata
+    bool use_default_operations is a flag for stopping stopping of adding
+        default cib operations (specified in a resource agent)
+    mixed wait is flag for controlling waiting for pacemaker idle mechanism
+    bool allow_not_suitable_command -- flag for FORCE_NOT_SUITABLE_COMMAND
+    bool allow_not_accessible_resource -- flag for
+        FORCE_RESOURCE_IN_BUNDLE_NOT_ACCESSIBLE
+    """
+    env.report_processor.process_list(
+        _validate_bulk_placement(resource_spec_list)
+    )
+    # Metadata of an agent are loaded only once for all its resources.
+    agent_dict = {}
+    for spec in resource_spec_list:
+        agent_name = spec["resource_agent_name"]
+        if agent_name not in agent_dict:
+            agent_dict[agent_name] = get_agent(
+                env.report_processor,
+                env.cmd_runner(),
+                agent_name,
+                allow_absent_agent,
+            )
+
+    disabled_after_wait = {
+        spec["resource_id"]: (
+            spec.get("ensure_disabled", False)
+            or
+            resource.common.are_meta_disabled(spec.get("meta_attributes", {}))
+            or
+            resource.common.is_clone_deactivated_by_meta(
+                spec.get("clone_meta_options", {})
+            )
+        )
+        for spec in resource_spec_list
+    }
+    with resource_environment(
+        env,
+        wait,
+        [spec["resource_id"] for spec in resource_spec_list],
+        lambda state, resource_id: ensure_resource_state(
+            not disabled_after_wait[resource_id], state, resource_id
+        ),
+        required_cib_version=(
+            Version(2, 8, 0)
+            if any(spec.get("bundle_id") for spec in resource_spec_list)
+            else None
+        ),
+    ) as resources_section:
+        # All ids are checked at once against one index of the CIB, the index
+        # then keeps track of ids of all the created elements.
+        id_provider = IdProvider(resources_section)
+        new_group_ids = {
+            spec["group_id"] for spec in resource_spec_list
+            if spec.get("group_id")
+            and
+            find_element_by_tag_and_id(
+                resource.group.TAG,
+                resources_section,
+                spec["group_id"],
+                none_if_id_unused=True,
+            ) is None
+        }
+        report_list = id_provider.book_ids(
+            *[spec["resource_id"] for spec in resource_spec_list]
+        )
+        report_list.extend(id_provider.book_ids(*sorted(new_group_ids)))
+        env.report_processor.process_list(report_list)
+
+        for spec in resource_spec_list:
+            _create_bulk_item(
+                env, resources_section, id_provider,
+                agent_dict[spec["resource_agent_name"]], spec,
+                allow_invalid_operation,
+                allow_invalid_instance_attributes,
+                use_default_operations,
+                allow_not_suitable_command,
+                allow_not_accessible_resource,
+            )
+
+def _validate_bulk_placement(resource_spec_list):
+    report_list = []
+    for spec in resource_spec_list:
+        placement_options = {
+            option for option in ("clone_meta_options", "group_id", "bundle_id")
+            if spec.get(option) is not None
+        }
+        if len(placement_options) > 1:
+            report_list.append(
+                reports.mutually_exclusive_options(
+                    sorted(placement_options), "resource"
+                )
+            )
+    return report_list
+
+def _create_bulk_item(
+    env, resources_section, id_provider, resource_agent, spec,
+    allow_invalid_operation,
+    allow_invalid_instance_attributes,
+    use_default_operations,
+    allow_not_suitable_command,
+    allow_not_accessible_resource,
+):
+    # pylint: disable=too-many-arguments
+    resource_id = spec["resource_id"]
+    meta_attributes = spec.get("meta_attributes", {})
+    instance_attributes = spec.get("instance_attributes", {})
+    _check_special_cases(
+        env,
+        resource_agent,
+        resources_section,
+        resource_id,
+        meta_attributes,
+        instance_attributes,
+        allow_not_suitable_command
+    )
+    if resource.guest_node.is_node_name_in_options(meta_attributes):
+        # the guest node must not get in conflict with following resources
+        env.report_processor.process_list(
+            id_provider.book_ids(
+                resource.guest_node.get_node_name_from_options(meta_attributes)
+            )
+        )
+
+    primitive_element = resource.primitive.create(
+        env.report_processor, resources_section, id_provider,
+        resource_id, resource_agent,
+        spec.get("operation_list", []), meta_attributes, instance_attributes,
+        allow_invalid_operation,
+        allow_invalid_instance_attributes,
+        use_default_operations,
+    )
+    top_element = primitive_element
+    if spec.get("clone_meta_options") is not None:
+        top_element = resource.clone.append_new(
+            resources_section,
+            id_provider,
+            primitive_element,
+            spec["clone_meta_options"],
+        )
+    if spec.get("ensure_disabled", False):
+        resource.common.disable(top_element, id_provider)
+
+    if spec.get("group_id") is not None:
+        validate_id(spec["group_id"], "group name")
+        resource.group.place_resource(
+            resource.group.provide_group(resources_section, spec["group_id"]),
+            primitive_element,
+            spec.get("adjacent_resource_id"),
+            spec.get("put_after_adjacent", False),
+        )
+    elif spec.get("bundle_id") is not None:
+        bundle_el = _find_bundle(resources_section, spec["bundle_id"])
+        if not resource.bundle.is_pcmk_remote_accessible(bundle_el):
+            env.report_processor.process(
+                reports.get_problem_creator(
+                    report_codes.FORCE_RESOURCE_IN_BUNDLE_NOT_ACCESSIBLE,
+                    allow_not_accessible_resource
+                )(
+                    reports.resource_in_bundle_not_accessible,
+                    spec["bundle_id"],
+                    resource_id
+                )
+            )
+        resource.bundle.add_resource(bundle_el, primitive_element)
+
 def bundle_create(
     env, bundle_id, container_type, container_options=None,
     network_options=None, port_map=None, storage_map=None, meta_attributes=None,
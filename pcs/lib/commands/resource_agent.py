@@ -1,4 +1,9 @@
-from pcs.lib import resource_agent
+from pcs import settings
+from pcs.common import env_file_role_codes
+from pcs.common.tools import format_environment_error, map_parallel
+from pcs.lib import reports, resource_agent
+from pcs.lib.agent_metadata_cache import AgentMetadataCache
+from pcs.lib.errors import LibraryError
 
 
 def list_standards(lib_env):
@@ -38,12 +43,14 @@ def list_agents_for_standard_and_provider(lib_env, standard_provider=None):
     )
 
 
-def list_agents(lib_env, describe=True, search=None):
+def list_agents(lib_env, describe=True, search=None, max_workers=None):
     """
     List all resource agents on the local host, optionally filtered and
         described
     bool describe load and return agents' description as well
     string search return only agents which name contains this string
+    int max_workers number of agents described at once, defaults to
+        settings.agent_metadata_max_workers
     """
     runner = lib_env.cmd_runner()
 
@@ -65,12 +72,13 @@ def list_agents(lib_env, describe=True, search=None):
         agent_names,
         describe,
         search,
-        resource_agent.ResourceAgent
+        resource_agent.ResourceAgent,
+        max_workers,
     )
 
 
 def _complete_agent_list(
-    runner, agent_names, describe, search, metadata_class
+    runner, agent_names, describe, search, metadata_class, max_workers=None
 ):
     # filter agents by name if requested
     if search:
@@ -80,14 +88,12 @@ def _complete_agent_list(
         ]
 
     # complete the output and load descriptions if requested
-    agent_list = []
-    for name in agent_names:
+    def get_agent_info(name):
         try:
             agent_metadata = metadata_class(runner, name)
             if describe:
-                agent_list.append(agent_metadata.get_description_info())
-            else:
-                agent_list.append(agent_metadata.get_name_info())
+                return agent_metadata.get_description_info()
+            return agent_metadata.get_name_info()
         except resource_agent.ResourceAgentError:
             #we don't return it in the list:
             #
@@ -102,8 +108,16 @@ def _complete_agent_list(
             #Providing a warning is not the way (currently). Other components
             #read this list and do not expect warnings there. Using the stderr
             #(to separate warnings) is currently difficult.
-            pass
-    return agent_list
+            return None
+
+    # Loading metadata means running an agent, which takes a while. Load
+    # metadata of several agents at once.
+    if not describe:
+        max_workers = 1
+    elif max_workers is None:
+        max_workers = settings.agent_metadata_max_workers
+    agent_info_list = map_parallel(get_agent_info, agent_names, max_workers)
+    return [info for info in agent_info_list if info is not None]
 
 
 def describe_agent(lib_env, agent_name):
@@ -118,3 +132,34 @@ def describe_agent(lib_env, agent_name):
         absent_agent_supported=False
     )
     return agent.get_full_info()
+
+
+def clear_metadata_cache(lib_env):
+    """
+    Remove all cached metadata of resource and stonith agents
+    """
+    # pylint: disable=unused-argument
+    try:
+        AgentMetadataCache(settings.agent_metadata_cache_dir).clear()
+    except EnvironmentError as e:
+        raise LibraryError(reports.file_io_error(
+            env_file_role_codes.AGENT_METADATA_CACHE,
+            file_path=settings.agent_metadata_cache_dir,
+            operation="remove",
+            reason=format_environment_error(e)
+        ))
+
+
+def warm_up_metadata_cache(lib_env):
+    """
+    Load metadata of all resource and stonith agents into the metadata cache
+    """
+    list_agents(lib_env, describe=True)
+    runner = lib_env.cmd_runner()
+    _complete_agent_list(
+        runner,
+        resource_agent.list_stonith_agents(runner),
+        True,
+        None,
+        resource_agent.StonithAgent
+    )
@@ -835,7 +835,7 @@ class AddNodesSuccessMinimal(TestCase):
         self.set_up(existing, new)
         (self.config
             .http.host.start_cluster(node_labels=self.new_nodes)
-            .http.host.check_pacemaker_started(self.new_nodes)
+            .http.host.check_pacemaker_started(self.new_nodes, wait_timeout=1)
         )
 
         with mock.patch("time.sleep", lambda secs: None):
@@ -952,7 +952,7 @@ class AddNodesSuccessMinimal(TestCase):
         (self.config
             .http.host.enable_cluster(node_labels=self.new_nodes)
             .http.host.start_cluster(node_labels=self.new_nodes)
-            .http.host.check_pacemaker_started(self.new_nodes)
+            .http.host.check_pacemaker_started(self.new_nodes, wait_timeout=1)
         )
         with mock.patch("time.sleep", lambda secs: None):
             cluster.add_nodes(
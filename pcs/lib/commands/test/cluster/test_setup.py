@@ -434,7 +434,7 @@ class SetupSuccessMinimal(TestCase):
     def test_start_wait(self):
         (self.config
             .http.host.start_cluster(NODE_LIST)
-            .http.host.check_pacemaker_started(NODE_LIST)
+            .http.host.check_pacemaker_started(NODE_LIST, wait_timeout=1)
         )
         cluster.setup(
             self.env_assist.get_env(),
@@ -492,7 +492,7 @@ class SetupSuccessMinimal(TestCase):
         (self.config
             .http.host.enable_cluster(NODE_LIST)
             .http.host.start_cluster(NODE_LIST)
-            .http.host.check_pacemaker_started(NODE_LIST)
+            .http.host.check_pacemaker_started(NODE_LIST, wait_timeout=1)
         )
         cluster.setup(
             self.env_assist.get_env(),
@@ -1989,6 +1989,7 @@ class SetupWithWait(TestCase):
     @mock.patch("time.time", get_time_mock())
     def test_some_success(self):
         self.config.http.host.check_pacemaker_started(
+            wait_timeout=1,
             pacemaker_started_node_list=NODE_LIST[:1],
             pacemaker_not_started_node_list=NODE_LIST[1:],
         )
@@ -2057,19 +2058,23 @@ class SetupWithWait(TestCase):
     def test_multiple_tries(self):
         (self.config
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 pacemaker_started_node_list=NODE_LIST[:1],
                 pacemaker_not_started_node_list=NODE_LIST[1:],
             )
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 pacemaker_not_started_node_list=NODE_LIST[1:],
                 name="pcmk_status_check_1"
             )
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 pacemaker_started_node_list=NODE_LIST[1:2],
                 pacemaker_not_started_node_list=NODE_LIST[2:],
                 name="pcmk_status_check_2"
             )
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 pacemaker_started_node_list=NODE_LIST[2:3],
                 name="pcmk_status_check_3"
             )
@@ -2100,6 +2105,65 @@ class SetupWithWait(TestCase):
             ]
         )
 
+    @mock.patch("time.time", get_time_mock())
+    def test_old_pcsd(self):
+        (self.config
+            .http.host.check_pacemaker_started(
+                wait_timeout=5,
+                communication_list=[
+                    dict(label=NODE_LIST[0], response_code=404),
+                    dict(
+                        label=NODE_LIST[1],
+                        output=json.dumps(dict(pending=False, online=True)),
+                    ),
+                    dict(label=NODE_LIST[2], response_code=404),
+                ],
+            )
+            .http.host.check_pacemaker_started(
+                pacemaker_started_node_list=NODE_LIST[:1],
+                pacemaker_not_started_node_list=NODE_LIST[2:],
+                name="pcmk_status_check_1"
+            )
+            .http.host.check_pacemaker_started(
+                pacemaker_not_started_node_list=NODE_LIST[2:],
+                name="pcmk_status_check_2"
+            )
+            .http.host.check_pacemaker_started(
+                pacemaker_started_node_list=NODE_LIST[2:],
+                name="pcmk_status_check_3"
+            )
+        )
+        with mock.patch("time.sleep") as mock_sleep:
+            cluster.setup(
+                self.env_assist.get_env(),
+                CLUSTER_NAME,
+                [dict(name=node, addrs=None) for node in NODE_LIST],
+                start=True,
+                wait=5,
+            )
+        # nodes with an old pcsd are polled less and less often
+        self.assertEqual(
+            [mock.call(2), mock.call(4)], mock_sleep.call_args_list
+        )
+        self.env_assist.assert_reports(
+            reports_success_minimal_fixture()
+            +
+            [
+                fixture.info(report_codes.CLUSTER_START_STARTED),
+                fixture.info(
+                    report_codes.WAIT_FOR_NODE_STARTUP_STARTED,
+                    node_name_list=NODE_LIST,
+                ),
+            ]
+            +
+            [
+                fixture.info(
+                    report_codes.CLUSTER_START_SUCCESS,
+                    node=node,
+                ) for node in NODE_LIST
+            ]
+        )
+
     @mock.patch("time.sleep", lambda secs: None)
     @mock.patch("time.time", get_time_mock())
     def test_fails(self):
@@ -2112,6 +2176,7 @@ class SetupWithWait(TestCase):
         )
         (self.config
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 communication_list=[
                     dict(
                         label=NODE_LIST[0],
@@ -2126,6 +2191,7 @@ class SetupWithWait(TestCase):
                 ],
             )
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 communication_list=[
                     dict(
                         label=NODE_LIST[0],
@@ -2136,6 +2202,7 @@ class SetupWithWait(TestCase):
                 name="pcmk_status_check_2"
             )
             .http.host.check_pacemaker_started(
+                wait_timeout=5,
                 pacemaker_started_node_list=NODE_LIST[2:3],
                 name="pcmk_status_check_3"
             )
@@ -2147,7 +2214,7 @@ class SetupWithWait(TestCase):
             fixture.error(
                 report_codes.NODE_COMMUNICATION_COMMAND_UNSUCCESSFUL,
                 node=NODE_LIST[0],
-                command="remote/pacemaker_node_status",
+                command="remote/pacemaker_node_status_wait",
                 reason="",
             ),
         ]
@@ -2177,7 +2244,7 @@ class SetupWithWait(TestCase):
                 fixture.warn(
                     report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
                     node=NODE_LIST[0],
-                    command="remote/pacemaker_node_status",
+                    command="remote/pacemaker_node_status_wait",
                     reason="error",
                 )
             ]
@@ -2197,6 +2264,7 @@ class SetupWithWait(TestCase):
     def test_fails_and_timed_out(self):
         (self.config
             .http.host.check_pacemaker_started(
+                wait_timeout=2,
                 communication_list=[
                     dict(
                         label=NODE_LIST[0],
@@ -2217,6 +2285,7 @@ class SetupWithWait(TestCase):
                 ],
             )
             .http.host.check_pacemaker_started(
+                wait_timeout=2,
                 pacemaker_started_node_list=[NODE_LIST[0]],
                 pacemaker_not_started_node_list=[NODE_LIST[2]],
                 name="pcmk_status_check_1"
@@ -2250,7 +2319,7 @@ class SetupWithWait(TestCase):
                 fixture.warn(
                     report_codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
                     node=NODE_LIST[0],
-                    command="remote/pacemaker_node_status",
+                    command="remote/pacemaker_node_status_wait",
                     reason="error",
                 ),
                 fixture.error(
@@ -0,0 +1,173 @@
+from unittest import TestCase
+
+from pcs.common import report_codes
+from pcs.lib.commands import resource
+from pcs.test.tools import fixture
+from pcs.test.tools.command_env import get_env_tools
+
+
+TIMEOUT = 10
+
+def fixture_primitive(resource_id, meta=""):
+    return """
+        <primitive class="ocf" id="{0}" provider="heartbeat" type="Dummy">
+            {1}
+            <operations>
+                <op id="{0}-monitor-interval-10" interval="10" name="monitor"
+                    timeout="20"
+                />
+            </operations>
+        </primitive>
+    """.format(resource_id, meta)
+
+def fixture_spec(resource_id, **kwargs):
+    spec = dict(
+        resource_id=resource_id,
+        resource_agent_name="ocf:heartbeat:Dummy",
+        operation_list=[],
+        meta_attributes={},
+        instance_attributes={},
+    )
+    spec.update(kwargs)
+    return spec
+
+def create_bulk(env, resource_spec_list, wait=False):
+    return resource.create_bulk(
+        env,
+        resource_spec_list,
+        use_default_operations=False,
+        wait=wait,
+    )
+
+
+class CreateBulk(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def test_agent_loaded_once_one_push(self):
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.cib.load(
+                resources="<resources><group id='G1'/></resources>"
+            )
+            .env.push_cib(
+                resources="""
+                    <resources>
+                        <group id="G1">{A}</group>
+                        <clone id="B-clone">{B}</clone>
+                        <group id="G2">{C}{D}</group>
+                    </resources>
+                """.format(
+                    A=fixture_primitive("A"),
+                    B=fixture_primitive("B"),
+                    C=fixture_primitive(
+                        "C",
+                        """
+                        <meta_attributes id="C-meta_attributes">
+                            <nvpair id="C-meta_attributes-target-role"
+                                name="target-role" value="Stopped"
+                            />
+                        </meta_attributes>
+                        """
+                    ),
+                    D=fixture_primitive("D"),
+                )
+            )
+        )
+        create_bulk(
+            self.env_assist.get_env(),
+            [
+                fixture_spec("A", group_id="G1"),
+                fixture_spec("B", clone_meta_options={}),
+                fixture_spec("C", group_id="G2", ensure_disabled=True),
+                fixture_spec("D", group_id="G2"),
+            ]
+        )
+
+    def test_all_id_conflicts_reported(self):
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.cib.load(
+                resources="<resources>{0}</resources>".format(
+                    fixture_primitive("A")
+                )
+            )
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: create_bulk(
+                self.env_assist.get_env(),
+                [
+                    fixture_spec("A"),
+                    fixture_spec("B", group_id="C"),
+                    fixture_spec("B"),
+                    fixture_spec("C"),
+                ]
+            ),
+            [
+                fixture.error(report_codes.ID_ALREADY_EXISTS, id=_id)
+                for _id in ("A", "B", "C")
+            ]
+        )
+
+    def test_placement_mutually_exclusive(self):
+        self.env_assist.assert_raise_library_error(
+            lambda: create_bulk(
+                self.env_assist.get_env(),
+                [
+                    fixture_spec("A", group_id="G", clone_meta_options={}),
+                    fixture_spec("B", group_id="G"),
+                ]
+            ),
+            [
+                fixture.error(
+                    report_codes.MUTUALLY_EXCLUSIVE_OPTIONS,
+                    option_names=["clone_meta_options", "group_id"],
+                    option_type="resource",
+                ),
+            ]
+        )
+
+    def test_wait_one_state_for_all(self):
+        (self.config
+            .runner.pcmk.load_agent()
+            .runner.pcmk.can_wait()
+            .runner.cib.load()
+            .env.push_cib(
+                resources="<resources>{0}{1}</resources>".format(
+                    fixture_primitive("A"), fixture_primitive("B")
+                ),
+                wait=TIMEOUT
+            )
+            .runner.pcmk.load_state(
+                resources="""
+                    <resources>
+                        <resource id="A" role="Started">
+                            <node name="node1" id="1" cached="false"/>
+                        </resource>
+                        <resource id="B" role="Stopped" active="false"
+                            nodes_running_on="0"
+                        />
+                    </resources>
+                """
+            )
+        )
+        self.env_assist.assert_raise_library_error(
+            lambda: create_bulk(
+                self.env_assist.get_env(),
+                [fixture_spec("A"), fixture_spec("B")],
+                wait=TIMEOUT
+            ),
+            [
+                fixture.error(
+                    report_codes.RESOURCE_DOES_NOT_RUN,
+                    resource_id="B",
+                ),
+            ]
+        )
+        self.env_assist.assert_reports([
+            fixture.info(
+                report_codes.RESOURCE_RUNNING_ON_NODES,
+                roles_with_nodes={"Started": ["node1"]},
+                resource_id="A",
+            ),
+        ])
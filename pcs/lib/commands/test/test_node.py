@@ -267,6 +267,68 @@ class SetInstaceAttrsList(SetInstaceAttrsBase):
         )
         mock_attrs.assert_not_called()
 
+@patch_command("update_nodes_nvsets")
+class UpdateAttributes(SetInstaceAttrsBase):
+    def test_success(self, mock_update):
+        lib.update_attributes(
+            create_env(),
+            attributes={"node-1": {"a": "1"}},
+            utilization={"node-0": {"cpu": "2", "ram": ""}},
+        )
+
+        self.assert_context_manager_launched(pre=True, post=True)
+        self.assertEqual(1, len(mock_update.call_args_list))
+        call = mock_update.call_args_list[0]
+        self.assertEqual(call[0][0], self.cib)
+        self.assertTrue(isinstance(call[0][1], IdProvider))
+        self.assertEqual(call[0][2], {"node-1": {"a": "1"}})
+        self.assertEqual(call[0][3], {"node-0": {"cpu": "2", "ram": ""}})
+        self.assertEqual(call[1]["state_nodes"], self.cluster_nodes)
+        self.assertFalse(call[1]["allow_remove_nonexistent"])
+
+    def test_allow_remove_nonexistent(self, mock_update):
+        lib.update_attributes(
+            create_env(),
+            attributes={"node-1": {"a": ""}},
+            allow_remove_nonexistent=True,
+        )
+        self.assertTrue(
+            mock_update.call_args_list[0][1]["allow_remove_nonexistent"]
+        )
+
+    def test_utilization_not_integer(self, mock_update):
+        assert_raise_library_error(
+            lambda: lib.update_attributes(
+                create_env(),
+                utilization={
+                    "node-0": {"cpu": "x"},
+                    "node-1": {"cpu": "1", "ram": "1G"},
+                },
+            ),
+            (
+                severity.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "cpu",
+                    "option_value": "x",
+                    "allowed_values": "an integer",
+                },
+                None
+            ),
+            (
+                severity.ERROR,
+                report_codes.INVALID_OPTION_VALUE,
+                {
+                    "option_name": "ram",
+                    "option_value": "1G",
+                    "allowed_values": "an integer",
+                },
+                None
+            ),
+        )
+        self.assert_context_manager_launched(pre=False, post=False)
+        mock_update.assert_not_called()
+
 @patch_env("push_cib")
 class CibRunnerNodes(TestCase):
     def setUp(self):
@@ -1,5 +1,8 @@
 # coding=utf-8
 import logging
+import os
+import tempfile
+import time
 from unittest import mock, TestCase
 from lxml import etree
 
@@ -12,6 +15,7 @@ from pcs.test.tools.custom_mock import MockLibraryReportProcessor
 
 from pcs.common import report_codes
 from pcs.lib import resource_agent as lib_ra
+from pcs.lib.agent_metadata_cache import AgentMetadataCache
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import ReportItemSeverity as severity
 
@@ -303,6 +307,64 @@ class CompleteAgentList(TestCase):
             metadata_class=Agent,
         ))
 
+    @mock.patch("pcs.settings.agent_metadata_max_workers", 4)
+    def test_describe_keeps_order(self):
+        # pylint: disable=too-few-public-methods, unused-argument
+        class Agent():
+            def __init__(self, runner, name):
+                self.name = name
+
+            def get_description_info(self):
+                if self.name == "ocf:heartbeat:Invalid":
+                    raise lib_ra.UnableToGetAgentMetadata(self.name, "error")
+                # make the first agents finish last
+                time.sleep(0.01 * (5 - int(self.name[-1])))
+                return self.name
+
+        self.assertEqual(
+            [
+                "ocf:heartbeat:Dummy1",
+                "ocf:heartbeat:Dummy2",
+                "ocf:heartbeat:Dummy3",
+                "ocf:heartbeat:Dummy4",
+            ],
+            lib._complete_agent_list(
+                mock.MagicMock(),
+                [
+                    "ocf:heartbeat:Dummy1",
+                    "ocf:heartbeat:Dummy2",
+                    "ocf:heartbeat:Invalid",
+                    "ocf:heartbeat:Dummy3",
+                    "ocf:heartbeat:Dummy4",
+                ],
+                describe=True,
+                search=None,
+                metadata_class=Agent,
+            )
+        )
+
+    @mock.patch("pcs.settings.agent_metadata_max_workers", 4)
+    @mock.patch("pcs.lib.commands.resource_agent.map_parallel")
+    def test_max_workers(self, mock_map_parallel):
+        mock_map_parallel.return_value = []
+        for describe, max_workers, expected_workers in [
+            (True, None, 4),
+            (True, 2, 2),
+            (False, 2, 1),
+        ]:
+            with self.subTest(describe=describe, max_workers=max_workers):
+                lib._complete_agent_list(
+                    mock.MagicMock(),
+                    ["ocf:heartbeat:Dummy"],
+                    describe=describe,
+                    search=None,
+                    metadata_class=mock.Mock(),
+                    max_workers=max_workers,
+                )
+                self.assertEqual(
+                    expected_workers, mock_map_parallel.call_args[0][2]
+                )
+
 @mock.patch.object(lib_ra.ResourceAgent, "_load_metadata", autospec=True)
 @mock.patch("pcs.lib.resource_agent.guess_exactly_one_resource_agent_full_name")
 @mock.patch.object(
@@ -468,3 +530,52 @@ class DescribeAgentUtf8(TestCase):
                 ],
             }
         )
+
+
+class ClearMetadataCache(TestCase):
+    def setUp(self):
+        self.env_assist, dummy_config = get_env_tools(test_case=self)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_dir = os.path.join(tmp_dir.name, "cache")
+
+    def test_success(self):
+        cache = AgentMetadataCache(self.cache_dir)
+        cache.put("ocf:heartbeat:Dummy", [1], "<resource-agent/>")
+        with mock.patch(
+            "pcs.settings.agent_metadata_cache_dir", self.cache_dir
+        ):
+            lib.clear_metadata_cache(self.env_assist.get_env())
+        self.assertIsNone(cache.get("ocf:heartbeat:Dummy", [1]))
+
+    def test_cache_does_not_exist(self):
+        with mock.patch(
+            "pcs.settings.agent_metadata_cache_dir", self.cache_dir
+        ):
+            lib.clear_metadata_cache(self.env_assist.get_env())
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_error(self):
+        with open(self.cache_dir, "w"):
+            pass
+        with mock.patch(
+            "pcs.settings.agent_metadata_cache_dir", self.cache_dir
+        ):
+            self.env_assist.assert_raise_library_error(
+                lambda: lib.clear_metadata_cache(self.env_assist.get_env()),
+                [
+                    (
+                        severity.ERROR,
+                        report_codes.FILE_IO_ERROR,
+                        {
+                            "file_role": "AGENT_METADATA_CACHE",
+                            "file_path": self.cache_dir,
+                            "operation": "remove",
+                            "reason": "Not a directory: '{0}'".format(
+                                self.cache_dir
+                            ),
+                        },
+                    )
+                ],
+                expected_in_processor=False
+            )
@@ -375,6 +375,60 @@ class CheckPacemakerStarted(
         return self._not_yet_started_target_list
 
 
+class WaitForPacemakerStarted(CheckPacemakerStarted):
+    """
+    Pcsd responds once pacemaker is started on its node or the wait timeout
+    expires. Targets with pcsd not able to wait are collected separately.
+    """
+    _not_supported_target_list = None
+    _waited = False
+
+    def __init__(self, report_processor, wait_timeout):
+        """
+        int wait_timeout -- how long pcsd waits for pacemaker, in seconds
+        """
+        super().__init__(report_processor)
+        self._wait_timeout = wait_timeout
+
+    def _get_request_data(self):
+        return RequestData(
+            "remote/pacemaker_node_status_wait",
+            [("timeout", str(self._wait_timeout))]
+        )
+
+    def _process_response(self, response):
+        target = response.request.target
+        if response.was_connected and response.response_code == 404:
+            self._not_supported_target_list.append(target)
+            return
+        super()._process_response(response)
+        if (
+            response.was_connected
+            and
+            target in self._not_yet_started_target_list
+        ):
+            self._waited = True
+
+    def before(self):
+        super().before()
+        self._not_supported_target_list = []
+        self._waited = False
+
+    @property
+    def not_supported_target_list(self):
+        """
+        Targets with pcsd not able to wait for pacemaker to start
+        """
+        return self._not_supported_target_list
+
+    @property
+    def waited(self):
+        """
+        True if pcsd on any target has waited for the whole wait timeout
+        """
+        return self._waited
+
+
 class UpdateKnownHosts(
     SimpleResponseProcessingNoResponseOnSuccessMixin, AllSameDataMixin,
     AllAtOnceStrategyMixin, RunRemotelyBase,
@@ -0,0 +1,91 @@
+import asyncio
+from unittest import TestCase
+
+from pcs.lib.communication import tools
+from pcs.lib.errors import LibraryError
+
+
+class AsyncCommunicator():
+    def __init__(self):
+        self.queue = []
+        self.processed = []
+
+    def add_requests(self, request_list):
+        self.queue.extend(request_list)
+
+    async def start_loop(self):
+        while self.queue:
+            request = self.queue.pop(0)
+            self.processed.append(request)
+            # let other tasks run as a real communicator does
+            await asyncio.sleep(0)
+            yield "response-{0}".format(request)
+
+
+class Command(tools.CommunicationCommandInterface):
+    def __init__(self, fail=False):
+        self.call_list = []
+        self._fail = fail
+
+    def before(self):
+        self.call_list.append("before")
+
+    def get_initial_request_list(self):
+        return ["A", "B"]
+
+    def on_response(self, response):
+        self.call_list.append(response)
+        if response == "response-A":
+            return ["C"]
+        return []
+
+    def on_complete(self):
+        self.call_list.append("complete")
+        return "result"
+
+    @property
+    def error_list(self):
+        return ["error"] if self._fail else []
+
+
+class RunAsync(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.communicator = AsyncCommunicator()
+
+    def test_success(self):
+        cmd = Command()
+        self.assertEqual(
+            "result",
+            self.loop.run_until_complete(
+                tools.run_async(self.communicator, cmd)
+            )
+        )
+        self.assertEqual(["A", "B", "C"], self.communicator.processed)
+        self.assertEqual(
+            [
+                "before",
+                "response-A",
+                "response-B",
+                "response-C",
+                "complete",
+            ],
+            cmd.call_list
+        )
+
+    def test_raise_success(self):
+        self.assertEqual(
+            "result",
+            self.loop.run_until_complete(
+                tools.run_and_raise_async(self.communicator, Command())
+            )
+        )
+
+    def test_raise_error(self):
+        cmd = Command(fail=True)
+        with self.assertRaises(LibraryError):
+            self.loop.run_until_complete(
+                tools.run_and_raise_async(self.communicator, cmd)
+            )
+        self.assertEqual("complete", cmd.call_list[-1])
@@ -42,6 +42,39 @@ def run_and_raise(communicator, cmd):
     return to_return
 
 
+async def run_async(communicator, cmd):
+    """
+    Run communication command in an asyncio event loop. Returns return value of
+    method on_complete() of communcation command after run.
+
+    AsyncCommunicator communicator -- object used for communication
+    CommunicationCommandInterface cmd
+    """
+    cmd.before()
+    communicator.add_requests(cmd.get_initial_request_list())
+    async for response in communicator.start_loop():
+        extra_requests = cmd.on_response(response)
+        if extra_requests:
+            communicator.add_requests(extra_requests)
+    return cmd.on_complete()
+
+
+async def run_and_raise_async(communicator, cmd):
+    """
+    Run communication command in an asyncio event loop. Returns return value of
+    method on_complete() of communcation command after run.
+    Raises LibraryError (with no report item) when some errors occured while
+    running communication command.
+
+    AsyncCommunicator communicator -- object used for communication
+    CommunicationCommandInterface cmd
+    """
+    to_return = await run_async(communicator, cmd)
+    if cmd.error_list:
+        raise LibraryError()
+    return to_return
+
+
 class CommunicationCommandInterface:
     """
     Interface for all communication commands.
@@ -20,26 +20,37 @@ class Section:
 
     def export(self, indent="    "):
         lines = []
-        for attr in self._attr_list:
-            lines.append("{0}: {1}".format(*attr))
-        if self._attr_list and self._section_list:
-            lines.append("")
-        section_count = len(self._section_list)
-        for index, section in enumerate(self._section_list, 1):
-            lines.extend(str(section).split("\n"))
-            if not lines[-1].strip():
-                del lines[-1]
-            if index < section_count:
-                lines.append("")
         if self.parent:
-            lines = [indent + x if x else x for x in lines]
-            lines.insert(0, self.name + " {")
+            lines.append(self.name + " {")
+            self._export_content(lines, "", indent)
             lines.append("}")
+        else:
+            self._export_content(lines, "", "")
         final = "\n".join(lines)
         if final:
             final += "\n"
         return final
 
+    def _export_content(self, lines, outer_indent, indent):
+        # Lines of all nested sections are appended to one list and each line
+        # is indented only once, so the export takes linear time regardless of
+        # the depth of sections.
+        for attr in self._attr_list:
+            _append_indented(
+                lines, outer_indent, indent + "{0}: {1}".format(*attr)
+            )
+        if self._attr_list and self._section_list:
+            lines.append("")
+        section_indent = outer_indent + indent
+        for index, section in enumerate(self._section_list):
+            if index:
+                lines.append("")
+            _append_indented(lines, section_indent, section.name + " {")
+            # here we are calling obj's method of the same class
+            # pylint: disable=protected-access
+            section._export_content(lines, section_indent, "    ")
+            lines.append(section_indent + "}")
+
     def get_root(self):
         parent = self
         while parent.parent:
@@ -116,15 +127,19 @@ class Section:
         return self.export()
 
 
-def parse_string(conf_text):
-    root = Section("")
-    _parse_section(conf_text.split("\n"), root)
-    return root
+def _append_indented(lines, indent, text):
+    # values may contain new lines, empty lines are never indented
+    for line in text.split("\n"):
+        lines.append(indent + line if line else line)
 
-def _parse_section(lines, section):
+def parse_string(conf_text):
     # parser should work the same way as the original parser in corosync
-    while lines:
-        current_line = lines.pop(0).strip()
+    root = Section("")
+    section = root
+    # Lines are processed in one pass, the currently open section is tracked
+    # instead of recursing into each section.
+    for line in conf_text.split("\n"):
+        current_line = line.strip()
         if not current_line or current_line[0] == "#":
             continue
         if "{" in current_line:
@@ -136,15 +151,15 @@ def _parse_section(lines, section):
             section_name = section_name_candidate.strip()
             if not section_name:
                 raise MissingSectionNameBeforeOpeningBraceException()
-            new_section = Section(section_name.strip())
+            new_section = Section(section_name)
             section.add_section(new_section)
-            _parse_section(lines, new_section)
+            section = new_section
         elif "}" in current_line:
-            if current_line.strip() != "}":
+            if current_line != "}":
                 raise ExtraCharactersBeforeOrAfterClosingBraceException()
             if not section.parent:
                 raise UnexpectedClosingBraceException()
-            return
+            section = section.parent
         elif ":" in current_line:
             section.add_attribute(
                 *[x.strip() for x in current_line.split(":", 1)]
@@ -153,6 +168,7 @@ def _parse_section(lines, section):
             raise LineIsNotSectionNorKeyValueException()
     if section.parent:
         raise MissingClosingBraceException()
+    return root
 
 
 class CorosyncConfParserException(Exception):
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Measure parsing and exporting of corosync.conf of large knet clusters
+
+Run from the pcs source directory:
+python3 pcs/lib/corosync/test/benchmark_config_parser.py [repeat]
+"""
+import os.path
+import sys
+import timeit
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)))
+sys.path.insert(0, PACKAGE_DIR)
+
+# pylint: disable=wrong-import-position
+from pcs.lib.corosync import config_parser
+from pcs.test.tools.fixture_corosync_conf import knet_config
+
+
+NODE_COUNT_LIST = (32, 64, 128)
+
+
+def main(repeat=20):
+    print("{0:>6} {1:>12} {2:>12}".format("nodes", "parse [ms]", "export [ms]"))
+    for node_count in NODE_COUNT_LIST:
+        conf_text = knet_config(node_count)
+        root = config_parser.parse_string(conf_text)
+        if str(root) != conf_text:
+            raise AssertionError(
+                "Exported config of {0} nodes differs from the parsed one"
+                .format(node_count)
+            )
+        parse_time = min(timeit.repeat(
+            lambda: config_parser.parse_string(conf_text),
+            number=1,
+            repeat=repeat
+        ))
+        export_time = min(timeit.repeat(root.export, number=1, repeat=repeat))
+        print("{0:>6} {1:>12.3f} {2:>12.3f}".format(
+            node_count, parse_time * 1000, export_time * 1000
+        ))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from pcs.lib.corosync import config_parser
+from pcs.test.tools.fixture_corosync_conf import knet_config
 from pcs.test.tools.misc import outdent
 
 
@@ -1320,3 +1321,38 @@ class ParserTest(TestCase):
             """
         )
         self.assertEqual(str(config_parser.parse_string(string)), parsed)
+
+    def test_full_knet_many_nodes(self):
+        string = knet_config(128)
+        self.assertEqual(str(config_parser.parse_string(string)), string)
+
+    def test_deep_sections(self):
+        string = outdent("""\
+            a {
+                b {
+                    c {
+                        d {
+                            e: f
+                        }
+                    }
+
+                    g: h
+                }
+            }
+            """
+        )
+        parsed = outdent("""\
+            a {
+                b {
+                    g: h
+
+                    c {
+                        d {
+                            e: f
+                        }
+                    }
+                }
+            }
+            """
+        )
+        self.assertEqual(str(config_parser.parse_string(string)), parsed)
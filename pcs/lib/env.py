@@ -3,6 +3,7 @@ from pcs.common.tools import Version
 from pcs.lib import reports
 from pcs.lib.booth.env import BoothEnv
 from pcs.lib.cib.tools import get_cib_crm_feature_set
+from pcs.lib.pacemaker.cib_diff import DiffNotSupported, diff_cibs
 from pcs.lib.pacemaker.env import PacemakerEnv
 from pcs.lib.communication import qdevice
 from pcs.lib.communication.corosync import (
@@ -84,11 +85,16 @@ class LibraryEnvironment:
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
+        self._cluster_state = None
+        communicator_logger = LibCommunicatorLogger(
+            self.logger, self.report_processor
+        )
         self._communicator_factory = NodeCommunicatorFactory(
-            LibCommunicatorLogger(self.logger, self.report_processor),
+            communicator_logger,
             self.user_login,
             self.user_groups,
-            self._request_timeout
+            self._request_timeout,
+            debug=communicator_logger.is_debug_enabled(),
         )
 
         self.__timeout_cache = {}
@@ -145,7 +151,14 @@ class LibraryEnvironment:
         return self.__loaded_cib_to_modify
 
     def get_cluster_state(self):
-        return get_cluster_state_dom(get_cluster_status_xml(self.cmd_runner()))
+        """
+        Return the cluster state, it is loaded once and kept until CIB is pushed
+        """
+        if self._cluster_state is None:
+            self._cluster_state = get_cluster_state_dom(
+                get_cluster_status_xml(self.cmd_runner())
+            )
+        return self._cluster_state
 
     def _get_wait_timeout(self, wait):
         if wait is False:
@@ -221,18 +234,25 @@ class LibraryEnvironment:
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
-            cmd_runner,
-            self.report_processor,
-            self.__loaded_cib_diff_source,
-            etree_to_str(self.__loaded_cib_to_modify)
-        )
+        try:
+            cib_diff_xml = diff_cibs(
+                get_cib(self.__loaded_cib_diff_source),
+                self.__loaded_cib_to_modify
+            )
+        except DiffNotSupported:
+            cib_diff_xml = diff_cibs_xml(
+                cmd_runner,
+                self.report_processor,
+                self.__loaded_cib_diff_source,
+                etree_to_str(self.__loaded_cib_to_modify)
+            )
         if cib_diff_xml:
             push_cib_diff_xml(cmd_runner, cib_diff_xml)
 
     def __do_push_cib(self, cmd_runner, push_strategy, wait):
         timeout = self._get_wait_timeout(wait)
         push_strategy()
+        self._cluster_state = None
         self._cib_upgrade_reported = False
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
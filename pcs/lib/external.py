@@ -1,6 +1,7 @@
+from collections import namedtuple
+import logging
 import re
 from shlex import quote as shell_quote
-import signal
 import subprocess
 
 from pcs import settings
@@ -8,6 +9,7 @@ from pcs.common.system import is_systemd as is_systemctl
 from pcs.common.tools import join_multilines
 from pcs.lib import reports
 from pcs.lib.errors import LibraryError
+from pcs.lib.tools import truncate_debug_payload
 
 
 
@@ -217,6 +219,98 @@ def is_service_installed(runner, service, instance=None):
     return service_name in get_systemd_services(runner)
 
 
+class ServiceState(namedtuple("ServiceState", "installed enabled running")):
+    """
+    State of a service in local system
+    """
+
+
+# states of a unit file for which 'systemctl is-enabled' exits with 0
+_SYSTEMD_ENABLED_STATES = frozenset([
+    "alias",
+    "enabled",
+    "enabled-runtime",
+    "generated",
+    "indirect",
+    "static",
+    "transient",
+])
+# states of a unit for which 'systemctl is-active' exits with 0
+_SYSTEMD_RUNNING_STATES = frozenset(["active", "reloading"])
+
+
+def get_services_state(runner, service_list):
+    """
+    Return a dict service name -> ServiceState for the specified services
+
+    On systemd systems, all the services are queried by one systemctl call.
+    Callers which need several states of several services should get them
+    all at once from this function.
+
+    runner -- CommandRunner
+    iterable service_list -- names of services
+    """
+    service_list = list(service_list)
+    if not service_list:
+        return {}
+    if is_systemctl():
+        state_dict = _get_systemd_services_state(runner, service_list)
+        if state_dict is not None:
+            return state_dict
+        installed_service_list = get_systemd_services(runner)
+    else:
+        installed_service_list = get_non_systemd_services(runner)
+    return {
+        service: ServiceState(
+            installed=(service in installed_service_list),
+            enabled=is_service_enabled(runner, service),
+            running=is_service_running(runner, service),
+        )
+        for service in service_list
+    }
+
+
+def _get_systemd_services_state(runner, service_list):
+    stdout, dummy_stderr, retval = runner.run(
+        [
+            _systemctl,
+            "show",
+            "--property=LoadState,ActiveState,UnitFileState",
+            "--",
+        ]
+        +
+        [_get_service_name(service) for service in service_list]
+    )
+    if retval != 0:
+        return None
+    # Properties of each unit are printed in a block of "name=value" lines,
+    # blocks are separated by an empty line and follow the order of units.
+    property_dict_list = []
+    property_dict = {}
+    for line in stdout.splitlines() + [""]:
+        if not line.strip():
+            if property_dict:
+                property_dict_list.append(property_dict)
+                property_dict = {}
+            continue
+        name, dummy_separator, value = line.partition("=")
+        property_dict[name] = value
+    if len(property_dict_list) != len(service_list):
+        return None
+    return {
+        service: ServiceState(
+            installed=(property_dict.get("LoadState") != "not-found"),
+            enabled=(
+                property_dict.get("UnitFileState") in _SYSTEMD_ENABLED_STATES
+            ),
+            running=(
+                property_dict.get("ActiveState") in _SYSTEMD_RUNNING_STATES
+            ),
+        )
+        for service, property_dict in zip(service_list, property_dict_list)
+    }
+
+
 def get_non_systemd_services(runner):
     """
     Returns list of all installed services on non systemd system.
@@ -303,30 +397,33 @@ class CommandRunner:
         )
 
         log_args = " ".join([shell_quote(x) for x in args])
-        self._logger.debug(
-            "Running: {args}\nEnvironment:{env_vars}{stdin_string}".format(
-                args=log_args,
-                stdin_string=("" if not stdin_string else (
-                    "\n--Debug Input Start--\n{0}\n--Debug Input End--"
-                    .format(stdin_string)
-                )),
-                env_vars=("" if not env_vars else (
-                    "\n" + "\n".join([
-                        "  {0}={1}".format(key, val)
-                        for key, val in sorted(env_vars.items())
-                    ])
-                ))
+        debug_stdin = truncate_debug_payload(stdin_string)
+        # Formatting payloads is expensive for big inputs (e.g. a CIB), do not
+        # do it if nobody reads the log.
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                "Running: {args}\nEnvironment:{env_vars}{stdin_string}"
+                .format(
+                    args=log_args,
+                    stdin_string=("" if not debug_stdin else (
+                        "\n--Debug Input Start--\n{0}\n--Debug Input End--"
+                        .format(debug_stdin)
+                    )),
+                    env_vars=("" if not env_vars else (
+                        "\n" + "\n".join([
+                            "  {0}={1}".format(key, val)
+                            for key, val in sorted(env_vars.items())
+                        ])
+                    ))
+                )
             )
-        )
         self._reporter.process(
             reports.run_external_process_started(
-                log_args, stdin_string, env_vars
+                log_args, debug_stdin, env_vars
             )
         )
 
         try:
-            # pylint: disable=subprocess-popen-preexec-fn
-            # this is OK as pcs is only single-threaded application
             process = subprocess.Popen(
                 args,
                 # Some commands react differently if they get anything via stdin
@@ -337,9 +434,10 @@ class CommandRunner:
                 ),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                preexec_fn=(
-                    lambda: signal.signal(signal.SIGPIPE, signal.SIG_DFL)
-                ),
+                # Resets SIGPIPE to its default action in the child process.
+                # Unlike preexec_fn, this is safe when running commands from
+                # several threads.
+                restore_signals=True,
                 close_fds=True,
                 shell=False,
                 env=env_vars,
@@ -353,19 +451,24 @@ class CommandRunner:
                 reports.run_external_process_error(log_args, e.strerror)
             )
 
-        self._logger.debug(
-            (
-                "Finished running: {args}\nReturn value: {retval}"
-                + "\n--Debug Stdout Start--\n{out_std}\n--Debug Stdout End--"
-                + "\n--Debug Stderr Start--\n{out_err}\n--Debug Stderr End--"
-            ).format(
-                args=log_args,
-                retval=retval,
-                out_std=out_std,
-                out_err=out_err
+        debug_out_std = truncate_debug_payload(out_std)
+        debug_out_err = truncate_debug_payload(out_err)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                (
+                    "Finished running: {args}\nReturn value: {retval}"
+                    + "\n--Debug Stdout Start--\n{out_std}"
+                    + "\n--Debug Stdout End--"
+                    + "\n--Debug Stderr Start--\n{out_err}"
+                    + "\n--Debug Stderr End--"
+                ).format(
+                    args=log_args,
+                    retval=retval,
+                    out_std=debug_out_std,
+                    out_err=debug_out_err
+                )
             )
-        )
         self._reporter.process(reports.run_external_process_finished(
-            log_args, retval, out_std, out_err
+            log_args, retval, debug_out_std, debug_out_err
         ))
         return out_std, out_err, retval
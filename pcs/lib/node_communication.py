@@ -1,3 +1,4 @@
+import logging
 import os
 
 from pcs import settings
@@ -12,6 +13,7 @@ from pcs.common.node_communicator import (
 )
 from pcs.lib.errors import ReportItemSeverity
 from pcs.lib import reports
+from pcs.lib.tools import truncate_debug_payload
 
 
 def _get_port(port):
@@ -24,14 +26,14 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
         self._reporter = reporter
 
     def log_request_start(self, request):
-        msg = "Sending HTTP Request to: {url}"
-        if request.data:
-            msg += "\n--Debug Input Start--\n{data}\n--Debug Input End--"
-        self._logger.debug(
-            msg.format(url=request.url, data=request.data)
-        )
+        data = truncate_debug_payload(request.data)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            msg = "Sending HTTP Request to: {url}"
+            if data:
+                msg += "\n--Debug Input Start--\n{data}\n--Debug Input End--"
+            self._logger.debug(msg.format(url=request.url, data=data))
         self._reporter.process(
-            reports.node_communication_started(request.url, request.data)
+            reports.node_communication_started(request.url, data)
         )
 
     def log_response(self, response):
@@ -43,17 +45,20 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
 
     def _log_response_successful(self, response):
         url = response.request.url
-        msg = (
-            "Finished calling: {url}\nResponse Code: {code}"
-            + "\n--Debug Response Start--\n{response}\n--Debug Response End--"
-        )
-        self._logger.debug(msg.format(
-            url=url,
-            code=response.response_code,
-            response=response.data
-        ))
+        data = truncate_debug_payload(response.data)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            msg = (
+                "Finished calling: {url}\nResponse Code: {code}"
+                + "\n--Debug Response Start--\n{response}"
+                + "\n--Debug Response End--"
+            )
+            self._logger.debug(msg.format(
+                url=url,
+                code=response.response_code,
+                response=data
+            ))
         self._reporter.process(reports.node_communication_finished(
-            url, response.response_code, response.data
+            url, response.response_code, data
         ))
 
     def _log_response_failure(self, response):
@@ -75,15 +80,16 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
 
     def _log_debug(self, response):
         url = response.request.url
-        debug_data = response.debug
-        self._logger.debug(
-            (
-                "Communication debug info for calling: {url}\n"
-                "--Debug Communication Info Start--\n"
-                "{data}\n"
-                "--Debug Communication Info End--"
-            ).format(url=url, data=debug_data)
-        )
+        debug_data = truncate_debug_payload(response.debug)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                (
+                    "Communication debug info for calling: {url}\n"
+                    "--Debug Communication Info Start--\n"
+                    "{data}\n"
+                    "--Debug Communication Info End--"
+                ).format(url=url, data=debug_data)
+            )
         self._reporter.process(
             reports.node_communication_debug_info(url, debug_data)
         )
@@ -113,6 +119,18 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
             response.request.url,
         ))
 
+    def is_debug_enabled(self):
+        """
+        Tell whether debug info of responses gets logged or reported
+        """
+        return (
+            self._logger.isEnabledFor(logging.DEBUG)
+            or
+            # Report processors which do not say anything about debug reports
+            # are expected to use them.
+            getattr(self._reporter, "debug", True)
+        )
+
     def log_no_more_addresses(self, response):
         msg = "No more addresses for node {label} to run '{req}'".format(
             label=response.request.host_label,
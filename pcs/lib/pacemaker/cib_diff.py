@@ -0,0 +1,194 @@
+"""
+Native computing of CIB differences in the patchset format (version 2)
+accepted by 'cibadmin --patch'. The patchset is equivalent to the one
+'crm_diff --no-version' produces, but it is built without serializing whole
+CIBs into temporary files and running an external process.
+
+Only subtrees which differ are visited: children of a changed element are
+compared by their serialization first and equal ones are skipped. Whenever
+the patchset cannot be built reliably (elements cannot be identified
+unambiguously, elements have been reordered, comments or text are involved),
+DiffNotSupported is raised so the caller can fall back to crm_diff.
+"""
+from copy import deepcopy
+
+from lxml import etree
+
+from pcs.lib.xml_tools import etree_to_str
+
+
+# These are removed from a patchset by 'crm_diff --no-version'. Pacemaker
+# maintains them on its own.
+_VERSION_ATTRIBUTES = frozenset(["admin_epoch", "epoch", "num_updates"])
+
+class DiffNotSupported(Exception):
+    """
+    The CIBs differ in a way the native diff does not handle
+    """
+
+def diff_cibs(cib_old, cib_new):
+    """
+    Return a patchset transforming cib_old into cib_new or an empty string if
+    the CIBs are the same. Raise DiffNotSupported if a patchset cannot be
+    built reliably.
+
+    etree cib_old -- original CIB
+    etree cib_new -- modified CIB
+    """
+    old_root = _get_root_element(cib_old)
+    new_root = _get_root_element(cib_new)
+    if old_root.tag != new_root.tag:
+        raise DiffNotSupported("root elements differ")
+
+    builder = _PatchsetBuilder()
+    builder.diff_element(
+        old_root,
+        new_root,
+        _element_path("", new_root),
+        ignore_attributes=_VERSION_ATTRIBUTES,
+    )
+    return builder.to_string()
+
+def _get_root_element(cib):
+    # ElementTree has getroot, Element has getroottree
+    tree = cib if hasattr(cib, "getroot") else cib.getroottree()
+    return tree.getroot()
+
+def _element_path(parent_path, element):
+    element_id = element.get("id")
+    if element_id is None:
+        return "{0}/{1}".format(parent_path, element.tag)
+    # pacemaker splits a path by slashes and does not support escaping
+    if "'" in element_id or "/" in element_id:
+        raise DiffNotSupported(
+            "id '{0}' cannot be used in a path".format(element_id)
+        )
+    return "{0}/{1}[@id='{2}']".format(parent_path, element.tag, element_id)
+
+def _has_text(text):
+    return text is not None and text.strip() != ""
+
+def _serialize(element):
+    return etree.tostring(element, with_tail=False)
+
+def _index_children(element):
+    """
+    Return a list of keys of element's children and a dict key: child
+
+    etree element -- parent element
+    """
+    key_list = []
+    child_dict = {}
+    for child in element:
+        if not isinstance(child.tag, str):
+            raise DiffNotSupported("comments and instructions not supported")
+        if _has_text(child.tail):
+            raise DiffNotSupported("text content not supported")
+        # Pacemaker identifies elements by their tag and id. Elements without
+        # an id can only be identified by their tag.
+        key = (child.tag, child.get("id"))
+        if key in child_dict:
+            raise DiffNotSupported(
+                "element '{0}' cannot be identified unambiguously".format(
+                    child.tag
+                )
+            )
+        key_list.append(key)
+        child_dict[key] = child
+    return key_list, child_dict
+
+class _PatchsetBuilder:
+    def __init__(self):
+        # pacemaker applies deletions first anyway
+        self._delete_list = []
+        self._change_list = []
+
+    def to_string(self):
+        if not self._delete_list and not self._change_list:
+            return ""
+        patchset = etree.Element("diff", format="2")
+        patchset.extend(self._delete_list)
+        patchset.extend(self._change_list)
+        return etree_to_str(patchset)
+
+    def diff_element(self, old, new, path, ignore_attributes=frozenset()):
+        if _has_text(old.text) or _has_text(new.text):
+            raise DiffNotSupported("text content not supported")
+        self._diff_attributes(old, new, path, ignore_attributes)
+        self._diff_children(old, new, path)
+
+    def _diff_attributes(self, old, new, path, ignore_attributes):
+        old_attrs = {
+            name: value for name, value in old.attrib.items()
+            if name not in ignore_attributes
+        }
+        new_attrs = {
+            name: value for name, value in new.attrib.items()
+            if name not in ignore_attributes
+        }
+        if old_attrs == new_attrs:
+            return
+
+        change = etree.Element("change", operation="modify", path=path)
+        change_list = etree.SubElement(change, "change-list")
+        for name, value in new_attrs.items():
+            if old_attrs.get(name) != value:
+                etree.SubElement(
+                    change_list,
+                    "change-attr",
+                    name=name,
+                    operation="set",
+                    value=value,
+                )
+        for name in old_attrs:
+            if name not in new_attrs:
+                etree.SubElement(
+                    change_list, "change-attr", name=name, operation="unset"
+                )
+        etree.SubElement(
+            etree.SubElement(change, "change-result"), new.tag, new_attrs
+        )
+        self._change_list.append(change)
+
+    def _diff_children(self, old, new, path):
+        old_keys, old_children = _index_children(old)
+        new_keys, new_children = _index_children(new)
+
+        for key in old_keys:
+            if key not in new_children:
+                self._delete_list.append(etree.Element(
+                    "change",
+                    operation="delete",
+                    path=_element_path(path, old_children[key]),
+                ))
+
+        # Patchsets are able to express moves, but pacemaker applies them
+        # together with creations in a way which is hard to reproduce. Let
+        # crm_diff deal with that.
+        if (
+            [key for key in old_keys if key in new_children]
+            !=
+            [key for key in new_keys if key in old_children]
+        ):
+            raise DiffNotSupported("elements have been reordered")
+
+        for position, key in enumerate(new_keys):
+            new_child = new_children[key]
+            if key not in old_children:
+                change = etree.Element(
+                    "change",
+                    operation="create",
+                    path=path,
+                    position=str(position),
+                )
+                created = deepcopy(new_child)
+                created.tail = None
+                change.append(created)
+                self._change_list.append(change)
+                continue
+            old_child = old_children[key]
+            if _serialize(old_child) != _serialize(new_child):
+                self.diff_element(
+                    old_child, new_child, _element_path(path, new_child)
+                )
+
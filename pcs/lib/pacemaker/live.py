@@ -260,19 +260,19 @@ def get_local_node_status(runner):
     except CrmMonErrorException:
         return {"offline": True}
     node_name = get_local_node_name(runner)
-    for node_status in cluster_status.node_section.nodes:
-        if node_status.attrs.name == node_name:
-            result = {
-                "offline": False,
-            }
-            for attr in (
-                'id', 'name', 'type', 'online', 'standby', 'standby_onfail',
-                'maintenance', 'pending', 'unclean', 'shutdown', 'expected_up',
-                'is_dc', 'resources_running',
-            ):
-                result[attr] = getattr(node_status.attrs, attr)
-            return result
-    raise LibraryError(reports.node_not_found(node_name))
+    node_status = cluster_status.get_node(node_name)
+    if node_status is None:
+        raise LibraryError(reports.node_not_found(node_name))
+    result = {
+        "offline": False,
+    }
+    for attr in (
+        'id', 'name', 'type', 'online', 'standby', 'standby_onfail',
+        'maintenance', 'pending', 'unclean', 'shutdown', 'expected_up',
+        'is_dc', 'resources_running',
+    ):
+        result[attr] = getattr(node_status.attrs, attr)
+    return result
 
 def remove_node(runner, node_name):
     stdout, stderr, retval = runner.run([
@@ -4,6 +4,7 @@ Hide information about underlaying xml is desired too.
 '''
 import os.path
 from collections import defaultdict
+from functools import lru_cache
 
 from lxml import etree
 
@@ -59,19 +60,22 @@ class _Children:
     def __getattr__(self, name):
         if name in self.children.keys():
             element_name, wrapper = self.children[name]
-            return [
+            value = [
                 wrapper(element)
                 for element in self.dom_part.findall('.//' + element_name)
             ]
-
-        if name in self.sections.keys():
+        elif name in self.sections.keys():
             element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall('.//' + element_name)[0])
-
-        raise AttributeError(
-            "'{0}' does not declare child or section '{1}'"
-            .format(self.owner_name, name)
-        )
+            value = wrapper(self.dom_part.findall('.//' + element_name)[0])
+        else:
+            raise AttributeError(
+                "'{0}' does not declare child or section '{1}'"
+                .format(self.owner_name, name)
+            )
+        # The state does not change, so the document is searched only on the
+        # first access. Next accesses do not get here.
+        setattr(self, name, value)
+        return value
 
 class _Element:
     required_attrs = {}
@@ -133,11 +137,29 @@ class _NodeSection(_Element):
         'nodes': ('node', _Node),
     }
 
+# Set once a cluster state has been validated in the "sampled" mode.
+_state_validation = {}
+
+@lru_cache()
+def _get_crm_mon_schema(schema_path):
+    # Compiling the schema takes longer than validating a state, so it is only
+    # done once in a process.
+    return etree.RelaxNG(file=schema_path)
+
+def _is_state_validation_needed():
+    mode = settings.crm_mon_state_validation
+    if mode == "off":
+        return False
+    if mode == "sampled" and _state_validation.get("sampled"):
+        return False
+    return os.path.isfile(settings.crm_mon_schema)
+
 def get_cluster_state_dom(xml):
     try:
         dom = xml_fromstring(xml)
-        if os.path.isfile(settings.crm_mon_schema):
-            etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+        if _is_state_validation_needed():
+            _get_crm_mon_schema(settings.crm_mon_schema).assertValid(dom)
+            _state_validation["sampled"] = True
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(reports.cluster_state_invalid_format())
@@ -151,30 +173,108 @@ class ClusterState(_Element):
     def __init__(self, xml):
         self.dom = get_cluster_state_dom(xml)
         super(ClusterState, self).__init__(self.dom)
+        self._node_dict = None
+
+    def get_node(self, name):
+        """
+        Return a node of the specified name or None if there is no such node
+
+        string name -- name of the node
+        """
+        if self._node_dict is None:
+            self._node_dict = {}
+            for node in self.node_section.nodes:
+                self._node_dict.setdefault(node.attrs.name, node)
+        return self._node_dict.get(name)
+
+class _ResourceIndex:
+    """
+    Resource elements of a cluster state indexed by their ids
 
-def _id_xpath_predicate(resource_id):
-    return """(@id="{0}" or starts-with(@id, "{0}:"))""".format(resource_id)
+    Resources are looked up in a cluster state once for each resource id
+    specified by a user. Going through the whole state each time would make
+    checking many resources slow in large clusters.
+    """
+    # tag -> index also by ids of clone instances (id:number)
+    _INDEXED_TAGS = {
+        "resource": True,
+        "group": True,
+        "clone": False,
+        "bundle": False,
+    }
+
+    def __init__(self, cluster_state):
+        """
+        etree cluster_state -- status of the cluster
+        """
+        self._position_dict = {}
+        self._index = {tag: defaultdict(list) for tag in self._INDEXED_TAGS}
+        for position, element in enumerate(
+            cluster_state.iterdescendants(*self._INDEXED_TAGS.keys())
+        ):
+            self._position_dict[element] = position
+            element_id = element.get("id")
+            if element_id is None:
+                continue
+            key_list = [element_id]
+            if self._INDEXED_TAGS[element.tag]:
+                # instances of clones are distinguished by a suffix ':number'
+                key_list.extend([
+                    element_id[:index]
+                    for index, char in enumerate(element_id) if char == ":"
+                ])
+            for key in key_list:
+                self._index[element.tag][key].append(element)
+
+    def get(self, tag, resource_id):
+        """
+        Return elements of the tag with the id, in the document order
+
+        string tag -- resource, group, clone or bundle
+        string resource_id -- id of the elements, resources and groups are
+            returned also if their id is resource_id:anything
+        """
+        return self._index[tag].get(resource_id, [])
+
+    def sort(self, element_list):
+        """
+        Return unique indexed elements in the document order
+
+        iterable element_list -- elements to sort
+        """
+        return sorted(set(element_list), key=self._position_dict.__getitem__)
+
+# The index of the last used cluster state. All checks in a command usually
+# work with one state.
+_resource_index_cache = {}
+
+def _get_resource_index(cluster_state):
+    if _resource_index_cache.get("state") is not cluster_state:
+        _resource_index_cache["state"] = cluster_state
+        _resource_index_cache["index"] = _ResourceIndex(cluster_state)
+    return _resource_index_cache["index"]
 
 def _get_primitives_for_state_check(
     cluster_state, resource_id, expected_running
 ):
-    primitives = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource[{predicate_position}]
-        |
-        .//clone[@id="{id}"]/resource
-        |
-        .//clone[@id="{id}"]/group/resource[{predicate_position}]
-        |
-        .//bundle[@id="{id}"]/replica/resource
-    """.format(
-        id=resource_id,
-        predicate_id=_id_xpath_predicate(resource_id),
-        predicate_position=("last()" if expected_running else "1")
-    ))
+    index = _get_resource_index(cluster_state)
+    position = -1 if expected_running else 0
+
+    def member(group_el):
+        primitive_list = group_el.findall("resource")
+        return [primitive_list[position]] if primitive_list else []
+
+    primitives = list(index.get("resource", resource_id))
+    for group_el in index.get("group", resource_id):
+        primitives.extend(member(group_el))
+    for clone_el in index.get("clone", resource_id):
+        primitives.extend(clone_el.findall("resource"))
+        for group_el in clone_el.findall("group"):
+            primitives.extend(member(group_el))
+    for bundle_el in index.get("bundle", resource_id):
+        primitives.extend(bundle_el.findall("replica/resource"))
     return [
-        element for element in primitives
+        element for element in index.sort(primitives)
             if not is_true(element.attrib.get("failed", ""))
     ]
 
@@ -241,12 +341,11 @@ def is_resource_managed(cluster_state, resource_id):
     etree cluster_state -- status of the cluster
     string resource_id -- id of the resource
     """
-    primitive_list = cluster_state.xpath("""
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource
-        """.format(predicate_id=_id_xpath_predicate(resource_id))
-    )
+    index = _get_resource_index(cluster_state)
+    primitive_list = list(index.get("resource", resource_id))
+    for group_el in index.get("group", resource_id):
+        primitive_list.extend(group_el.findall("resource"))
+    primitive_list = index.sort(primitive_list)
     if primitive_list:
         for primitive in primitive_list:
             if is_false(primitive.attrib.get("managed", "")):
@@ -260,11 +359,8 @@ def is_resource_managed(cluster_state, resource_id):
                 return False
         return True
 
-    parent_list = cluster_state.xpath("""
-        .//clone[@id="{0}"]
-        |
-        .//bundle[@id="{0}"]
-        """.format(resource_id)
+    parent_list = index.sort(
+        index.get("clone", resource_id) + index.get("bundle", resource_id)
     )
     for parent in parent_list:
         if is_false(parent.attrib.get("managed", "")):
@@ -0,0 +1,216 @@
+from unittest import TestCase
+
+from pcs.test.tools.assertions import assert_xml_equal
+
+from pcs.common.tools import xml_fromstring
+from pcs.lib.pacemaker.cib_diff import diff_cibs, DiffNotSupported
+
+
+CIB_TEMPLATE = """
+    <cib epoch="{epoch}" num_updates="0" admin_epoch="0"
+        validate-with="pacemaker-2.0" crm_feature_set="3.0.9"
+    >
+        <configuration>
+            <crm_config/>
+            <nodes/>
+            <resources>{resources}</resources>
+            <constraints/>
+        </configuration>
+        <status/>
+    </cib>
+"""
+
+PRIMITIVE = """
+    <primitive id="{id}" class="ocf" provider="heartbeat" type="Dummy">
+        <instance_attributes id="{id}-instance_attributes">
+            <nvpair id="{id}-instance_attributes-fake" name="fake"
+                value="{value}"
+            />
+        </instance_attributes>
+        <operations>
+            <op id="{id}-monitor" name="monitor" interval="10s"/>
+        </operations>
+    </primitive>
+"""
+
+RESOURCES_PATH = "/cib/configuration/resources"
+
+def cib(resources="", epoch="1"):
+    return xml_fromstring(
+        CIB_TEMPLATE.format(resources=resources, epoch=epoch)
+    )
+
+def primitive(resource_id, value="1"):
+    return PRIMITIVE.format(id=resource_id, value=value)
+
+class DiffCibs(TestCase):
+    def assert_diff(self, cib_old, cib_new, expected_changes):
+        assert_xml_equal(
+            '<diff format="2">{0}</diff>'.format(expected_changes),
+            diff_cibs(cib_old, cib_new)
+        )
+
+    def test_no_difference(self):
+        self.assertEqual(
+            "",
+            diff_cibs(cib(primitive("R1")), cib(primitive("R1")))
+        )
+
+    def test_version_attributes_ignored(self):
+        self.assertEqual("", diff_cibs(cib(epoch="1"), cib(epoch="2")))
+
+    def test_accepts_element_trees(self):
+        self.assertEqual(
+            "",
+            diff_cibs(cib().getroottree(), cib().getroottree())
+        )
+
+    def test_create(self):
+        self.assert_diff(
+            cib(primitive("R1") + primitive("R3")),
+            cib(primitive("R1") + primitive("R2") + primitive("R3")),
+            """
+                <change operation="create" path="{path}" position="1">
+                    {primitive}
+                </change>
+            """.format(path=RESOURCES_PATH, primitive=primitive("R2"))
+        )
+
+    def test_delete(self):
+        self.assert_diff(
+            cib(primitive("R1") + primitive("R2")),
+            cib(primitive("R1")),
+            """
+                <change operation="delete"
+                    path="{0}/primitive[@id='R2']"
+                />
+            """.format(RESOURCES_PATH)
+        )
+
+    def test_delete_element_without_id(self):
+        cib_new = cib(primitive("R1"))
+        operations = cib_new.find(".//operations")
+        operations.getparent().remove(operations)
+        self.assert_diff(
+            cib(primitive("R1")),
+            cib_new,
+            """
+                <change operation="delete"
+                    path="{0}/primitive[@id='R1']/operations"
+                />
+            """.format(RESOURCES_PATH)
+        )
+
+    def test_modify(self):
+        self.assert_diff(
+            cib(primitive("R1") + primitive("R2")),
+            cib(primitive("R1") + primitive("R2", value="2")),
+            """
+                <change operation="modify"
+                    path="{0}/primitive[@id='R2']/instance_attributes[@id='R2-instance_attributes']/nvpair[@id='R2-instance_attributes-fake']"
+                >
+                    <change-list>
+                        <change-attr name="value" operation="set" value="2"/>
+                    </change-list>
+                    <change-result>
+                        <nvpair id="R2-instance_attributes-fake" name="fake"
+                            value="2"
+                        />
+                    </change-result>
+                </change>
+            """.format(RESOURCES_PATH)
+        )
+
+    def test_modify_unset_attribute(self):
+        cib_new = cib(primitive("R1"))
+        cib_new.find(".//primitive").attrib.pop("provider")
+        self.assert_diff(
+            cib(primitive("R1")),
+            cib_new,
+            """
+                <change operation="modify"
+                    path="{0}/primitive[@id='R1']"
+                >
+                    <change-list>
+                        <change-attr name="provider" operation="unset"/>
+                    </change-list>
+                    <change-result>
+                        <primitive id="R1" class="ocf" type="Dummy"/>
+                    </change-result>
+                </change>
+            """.format(RESOURCES_PATH)
+        )
+
+    def test_modify_cib_element(self):
+        cib_new = cib(epoch="2")
+        cib_new.set("crm_feature_set", "3.0.14")
+        self.assert_diff(
+            cib(),
+            cib_new,
+            """
+                <change operation="modify" path="/cib">
+                    <change-list>
+                        <change-attr name="crm_feature_set" operation="set"
+                            value="3.0.14"
+                        />
+                    </change-list>
+                    <change-result>
+                        <cib validate-with="pacemaker-2.0"
+                            crm_feature_set="3.0.14"
+                        />
+                    </change-result>
+                </change>
+            """
+        )
+
+    def test_deletions_go_first(self):
+        self.assert_diff(
+            cib(primitive("R1")),
+            cib(primitive("R2")),
+            """
+                <change operation="delete"
+                    path="{path}/primitive[@id='R1']"
+                />
+                <change operation="create" path="{path}" position="0">
+                    {primitive}
+                </change>
+            """.format(path=RESOURCES_PATH, primitive=primitive("R2"))
+        )
+
+class DiffCibsNotSupported(TestCase):
+    def assert_not_supported(self, cib_old, cib_new):
+        with self.assertRaises(DiffNotSupported):
+            diff_cibs(cib_old, cib_new)
+
+    def test_reordered(self):
+        self.assert_not_supported(
+            cib(primitive("R1") + primitive("R2")),
+            cib(primitive("R2") + primitive("R1")),
+        )
+
+    def test_ambiguous_elements(self):
+        self.assert_not_supported(
+            cib("<tag/><tag/>"),
+            cib("<tag/><tag a='b'/>"),
+        )
+
+    def test_comment(self):
+        self.assert_not_supported(
+            cib(primitive("R1") + "<!-- comment -->"),
+            cib(primitive("R1", value="2") + "<!-- comment -->"),
+        )
+
+    def test_text(self):
+        self.assert_not_supported(
+            cib("<tag>text</tag>"),
+            cib("<tag>text 2</tag>"),
+        )
+
+    def test_id_not_usable_in_path(self):
+        self.assert_not_supported(
+            cib('<tag id="a\'b"/>'),
+            cib('<tag id="a\'b" a="b"/>'),
+        )
+
+    def test_different_root(self):
+        self.assert_not_supported(cib(), xml_fromstring("<not-cib/>"))
@@ -1,3 +1,4 @@
+import tempfile
 from unittest import mock, TestCase
 
 from lxml import etree
@@ -64,6 +65,13 @@ class ChildrenTest(TestCase):
         children = _Children('test', self.dom, {}, {})
         self.assertRaises(AttributeError, lambda: children.some_section)
 
+    def test_searches_document_once(self):
+        wrap = mock.Mock(side_effect=self.wrap)
+        children = _Children('test', self.dom, {'anys': ('any', wrap)}, {})
+        self.assertEqual(['any.1', 'any.2'], children.anys)
+        self.assertEqual(['any.1', 'any.2'], children.anys)
+        self.assertEqual(2, wrap.call_count)
+
 
 class TestBase(TestCase):
     def setUp(self):
@@ -94,6 +102,53 @@ class ClusterStatusTest(TestBase):
         )
 
 
+@mock.patch("pcs.lib.pacemaker.state.settings")
+class GetClusterStateDomValidation(TestCase):
+    schema = """<?xml version="1.0" encoding="UTF-8"?>
+        <grammar xmlns="http://relaxng.org/ns/structure/1.0">
+            <start><element name="crm_mon"><empty/></element></start>
+        </grammar>
+    """
+
+    def setUp(self):
+        tmp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".rng")
+        self.addCleanup(tmp_file.close)
+        tmp_file.write(self.schema)
+        tmp_file.flush()
+        self.schema_path = tmp_file.name
+        state._get_crm_mon_schema.cache_clear()
+        self.addCleanup(state._get_crm_mon_schema.cache_clear)
+        patcher = mock.patch.dict(state._state_validation, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_invalid(self, xml):
+        assert_raise_library_error(
+            lambda: state.get_cluster_state_dom(xml),
+            (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {})
+        )
+
+    def test_full(self, mock_settings):
+        mock_settings.crm_mon_schema = self.schema_path
+        mock_settings.crm_mon_state_validation = "full"
+        state.get_cluster_state_dom("<crm_mon/>")
+        self.assert_invalid("<crm_mon><invalid/></crm_mon>")
+        self.assertEqual(1, state._get_crm_mon_schema.cache_info().misses)
+
+    def test_sampled(self, mock_settings):
+        mock_settings.crm_mon_schema = self.schema_path
+        mock_settings.crm_mon_state_validation = "sampled"
+        self.assert_invalid("<crm_mon><invalid/></crm_mon>")
+        state.get_cluster_state_dom("<crm_mon/>")
+        state.get_cluster_state_dom("<crm_mon><invalid/></crm_mon>")
+
+    def test_off(self, mock_settings):
+        mock_settings.crm_mon_schema = self.schema_path
+        mock_settings.crm_mon_state_validation = "off"
+        state.get_cluster_state_dom("<crm_mon><invalid/></crm_mon>")
+        self.assert_invalid("invalid xml")
+        self.assertEqual(0, state._get_crm_mon_schema.cache_info().misses)
+
 class WorkWithClusterStatusNodesTest(TestBase):
     def fixture_node_string(self, **kwargs):
         attrs = dict(name='name', id='id', type='member')
@@ -126,6 +181,16 @@ class WorkWithClusterStatusNodesTest(TestBase):
             [node.attrs.name for node in ClusterState(xml).node_section.nodes]
         )
 
+    def test_can_get_node_by_name(self):
+        self.covered_status.append_to_first_tag_name(
+            'nodes',
+            self.fixture_node_string(name='node1', id='1'),
+            self.fixture_node_string(name='node2', id='2'),
+        )
+        cluster_state = ClusterState(str(self.covered_status))
+        self.assertEqual('2', cluster_state.get_node('node2').attrs.id)
+        self.assertIsNone(cluster_state.get_node('node3'))
+
     def test_can_filter_out_remote_nodes(self):
         self.covered_status.append_to_first_tag_name(
             'nodes',
@@ -488,6 +553,58 @@ class GetPrimitivesForStateCheck(TestCase):
         self.assert_primitives("B2-R2", ["B2-R2", "B2-R2"], False)
 
 
+class ResourceIndex(TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(state._resource_index_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_index_is_reused_for_the_same_state(self):
+        dom = etree.fromstring('<resources><resource id="R1:0"/></resources>')
+        index = state._get_resource_index(dom)
+        self.assertIs(index, state._get_resource_index(dom))
+        self.assertIsNot(
+            index, state._get_resource_index(etree.fromstring("<resources/>"))
+        )
+
+    def test_clone_instances(self):
+        dom = etree.fromstring("""
+            <resources>
+                <resource id="R1:0:1"/>
+                <resource id="R1:0"/>
+                <resource id="R11"/>
+                <clone id="C1"><group id="C1:0"/></clone>
+            </resources>
+        """)
+        index = state._ResourceIndex(dom)
+        self.assertEqual(
+            ["R1:0:1", "R1:0"],
+            [el.get("id") for el in index.get("resource", "R1")]
+        )
+        self.assertEqual(
+            ["R1:0:1", "R1:0"],
+            [el.get("id") for el in index.get("resource", "R1:0")]
+        )
+        self.assertEqual(
+            ["C1"], [el.get("id") for el in index.get("clone", "C1")]
+        )
+        self.assertEqual([], index.get("clone", "C1:0"))
+        self.assertEqual(
+            ["C1:0"], [el.get("id") for el in index.get("group", "C1")]
+        )
+
+    def test_sort(self):
+        dom = etree.fromstring(
+            '<resources><resource id="A"/><resource id="B"/></resources>'
+        )
+        index = state._ResourceIndex(dom)
+        element_a, element_b = dom
+        self.assertEqual(
+            [element_a, element_b],
+            index.sort([element_b, element_a, element_b])
+        )
+
+
 class CommonResourceState(TestCase):
     resource_id = "R"
     def setUp(self):
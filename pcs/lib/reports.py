@@ -1949,6 +1949,25 @@ def resource_operation_interval_adapted(
         }
     )
 
+def node_attribute_does_not_exist(
+    node, attribute_name, severity=ReportItemSeverity.ERROR, forceable=None
+):
+    """
+    an attribute to be removed from a node does not exist
+
+    string node -- node name
+    string attribute_name -- name of the attribute
+    """
+    return ReportItem(
+        report_codes.NODE_ATTRIBUTE_DOES_NOT_EXIST,
+        severity,
+        info={
+            "node": node,
+            "attribute_name": attribute_name,
+        },
+        forceable=forceable
+    )
+
 def node_not_found(
     node, searched_types=None, severity=ReportItemSeverity.ERROR, forceable=None
 ):
@@ -1,3 +1,4 @@
+import os
 import re
 from collections import namedtuple
 from lxml import etree
@@ -807,6 +808,9 @@ class FencedMetadata(FakeAgentMetadata):
 
 class CrmAgent(Agent):
     #pylint:disable=abstract-method
+    # AgentMetadataCache shared by all agents, no cache is used when None
+    _metadata_cache = None
+
     def __init__(self, runner, name):
         """
         init
@@ -815,6 +819,13 @@ class CrmAgent(Agent):
         super(CrmAgent, self).__init__(runner)
         self._name_parts = self._prepare_name_parts(name)
 
+    @staticmethod
+    def set_metadata_cache(metadata_cache):
+        """
+        AgentMetadataCache metadata_cache -- cache to use, None to use none
+        """
+        CrmAgent._metadata_cache = metadata_cache
+
     def _prepare_name_parts(self, name):
         raise NotImplementedError()
 
@@ -848,7 +859,45 @@ class CrmAgent(Agent):
         self._get_metadata()
         return self
 
+    def _get_agent_file(self):
+        """
+        Return path to the agent's file or None if it is not known
+        """
+        return None
+
+    def _get_metadata_fingerprint(self):
+        agent_file = self._get_agent_file()
+        if agent_file is None:
+            return None
+        try:
+            agent_stat = os.stat(agent_file)
+            # crm_resource is a part of pacemaker, it changes with pacemaker
+            # version
+            pacemaker_stat = os.stat(settings.crm_resource_binary)
+        except EnvironmentError:
+            return None
+        return [
+            agent_stat.st_mtime_ns,
+            agent_stat.st_size,
+            pacemaker_stat.st_mtime_ns,
+            pacemaker_stat.st_size,
+        ]
+
     def _load_metadata(self):
+        metadata_cache = CrmAgent._metadata_cache
+        fingerprint = (
+            self._get_metadata_fingerprint() if metadata_cache else None
+        )
+        if fingerprint:
+            metadata = metadata_cache.get(self._get_full_name(), fingerprint)
+            if metadata is not None:
+                return metadata
+        metadata = self._load_metadata_from_crm_resource()
+        if fingerprint:
+            metadata_cache.put(self._get_full_name(), fingerprint, metadata)
+        return metadata
+
+    def _load_metadata_from_crm_resource(self):
         env_path = ":".join([
             # otherwise pacemaker cannot run RHEL fence agents to get their
             # metadata
@@ -885,6 +934,19 @@ class ResourceAgent(CrmAgent):
     def get_name(self):
         return self._get_full_name()
 
+    def _get_agent_file(self):
+        if self.get_standard() == "ocf":
+            return os.path.join(
+                settings.ocf_resource_agents_dir,
+                self.get_provider(),
+                self.get_type()
+            )
+        if self.get_standard() == "lsb":
+            return os.path.join(
+                settings.lsb_resource_agents_dir, self.get_type()
+            )
+        return None
+
     def get_parameters(self):
         parameters = super(ResourceAgent, self).get_parameters()
         if (
@@ -998,6 +1060,9 @@ class StonithAgent(CrmAgent):
     def get_name(self):
         return self.get_type()
 
+    def _get_agent_file(self):
+        return os.path.join(settings.fence_agent_binaries, self.get_type())
+
     def get_parameters(self):
         return (
             self._filter_parameters(
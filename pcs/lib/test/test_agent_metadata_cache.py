@@ -0,0 +1,79 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from pcs.lib.agent_metadata_cache import AgentMetadataCache
+
+
+class AgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.cache = AgentMetadataCache(self.cache_dir)
+
+    def test_get_empty(self):
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [1, 2]))
+
+    def test_put_get(self):
+        self.cache.put("ocf:heartbeat:Dummy", [1, 2], "<resource-agent/>")
+        self.assertEqual(
+            "<resource-agent/>",
+            self.cache.get("ocf:heartbeat:Dummy", [1, 2])
+        )
+        self.assertEqual(
+            0o700, os.stat(self.cache_dir).st_mode & 0o777
+        )
+
+    def test_fingerprint_mismatch(self):
+        self.cache.put("ocf:heartbeat:Dummy", [1, 2], "<resource-agent/>")
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [1, 3]))
+
+    def test_agents_do_not_collide(self):
+        self.cache.put("ocf:heartbeat:Dummy", [1], "<dummy/>")
+        self.cache.put("stonith:fence_xvm", [1], "<fence/>")
+        self.assertEqual(
+            "<dummy/>", self.cache.get("ocf:heartbeat:Dummy", [1])
+        )
+        self.assertEqual("<fence/>", self.cache.get("stonith:fence_xvm", [1]))
+        self.assertEqual(
+            [
+                "ocf%3Aheartbeat%3ADummy.json",
+                "stonith%3Afence_xvm.json",
+            ],
+            sorted(os.listdir(self.cache_dir))
+        )
+
+    def test_put_overwrites(self):
+        self.cache.put("ocf:heartbeat:Dummy", [1], "<old/>")
+        self.cache.put("ocf:heartbeat:Dummy", [2], "<new/>")
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [1]))
+        self.assertEqual("<new/>", self.cache.get("ocf:heartbeat:Dummy", [2]))
+
+    def test_get_corrupted_file(self):
+        self.cache.put("ocf:heartbeat:Dummy", [1], "<resource-agent/>")
+        with open(
+            os.path.join(self.cache_dir, "ocf%3Aheartbeat%3ADummy.json"), "w"
+        ) as cache_file:
+            cache_file.write("not a json")
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [1]))
+
+    def test_put_error_ignored(self):
+        # the cache directory cannot be created
+        with open(self.cache_dir, "w"):
+            pass
+        self.cache.put("ocf:heartbeat:Dummy", [1], "<resource-agent/>")
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [1]))
+        self.assertEqual(["cache"], os.listdir(self.tmp_dir.name))
+
+    def test_clear(self):
+        self.cache.put("ocf:heartbeat:Dummy", [1], "<dummy/>")
+        self.cache.put("stonith:fence_xvm", [1], "<fence/>")
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("ocf:heartbeat:Dummy", [1]))
+        self.assertIsNone(self.cache.get("stonith:fence_xvm", [1]))
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_clear_missing_dir(self):
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache_dir))
@@ -57,6 +57,28 @@ class LibraryEnvironmentTest(TestCase):
         env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
         self.assertEqual([], env.user_groups)
 
+@patch_env("get_cluster_state_dom", lambda xml: "dom of " + xml)
+@patch_env("get_cluster_status_xml")
+@patch_env("replace_cib_configuration", mock.Mock())
+@patch_env("CommandRunner", mock.Mock())
+class GetClusterState(TestCase):
+    def setUp(self):
+        self.env = LibraryEnvironment(
+            mock.MagicMock(logging.Logger), MockLibraryReportProcessor()
+        )
+
+    def test_loaded_once(self, mock_status_xml):
+        mock_status_xml.return_value = "state"
+        self.assertEqual("dom of state", self.env.get_cluster_state())
+        self.assertEqual("dom of state", self.env.get_cluster_state())
+        mock_status_xml.assert_called_once_with(mock.ANY)
+
+    def test_reloaded_after_push(self, mock_status_xml):
+        mock_status_xml.side_effect = ["state1", "state2"]
+        self.assertEqual("dom of state1", self.env.get_cluster_state())
+        self.env.push_cib(custom_cib="cib")
+        self.assertEqual("dom of state2", self.env.get_cluster_state())
+
 @patch_env("CommandRunner")
 class CmdRunner(TestCase):
     def setUp(self):
@@ -139,6 +139,17 @@ class GetCib(TestCase, ManageCibAssertionMixin):
 class PushLoadedCib(TestCase, ManageCibAssertionMixin):
     # pylint: disable=too-many-public-methods
     wait_timeout = 10
+    cib_diff = """
+        <diff format="2">
+            <change operation="create" path="/cib/configuration/resources"
+                position="0"
+            >
+                <primitive id="R" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            </change>
+        </diff>
+    """
     def setUp(self):
         tmpfile_patcher = mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
         self.addCleanup(tmpfile_patcher.stop)
@@ -152,7 +163,33 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.cib_cannot_diff = "cib-empty-1.2.xml"
         self.env_assist, self.config = get_env_tools(test_case=self)
 
+    @staticmethod
+    def modify_cib(cib):
+        # a change the native diff is able to express
+        etree.SubElement(
+            cib.find(".//resources"),
+            "primitive",
+            {
+                "id": "R",
+                "class": "ocf",
+                "provider": "pacemaker",
+                "type": "Dummy",
+            }
+        )
+
+    @staticmethod
+    def reorder_cib(cib):
+        # a change which makes the native diff fall back to crm_diff
+        configuration = cib.find("configuration")
+        configuration.insert(0, configuration.find("nodes"))
+
     def config_load_and_push_diff(self):
+        (self.config
+            .runner.cib.load(filename=self.cib_can_diff)
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
+        )
+
+    def config_load_and_push_crm_diff(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
@@ -165,20 +202,18 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             .runner.cib.push()
         )
 
-    def push_reports(self, cib_old=None, cib_new=None):
-        # No test changes the CIB between load and push. The point is to test
-        # loading and pushing, not editing the CIB.
+    def crm_diff_reports(self, cib_new):
         loaded_cib = self.config.calls.get("runner.cib.load").stdout
         return [
             fixture.debug(
                 report_codes.TMP_FILE_WRITE,
                 file_path=self.tmpfile_old.name,
-                content=(cib_old if cib_old is not None else loaded_cib)
+                content=loaded_cib
             ),
             fixture.debug(
                 report_codes.TMP_FILE_WRITE,
                 file_path=self.tmpfile_new.name,
-                content=(cib_new if cib_new is not None else loaded_cib).strip()
+                content=etree_to_str(cib_new).strip()
             ),
         ]
 
@@ -196,9 +231,17 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.config_load_and_push_diff()
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports())
+
+    def test_get_and_push_crm_diff(self):
+        self.config_load_and_push_crm_diff()
+        env = self.env_assist.get_env()
+
+        cib = env.get_cib()
+        self.reorder_cib(cib)
+        env.push_cib()
+        self.env_assist.assert_reports(self.crm_diff_reports(cib))
 
     def test_get_and_push_cannot_diff(self):
         self.config_load_and_push()
@@ -211,18 +254,33 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
     def test_modified_cib_features_do_not_matter(self):
-        self.config_load_and_push_diff()
+        (self.config
+            .runner.cib.load(filename=self.cib_can_diff)
+            .runner.cib.push_diff(cib_diff="""
+                <diff format="2">
+                    <change operation="modify" path="/cib">
+                        <change-list>
+                            <change-attr name="crm_feature_set"
+                                operation="set" value="3.0.8"
+                            />
+                        </change-list>
+                        <change-result>
+                            <cib validate-with="pacemaker-2.0"
+                                crm_feature_set="3.0.8" update-origin="rh7-3"
+                                update-client="crmd"
+                                cib-last-written="Thu Aug 23 16:49:17 2012"
+                                have-quorum="0" dc-uuid="2"
+                            />
+                        </change-result>
+                    </change>
+                </diff>
+            """)
+        )
         env = self.env_assist.get_env()
 
         cib = env.get_cib()
         cib.set("crm_feature_set", "3.0.8")
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports(
-            cib_new=self.config.calls.get("runner.cib.load").stdout.replace(
-                "3.0.9",
-                "3.0.8"
-            )
-        ))
 
     def test_push_no_features_goes_with_full(self):
         (self.config
@@ -245,12 +303,11 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib()
         # need to use lambda because env.cib is a property
         self.assert_raises_cib_not_loaded(lambda: env.cib)
         env.get_cib()
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_can_get_after_push_cannot_diff(self):
         self.config_load_and_push()
@@ -278,7 +335,7 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         self.mock_write_tmpfile.side_effect = EnvironmentError("test error")
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.reorder_cib(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -291,6 +348,12 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
     def test_diff_is_empty(self):
+        self.config.runner.cib.load(filename=self.cib_can_diff)
+        env = self.env_assist.get_env()
+        env.get_cib()
+        env.push_cib()
+
+    def test_crm_diff_is_empty(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.cib.diff(
@@ -302,9 +365,10 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        cib = env.get_cib()
+        self.reorder_cib(cib)
         env.push_cib()
-        self.env_assist.assert_reports(self.push_reports())
+        self.env_assist.assert_reports(self.crm_diff_reports(cib))
 
     def test_diff_fails(self):
         (self.config
@@ -317,7 +381,8 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        cib = env.get_cib()
+        self.reorder_cib(cib)
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -328,16 +393,19 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             ],
             expected_in_processor=False
         )
-        self.env_assist.assert_reports(self.push_reports())
+        self.env_assist.assert_reports(self.crm_diff_reports(cib))
 
     def test_push_diff_fails(self):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
-            .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
-            .runner.cib.push_diff(stderr="invalid cib", returncode=1)
+            .runner.cib.push_diff(
+                cib_diff=self.cib_diff,
+                stderr="invalid cib",
+                returncode=1
+            )
         )
         env = self.env_assist.get_env()
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         self.env_assist.assert_raise_library_error(
             env.push_cib,
             [
@@ -348,7 +416,6 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             ],
             expected_in_processor=False
         )
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_push_fails(self):
         (self.config
@@ -375,15 +442,13 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         (self.config
             .runner.cib.load(filename=self.cib_can_diff)
             .runner.pcmk.can_wait()
-            .runner.cib.diff(self.tmpfile_old.name, self.tmpfile_new.name)
-            .runner.cib.push_diff()
+            .runner.cib.push_diff(cib_diff=self.cib_diff)
             .runner.pcmk.wait(timeout=self.wait_timeout)
         )
         env = self.env_assist.get_env()
 
-        env.get_cib()
+        self.modify_cib(env.get_cib())
         env.push_cib(wait=self.wait_timeout)
-        self.env_assist.assert_reports(self.push_reports())
 
     def test_wait_cannot_diff(self):
         (self.config
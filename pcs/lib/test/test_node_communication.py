@@ -491,6 +491,13 @@ class CommunicatorLoggerTest(TestCase):
         self.reporter = MockLibraryReportProcessor()
         self.com_logger = lib.LibCommunicatorLogger(self.logger, self.reporter)
 
+    @property
+    def logger_calls(self):
+        return [
+            call for call in self.logger.mock_calls
+            if not call[0].startswith("isEnabledFor")
+        ]
+
     def test_log_request_start(self):
         request = fixture_request()
         self.com_logger.log_request_start(request)
@@ -499,7 +506,69 @@ class CommunicatorLoggerTest(TestCase):
         )
         self.assertEqual(
             [fixture_logger_call_send(request.url, request.data)],
-            self.logger.mock_calls
+            self.logger_calls
+        )
+
+    def test_log_request_start_debug_disabled(self):
+        self.logger.isEnabledFor.return_value = False
+        request = fixture_request()
+        self.com_logger.log_request_start(request)
+        self.reporter.assert_reports(
+            fixture_report_item_list_send(request.url, request.data)
+        )
+        self.assertEqual([], self.logger_calls)
+
+    def test_debug_enabled_logger(self):
+        self.logger.isEnabledFor.return_value = True
+        self.assertTrue(self.com_logger.is_debug_enabled())
+        self.logger.isEnabledFor.assert_called_once_with(logging.DEBUG)
+
+    def test_debug_enabled_reporter(self):
+        self.logger.isEnabledFor.return_value = False
+        self.assertTrue(
+            lib.LibCommunicatorLogger(
+                self.logger, MockLibraryReportProcessor(debug=True)
+            ).is_debug_enabled()
+        )
+
+    def test_debug_disabled(self):
+        self.logger.isEnabledFor.return_value = False
+        self.assertFalse(self.com_logger.is_debug_enabled())
+
+    @mock.patch.object(settings, "debug_payload_max_length", 3)
+    def test_log_response_connected_truncated(self):
+        expected_code = 200
+        response = Response.connection_successful(
+            MockCurlSimple(
+                info={pycurl.RESPONSE_CODE: expected_code},
+                output="data".encode("utf-8"),
+                debug_output="debug".encode("utf-8"),
+                request=fixture_request(),
+            )
+        )
+        self.com_logger.log_response(response)
+        truncated_data = (
+            "dat\n--Debug Output Truncated, 1 characters omitted--"
+        )
+        truncated_debug_data = (
+            "deb\n--Debug Output Truncated, 2 characters omitted--"
+        )
+        self.reporter.assert_reports(
+            fixture_report_item_list_on_success(
+                response.request.url,
+                expected_code,
+                truncated_data,
+                truncated_debug_data
+            )
+        )
+        self.assertEqual(
+            fixture_logger_calls_on_success(
+                response.request.url,
+                expected_code,
+                truncated_data,
+                truncated_debug_data
+            ),
+            self.logger_calls
         )
 
     def test_log_response_connected(self):
@@ -529,7 +598,7 @@ class CommunicatorLoggerTest(TestCase):
             expected_data,
             expected_debug_data
         )
-        self.assertEqual(logger_calls, self.logger.mock_calls)
+        self.assertEqual(logger_calls, self.logger_calls)
 
     @mock.patch("pcs.lib.node_communication.is_proxy_set")
     def test_log_response_not_connected(self, mock_proxy):
@@ -562,7 +631,7 @@ class CommunicatorLoggerTest(TestCase):
                 response.request.url, expected_debug_data
             )
         ]
-        self.assertEqual(logger_calls, self.logger.mock_calls)
+        self.assertEqual(logger_calls, self.logger_calls)
 
     @mock.patch("pcs.lib.node_communication.is_proxy_set")
     def test_log_response_not_connected_with_proxy(self, mock_proxy):
@@ -600,7 +669,7 @@ class CommunicatorLoggerTest(TestCase):
                 response.request.url, expected_debug_data
             )
         ]
-        self.assertEqual(logger_calls, self.logger.mock_calls)
+        self.assertEqual(logger_calls, self.logger_calls)
 
     def test_log_retry(self):
         prev_addr = "addr"
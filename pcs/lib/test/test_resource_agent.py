@@ -1,5 +1,7 @@
 # pylint: disable=too-many-lines
 from functools import partial
+import os
+import tempfile
 from unittest import mock, TestCase
 from lxml import etree
 
@@ -16,6 +18,7 @@ from pcs.test.tools.xml import XmlManipulation
 
 from pcs.common import report_codes
 from pcs.lib import resource_agent as lib_ra
+from pcs.lib.agent_metadata_cache import AgentMetadataCache
 from pcs.lib.errors import ReportItemSeverity as severity, LibraryError
 from pcs.lib.external import CommandRunner
 
@@ -1882,6 +1885,113 @@ class CrmAgentMetadataIsValidAgentTest(TestCase):
         self.assertFalse(self.agent.is_valid_metadata())
 
 
+class CrmAgentDescendantWithFile(CrmAgentDescendant):
+    agent_file = None
+
+    def _get_agent_file(self):
+        return self.agent_file
+
+
+class CrmAgentMetadataCacheTest(TestCase):
+    metadata = "<resource-agent><shortdesc>cached</shortdesc></resource-agent>"
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.agent_file = os.path.join(tmp_dir.name, "agent")
+        self.write_file(self.agent_file, "agent")
+        self.crm_resource = os.path.join(tmp_dir.name, "crm_resource")
+        self.write_file(self.crm_resource, "crm_resource")
+        patcher = patch_agent("settings.crm_resource_binary", self.crm_resource)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cache = AgentMetadataCache(os.path.join(tmp_dir.name, "cache"))
+        lib_ra.CrmAgent.set_metadata_cache(self.cache)
+        self.addCleanup(lib_ra.CrmAgent.set_metadata_cache, None)
+        self.mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        self.mock_runner.run.return_value = (self.metadata, "", 0)
+
+    @staticmethod
+    def write_file(path, content):
+        with open(path, "w") as a_file:
+            a_file.write(content)
+
+    def get_agent(self):
+        agent = CrmAgentDescendantWithFile(self.mock_runner, "TYPE")
+        agent.agent_file = self.agent_file
+        return agent
+
+    def test_metadata_loaded_once(self):
+        for dummy_i in range(2):
+            assert_xml_equal(
+                self.metadata,
+                str(XmlManipulation(self.get_agent()._get_metadata()))
+            )
+        self.mock_runner.run.assert_called_once_with(
+            [self.crm_resource, "--show-metadata", "STANDARD:TYPE"],
+            env_extend={"PATH": "/usr/sbin/:/bin/:/usr/bin/"}
+        )
+
+    def test_agent_updated(self):
+        self.get_agent()._get_metadata()
+        self.write_file(self.agent_file, "updated agent")
+        self.get_agent()._get_metadata()
+        self.assertEqual(2, len(self.mock_runner.run.mock_calls))
+
+    def test_pacemaker_updated(self):
+        self.get_agent()._get_metadata()
+        self.write_file(self.crm_resource, "updated crm_resource")
+        self.get_agent()._get_metadata()
+        self.assertEqual(2, len(self.mock_runner.run.mock_calls))
+
+    def test_failure_not_cached(self):
+        self.mock_runner.run.return_value = ("", "some error", 1)
+        with self.assertRaises(lib_ra.UnableToGetAgentMetadata):
+            self.get_agent()._get_metadata()
+        self.assertIsNone(self.cache.get("STANDARD:TYPE", mock.ANY))
+
+    def test_agent_file_missing(self):
+        os.remove(self.agent_file)
+        for dummy_i in range(2):
+            self.get_agent()._get_metadata()
+        self.assertEqual(2, len(self.mock_runner.run.mock_calls))
+
+    def test_agent_file_unknown(self):
+        for dummy_i in range(2):
+            CrmAgentDescendant(self.mock_runner, "TYPE")._get_metadata()
+        self.assertEqual(2, len(self.mock_runner.run.mock_calls))
+
+
+@patch_agent("settings.ocf_resource_agents_dir", "/ocf")
+@patch_agent("settings.lsb_resource_agents_dir", "/lsb")
+@patch_agent("settings.fence_agent_binaries", "/fence/")
+class GetAgentFile(TestCase):
+    def assert_agent_file(self, agent_class, agent_name, agent_file):
+        self.assertEqual(
+            agent_file,
+            agent_class(mock.Mock(), agent_name)._get_agent_file()
+        )
+
+    def test_ocf(self):
+        self.assert_agent_file(
+            lib_ra.ResourceAgent, "ocf:heartbeat:Dummy", "/ocf/heartbeat/Dummy"
+        )
+
+    def test_lsb(self):
+        self.assert_agent_file(
+            lib_ra.ResourceAgent, "lsb:network", "/lsb/network"
+        )
+
+    def test_systemd(self):
+        self.assert_agent_file(lib_ra.ResourceAgent, "systemd:pcsd", None)
+
+    def test_stonith(self):
+        self.assert_agent_file(
+            lib_ra.StonithAgent, "fence_xvm", "/fence/fence_xvm"
+        )
+
+
 class StonithAgentMetadataGetNameTest(TestCase, ExtendedAssertionsMixin):
     def test_success(self):
         mock_runner = mock.MagicMock(spec_set=CommandRunner)
@@ -1,6 +1,8 @@
 import os
 import tempfile
 
+from pcs import settings
+
 
 def generate_binary_key(random_bytes_count):
     return os.urandom(random_bytes_count)
@@ -58,3 +60,22 @@ def write_tmpfile(data, binary=False):
     tmpfile.write(data)
     tmpfile.flush()
     return tmpfile
+
+def truncate_debug_payload(payload, max_length=None):
+    """
+    Return a debug payload cut to the configured length
+
+    string or bytes payload -- data to be logged or reported, may be None
+    int max_length -- max length of the payload, 0 means no limit, None means
+        settings.debug_payload_max_length
+    """
+    if max_length is None:
+        max_length = settings.debug_payload_max_length
+    if not payload or not max_length or len(payload) <= max_length:
+        return payload
+    note = "\n--Debug Output Truncated, {0} characters omitted--".format(
+        len(payload) - max_length
+    )
+    if isinstance(payload, bytes):
+        return payload[:max_length] + note.encode()
+    return payload[:max_length] + note
@@ -49,10 +49,9 @@ def node_attribute_cmd(lib, argv, modifiers):
     """
     Options:
       * -f - CIB file (in lib wrapper)
-      * --force - allows not unique recipient values
+      * --force - no error if attribute to delete doesn't exist
       * --name - specify attribute name to filter out
     """
-    del lib
     modifiers.ensure_only_supported("-f", "--force", "--name")
     if modifiers.get("--name") and len(argv) > 1:
         raise CmdLineInputError()
@@ -61,8 +60,16 @@ def node_attribute_cmd(lib, argv, modifiers):
     elif len(argv) == 1:
         attribute_show_cmd(argv.pop(0), filter_attr=modifiers.get("--name"))
     else:
-        # --force is used only when setting attributes
-        attribute_set_cmd(argv.pop(0), argv)
+        node_options = prepare_node_options(argv)
+        if len(node_options) > 1:
+            lib.node.update_attributes(
+                attributes=node_options,
+                allow_remove_nonexistent=modifiers.get("--force"),
+            )
+        else:
+            # A single node is set by crm_attribute, pcsd relies on its exit
+            # codes.
+            attribute_set_cmd(argv.pop(0), argv)
 
 def node_utilization_cmd(lib, argv, modifiers):
     """
@@ -70,7 +77,6 @@ def node_utilization_cmd(lib, argv, modifiers):
       * -f - CIB file (in lib wrapper)
       * --name - specify attribute name to filter out
     """
-    del lib
     modifiers.ensure_only_supported("-f", "--name")
     if modifiers.get("--name") and len(argv) > 1:
         raise CmdLineInputError()
@@ -79,7 +85,39 @@ def node_utilization_cmd(lib, argv, modifiers):
     elif len(argv) == 1:
         print_node_utilization(argv.pop(0), filter_name=modifiers.get("--name"))
     else:
-        set_node_utilization(argv.pop(0), argv)
+        node_options = prepare_node_options(argv)
+        if len(node_options) > 1:
+            lib.node.update_attributes(utilization=node_options)
+        else:
+            set_node_utilization(argv.pop(0), argv)
+
+def prepare_node_options(argv):
+    """
+    Return {node name: {name: value}} from "<node> <name>=<value>..." groups
+
+    The first argument is a node name, each following argument without '=' is
+    a name of the next node.
+
+    Commandline options: no options
+    """
+    node_args = {argv[0]: []}
+    node_name = argv[0]
+    for arg in argv[1:]:
+        if "=" in arg:
+            node_args[node_name].append(arg)
+            continue
+        if arg in node_args:
+            raise CmdLineInputError(
+                "Node '{0}' specified more than once".format(arg)
+            )
+        node_name = arg
+        node_args[node_name] = []
+    if not all(node_args.values()):
+        raise CmdLineInputError()
+    return {
+        node_name: prepare_options(arg_list)
+        for node_name, arg_list in node_args.items()
+    }
 
 def node_maintenance_cmd(lib, argv, modifiers, enable):
     """
@@ -1,3 +1,4 @@
+import os
 import sys
 import json
 import logging
@@ -19,29 +20,43 @@ SUPPORTED_COMMANDS = {
     "cluster.remove_nodes",
 }
 
+# When started with --worker, pcs_internal stays alive and processes one
+# request per line read from stdin. Each response is written as one line of
+# json to the original stdout.
+WORKER_MODE_ARG = "--worker"
 
-def _exit(status, status_msg=None, report_list=None, data=None):
-    json.dump(
-        dict(
-            status=status,
-            status_msg=status_msg,
-            report_list=report_list or [],
-            data=data,
-        ),
-        sys.stdout
+
+class _InputError(Exception):
+    pass
+
+
+def _output(status, status_msg=None, report_list=None, data=None):
+    return dict(
+        status=status,
+        status_msg=status_msg,
+        report_list=report_list or [],
+        data=data,
     )
+
+
+def _exit(status, status_msg=None, report_list=None, data=None):
+    json.dump(_output(status, status_msg, report_list, data), sys.stdout)
     sys.exit(0)
 
 
-def get_cli_env(options):
+def get_cli_env(options, user_groups=None):
+    """
+    dict options -- options of the request
+    tuple user_groups -- user and groups to run the command as, read from the
+        environment if not specified
+    """
     env = Env()
-    env.user, env.groups = utils.get_cib_user_groups()
+    env.user, env.groups = user_groups or utils.get_cib_user_groups()
     env.known_hosts_getter = utils.read_known_hosts_file
-    # Debug messages always go to the processor. The parameter only affects if
-    # they will be printed to stdout. We are not printing the messages. Instead
-    # we get all the messages the processor got. So the value of the parameter
-    # does not matter.
-    env.report_processor = LibraryReportProcessor(True)
+    # We are not printing the messages. Instead we get all the messages the
+    # processor got. Debug messages are dropped by pcsd anyway and they may
+    # carry big payloads (e.g. whole CIBs), so they are not collected at all.
+    env.report_processor = LibraryReportProcessor(False)
     env.request_timeout = (
         options.get("request_timeout") or settings.default_request_timeout
     )
@@ -49,10 +64,15 @@ def get_cli_env(options):
 
 
 class LibraryReportProcessor(LibraryReportProcessorToConsole):
-    processed_items = []
-    def _send(self, report_item_list, print_errors=True):
+    def __init__(self, debug=False):
+        super().__init__(debug)
+        self.processed_items = []
 
-        self.processed_items.extend(report_item_list)
+    def _send(self, report_item_list, print_errors=True):
+        self.processed_items.extend([
+            report for report in report_item_list
+            if self.debug or report.severity != ReportItemSeverity.DEBUG
+        ])
         return [
             report
             for report in report_item_list
@@ -71,26 +91,28 @@ def report_item_to_dict(report_item):
         report_text=build_report_message(report_item),
     )
 
-def main():
-    # pylint: disable=broad-except
-    argv = sys.argv[1:]
-    if argv:
-        _exit("input_error", status_msg="No arguments allowed")
-
-    utils.subprocess_setup()
-    logging.basicConfig()
+def process_request(input_data, user_groups=None):
+    """
+    Run a library command and return its result
 
+    dict input_data -- command, its data and options
+    tuple user_groups -- user and groups to run the command as, read from the
+        environment if not specified
+    """
+    # pylint: disable=broad-except
+    cli_env = None
     try:
-        input_data = json.load(sys.stdin)
-        cli_env = get_cli_env(input_data.get("options", {}))
+        if not isinstance(input_data, dict):
+            raise _InputError("Input data must be an object")
+        cli_env = get_cli_env(input_data.get("options", {}), user_groups)
         lib = Library(cli_env, utils.get_middleware_factory())
         cmd = input_data["cmd"]
         if cmd not in SUPPORTED_COMMANDS:
-            _exit("unknown_cmd", status_msg=f"Unknown command '{cmd}'")
+            return _output("unknown_cmd", status_msg=f"Unknown command '{cmd}'")
         for sub_cmd in cmd.split("."):
             lib = getattr(lib, sub_cmd)
         output_data = lib(**input_data["cmd_data"])
-        _exit(
+        return _output(
             "success",
             report_list=export_reports(
                 cli_env.report_processor.processed_items
@@ -98,16 +120,85 @@ def main():
             data=output_data,
         )
     except LibraryError as e:
-        _exit(
+        return _output(
             "error",
             report_list=export_reports(
                 cli_env.report_processor.processed_items + list(e.args)
             ),
         )
-    except json.JSONDecodeError as e:
-        _exit("input_error", status_msg=f"Unable to parse input data: {e.msg}")
+    except _InputError as e:
+        return _output("input_error", status_msg=str(e))
     except KeyError as e:
-        _exit("input_error", status_msg=f"Missing key {e}")
+        return _output("input_error", status_msg=f"Missing key {e}")
     except Exception as e:
         # TODO: maybe add traceback?
-        _exit("exception", status_msg=str(e))
+        return _output("exception", status_msg=str(e))
+
+def _get_request_user_groups(input_data):
+    # A worker serves requests of various users, so pcsd sends the user in
+    # each request instead of setting it in the environment. It is trusted
+    # the same way the environment is.
+    if os.geteuid() != 0 or not isinstance(input_data, dict):
+        return None, None
+    options = input_data.get("options")
+    if not isinstance(options, dict):
+        return None, None
+    user = options.get("cib_user") or None
+    groups = options.get("cib_user_groups") or None
+    return user, groups
+
+def process_request_json(request_json):
+    """
+    Run a library command specified by a serialized request and return
+    a serialized result
+
+    string request_json -- serialized command, its data and options
+    """
+    try:
+        input_data = json.loads(request_json)
+    except json.JSONDecodeError as e:
+        response = _output(
+            "input_error", status_msg=f"Unable to parse input data: {e.msg}"
+        )
+    else:
+        response = process_request(
+            input_data, _get_request_user_groups(input_data)
+        )
+    return json.dumps(response)
+
+def run_worker(input_stream, response_stream):
+    """
+    Process requests, one per line, until the end of the input
+
+    file input_stream -- stream of serialized requests
+    file response_stream -- stream to write serialized results to
+    """
+    for request_json in input_stream:
+        if not request_json.strip():
+            continue
+        # Known hosts and others may have changed since the previous request.
+        utils.clear_run_caches()
+        response_stream.write(process_request_json(request_json) + "\n")
+        response_stream.flush()
+
+def main():
+    argv = sys.argv[1:]
+    if argv and argv != [WORKER_MODE_ARG]:
+        _exit("input_error", status_msg="No arguments allowed")
+
+    utils.subprocess_setup()
+    logging.basicConfig()
+
+    if argv:
+        # Anything else printed by the library goes to stderr so it cannot
+        # corrupt the responses.
+        response_stream = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        run_worker(sys.stdin, response_stream)
+        return
+
+    try:
+        input_data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        _exit("input_error", status_msg=f"Unable to parse input data: {e.msg}")
+    json.dump(process_request(input_data), sys.stdout)
@@ -106,6 +106,8 @@ def resource_cmd(lib, argv, modifiers):
             resource_providers(lib, argv_next, modifiers)
         elif sub_cmd == "agents":
             resource_agents(lib, argv_next, modifiers)
+        elif sub_cmd == "metadata-cache":
+            resource_metadata_cache(lib, argv_next, modifiers)
         elif sub_cmd == "update":
             resource_update(lib, argv_next, modifiers)
         elif sub_cmd == "meta":
@@ -204,7 +206,7 @@ def resource_defaults_cmd(lib, argv, modifiers):
     """
     modifiers.ensure_only_supported("-f")
     if not argv:
-        print("\n".join(show_defaults(utils.get_cib_dom(), "rsc_defaults")))
+        print("\n".join(show_defaults(utils.get_cib_etree(), "rsc_defaults")))
     else:
         lib.cib_options.set_resources_defaults(
             prepare_options(argv)
@@ -218,7 +220,7 @@ def resource_op_defaults_cmd(lib, argv, modifiers):
     """
     modifiers.ensure_only_supported("-f")
     if not argv:
-        print("\n".join(show_defaults(utils.get_cib_dom(), "op_defaults")))
+        print("\n".join(show_defaults(utils.get_cib_etree(), "op_defaults")))
     else:
         lib.cib_options.set_operations_defaults(
             prepare_options(argv)
@@ -293,14 +295,17 @@ def resource_list_available(lib, argv, modifiers):
     """
     Options:
       * --nodesc - don't display description
+      * --jobs - number of agents described at once
     """
-    modifiers.ensure_only_supported("--nodesc")
+    modifiers.ensure_only_supported("--nodesc", "--jobs")
     if len(argv) > 1:
         raise CmdLineInputError()
 
     search = argv[0] if argv else None
     agent_list = lib.resource_agent.list_agents(
-        not modifiers.get("--nodesc"), search
+        not modifiers.get("--nodesc"),
+        search,
+        _get_agent_list_max_workers(modifiers),
     )
 
     if not agent_list:
@@ -323,6 +328,23 @@ def resource_list_available(lib, argv, modifiers):
             print(name)
 
 
+def _get_agent_list_max_workers(modifiers):
+    """
+    Options:
+      * --jobs - number of agents described at once
+    """
+    jobs = modifiers.get("--jobs")
+    if jobs is None:
+        return None
+    if not utils.is_int(jobs) or int(jobs) < 1:
+        raise CmdLineInputError(
+            "'{0}' is not a valid --jobs value, use a positive integer".format(
+                jobs
+            )
+        )
+    return int(jobs)
+
+
 def resource_list_options(lib, argv, modifiers):
     """
     Options:
@@ -913,6 +935,20 @@ def resource_agents(lib, argv, modifiers):
             " for {0}".format(argv[0]) if argv else ""
         ))
 
+def resource_metadata_cache(lib, argv, modifiers):
+    """
+    Options: no options
+    """
+    modifiers.ensure_only_supported()
+    if len(argv) != 1:
+        raise CmdLineInputError()
+    if argv[0] == "clear":
+        lib.resource_agent.clear_metadata_cache()
+    elif argv[0] == "warm-up":
+        lib.resource_agent.warm_up_metadata_cache()
+    else:
+        raise CmdLineInputError()
+
 # Update a resource, removing any args that are empty and adding/updating
 # args that are not empty
 def resource_update(lib, args, modifiers, deal_with_guest_change=True):
@@ -1689,8 +1725,14 @@ def resource_remove_cmd(lib, argv, modifiers):
         raise CmdLineInputError()
     resource_remove(argv[0])
 
-def resource_remove(resource_id, output=True, is_remove_remote_context=False):
+def resource_remove(
+    resource_id, output=True, is_remove_remote_context=False,
+    remove_references=True
+):
     """
+    bool remove_references -- False if constraints, fencing levels and acl
+        permissions referencing the resource have been already removed
+
     Commandline options:
       * -f - CIB file
       * --force - don't stop a resource before its deletion
@@ -1809,8 +1851,20 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
                 if retval != 0 and output:
                     msg.append("\n" + output)
                 utils.err("\n".join(msg).strip())
-        for res in group_dom.documentElement.getElementsByTagName("primitive"):
-            resource_remove(res.getAttribute("id"))
+        member_id_list = [
+            res.getAttribute("id")
+            for res in group_dom.documentElement.getElementsByTagName(
+                "primitive"
+            )
+        ]
+        # references of all the resources are removed using one CIB snapshot
+        utils.replace_cib_configuration(
+            remove_resources_references(
+                utils.get_cib_dom(), member_id_list, output=True
+            )
+        )
+        for res_id in member_id_list:
+            resource_remove(res_id, remove_references=False)
         sys.exit(0)
 
     # now we know resource is not a group, a clone, a master nor a bundle
@@ -1862,9 +1916,10 @@ def resource_remove(resource_id, output=True, is_remove_remote_context=False):
             utils.err("\n".join(msg).strip())
         print("Stopped")
 
-    utils.replace_cib_configuration(
-        remove_resource_references(utils.get_cib_dom(), resource_id, output)
-    )
+    if remove_references:
+        utils.replace_cib_configuration(
+            remove_resource_references(utils.get_cib_dom(), resource_id, output)
+        )
     dom = utils.get_cib_dom()
     resource_el = utils.dom_get_resource(dom, resource_id)
     remote_node_name = None
@@ -2006,6 +2061,18 @@ def remove_resource_references(
     lib_acl.dom_remove_permissions_referencing(dom, resource_id)
     return dom
 
+def remove_resources_references(dom, resource_id_list, output=False):
+    """
+    Commandline options: no options
+    """
+    constraint.remove_constraints_containing_resources(
+        resource_id_list, output, passed_dom=dom
+    )
+    for resource_id in resource_id_list:
+        stonith_level_rm_device(dom, resource_id)
+        lib_acl.dom_remove_permissions_referencing(dom, resource_id)
+    return dom
+
 # This removes a resource from a group, but keeps it in the config
 def resource_group_rm(cib_dom, group_name, resource_ids):
     """
@@ -2668,19 +2735,18 @@ def resource_failcount_show(lib, resource, node, operation, interval, full):
                 result_lines.append(f"  {current_node}: {failcount}")
     return "\n".join(result_lines)
 
-def show_defaults(cib_dom, def_type):
+def show_defaults(cib, def_type):
     """
     Commandline options: no options
     """
-    defs = cib_dom.getElementsByTagName(def_type)
-    if not defs:
+    defs = cib.find(f".//{def_type}")
+    if defs is None:
         return ["No defaults set"]
-    defs = defs[0]
 
     # TODO duplicite to _nvpairs_strings
     key_val = {
-        nvpair.getAttribute("name"): nvpair.getAttribute("value")
-        for nvpair in defs.getElementsByTagName("nvpair")
+        nvpair.get("name", ""): nvpair.get("value", "")
+        for nvpair in defs.iterfind(".//nvpair")
     }
     if not key_val:
         return ["No defaults set"]
@@ -1,5 +1,4 @@
 import re
-import xml.dom.minidom
 
 from pcs import utils
 
@@ -114,60 +113,58 @@ class ExportDetailed:
 
     def list_rule(self, rule):
         rule_parts = ["Rule: %s" % " ".join(self._list_attributes(rule))]
-        for child in rule.childNodes:
-            if child.nodeType == xml.dom.minidom.Node.TEXT_NODE:
-                continue
-            if child.tagName == "expression":
+        for child in rule.iterchildren("expression", "date_expression", "rule"):
+            if child.tag == "expression":
                 self.indent_append(rule_parts, self.list_expression(child))
-            elif child.tagName == "date_expression":
+            elif child.tag == "date_expression":
                 self.indent_append(rule_parts, self.list_date_expression(child))
-            elif child.tagName == "rule":
+            elif child.tag == "rule":
                 self.indent_append(rule_parts, self.list_rule(child))
         return rule_parts
 
     def list_expression(self, expression):
-        if "value" in expression.attributes.keys():
+        if "value" in expression.attrib:
             exp_parts = [
-                expression.getAttribute("attribute"),
-                expression.getAttribute("operation")
+                expression.get("attribute", ""),
+                expression.get("operation", "")
             ]
-            if expression.hasAttribute("type"):
-                exp_parts.append(expression.getAttribute("type"))
-            exp_parts.append(expression.getAttribute("value"))
+            if "type" in expression.attrib:
+                exp_parts.append(expression.get("type", ""))
+            exp_parts.append(expression.get("value", ""))
         else:
             exp_parts = [
-                expression.getAttribute("operation"),
-                expression.getAttribute("attribute")
+                expression.get("operation", ""),
+                expression.get("attribute", "")
             ]
         if self.show_detail:
-            exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+            exp_parts.append(" (id:%s)" % expression.get("id", ""))
         return ["Expression: %s" % " ".join(exp_parts)]
 
     def list_date_expression(self, expression):
-        operation = expression.getAttribute("operation")
+        operation = expression.get("operation", "")
         if operation == "date_spec":
             date_spec_parts = self._list_attributes(
-                expression.getElementsByTagName("date_spec")[0]
+                expression.find(".//date_spec")
             )
             exp_parts = ["Expression:"]
             if self.show_detail:
-                exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+                exp_parts.append(" (id:%s)" % expression.get("id", ""))
             return self.indent_append(
                 [" ".join(exp_parts)],
                 ["Date Spec: %s" % " ".join(date_spec_parts)]
             )
         if operation == "in_range":
             exp_parts = ["date", "in_range"]
-            if expression.hasAttribute("start"):
-                exp_parts.extend([expression.getAttribute("start"), "to"])
-            if expression.hasAttribute("end"):
-                exp_parts.append(expression.getAttribute("end"))
-            durations = expression.getElementsByTagName("duration")
+            if "start" in expression.attrib:
+                exp_parts.extend([expression.get("start", ""), "to"])
+            if "end" in expression.attrib:
+                exp_parts.append(expression.get("end", ""))
+            durations = expression.findall(".//duration")
             if durations:
                 exp_parts.append("duration")
                 duration_parts = self._list_attributes(durations[0])
             if self.show_detail:
-                exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+                exp_parts.append(" (id:%s)" % expression.get("id", ""))
             result = ["Expression: %s" % " ".join(exp_parts)]
             if durations:
                 self.indent_append(
@@ -175,19 +172,19 @@ class ExportDetailed:
                     ["Duration: %s" % " ".join(duration_parts)]
                 )
             return result
-        exp_parts = ["date", expression.getAttribute("operation")]
-        if expression.hasAttribute("start"):
-            exp_parts.append(expression.getAttribute("start"))
-        if expression.hasAttribute("end"):
-            exp_parts.append(expression.getAttribute("end"))
+        exp_parts = ["date", expression.get("operation", "")]
+        if "start" in expression.attrib:
+            exp_parts.append(expression.get("start", ""))
+        if "end" in expression.attrib:
+            exp_parts.append(expression.get("end", ""))
         if self.show_detail:
-            exp_parts.append(" (id:%s)" % expression.getAttribute("id"))
+            exp_parts.append(" (id:%s)" % expression.get("id", ""))
         return ["Expression: " + " ".join(exp_parts)]
 
     def _list_attributes(self, element):
         attributes = utils.dom_attrs_to_list(element, with_id=False)
         if self.show_detail:
-            attributes.append(" (id:%s)" % (element.getAttribute("id")))
+            attributes.append(" (id:%s)" % (element.get("id", "")))
         return attributes
 
     @staticmethod
@@ -206,65 +203,63 @@ class ExportAsExpression:
         return self.string_rule(rule)
 
     def string_rule(self, rule):
-        boolean_op = rule.getAttribute("boolean-op") or "or"
+        boolean_op = rule.get("boolean-op") or "or"
         rule_parts = []
-        for child in rule.childNodes:
-            if child.nodeType == xml.dom.minidom.Node.TEXT_NODE:
-                continue
-            if child.tagName == "expression":
+        for child in rule.iterchildren("expression", "date_expression", "rule"):
+            if child.tag == "expression":
                 rule_parts.append(self.string_expression(child))
-            elif child.tagName == "date_expression":
+            elif child.tag == "date_expression":
                 rule_parts.append(self.string_date_expression(child))
-            elif child.tagName == "rule":
+            elif child.tag == "rule":
                 rule_parts.append("(%s)" % self.string_rule(child))
         if self.normalize:
             rule_parts.sort()
         return (" %s " % boolean_op).join(rule_parts)
 
     def string_expression(self, expression):
-        if "value" in expression.attributes.keys():
+        if "value" in expression.attrib:
             exp_parts = [
-                expression.getAttribute("attribute"),
-                expression.getAttribute("operation")
+                expression.get("attribute", ""),
+                expression.get("operation", "")
             ]
-            if expression.hasAttribute("type"):
-                exp_parts.append(expression.getAttribute("type"))
+            if "type" in expression.attrib:
+                exp_parts.append(expression.get("type", ""))
             elif self.normalize:
                 exp_parts.append("string")
-            value = expression.getAttribute("value")
+            value = expression.get("value", "")
             if " " in value:
                 value = '"%s"' % value
             exp_parts.append(value)
         else:
             exp_parts = [
-                expression.getAttribute("operation"),
-                expression.getAttribute("attribute")
+                expression.get("operation", ""),
+                expression.get("attribute", "")
             ]
         return " ".join(exp_parts)
 
     def string_date_expression(self, expression):
-        operation = expression.getAttribute("operation")
+        operation = expression.get("operation", "")
         if operation == "date_spec":
             exp_parts = ["date-spec"] + self._list_attributes(
-                expression.getElementsByTagName("date_spec")[0]
+                expression.find(".//date_spec")
             )
             return " ".join(exp_parts)
         if operation == "in_range":
             exp_parts = ["date", "in_range"]
-            if expression.hasAttribute("start"):
-                exp_parts.extend([expression.getAttribute("start"), "to"])
-            if expression.hasAttribute("end"):
-                exp_parts.append(expression.getAttribute("end"))
-            durations = expression.getElementsByTagName("duration")
+            if "start" in expression.attrib:
+                exp_parts.extend([expression.get("start", ""), "to"])
+            if "end" in expression.attrib:
+                exp_parts.append(expression.get("end", ""))
+            durations = expression.findall(".//duration")
             if durations:
                 exp_parts.append("duration")
                 exp_parts.extend(self._list_attributes(durations[0]))
             return " ".join(exp_parts)
-        exp_parts = ["date", expression.getAttribute("operation")]
-        if expression.hasAttribute("start"):
-            exp_parts.append(expression.getAttribute("start"))
-        if expression.hasAttribute("end"):
-            exp_parts.append(expression.getAttribute("end"))
+        exp_parts = ["date", expression.get("operation", "")]
+        if "start" in expression.attrib:
+            exp_parts.append(expression.get("start", ""))
+        if "end" in expression.attrib:
+            exp_parts.append(expression.get("end", ""))
         return " ".join(exp_parts)
 
     @staticmethod
@@ -38,6 +38,10 @@ crm_report = os.path.join(pacemaker_binaries, "crm_report")
 crm_verify = os.path.join(pacemaker_binaries, "crm_verify")
 cibadmin = os.path.join(pacemaker_binaries, "cibadmin")
 crm_mon_schema = '/usr/share/pacemaker/crm_mon.rng'
+# How cluster state provided by crm_mon is validated against crm_mon_schema:
+# "full" - every state, "sampled" - only the first state loaded by a pcs
+# process, "off" - no validation
+crm_mon_state_validation = "full"
 agent_metadata_schema = "/usr/share/resource-agents/ra-api-1.dtd"
 pcsd_cert_location = "/var/lib/pcsd/pcsd.crt"
 pcsd_key_location = "/var/lib/pcsd/pcsd.key"
@@ -60,6 +64,38 @@ pacemaker_wait_timeout_status = 124
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# How many requests to other nodes an asynchronous node communicator runs at
+# once. Set it to 0 to run all requests at once.
+node_communication_max_parallel_requests = 0
+# How long pcsd waits for pacemaker to start on its node when handling one
+# request of a node waiting for the cluster to start, in seconds. Pcsd limits it
+# to its pcsd_pacemaker_start_wait_max_timeout.
+pacemaker_start_wait_request_timeout = 30
+# Initial and maximal interval in seconds between checks of pacemaker status on
+# nodes which cannot wait for pacemaker to start. The interval doubles after
+# each check.
+pacemaker_start_check_interval = 2
+pacemaker_start_check_max_interval = 32
+# Debug output of external processes and of node communication is cut to this
+# many characters in logs and debug reports. Set it to 0 to keep it whole.
+debug_payload_max_length = 0
+# Bash completion tree built from pcs usage is cached in this file. It is
+# rebuilt when pcs usage is newer than the file.
+pcs_completion_tree_file = os.path.join(
+    os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    ),
+    "pcs",
+    "completion_tree.json",
+)
+# Metadata of resource and stonith agents are cached in this directory. Cached
+# metadata are used until the agent or pacemaker is updated.
+agent_metadata_cache_dir = "/var/lib/pcsd/agent_metadata_cache"
+ocf_resource_agents_dir = "/usr/lib/ocf/resource.d"
+lsb_resource_agents_dir = "/etc/init.d"
+# Maximal number of agents whose metadata are loaded at once when listing
+# agents. Set it to 1 to load metadata one by one.
+agent_metadata_max_workers = 8
 pcs_bundled_dir = "/usr/lib/pcs/bundled/"
 pcs_bundled_pacakges_dir = os.path.join(pcs_bundled_dir, "packages")
 
@@ -85,3 +121,21 @@ pcsd_gem_path = "vendor/bundle/ruby"
 ruby_executable = "/usr/bin/ruby"
 
 gui_session_lifetime_seconds = 60 * 60
+# Number of long-lived ruby processes handling pcsd requests. Set it to 0 to
+# run a new ruby process for each request.
+pcsd_ruby_workers = 4
+# A ruby worker is replaced by a new one after it has served so many requests.
+# Set it to 0 to keep workers running for the whole pcsd lifetime.
+pcsd_ruby_worker_max_requests = 500
+# Requests are refused when so many requests are waiting for a free ruby
+# worker. Set it to 0 to never refuse requests.
+pcsd_ruby_worker_max_waiting_requests = 100
+# Longest time pcsd waits for pacemaker to start on its node when handling one
+# request, in seconds. The waiting is done out of ruby workers, pacemaker status
+# is checked by a ruby worker every pcsd_pacemaker_start_check_interval seconds.
+pcsd_pacemaker_start_wait_max_timeout = 60
+pcsd_pacemaker_start_check_interval = 0.5
+# Number of processes authenticating users in pcsd
+pcsd_auth_workers = 2
+# How many seconds pcsd remembers groups of a user
+pcsd_auth_groups_cache_ttl_seconds = 10
@@ -0,0 +1,309 @@
+"""
+Status of a cluster for the SNMP agent
+
+The status is built from one crm_mon snapshot and the corosync runtime status
+without starting pcsd, so it can be gathered often.
+"""
+from collections import namedtuple
+import logging
+import re
+
+from lxml import etree
+
+from pcs import settings, utils
+from pcs.common.tools import xml_fromstring
+from pcs.lib.corosync import config_parser as corosync_conf_parser
+from pcs.lib.corosync.config_facade import ConfigFacade
+from pcs.lib.pacemaker.values import is_true
+
+logger = logging.getLogger("pcs.snmp.cluster_status")
+logger.addHandler(logging.NullHandler())
+
+
+RESOURCE_RUNNING = "running"
+RESOURCE_DISABLED = "disabled"
+RESOURCE_FAILED = "failed"
+RESOURCE_BLOCKED = "blocked"
+
+NODE_ONLINE = "online"
+NODE_STANDBY = "standby"
+NODE_MAINTENANCE = "maintenance"
+NODE_OFFLINE = "offline"
+
+ClusterStatus = namedtuple(
+    "ClusterStatus",
+    [
+        "cluster_name",
+        "quorate",
+        "node_list",
+        "corosync_online",
+        "corosync_offline",
+        "pacemaker_online",
+        "pacemaker_standby",
+        "pacemaker_offline",
+        "node_status_list",
+        "resource_status_list",
+    ]
+)
+
+NodeStatus = namedtuple(
+    "NodeStatus", ["name", "corosync_online", "pacemaker", "resources_running"]
+)
+
+ResourceStatus = namedtuple("ResourceStatus", ["id", "status", "node_list"])
+
+# Snapshot of everything the status is built from. The status is rebuilt only
+# when the snapshot changes.
+_Snapshot = namedtuple(
+    "_Snapshot",
+    ["corosync_conf", "corosync_online", "crm_mon_xml"]
+)
+
+# 7 == OCF_NOT_RUNNING == The resource is safely stopped (monitor only).
+# 8 == OCF_RUNNING_MASTER == The resource is running in master mode.
+# 193 == PCMK_OCF_UNKNOWN == The resource operation is still in progress.
+_OCF_NOT_RUNNING = 7
+_IGNORED_FAILURE_EXITCODES = {8, 193}
+_OP_KEY_RE = re.compile(r"^(.+?)_(migrate_to|migrate_from|[^_]+)_(\d+)$")
+# The time of the crm_mon run changes with each snapshot.
+_LAST_UPDATE_RE = re.compile(r"<last_update\s[^>]*/>")
+
+
+class ClusterStatusCollector:
+    """
+    Gather status of the cluster and reuse it while the cluster does not change
+    """
+    def __init__(self):
+        self._snapshot = None
+        self._status = None
+
+    def collect(self):
+        """
+        Return the status of the cluster and whether it has changed since
+        the last call
+        """
+        snapshot = _get_snapshot()
+        if self._status is not None and snapshot == self._snapshot:
+            return self._status, False
+        self._status = build_cluster_status(
+            _get_corosync_conf_facade(snapshot.corosync_conf),
+            snapshot.corosync_online,
+            snapshot.crm_mon_xml,
+        )
+        self._snapshot = snapshot
+        return self._status, True
+
+
+def _get_snapshot():
+    try:
+        with open(settings.corosync_conf_file) as conf_file:
+            corosync_conf = conf_file.read()
+    except EnvironmentError as e:
+        logger.debug("Unable to read corosync.conf: %s", e)
+        corosync_conf = None
+    crm_mon_xml, retval = utils.run(
+        ["crm_mon", "--one-shot", "--as-xml", "--inactive"],
+        ignore_stderr=True
+    )
+    if retval != 0:
+        logger.debug("Unable to get cluster status from crm_mon")
+        crm_mon_xml = None
+    else:
+        crm_mon_xml = _LAST_UPDATE_RE.sub("", crm_mon_xml)
+    return _Snapshot(
+        corosync_conf,
+        tuple(sorted(utils.getCorosyncActiveNodes())),
+        crm_mon_xml,
+    )
+
+
+def _get_corosync_conf_facade(corosync_conf):
+    if corosync_conf is None:
+        return None
+    try:
+        return ConfigFacade.from_string(corosync_conf)
+    except corosync_conf_parser.CorosyncConfParserException as e:
+        logger.error("Unable to parse corosync.conf: %s", e)
+        return None
+
+
+def build_cluster_status(corosync_conf_facade, corosync_online, crm_mon_xml):
+    """
+    Return ClusterStatus
+
+    ConfigFacade corosync_conf_facade -- corosync.conf, None if not available
+    iterable corosync_online -- names of nodes online in corosync
+    string crm_mon_xml -- output of crm_mon --as-xml, None if not available
+    """
+    cluster_name = ""
+    corosync_nodes = []
+    if corosync_conf_facade:
+        cluster_name = corosync_conf_facade.get_cluster_name()
+        corosync_nodes = corosync_conf_facade.get_nodes_names()
+    corosync_online = sorted(corosync_online)
+    corosync_offline = sorted(
+        set(corosync_nodes) - set(corosync_online)
+    )
+
+    crm_mon = None
+    if crm_mon_xml:
+        try:
+            crm_mon = xml_fromstring(crm_mon_xml)
+        except etree.XMLSyntaxError as e:
+            logger.error("Unable to parse crm_mon output: %s", e)
+
+    pacemaker_nodes = []
+    resource_status_list = []
+    quorate = False
+    if crm_mon is not None:
+        quorate = crm_mon.find(
+            "./summary/current_dc[@with_quorum='true']"
+        ) is not None
+        pacemaker_nodes = [
+            node for node in crm_mon.findall("./nodes/node")
+            if node.get("type") != "remote"
+        ]
+        resource_status_list = _get_resource_status_list(crm_mon)
+
+    pacemaker_status = {
+        node.get("name"): _get_node_status(node) for node in pacemaker_nodes
+    }
+    pacemaker_online = [
+        name for name, status in pacemaker_status.items()
+        if status in (NODE_ONLINE, NODE_MAINTENANCE)
+    ]
+    pacemaker_standby = [
+        name for name, status in pacemaker_status.items()
+        if status == NODE_STANDBY
+    ]
+    pacemaker_offline = [
+        name for name, status in pacemaker_status.items()
+        if status == NODE_OFFLINE
+    ]
+
+    node_list = _unique(
+        corosync_online + corosync_offline
+        + pacemaker_online + pacemaker_offline + pacemaker_standby
+    )
+    resources_running = {
+        node.get("name"): int(node.get("resources_running", 0))
+        for node in pacemaker_nodes
+    }
+    node_status_list = [
+        NodeStatus(
+            name,
+            name in corosync_online,
+            pacemaker_status.get(name, ""),
+            resources_running.get(name, 0),
+        )
+        for name in node_list
+    ]
+
+    return ClusterStatus(
+        cluster_name=cluster_name,
+        quorate=quorate,
+        node_list=node_list,
+        corosync_online=corosync_online,
+        corosync_offline=corosync_offline,
+        pacemaker_online=pacemaker_online,
+        pacemaker_standby=pacemaker_standby,
+        pacemaker_offline=pacemaker_offline,
+        node_status_list=node_status_list,
+        resource_status_list=resource_status_list,
+    )
+
+
+def _unique(item_list):
+    return list(dict.fromkeys(item_list))
+
+
+def _get_node_status(node):
+    if not is_true(node.get("online", "")):
+        return NODE_OFFLINE
+    if is_true(node.get("standby", "")):
+        return NODE_STANDBY
+    if is_true(node.get("maintenance", "")):
+        return NODE_MAINTENANCE
+    return NODE_ONLINE
+
+
+def _get_primitive_id(resource_id):
+    # clone instances are distinguished by a suffix ':number'
+    return resource_id.split(":")[0]
+
+
+def _get_failed_primitive_ids(crm_mon):
+    failed_ids = set()
+    for failure in crm_mon.findall("./failures/failure"):
+        match = _OP_KEY_RE.match(failure.get("op_key", ""))
+        if not match:
+            continue
+        resource_id, task, _ = match.groups()
+        try:
+            exitcode = int(failure.get("exitcode", ""))
+        except ValueError:
+            exitcode = None
+        if (
+            exitcode in _IGNORED_FAILURE_EXITCODES
+            or
+            (task == "monitor" and exitcode == _OCF_NOT_RUNNING)
+        ):
+            continue
+        failed_ids.add(_get_primitive_id(resource_id))
+    return failed_ids
+
+
+def _is_disabled(resource):
+    if resource.get("resource_agent", "").startswith("stonith:"):
+        return False
+    element = resource
+    # target role of groups and clones is inherited by their primitives
+    while element is not None and element.tag != "resources":
+        if element.get("target_role", "").lower() == "stopped":
+            return True
+        element = element.getparent()
+    return False
+
+
+def _get_resource_status_list(crm_mon):
+    instance_dict = {}
+    for resource in crm_mon.iterfind("./resources//resource"):
+        # Bundles and orphaned resources are not reported.
+        if (
+            is_true(resource.get("orphaned", ""))
+            or
+            any(parent.tag == "bundle" for parent in resource.iterancestors())
+        ):
+            continue
+        instance_dict.setdefault(
+            _get_primitive_id(resource.get("id", "")), []
+        ).append(resource)
+
+    failed_ids = _get_failed_primitive_ids(crm_mon)
+    status_list = []
+    for primitive_id, instance_list in instance_dict.items():
+        running_nodes = [
+            node.get("name")
+            for instance in instance_list
+            if is_true(instance.get("active", ""))
+            for node in instance.findall("node")
+        ]
+        if any(_is_disabled(instance) for instance in instance_list):
+            status = RESOURCE_DISABLED
+        elif any(
+            is_true(instance.get("active", "")) for instance in instance_list
+        ):
+            status = RESOURCE_RUNNING
+        elif (
+            primitive_id in failed_ids
+            or
+            any(
+                is_true(instance.get("failed", ""))
+                for instance in instance_list
+            )
+        ):
+            status = RESOURCE_FAILED
+        else:
+            status = RESOURCE_BLOCKED
+        status_list.append(ResourceStatus(primitive_id, status, running_nodes))
+    return status_list
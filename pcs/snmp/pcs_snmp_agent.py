@@ -49,7 +49,7 @@ def setup_logging(debug=False):
     level = logging.INFO
     if debug:
         level = logging.DEBUG
-        # this is required to enable debug also in the ruby code
+        # this is required to enable debug also in the executed commands
         # key '--debug' has to be added
         pcs.utils.pcs_options["--debug"] = debug
     formatter = logging.Formatter(
@@ -0,0 +1,188 @@
+from unittest import mock, TestCase
+
+from pcs.lib.corosync.config_facade import ConfigFacade
+from pcs.snmp import cluster_status
+from pcs.snmp.cluster_status import (
+    build_cluster_status,
+    ClusterStatusCollector,
+    NodeStatus,
+    ResourceStatus,
+)
+
+
+COROSYNC_CONF = """
+totem {
+    cluster_name: test99
+}
+
+nodelist {
+    node {
+        ring0_addr: node1
+        name: node1
+        nodeid: 1
+    }
+
+    node {
+        ring0_addr: node2
+        name: node2
+        nodeid: 2
+    }
+
+    node {
+        ring0_addr: node3
+        name: node3
+        nodeid: 3
+    }
+}
+"""
+
+CRM_MON = """
+<crm_mon version="2.0.0">
+    <summary>
+        <current_dc present="true" with_quorum="true" />
+    </summary>
+    <nodes>
+        <node name="node1" online="true" standby="false" maintenance="false"
+            resources_running="3" type="member"
+        />
+        <node name="node2" online="true" standby="true" maintenance="false"
+            resources_running="0" type="member"
+        />
+        <node name="node3" online="false" standby="false" maintenance="false"
+            resources_running="0" type="member"
+        />
+        <node name="remote1" online="true" standby="false" maintenance="false"
+            resources_running="0" type="remote"
+        />
+    </nodes>
+    <resources>
+        <resource id="R1" resource_agent="ocf::pacemaker:Dummy" active="true"
+            failed="false" orphaned="false"
+        >
+            <node name="node1" />
+        </resource>
+        <resource id="R2" resource_agent="ocf::pacemaker:Dummy" active="false"
+            failed="false" orphaned="false" target_role="Stopped"
+        />
+        <resource id="S1" resource_agent="stonith:fence_xvm" active="false"
+            failed="false" orphaned="false" target_role="Stopped"
+        />
+        <group id="G1" number_resources="1">
+            <resource id="R3" resource_agent="ocf::pacemaker:Dummy"
+                active="false" failed="true" orphaned="false"
+            />
+        </group>
+        <clone id="C1" target_role="Stopped">
+            <resource id="R4:0" resource_agent="ocf::pacemaker:Dummy"
+                active="false" failed="false" orphaned="false"
+            />
+        </clone>
+        <clone id="C2">
+            <resource id="R5:0" resource_agent="ocf::pacemaker:Dummy"
+                active="true" failed="false" orphaned="false"
+            >
+                <node name="node1" />
+            </resource>
+            <resource id="R5:1" resource_agent="ocf::pacemaker:Dummy"
+                active="false" failed="false" orphaned="false"
+            />
+        </clone>
+        <resource id="R6_x" resource_agent="ocf::pacemaker:Dummy"
+            active="false" failed="false" orphaned="false"
+        />
+        <resource id="R7" resource_agent="ocf::pacemaker:Dummy"
+            active="false" failed="false" orphaned="false"
+        />
+        <resource id="R8" resource_agent="ocf::pacemaker:Dummy"
+            active="false" failed="false" orphaned="true"
+        />
+        <bundle id="B1">
+            <replica id="0">
+                <resource id="B1-docker-0" active="true" failed="false"
+                    orphaned="false"
+                />
+            </replica>
+        </bundle>
+    </resources>
+    <failures>
+        <failure op_key="R6_x_migrate_to_0" node="node1" exitcode="1" />
+        <failure op_key="R7_monitor_10000" node="node1" exitcode="7" />
+    </failures>
+</crm_mon>
+"""
+
+
+class BuildClusterStatus(TestCase):
+    def test_success(self):
+        status = build_cluster_status(
+            ConfigFacade.from_string(COROSYNC_CONF),
+            ["node2", "node1"],
+            CRM_MON,
+        )
+        self.assertEqual("test99", status.cluster_name)
+        self.assertTrue(status.quorate)
+        self.assertEqual(["node1", "node2", "node3"], status.node_list)
+        self.assertEqual(["node1", "node2"], status.corosync_online)
+        self.assertEqual(["node3"], status.corosync_offline)
+        self.assertEqual(["node1"], status.pacemaker_online)
+        self.assertEqual(["node2"], status.pacemaker_standby)
+        self.assertEqual(["node3"], status.pacemaker_offline)
+        self.assertEqual(
+            [
+                NodeStatus("node1", True, "online", 3),
+                NodeStatus("node2", True, "standby", 0),
+                NodeStatus("node3", False, "offline", 0),
+            ],
+            status.node_status_list
+        )
+        self.assertEqual(
+            [
+                ResourceStatus("R1", "running", ["node1"]),
+                ResourceStatus("R2", "disabled", []),
+                ResourceStatus("S1", "blocked", []),
+                ResourceStatus("R3", "failed", []),
+                ResourceStatus("R4", "disabled", []),
+                ResourceStatus("R5", "running", ["node1"]),
+                ResourceStatus("R6_x", "failed", []),
+                ResourceStatus("R7", "blocked", []),
+            ],
+            status.resource_status_list
+        )
+
+    def test_cluster_not_running(self):
+        status = build_cluster_status(
+            ConfigFacade.from_string(COROSYNC_CONF), [], None
+        )
+        self.assertEqual("test99", status.cluster_name)
+        self.assertFalse(status.quorate)
+        self.assertEqual(["node1", "node2", "node3"], status.node_list)
+        self.assertEqual([], status.corosync_online)
+        self.assertEqual([], status.pacemaker_online)
+        self.assertEqual([], status.resource_status_list)
+        self.assertEqual(
+            NodeStatus("node1", False, "", 0), status.node_status_list[0]
+        )
+
+    def test_no_corosync_conf(self):
+        status = build_cluster_status(None, [], CRM_MON)
+        self.assertEqual("", status.cluster_name)
+        self.assertEqual(["node1", "node3", "node2"], status.node_list)
+
+
+@mock.patch("pcs.snmp.cluster_status._get_snapshot")
+class ClusterStatusCollectorTest(TestCase):
+    def test_status_reused_until_snapshot_changes(self, mock_snapshot):
+        mock_snapshot.side_effect = [
+            cluster_status._Snapshot(COROSYNC_CONF, ("node1",), CRM_MON),
+            cluster_status._Snapshot(COROSYNC_CONF, ("node1",), CRM_MON),
+            cluster_status._Snapshot(COROSYNC_CONF, ("node1", "node2"), None),
+        ]
+        collector = ClusterStatusCollector()
+        status, changed = collector.collect()
+        self.assertTrue(changed)
+        self.assertEqual(["node1"], status.corosync_online)
+        self.assertEqual((status, False), collector.collect())
+        status, changed = collector.collect()
+        self.assertTrue(changed)
+        self.assertEqual(["node1", "node2"], status.corosync_online)
+        self.assertEqual([], status.resource_status_list)
@@ -1,6 +1,6 @@
 import logging
 
-from pcs.utils import run_pcsdcli
+from pcs.snmp import cluster_status
 from pcs.snmp.agentx.updater import AgentxUpdaterBase
 from pcs.snmp.agentx.types import (
     IntegerType,
@@ -38,168 +38,110 @@ _cluster_v1_oid_tree = Oid(
     ]
 )
 
+# Tables are set by rows, oids of their entries are used directly.
+_RESOURCE_ENTRY_OID = "3.1"
+_NODE_ENTRY_OID = "4.1"
+
 
 class ClusterPcsV1Updater(AgentxUpdaterBase):
     _oid_tree = Oid(0, "pcs_v1", member_list=[_cluster_v1_oid_tree])
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._collector = cluster_status.ClusterStatusCollector()
+        self._last_data = {}
+
     def update(self):
-        # pylint: disable=too-many-locals
-        output, ret_val = run_pcsdcli("node_status")
-        if ret_val != 0 or output["status"] != "ok":
-            logger.error(
-                "Unable to obtain cluster status.\nPCSD return code: %s\n"
-                "PCSD output: %s\n",
-                ret_val,
-                output
-            )
+        # pylint: disable=broad-except
+        try:
+            status, changed = self._collector.collect()
+        except Exception as e:
+            logger.error("Unable to obtain cluster status: %s", e)
             return
-        data = output["data"]
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterName",
-            data.get("cluster_name", "")
+        if not changed:
+            # Values are cleared before each update, keep the previous ones.
+            self._data.update(self._last_data)
+            return
+        self._update_cluster(status)
+        self.set_table(
+            _RESOURCE_ENTRY_OID,
+            [
+                [
+                    StringType(resource.id),
+                    StringType(resource.status),
+                    IntegerType(len(resource.node_list)),
+                    StringType(" ".join(resource.node_list)),
+                ]
+                for resource in status.resource_status_list
+            ]
+        )
+        self.set_table(
+            _NODE_ENTRY_OID,
+            [
+                [
+                    StringType(node.name),
+                    IntegerType(_bool_to_int(node.corosync_online)),
+                    StringType(node.pacemaker),
+                    IntegerType(node.resources_running),
+                ]
+                for node in status.node_status_list
+            ]
+        )
+        self._last_data = dict(self._data)
+
+    def _update_cluster(self, status):
+        self.set_value(
+            "pcmkPcsV1Cluster.pcmkPcsV1ClusterName", status.cluster_name
         )
         self.set_value(
             "pcmkPcsV1Cluster.pcmkPcsV1ClusterQuorate",
-            _bool_to_int(data.get("node", {}).get("quorum"))
+            _bool_to_int(status.quorate)
         )
 
         # nodes
-        known_nodes = data.get("known_nodes", [])
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNum",
-            len(known_nodes)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterNodesNames",
-            known_nodes
-        )
-
-        corosync_nodes_online = data.get("corosync_online")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNum",
-            len(corosync_nodes_online)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOnlineNames",
-            corosync_nodes_online
-        )
-
-        corosync_nodes_offline = data.get("corosync_offline")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNum",
-            len(corosync_nodes_offline)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterCorosyncNodesOfflineNames",
-            corosync_nodes_offline
-        )
-
-        pcmk_nodes_online = data.get("pacemaker_online")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNum",
-            len(pcmk_nodes_online)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOnlineNames",
-            pcmk_nodes_online
-        )
-
-        pcmk_nodes_standby = data.get("pacemaker_standby")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNum",
-            len(pcmk_nodes_standby)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesStandbyNames",
-            pcmk_nodes_standby
-        )
-
-        pcmk_nodes_offline = data.get("pacemaker_offline")
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNum",
-            len(pcmk_nodes_offline)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterPcmkNodesOfflineNames",
-            pcmk_nodes_offline
-        )
+        for name, node_list in (
+            ("Nodes", status.node_list),
+            ("CorosyncNodesOnline", status.corosync_online),
+            ("CorosyncNodesOffline", status.corosync_offline),
+            ("PcmkNodesOnline", status.pacemaker_online),
+            ("PcmkNodesStandby", status.pacemaker_standby),
+            ("PcmkNodesOffline", status.pacemaker_offline),
+        ):
+            self._set_id_list(name, "Names", node_list)
 
         # resources
-        primitive_list = []
-        for resource in data.get("resource_list", []):
-            primitive_list.extend(_get_primitives(resource))
-
-        primitive_id_list = _get_resource_id_list(primitive_list)
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesNum",
-            len(primitive_id_list)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterAllResourcesIds",
-            primitive_id_list
-        )
-        running_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["running"])
-        )
-
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesNum",
-            len(running_primitive_id_list)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterRunningResourcesIds",
-            running_primitive_id_list
-        )
+        resource_list = status.resource_status_list
+        for name, status_list in (
+            ("AllResources", None),
+            ("RunningResources", [cluster_status.RESOURCE_RUNNING]),
+            ("StoppedResources", [cluster_status.RESOURCE_DISABLED]),
+            (
+                "FailedResources",
+                [
+                    cluster_status.RESOURCE_FAILED,
+                    cluster_status.RESOURCE_BLOCKED,
+                ]
+            ),
+        ):
+            self._set_id_list(
+                name,
+                "Ids",
+                [
+                    resource.id for resource in resource_list
+                    if status_list is None or resource.status in status_list
+                ]
+            )
 
-        disabled_primitive_id_list = _get_resource_id_list(
-            primitive_list, _res_in_status(["disabled"])
-        )
+    def _set_id_list(self, name, list_suffix, id_list):
         self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesNum",
-            len(disabled_primitive_id_list)
+            "pcmkPcsV1Cluster.pcmkPcsV1Cluster{0}Num".format(name),
+            len(id_list)
         )
         self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterStoppedResourcesIds",
-            disabled_primitive_id_list
-        )
-
-        failed_primitive_id_list = _get_resource_id_list(
-            primitive_list,
-            lambda res: not _res_in_status(["running", "disabled"])(res)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesNum",
-            len(failed_primitive_id_list)
-        )
-        self.set_value(
-            "pcmkPcsV1Cluster.pcmkPcsV1ClusterFailedResourcesIds",
-            failed_primitive_id_list
+            "pcmkPcsV1Cluster.pcmkPcsV1Cluster{0}{1}".format(name, list_suffix),
+            id_list
         )
 
 
 def _bool_to_int(value):
     return 1 if value else 0
-
-
-def _get_primitives(resource):
-    res_type = resource["class_type"]
-    if res_type == "primitive":
-        return [resource]
-    if res_type == "group":
-        primitive_list = []
-        for primitive in resource["members"]:
-            primitive_list.extend(_get_primitives(primitive))
-        return primitive_list
-    # check master-slave type
-    if res_type in ["clone", "master"]:
-        return _get_primitives(resource["member"])
-    return []
-
-
-def _get_resource_id_list(resource_list, predicate=None):
-    if predicate is None:
-        predicate = lambda _: True
-    return [resource["id"] for resource in resource_list if predicate(resource)]
-
-
-def _res_in_status(status_list):
-    return lambda res: res["status"] in status_list
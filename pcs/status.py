@@ -3,6 +3,7 @@ import os
 
 from pcs import (
     resource,
+    settings,
     usage,
     utils,
 )
@@ -12,6 +13,9 @@ from pcs.cli.booth.command import status as booth_status_cmd
 from pcs.cli.common.console_report import indent
 from pcs.cli.common.errors import CmdLineInputError
 from pcs.cli.common.routing import create_router
+from pcs.common.tools import map_parallel
+from pcs.lib.corosync import config_parser as corosync_conf_parser
+from pcs.lib.corosync.config_facade import ConfigFacade as corosync_conf_facade
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.live import is_fence_history_supported
 from pcs.lib.pacemaker.state import ClusterState
@@ -21,6 +25,8 @@ from pcs.lib.sbd import get_sbd_service_name
 
 # pylint: disable=too-many-branches, too-many-locals, too-many-statements
 
+_PCSD_ONLINE_CODE = 0
+
 def status_cmd(lib, argv, modifiers):
     create_router(
         {
@@ -49,6 +55,7 @@ def full_status(lib, argv, modifiers):
       * --corosync_conf - file corocync.conf
       * --request-timeout - HTTP timeout for node authorization check
     """
+    del lib
     modifiers.ensure_only_supported(
         "--hide-inactive", "--full", "-f", "--corosync_conf",
         "--request-timeout",
@@ -62,22 +69,15 @@ def full_status(lib, argv, modifiers):
     ):
         utils.err("you cannot specify both --hide-inactive and --full")
 
-    monitor_command = ["crm_mon", "--one-shot"]
-    if not modifiers.get("--hide-inactive"):
-        monitor_command.append('--inactive')
-    if modifiers.get("--full"):
-        monitor_command.extend(
-            ["--show-detail", "--show-node-attributes", "--failcounts"]
-        )
-        # by default, pending and failed actions are displayed
-        # with --full, we display the whole history
-        if is_fence_history_supported():
-            monitor_command.append("--fence-history=3")
-
-    stdout, stderr, retval = utils.cmd_runner().run(monitor_command)
+    status = _collect_full_status(modifiers)
 
+    stdout, stderr, retval = status["crm_mon"]
     if retval != 0:
         utils.err("cluster is not currently running on this node")
+    cib_xml, retval = status["cib"]
+    if retval != 0:
+        utils.err("unable to get cib")
+    cib_dom = utils.get_cib_dom(cib_xml)
 
     warnings = []
     if stderr.strip():
@@ -87,9 +87,14 @@ def full_status(lib, argv, modifiers):
                     warnings.append(line)
             else:
                 warnings.append(line)
-    warnings.extend(status_stonith_check(modifiers))
+    sbd_state = status.get("daemons", {}).get(get_sbd_service_name())
+    warnings.extend(
+        status_stonith_check(
+            cib_dom, sbd_state is not None and sbd_state.running
+        )
+    )
 
-    print("Cluster name: %s" % utils.getClusterName())
+    print("Cluster name: %s" % utils.getClusterName(cib_dom))
     if warnings:
         print()
         print("WARNINGS:")
@@ -97,8 +102,8 @@ def full_status(lib, argv, modifiers):
         print()
     print(stdout)
 
-    if modifiers.get("--full"):
-        tickets, retval = utils.run(["crm_ticket", "-L"])
+    if "tickets" in status:
+        tickets, retval = status["tickets"]
         if retval != 0:
             print("WARNING: Unable to get information about tickets")
             print()
@@ -106,23 +111,121 @@ def full_status(lib, argv, modifiers):
             print("Tickets:")
             print("\n".join(indent(tickets.split("\n"))))
 
-    if not (
+    if "pcsd" in status:
+        line_list, error = status["pcsd"]
+        print("PCSD Status:")
+        for line in line_list:
+            print(line)
+        if error:
+            utils.err(error)
+        print()
+    if _is_live(modifiers):
+        utils.print_daemon_status(status["daemons"], "  ")
+
+def _collect_full_status(modifiers):
+    """
+    Gather data to be displayed by full_status, return a dict source -> data
+
+    Commandline options:
+      * --hide-inactive - hide inactive resources
+      * --full - show full details, node attributes and failcount
+      * -f - CIB file
+      * --corosync_conf - file corocync.conf
+      * --request-timeout - HTTP timeout for node authorization check
+    """
+    monitor_command = ["crm_mon", "--one-shot"]
+    if not modifiers.get("--hide-inactive"):
+        monitor_command.append('--inactive')
+    if modifiers.get("--full"):
+        monitor_command.extend(
+            ["--show-detail", "--show-node-attributes", "--failcounts"]
+        )
+        # by default, pending and failed actions are displayed
+        # with --full, we display the whole history
+        if is_fence_history_supported():
+            monitor_command.append("--fence-history=3")
+
+    # The sources do not depend on each other and most of them are external
+    # commands or requests to other nodes. They are gathered all at once and
+    # errors are dealt with when printing the status. The CIB is loaded only
+    # once and used by all the checks which need it.
+    task_dict = {
+        "crm_mon": lambda: utils.cmd_runner().run(monitor_command),
+        "cib": lambda: utils.run(["cibadmin", "-l", "-Q"]),
+    }
+    if not modifiers.is_specified("-f"):
+        # needed to check if SBD is running even if daemons are not displayed
+        task_dict["daemons"] = utils.get_daemons_state
+    if modifiers.get("--full"):
+        task_dict["tickets"] = lambda: utils.run(["crm_ticket", "-L"])
+        # do this only if in live environment
+        if _is_live(modifiers):
+            task_dict["pcsd"] = _get_pcsd_daemon_status
+
+    source_list = list(task_dict.keys())
+    return dict(zip(
+        source_list,
+        map_parallel(
+            lambda source: task_dict[source](), source_list, len(source_list)
+        )
+    ))
+
+def _is_live(modifiers):
+    """
+    Commandline options:
+      * -f - CIB file
+      * --corosync_conf - file corocync.conf
+    """
+    return not (
         modifiers.is_specified("-f")
         or
         modifiers.is_specified("--corosync_conf")
-    ):
-        # do this only if in live environment
-        if modifiers.get("--full"):
-            print_pcsd_daemon_status(lib, modifiers)
-            print()
-        utils.serviceStatus("  ")
+    )
 
-def status_stonith_check(modifiers):
+def _get_pcsd_daemon_status():
     """
+    Return lines describing pcsd status and an error message or None
+
+    Errors are not printed right away, so they do not get mixed up with the
+    rest of the status.
+
     Commandline options:
-      * -f - CIB file, to get stonith devices and cluster property
-        stonith-enabled from CIB, to determine whenever we are working with
-        files or cluster
+      * --request-timeout - HTTP timeout for node authorization check or when
+        not running under root to call local pcsd
+    """
+    if os.getuid() != 0:
+        err_msgs, exitcode, std_out, dummy_std_err = utils.call_local_pcsd(
+            ['status', 'pcsd']
+        )
+        return (
+            list(err_msgs)
+            +
+            [std_out if exitcode == 0 else "Unable to get PCSD status"]
+        ), None
+    try:
+        with open(settings.corosync_conf_file) as conf_file:
+            node_list = corosync_conf_facade.from_string(
+                conf_file.read()
+            ).get_nodes_names()
+    except EnvironmentError as e:
+        return [], "Unable to read %s: %s" % (
+            settings.corosync_conf_file, e.strerror
+        )
+    except corosync_conf_parser.CorosyncConfParserException as e:
+        return [], "Unable to parse corosync.conf: %s" % e
+    if not node_list:
+        return [], "no nodes found in corosync.conf"
+    return [
+        _format_pcsd_status(node, returncode, "  ")
+        for node, returncode in _get_pcsd_status_list(node_list)
+    ], None
+
+def status_stonith_check(cib_dom, sbd_running):
+    """
+    Return warnings about stonith configuration
+
+    cib_dom -- the CIB to check
+    bool sbd_running -- True if SBD daemon is running
     """
     # pylint: disable=too-many-nested-blocks
     # We should read the default value from pacemaker. However that may slow
@@ -132,10 +235,8 @@ def status_stonith_check(modifiers):
     stonith_devices = []
     stonith_devices_id_action = []
     stonith_devices_id_method_cycle = []
-    sbd_running = False
 
-    cib = utils.get_cib_dom()
-    for conf in cib.getElementsByTagName("configuration"):
+    for conf in cib_dom.getElementsByTagName("configuration"):
         for crm_config in conf.getElementsByTagName("crm_config"):
             for nvpair in crm_config.getElementsByTagName("nvpair"):
                 if (
@@ -171,16 +272,6 @@ def status_stonith_check(modifiers):
                                 resource_el.getAttribute("id")
                             )
 
-    if not modifiers.is_specified("-f"):
-        # check if SBD daemon is running
-        try:
-            sbd_running = utils.is_service_running(
-                utils.cmd_runner(),
-                get_sbd_service_name()
-            )
-        except LibraryError:
-            pass
-
     if stonith_enabled and not stonith_devices and not sbd_running:
         warnings.append(
             "No stonith devices and stonith-enabled is not false"
@@ -370,17 +461,6 @@ def xml_status(lib, argv, modifiers):
         utils.err("running crm_mon, is pacemaker running?")
     print(output.rstrip())
 
-def is_service_running(service):
-    """
-    Used in module pcs.config
-    Commandline options: no options
-    """
-    if utils.is_systemctl():
-        dummy_output, retval = utils.run(["systemctl", "status", service])
-    else:
-        dummy_output, retval = utils.run(["service", service, "status"])
-    return retval == 0
-
 def print_pcsd_daemon_status(lib, modifiers):
     """
     Commandline options:
@@ -411,27 +491,45 @@ def check_nodes(node_list, prefix=""):
     Commandline options:
       * --request-timeout - HTTP timeout for node authorization check
     """
-    online_code = 0
-    status_desc_map = {
-        online_code: 'Online',
-        3: 'Unable to authenticate'
-    }
     status_list = []
     def report(node, returncode, output):
         del output
-        print("{0}{1}: {2}".format(
-            prefix,
-            node,
-            status_desc_map.get(returncode, 'Offline')
-        ))
+        print(_format_pcsd_status(node, returncode, prefix))
         status_list.append(returncode)
 
-    utils.read_known_hosts_file() # cache known hosts
-    utils.run_parallel(
-        utils.create_task_list(report, utils.checkAuthorization, node_list)
-    )
+    utils.run_for_nodes(report, utils.checkAuthorization, node_list)
+
+    return any([status != _PCSD_ONLINE_CODE for status in status_list])
+
+def _get_pcsd_status_list(node_list):
+    """
+    Return a list of (node, returncode) of pcsd status check in node_list order
+
+    Commandline options:
+      * --request-timeout - HTTP timeout for node authorization check
+    """
+    status_dict = {}
+    def report(node, returncode, output):
+        del output
+        status_dict[node] = returncode
 
-    return any([status != online_code for status in status_list])
+    utils.run_for_nodes(report, utils.checkAuthorization, node_list)
+
+    return [(node, status_dict[node]) for node in node_list]
+
+def _format_pcsd_status(node, returncode, prefix):
+    """
+    Commandline options: no options
+    """
+    status_desc_map = {
+        _PCSD_ONLINE_CODE: 'Online',
+        3: 'Unable to authenticate'
+    }
+    return "{0}{1}: {2}".format(
+        prefix,
+        node,
+        status_desc_map.get(returncode, 'Offline')
+    )
 
 # If no arguments get current cluster node status, otherwise get listed
 # nodes status
@@ -135,8 +135,9 @@ def stonith_list_available(lib, argv, modifiers):
     """
     Options:
       * --nodesc - do not show description of the agents
+      * --jobs - number of agents described at once
     """
-    modifiers.ensure_only_supported("--nodesc")
+    modifiers.ensure_only_supported("--nodesc", "--jobs")
     if len(argv) > 1:
         raise CmdLineInputError()
 
@@ -144,6 +145,7 @@ def stonith_list_available(lib, argv, modifiers):
     agent_list = lib.stonith_agent.list_agents(
         describe=not modifiers.get("--nodesc"),
         search=search,
+        max_workers=resource._get_agent_list_max_workers(modifiers),
     )
 
     if not agent_list:
@@ -0,0 +1,38 @@
+import os.path
+import subprocess
+import sys
+from unittest import TestCase
+
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+def loaded_pcs_modules(code):
+    # A fresh interpreter is needed, the test runner has already loaded most
+    # of pcs.
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport sys\nprint('\\n'.join(sys.modules))",
+        ],
+        cwd=PACKAGE_DIR,
+        universal_newlines=True,
+    )
+    return {
+        name for name in output.splitlines()
+        if name == "pcs" or name.startswith("pcs.")
+    }
+
+
+class StartupImports(TestCase):
+    # Keep pcs startup fast: commands import only what they need.
+    def test_app_does_not_import_commands(self):
+        loaded = loaded_pcs_modules("import pcs.app")
+        for module in ["pcs.resource", "pcs.cluster", "pcs.utils", "pcs.lib"]:
+            self.assertNotIn(module, loaded)
+
+    def test_lib_wrapper_does_not_import_lib_commands(self):
+        loaded = loaded_pcs_modules("import pcs.cli.common.lib_wrapper")
+        self.assertNotIn("pcs.lib.commands", loaded)
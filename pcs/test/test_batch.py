@@ -0,0 +1,151 @@
+import shutil
+from unittest import TestCase
+
+from pcs import batch
+from pcs.test.tools.assertions import AssertPcsMixin
+from pcs.test.tools.misc import (
+    get_test_resource as rc,
+    outdent,
+)
+from pcs.test.tools.pcs_runner import PcsRunner
+
+
+empty_cib = rc("cib-empty.xml")
+temp_cib = rc("temp-cib.xml")
+temp_batch = rc("temp-batch.txt")
+
+
+class ParseLine(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            (
+                "resource",
+                ["create", "R", "ocf:heartbeat:Dummy", "fake=a b"],
+                {"--debug": "", "--force": ""},
+            ),
+            batch._parse_line(
+                "pcs resource create R ocf:heartbeat:Dummy 'fake=a b' --force"
+                    " # comment"
+                ,
+                {"--debug": ""}
+            )
+        )
+
+    def test_pcs_is_optional(self):
+        self.assertEqual(
+            ("property", ["set", "a=b"], {}),
+            batch._parse_line("property set a=b", {})
+        )
+
+    def test_refuse_batch_options(self):
+        for option in ("-f file", "--wait", "--all-or-nothing"):
+            with self.subTest(option=option):
+                self.assertRaises(
+                    batch._LineError,
+                    batch._parse_line,
+                    "resource enable R {0}".format(option),
+                    {}
+                )
+
+    def test_refuse_unsupported_command(self):
+        for line in ("cluster stop", "pcs", "batch run file"):
+            with self.subTest(line=line):
+                self.assertRaises(
+                    batch._LineError, batch._parse_line, line, {}
+                )
+
+    def test_refuse_invalid_line(self):
+        self.assertRaises(
+            batch._LineError, batch._parse_line, "resource create 'R", {}
+        )
+
+    def test_refuse_unknown_option(self):
+        self.assertRaises(
+            batch._LineError, batch._parse_line, "resource --unknown", {}
+        )
+
+
+class BatchRun(TestCase, AssertPcsMixin):
+    def setUp(self):
+        shutil.copy(empty_cib, temp_cib)
+        self.pcs_runner = PcsRunner(temp_cib)
+
+    def write_batch(self, text):
+        with open(temp_batch, "w") as batch_file:
+            batch_file.write(outdent(text))
+
+    def test_all_commands_applied(self):
+        self.write_batch(
+            """\
+            # resources
+            pcs resource create R1 ocf:heartbeat:Dummy --no-default-ops
+
+            resource create R2 ocf:heartbeat:Dummy --no-default-ops
+            constraint order R1 then R2
+            """
+        )
+        self.assert_pcs_success(
+            "batch run {0}".format(temp_batch),
+            "Adding R1 R2 (kind: Mandatory) (Options: first-action=start "
+                "then-action=start)\n"
+        )
+        self.assert_pcs_success(
+            "constraint order",
+            outdent(
+                """\
+                Ordering Constraints:
+                  start R1 then start R2 (kind:Mandatory)
+                """
+            )
+        )
+
+    def test_failed_command_not_applied(self):
+        self.write_batch(
+            """\
+            resource create R1 ocf:heartbeat:Dummy --no-default-ops
+            resource create R1 ocf:heartbeat:Dummy --no-default-ops
+            cluster stop
+            resource create R2 ocf:heartbeat:Dummy --no-default-ops
+            """
+        )
+        self.assert_pcs_fail(
+            "batch run {0}".format(temp_batch),
+            outdent(
+                """\
+                Error: 'R1' already exists
+                Error: Command on line 2 failed: resource create R1 ocf:heartbeat:Dummy --no-default-ops
+                Error: Only commands acl, alert, constraint, node, property, resource, stonith can be run in a batch
+                Error: Command on line 3 failed: cluster stop
+                Error: 2 of 4 commands failed
+                """
+            )
+        )
+        self.assert_pcs_success(
+            "resource",
+            outdent(
+                """\
+                 R1\t(ocf::heartbeat:Dummy):\tStopped
+                 R2\t(ocf::heartbeat:Dummy):\tStopped
+                """
+            )
+        )
+
+    def test_all_or_nothing(self):
+        self.write_batch(
+            """\
+            resource create R1 ocf:heartbeat:Dummy --no-default-ops
+            resource create R1 ocf:heartbeat:Dummy --no-default-ops
+            resource create R2 ocf:heartbeat:Dummy --no-default-ops
+            """
+        )
+        self.assert_pcs_fail(
+            "batch run {0} --all-or-nothing".format(temp_batch),
+            outdent(
+                """\
+                Error: 'R1' already exists
+                Error: Command on line 2 failed: resource create R1 ocf:heartbeat:Dummy --no-default-ops
+                Error: No changes have been pushed
+                """
+            )
+        )
+        self.assert_pcs_success("resource", "NO resources configured\n")
@@ -1,3 +1,4 @@
+import threading
 import time
 from unittest import TestCase
 
@@ -27,6 +28,56 @@ class RunParallelTestCase(TestCase):
         self.assertTrue(elapsed_time < sum([i + 1 for i in range(timeout)]))
 
 
+class MapParallel(TestCase):
+    def test_keep_order(self):
+        def worker(i):
+            # make the first items finish last
+            time.sleep((5 - i) / 100)
+            return i * 2
+        self.assertEqual(
+            [0, 2, 4, 6, 8],
+            tools.map_parallel(worker, range(5), 5)
+        )
+
+    def test_empty(self):
+        self.assertEqual([], tools.map_parallel(str, [], 5))
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        def worker(i):
+            with lock:
+                running.append(i)
+                max_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(i)
+            return i
+        self.assertEqual(
+            list(range(10)),
+            tools.map_parallel(worker, range(10), 3)
+        )
+        self.assertLessEqual(max(max_running), 3)
+        self.assertGreater(max(max_running), 1)
+
+    def test_one_worker_runs_in_current_thread(self):
+        self.assertEqual(
+            [threading.current_thread()] * 2,
+            tools.map_parallel(
+                lambda i: threading.current_thread(), range(2), 1
+            )
+        )
+
+    def test_exception(self):
+        def worker(i):
+            if i == 1:
+                raise TestException()
+            return i
+        with self.assertRaises(TestException):
+            tools.map_parallel(worker, range(3), 3)
+
+
 class JoinMultilinesTest(TestCase):
     def test_empty_input(self):
         self.assertEqual(
@@ -1,11 +1,15 @@
 # pylint: disable=too-many-lines
+from io import StringIO
 import os
 import shutil
 import unittest
+from unittest import mock
+from xml.dom.minidom import parseString
 from lxml import etree
 
 from pcs.test.tools.assertions import (
     ac,
+    assert_xml_equal,
     AssertPcsMixin,
     console_report,
 )
@@ -25,7 +29,14 @@ from pcs.test.tools.misc import (
 )
 from pcs.test.tools.pcs_runner import pcs, PcsRunner
 
-from pcs.constraint import LOCATION_NODE_VALIDATION_SKIP_MSG
+from pcs.constraint import (
+    find_constraints_containing,
+    LOCATION_NODE_VALIDATION_SKIP_MSG,
+    location_rule_check_duplicates,
+    remove_constraints_containing,
+    remove_constraints_containing_resources,
+)
+from pcs.lib.cib.constraint.index import ConstraintIndex
 
 # pylint: disable=line-too-long, too-many-public-methods, invalid-name, no-self-use, bad-whitespace, redefined-outer-name, too-many-statements
 
@@ -3209,3 +3220,218 @@ class BundleTicket(Bundle):
             "Warning: R is a bundle resource, you should use the bundle id: B "
                 "when adding constraints\n"
         )
+
+
+class FindConstraintsContaining(unittest.TestCase):
+    cib = etree.fromstring("""
+        <cib>
+            <configuration>
+                <resources>
+                    <primitive id="A"/>
+                    <clone id="B-clone"><primitive id="B"/></clone>
+                </resources>
+                <constraints>
+                    <rsc_location id="L1" rsc="A" node="node1" score="1"/>
+                    <rsc_order id="O1" first="B-clone" then="A"/>
+                    <rsc_colocation id="C1" rsc="A" with-rsc="B-clone"
+                        score="INFINITY"
+                    />
+                    <rsc_ticket id="T1" rsc="B" ticket="T"/>
+                    <rsc_order id="O2">
+                        <resource_set id="O2-set">
+                            <resource_ref id="A"/>
+                            <resource_ref id="B-clone"/>
+                        </resource_set>
+                    </rsc_order>
+                </constraints>
+            </configuration>
+        </cib>
+    """)
+
+    def test_resource(self):
+        self.assertEqual(
+            (["C1", "L1", "O1"], ["O2"]),
+            find_constraints_containing("A", self.cib)
+        )
+
+    def test_resource_in_clone(self):
+        self.assertEqual(
+            (["C1", "O1", "T1"], ["O2"]),
+            find_constraints_containing("B", self.cib)
+        )
+
+    def test_no_constraints(self):
+        self.assertEqual(
+            ([], []),
+            find_constraints_containing("X", self.cib)
+        )
+
+
+class RemoveConstraintsContaining(unittest.TestCase):
+    cib = """
+        <cib>
+            <configuration>
+                <resources>
+                    <primitive id="A"/>
+                    <clone id="B-clone"><primitive id="B"/></clone>
+                </resources>
+                <constraints>
+                    <rsc_ticket id="T1" rsc="B" ticket="T"/>
+                    <rsc_order id="O1" first="B-clone" then="A"/>
+                    <rsc_location id="L1" rsc="B" node="node1" score="1"/>
+                    <rsc_location id="L2" rsc-pattern="B" node="node1"
+                        score="1"
+                    />
+                    <rsc_order id="O2">
+                        <resource_set id="O2-set1">
+                            <resource_ref id="A"/>
+                            <resource_ref id="B"/>
+                        </resource_set>
+                        <resource_set id="O2-set2">
+                            <resource_ref id="B"/>
+                        </resource_set>
+                    </rsc_order>
+                    <rsc_colocation id="C1" score="INFINITY">
+                        <resource_set id="C1-set">
+                            <resource_ref id="B"/>
+                        </resource_set>
+                    </rsc_colocation>
+                </constraints>
+            </configuration>
+        </cib>
+    """
+
+    def test_remove_all_references(self):
+        dom = parseString(self.cib)
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            remove_constraints_containing("B", output=True, passed_dom=dom)
+        self.assertEqual(
+            outdent(
+                """\
+                Removing Constraint - O1
+                Removing Constraint - L1
+                Removing Constraint - T1
+                Removing B from set O2-set1
+                Removing B from set O2-set2
+                Removing set O2-set2
+                Removing B from set C1-set
+                Removing set C1-set
+                Removing constraint C1
+                """
+            ),
+            stdout.getvalue()
+        )
+        assert_xml_equal(
+            """
+            <constraints>
+                <rsc_location id="L2" rsc-pattern="B" node="node1"
+                    score="1"
+                />
+                <rsc_order id="O2">
+                    <resource_set id="O2-set1">
+                        <resource_ref id="A"/>
+                    </resource_set>
+                </rsc_order>
+            </constraints>
+            """,
+            dom.getElementsByTagName("constraints")[0].toxml()
+        )
+
+    def test_remove_references_of_many_resources(self):
+        dom = parseString(self.cib)
+        with mock.patch(
+            "pcs.constraint.ConstraintIndex", wraps=ConstraintIndex
+        ) as mock_index, mock.patch(
+            "sys.stdout", new_callable=StringIO
+        ) as stdout:
+            remove_constraints_containing_resources(
+                ["A", "B"], output=True, passed_dom=dom
+            )
+        mock_index.assert_called_once()
+        self.assertEqual(
+            outdent(
+                """\
+                Removing Constraint - O1
+                Removing A from set O2-set1
+                Removing Constraint - L1
+                Removing Constraint - T1
+                Removing B from set O2-set1
+                Removing set O2-set1
+                Removing B from set O2-set2
+                Removing set O2-set2
+                Removing constraint O2
+                Removing B from set C1-set
+                Removing set C1-set
+                Removing constraint C1
+                """
+            ),
+            stdout.getvalue()
+        )
+        assert_xml_equal(
+            """
+            <constraints>
+                <rsc_location id="L2" rsc-pattern="B" node="node1"
+                    score="1"
+                />
+            </constraints>
+            """,
+            dom.getElementsByTagName("constraints")[0].toxml()
+        )
+
+
+class LocationRuleCheckDuplicates(unittest.TestCase):
+    constraints = """
+        <constraints>
+            <rsc_location id="L1" rsc="A">
+                <rule id="L1-rule" score="INFINITY" boolean-op="and">
+                    <expression id="L1-rule-expr" attribute="#uname"
+                        operation="eq" value="node1"
+                    />
+                </rule>
+            </rsc_location>
+            <rsc_location id="L2" rsc="A">
+                <rule id="L2-rule" score="INFINITY" boolean-op="and">
+                    <expression id="L2-rule-expr" attribute="#uname"
+                        operation="eq" value="node2"
+                    />
+                </rule>
+            </rsc_location>
+        </constraints>
+    """
+
+    def setUp(self):
+        patcher = mock.patch(
+            "pcs.utils.get_cib_etree",
+            lambda: etree.fromstring(
+                "<cib><configuration>{0}</configuration></cib>".format(
+                    self.constraints
+                )
+            )
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.dom = parseString(self.constraints)
+
+    def get_constraint(self, constraint_id):
+        for constraint in self.dom.getElementsByTagName("rsc_location"):
+            if constraint.getAttribute("id") == constraint_id:
+                return constraint
+        raise AssertionError(constraint_id)
+
+    def test_duplicate_refused(self):
+        constraint = self.get_constraint("L2")
+        expression = constraint.getElementsByTagName("expression")[0]
+        expression.setAttribute("value", "node1")
+        with mock.patch("sys.stderr", new_callable=StringIO) as stderr:
+            with self.assertRaises(SystemExit):
+                location_rule_check_duplicates(constraint, False)
+        self.assertIn("Constraint: L1", stderr.getvalue())
+
+    def test_duplicate_forced(self):
+        constraint = self.get_constraint("L2")
+        expression = constraint.getElementsByTagName("expression")[0]
+        expression.setAttribute("value", "node1")
+        location_rule_check_duplicates(constraint, True)
+
+    def test_constraint_not_duplicate_of_itself(self):
+        location_rule_check_duplicates(self.get_constraint("L2"), False)
@@ -385,6 +385,96 @@ class CommandRunnerTest(TestCase):
             ]
         )
 
+    def test_debug_log_disabled(self, mock_popen):
+        command = ["a_command"]
+        mock_process = mock.MagicMock(spec_set=["communicate", "returncode"])
+        mock_process.communicate.return_value = ("stdout", "stderr")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+        self.mock_logger.isEnabledFor.return_value = False
+
+        runner = lib.CommandRunner(self.mock_logger, self.mock_reporter)
+        runner.run(command, stdin_string="stdin")
+
+        self.mock_logger.debug.assert_not_called()
+        self.assertEqual(len(self.mock_reporter.report_item_list), 2)
+
+    @mock.patch.object(settings, "debug_payload_max_length", 3)
+    def test_debug_payload_truncated(self, mock_popen):
+        command = ["a_command"]
+        command_str = "a_command"
+        mock_process = mock.MagicMock(spec_set=["communicate", "returncode"])
+        mock_process.communicate.return_value = ("stdout", "stderr")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        runner = lib.CommandRunner(self.mock_logger, self.mock_reporter)
+        real_stdout, real_stderr, dummy_retval = runner.run(
+            command, stdin_string="stdin"
+        )
+
+        self.assertEqual(real_stdout, "stdout")
+        self.assertEqual(real_stderr, "stderr")
+        mock_process.communicate.assert_called_once_with("stdin")
+        logger_calls = [
+            mock.call(
+                outdent(
+                    """\
+                    Running: {0}
+                    Environment:
+                    --Debug Input Start--
+                    std
+                    --Debug Output Truncated, 2 characters omitted--
+                    --Debug Input End--"""
+                ).format(command_str)
+            ),
+            mock.call(
+                outdent(
+                    """\
+                    Finished running: {0}
+                    Return value: 0
+                    --Debug Stdout Start--
+                    std
+                    --Debug Output Truncated, 3 characters omitted--
+                    --Debug Stdout End--
+                    --Debug Stderr Start--
+                    std
+                    --Debug Output Truncated, 3 characters omitted--
+                    --Debug Stderr End--"""
+                ).format(command_str)
+            ),
+        ]
+        self.assertEqual(self.mock_logger.debug.call_count, len(logger_calls))
+        self.mock_logger.debug.assert_has_calls(logger_calls)
+        truncated = "std\n--Debug Output Truncated, 3 characters omitted--"
+        assert_report_item_list_equal(
+            self.mock_reporter.report_item_list,
+            [
+                (
+                    severity.DEBUG,
+                    report_codes.RUN_EXTERNAL_PROCESS_STARTED,
+                    {
+                        "command": command_str,
+                        "stdin": (
+                            "std\n--Debug Output Truncated, 2 characters "
+                            "omitted--"
+                        ),
+                        "environment": dict(),
+                    }
+                ),
+                (
+                    severity.DEBUG,
+                    report_codes.RUN_EXTERNAL_PROCESS_FINISHED,
+                    {
+                        "command": command_str,
+                        "return_value": 0,
+                        "stdout": truncated,
+                        "stderr": truncated,
+                    }
+                )
+            ]
+        )
+
 
 @mock.patch("pcs.lib.external.is_systemctl")
 @mock.patch("pcs.lib.external.is_service_installed")
@@ -958,6 +1048,108 @@ class GetNonSystemdServicesTest(TestCase):
         self.assertEqual(mock_is_systemctl.call_count, 1)
         self.assertEqual(self.mock_runner.call_count, 0)
 
+@mock.patch("pcs.lib.external.is_systemctl")
+class GetServicesStateTest(TestCase):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=lib.CommandRunner)
+
+    def test_systemd(self, mock_is_systemctl):
+        mock_is_systemctl.return_value = True
+        self.mock_runner.run.return_value = (outdent(
+            """\
+            LoadState=loaded
+            ActiveState=active
+            UnitFileState=enabled
+
+            LoadState=loaded
+            ActiveState=inactive
+            UnitFileState=static
+
+            LoadState=loaded
+            ActiveState=reloading
+            UnitFileState=disabled
+
+            LoadState=not-found
+            ActiveState=inactive
+            """
+        ), "", 0)
+        self.assertEqual(
+            {
+                "pacemaker": lib.ServiceState(True, True, True),
+                "corosync": lib.ServiceState(True, True, False),
+                "pcsd": lib.ServiceState(True, False, True),
+                "sbd": lib.ServiceState(False, False, False),
+            },
+            lib.get_services_state(
+                self.mock_runner, ["pacemaker", "corosync", "pcsd", "sbd"]
+            )
+        )
+        self.mock_runner.run.assert_called_once_with([
+            _systemctl, "show",
+            "--property=LoadState,ActiveState,UnitFileState", "--",
+            "pacemaker.service", "corosync.service", "pcsd.service",
+            "sbd.service",
+        ])
+
+    def test_systemd_failed(self, mock_is_systemctl):
+        mock_is_systemctl.return_value = True
+        self.mock_runner.run.side_effect = [
+            ("", "error", 1),
+            ("pcsd.service  enabled\n", "", 0),
+            ("", "", 0),
+            ("", "", 3),
+        ]
+        self.assertEqual(
+            {"pcsd": lib.ServiceState(True, True, False)},
+            lib.get_services_state(self.mock_runner, ["pcsd"])
+        )
+        self.assertEqual(
+            [
+                mock.call([
+                    _systemctl, "show",
+                    "--property=LoadState,ActiveState,UnitFileState", "--",
+                    "pcsd.service",
+                ]),
+                mock.call([_systemctl, "list-unit-files", "--full"]),
+                mock.call([_systemctl, "is-enabled", "pcsd.service"]),
+                mock.call([_systemctl, "is-active", "pcsd.service"]),
+            ],
+            self.mock_runner.run.call_args_list
+        )
+
+    def test_not_systemd(self, mock_is_systemctl):
+        mock_is_systemctl.return_value = False
+        self.mock_runner.run.side_effect = [
+            ("pcsd    0:off   1:off   2:on\n", "", 0),
+            ("", "", 0),
+            ("", "", 0),
+            ("", "", 1),
+            ("", "", 0),
+        ]
+        self.assertEqual(
+            {
+                "pcsd": lib.ServiceState(True, True, True),
+                "sbd": lib.ServiceState(False, False, True),
+            },
+            lib.get_services_state(self.mock_runner, ["pcsd", "sbd"])
+        )
+        self.assertEqual(
+            [
+                mock.call([_chkconfig]),
+                mock.call([_chkconfig, "pcsd"]),
+                mock.call([_service, "pcsd", "status"]),
+                mock.call([_chkconfig, "sbd"]),
+                mock.call([_service, "sbd", "status"]),
+            ],
+            self.mock_runner.run.call_args_list
+        )
+
+    def test_no_services(self, mock_is_systemctl):
+        self.assertEqual({}, lib.get_services_state(self.mock_runner, []))
+        mock_is_systemctl.assert_not_called()
+        self.mock_runner.run.assert_not_called()
+
+
 @mock.patch("pcs.lib.external.is_systemctl")
 class EnsureIsSystemctlTest(TestCase):
     # pylint: disable=no-self-use
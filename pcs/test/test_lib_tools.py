@@ -38,3 +38,26 @@ ANOTHER ONE="complex value"
 OPTION=value
 """
         self.assertEqual(expected, tools.dict_to_environment_file(cfg_dict))
+
+
+class TruncateDebugPayloadTest(TestCase):
+    def test_no_limit(self):
+        self.assertEqual("payload", tools.truncate_debug_payload("payload", 0))
+
+    def test_short_payload(self):
+        self.assertEqual("payload", tools.truncate_debug_payload("payload", 7))
+
+    def test_none(self):
+        self.assertEqual(None, tools.truncate_debug_payload(None, 3))
+
+    def test_truncate(self):
+        self.assertEqual(
+            "pay\n--Debug Output Truncated, 4 characters omitted--",
+            tools.truncate_debug_payload("payload", 3)
+        )
+
+    def test_truncate_bytes(self):
+        self.assertEqual(
+            b"pay\n--Debug Output Truncated, 4 characters omitted--",
+            tools.truncate_debug_payload(b"payload", 3)
+        )
@@ -4,6 +4,7 @@ from unittest import mock, TestCase
 from lxml import etree
 
 from pcs import node
+from pcs.cli.common.errors import CmdLineInputError
 from pcs.test.tools.assertions import (
     ac,
     AssertPcsMixin,
@@ -25,6 +26,31 @@ from pcs import utils
 empty_cib = rc("cib-empty-withnodes.xml")
 temp_cib = rc("temp-cib.xml")
 
+class PrepareNodeOptions(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            {
+                "node1": {"a": "1", "b": ""},
+                "node2": {"a": "2"},
+            },
+            node.prepare_node_options(["node1", "a=1", "b=", "node2", "a=2"])
+        )
+
+    def test_node_without_options(self):
+        self.assertRaises(
+            CmdLineInputError,
+            node.prepare_node_options,
+            ["node1", "a=1", "node2"]
+        )
+
+    def test_node_specified_twice(self):
+        self.assertRaises(
+            CmdLineInputError,
+            node.prepare_node_options,
+            ["node1", "a=1", "node2", "a=2", "node1", "b=1"]
+        )
+
+
 class NodeUtilizationSet(
     TestCase,
     get_assert_pcs_effect_mixin(
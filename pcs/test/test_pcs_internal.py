@@ -0,0 +1,134 @@
+import json
+from io import StringIO
+from unittest import mock, TestCase
+
+from pcs import pcs_internal, utils
+from pcs.lib.errors import ReportItem
+
+
+def known_hosts_output(*host_list):
+    return (
+        dict(
+            status="ok",
+            data=dict(known_hosts={
+                host: dict(
+                    token="token",
+                    dest_list=[dict(addr=host, port=2224)],
+                )
+                for host in host_list
+            }),
+        ),
+        0
+    )
+
+
+class LibraryReportProcessor(TestCase):
+    def test_items_are_not_shared(self):
+        processor = pcs_internal.LibraryReportProcessor()
+        processor.process(ReportItem.info("CODE"))
+        self.assertEqual(1, len(processor.processed_items))
+        self.assertEqual(
+            [], pcs_internal.LibraryReportProcessor().processed_items
+        )
+
+    def test_debug_reports_dropped(self):
+        processor = pcs_internal.LibraryReportProcessor()
+        processor.process(ReportItem.debug("CODE"))
+        self.assertEqual([], processor.processed_items)
+
+
+@mock.patch("pcs.pcs_internal.os.geteuid", lambda: 0)
+class RunWorker(TestCase):
+    def run_worker(self, *request_list):
+        response_stream = StringIO()
+        pcs_internal.run_worker(
+            StringIO("\n".join(request_list) + "\n"), response_stream
+        )
+        return [
+            json.loads(line)
+            for line in response_stream.getvalue().splitlines()
+        ]
+
+    def assert_status(self, response, status, status_msg):
+        self.assertEqual(
+            dict(
+                status=status,
+                status_msg=status_msg,
+                report_list=[],
+                data=None,
+            ),
+            response
+        )
+
+    def test_process_requests_one_per_line(self):
+        response_list = self.run_worker(
+            json.dumps(dict(cmd="unknown", cmd_data={})),
+            "",
+            "invalid",
+            json.dumps(dict(cmd="cluster.setup")),
+            "[]",
+        )
+        self.assertEqual(4, len(response_list))
+        self.assert_status(
+            response_list[0], "unknown_cmd", "Unknown command 'unknown'"
+        )
+        self.assert_status(
+            response_list[1],
+            "input_error",
+            "Unable to parse input data: Expecting value"
+        )
+        self.assert_status(
+            response_list[2], "input_error", "Missing key 'cmd_data'"
+        )
+        self.assert_status(
+            response_list[3], "input_error", "Input data must be an object"
+        )
+
+    @mock.patch("pcs.pcs_internal.Library")
+    def test_user_from_request(self, mock_library):
+        mock_library.return_value.cluster.setup.return_value = "data"
+        response_list = self.run_worker(
+            json.dumps(dict(
+                cmd="cluster.setup",
+                cmd_data=dict(cluster_name="name"),
+                options=dict(cib_user="user", cib_user_groups=["g1", "g2"]),
+            )),
+            json.dumps(dict(cmd="cluster.setup", cmd_data={}, options={})),
+        )
+        self.assertEqual(
+            ["success", "success"],
+            [response["status"] for response in response_list]
+        )
+        self.assertEqual("data", response_list[0]["data"])
+        env_list = [call[0][0] for call in mock_library.call_args_list]
+        self.assertEqual(
+            [("user", ["g1", "g2"]), (None, None)],
+            [(env.user, env.groups) for env in env_list]
+        )
+        self.assertIsNot(
+            env_list[0].report_processor, env_list[1].report_processor
+        )
+        mock_library.return_value.cluster.setup.assert_any_call(
+            cluster_name="name"
+        )
+
+    @mock.patch("pcs.utils.run_pcsdcli")
+    @mock.patch("pcs.pcs_internal.Library")
+    def test_known_hosts_read_for_each_request(
+        self, mock_library, mock_pcsdcli
+    ):
+        self.addCleanup(utils.read_known_hosts_file.cache_clear)
+        mock_library.return_value.cluster.setup.side_effect = (
+            lambda: sorted(mock_library.call_args[0][0].known_hosts_getter())
+        )
+        # the known-hosts file changes between the requests
+        mock_pcsdcli.side_effect = [
+            known_hosts_output("node1"),
+            known_hosts_output("node1", "node2"),
+        ]
+        request = json.dumps(dict(cmd="cluster.setup", cmd_data={}))
+        response_list = self.run_worker(request, request)
+        self.assertEqual(
+            [["node1"], ["node1", "node2"]],
+            [response["data"] for response in response_list]
+        )
@@ -3,6 +3,8 @@ import shutil
 from unittest import TestCase
 import xml.dom.minidom
 
+from lxml import etree
+
 from pcs import rule
 from pcs.test.tools.assertions import ac
 from pcs.test.tools.misc import get_test_resource as rc
@@ -1643,14 +1645,14 @@ class ExportAsExpressionTest(TestCase):
         ac(
             export + "\n",
             rule.ExportAsExpression().get_string(
-                xml.dom.minidom.parseString(rule_xml).documentElement,
+                etree.fromstring(rule_xml),
                 normalize=False
             ) + "\n"
         )
         ac(
             export_normalized + "\n",
             rule.ExportAsExpression().get_string(
-                xml.dom.minidom.parseString(rule_xml).documentElement,
+                etree.fromstring(rule_xml),
                 normalize=True
             ) + "\n"
         )
@@ -1,15 +1,17 @@
 # pylint: disable=too-many-lines
 from io import StringIO
 import sys
-from time import sleep
 from unittest import mock, TestCase
 import xml.dom.minidom
 import xml.etree.cElementTree as ET
 
+from lxml import etree
+
 from pcs.test.tools.xml import dom_get_child_elements
 from pcs.test.tools.misc import get_test_resource as rc
 
-from pcs import utils
+from pcs import settings, utils
+from pcs.lib.external import ServiceState
 
 # pylint: disable=too-many-public-methods, too-many-statements, line-too-long, invalid-name
 
@@ -497,7 +499,16 @@ class UtilsTest(TestCase):
         self.assertEqual(None, utils.dom_get_parent_by_tag_names(cc1, ["ee"]))
 
     def testValidateConstraintResource(self):
-        dom = self.get_cib_resources()
+        with mock.patch.dict(utils.pcs_options, clear=True):
+            self.assert_validate_constraint_resource(self.get_cib_resources())
+
+    def testValidateConstraintResourceEtree(self):
+        with mock.patch.dict(utils.pcs_options, clear=True):
+            self.assert_validate_constraint_resource(
+                etree.fromstring(self.get_cib_resources().toxml())
+            )
+
+    def assert_validate_constraint_resource(self, dom):
         self.assertEqual(
             (True, "", "myClone"),
             utils.validate_constraint_resource(dom, "myClone")
@@ -726,6 +737,25 @@ class UtilsTest(TestCase):
         self.assertFalse(utils.is_iso8601_date("2014-W27-8"))
         self.assertFalse(utils.is_iso8601_date("2014-367"))
 
+    def test_find_unique_id(self):
+        dom = xml.dom.minidom.parseString("""
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="myId"/>
+                        <primitive id="myId-1"/>
+                        <primitive id="myId-3"/>
+                    </resources>
+                </configuration>
+                <status>
+                    <node_state id="other"/>
+                </status>
+            </cib>
+        """)
+        self.assertEqual("myId-2", utils.find_unique_id(dom, "myId"))
+        self.assertEqual("other", utils.find_unique_id(dom, "other"))
+        self.assertEqual("new", utils.find_unique_id(dom, "new"))
+
     def test_is_score(self):
         self.assertTrue(utils.is_score("INFINITY"))
         self.assertTrue(utils.is_score("+INFINITY"))
@@ -1837,43 +1867,202 @@ class UtilsTest(TestCase):
             self.assertEqual(node.tagName, tag)
 
 
-class RunParallelTest(TestCase):
-    @staticmethod
-    def fixture_create_worker(log, name, sleepSeconds=0):
-        def worker():
-            sleep(sleepSeconds)
-            log.append(name)
-        return worker
-
-    def test_run_all_workers(self):
-        log = []
-        utils.run_parallel(
+class FakeCommunicator():
+    def __init__(self, response_map, completion_order):
+        # node -> list of (was_connected, response code or error, data)
+        self.response_map = response_map
+        self.completion_order = completion_order
+        self.queue = []
+        self.request_list = []
+
+    def add_requests(self, request_list):
+        self.queue.extend(request_list)
+        self.request_list.extend(request_list)
+
+    def start_loop(self):
+        while self.queue:
+            request = min(
+                self.queue,
+                key=lambda req: self.completion_order.index(req.host_label)
+            )
+            self.queue.remove(request)
+            was_connected, code, data = (
+                self.response_map[request.host_label].pop(0)
+            )
+            yield mock.Mock(
+                request=request,
+                was_connected=was_connected,
+                response_code=(code if was_connected else None),
+                error_msg=(None if was_connected else code),
+                data=data,
+            )
+
+
+@mock.patch("pcs.utils.read_known_hosts_file", mock.Mock(return_value={}))
+@mock.patch("pcs.utils._get_node_communicator_factory")
+class SendHttpRequests(TestCase):
+    def setUp(self):
+        self.report_list = []
+        self.communicator = None
+
+    def fixture_communicator(self, factory, response_map, completion_order):
+        self.communicator = FakeCommunicator(response_map, completion_order)
+        factory.return_value.get_communicator.return_value = (
+            self.communicator
+        )
+
+    def report(self, node, returncode, output):
+        self.report_list.append((node, returncode, output))
+
+    def test_report_in_completion_order(self, factory):
+        self.fixture_communicator(
+            factory,
+            {
+                "node1": [(True, 200, "one")],
+                "node2": [(True, 401, "")],
+                "node3": [(False, "Connection refused", "")],
+            },
+            ["node3", "node1", "node2"]
+        )
+        with mock.patch.dict(utils.pcs_options, clear=True):
+            utils._send_http_requests(
+                self.report, ["node1", "node2", "node3"], "remote/status",
+                data="a=1&b=", printResult=False, printSuccess=False,
+            )
+        self.assertEqual(
             [
-                self.fixture_create_worker(log, 'first'),
-                self.fixture_create_worker(log, 'second'),
+                (
+                    "node3", 2,
+                    "Unable to connect to node3, try setting higher timeout "
+                        "in --request-timeout option (Connection refused)"
+                ),
+                ("node1", 0, "one"),
+                (
+                    "node2", 3,
+                    "Unable to authenticate to node2 - (HTTP error: 401), "
+                        "try running 'pcs host auth node2'"
+                ),
             ],
-            wait_seconds=.1
+            self.report_list
+        )
+        self.assertEqual(
+            ["a=1&b="],
+            list(set(req.data for req in self.communicator.request_list))
+        )
+        factory.return_value.get_communicator.assert_called_once_with(
+            request_timeout=settings.default_request_timeout
+        )
+
+    def test_request_timeout_option(self, factory):
+        self.fixture_communicator(
+            factory, {"node1": [(True, 200, "one")]}, ["node1"]
+        )
+        with mock.patch.dict(
+            utils.pcs_options, {"--request-timeout": 5}, clear=True
+        ):
+            utils._send_http_requests(
+                self.report, ["node1"], "remote/status", timeout=120,
+                printResult=False, printSuccess=False,
+            )
+        factory.return_value.get_communicator.assert_called_once_with(
+            request_timeout=5
         )
 
+    def test_repeat_on_timeout(self, factory):
+        timeout = (False, "Operation timed out after 1 milliseconds", "")
+        self.fixture_communicator(
+            factory,
+            {
+                "node1": [timeout, (True, 200, "one")],
+                "node2": [timeout, timeout, timeout],
+            },
+            ["node1", "node2"]
+        )
+        with mock.patch.dict(utils.pcs_options, clear=True):
+            utils._send_http_requests(
+                self.report, ["node1", "node2"], "remote/cluster_stop",
+                printResult=False, printSuccess=False, repeat_on_timeout=2,
+            )
         self.assertEqual(
-            sorted(log),
-            sorted(['first', 'second'])
+            [
+                ("node1", 0, "one"),
+                (
+                    "node2", 2,
+                    "Unable to connect to node2, try setting higher timeout "
+                        "in --request-timeout option (Operation timed out "
+                        "after 1 milliseconds)"
+                ),
+            ],
+            self.report_list
         )
+        self.assertEqual(5, len(self.communicator.request_list))
 
+    def test_send_http_request(self, factory):
+        self.fixture_communicator(
+            factory, {"node1": [(True, 403, "")]}, ["node1"]
+        )
+        with mock.patch.dict(utils.pcs_options, clear=True):
+            self.assertEqual(
+                (4, "node1: Permission denied - (HTTP error: 403)"),
+                utils.sendHTTPRequest(
+                    "node1", "remote/status", printResult=False,
+                    printSuccess=False
+                )
+            )
 
-class NodeActionTaskTest(TestCase):
-    def test_can_run_action(self):
-        def action(node, arg, kwarg=None):
-            return (0, ':'.join([node, arg, kwarg]))
+    def test_parallel_for_nodes(self, factory):
+        self.fixture_communicator(
+            factory,
+            {
+                "node1": [(True, 200, " Starting Cluster...\n")],
+                "node2": [(True, 500, "")],
+            },
+            ["node2", "node1"]
+        )
+        with mock.patch.dict(utils.pcs_options, clear=True):
+            with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+                node_errors = utils.parallel_for_nodes(
+                    utils.startCluster, ["node1", "node2"], quiet=True
+                )
+        self.assertEqual(
+            {"node2": "node2: Error connecting to node2 - (HTTP error: 500)"},
+            node_errors
+        )
+        self.assertEqual(
+            (
+                "node2: Error connecting to node2 - (HTTP error: 500)\n"
+                "node1: Starting Cluster...\n"
+            ),
+            stdout.getvalue()
+        )
+        self.assertEqual(
+            ["remote/cluster_start"],
+            list(set(req.action for req in self.communicator.request_list))
+        )
 
-        report_list = []
-        def report(node, returncode, output):
-            report_list.append('|'.join([node, str(returncode), output]))
 
-        task = utils.create_task(report, action, 'node', 'arg', kwarg='kwarg')
-        task()
+class NodeHttpAction(TestCase):
+    @staticmethod
+    def build_request(arg, kwarg=None):
+        return dict(request="remote/{0}/{1}".format(arg, kwarg), data="x=1")
+
+    @mock.patch("pcs.utils.sendHTTPRequest")
+    def test_call_for_node(self, mock_send):
+        mock_send.return_value = (0, "output")
+        action = utils.node_http_action(self.build_request)
+        self.assertEqual((0, "output"), action("node", "arg", kwarg="kwarg"))
+        mock_send.assert_called_once_with(
+            "node", request="remote/arg/kwarg", data="x=1"
+        )
 
-        self.assertEqual(['node|0|node:arg:kwarg'], report_list)
+    def test_repeat_if_timeout(self):
+        action = utils.repeat_if_timeout(
+            utils.node_http_action(self.build_request), repeat_count=3
+        )
+        self.assertEqual(
+            dict(request="remote/arg/None", data="x=1", repeat_on_timeout=3),
+            action.build_request("arg")
+        )
 
 
 class TouchCibFile(TestCase):
@@ -1890,3 +2079,176 @@ class TouchCibFile(TestCase):
         err.assert_called_once_with(
             "Unable to write to file: '/fake/filename': 'some message'"
         )
+
+
+@mock.patch("pcs.utils.usefile", False)
+@mock.patch("pcs.utils.subprocess.Popen")
+class CibSnapshot(TestCase):
+    cib = """
+        <cib>
+            <configuration>
+                <resources>
+                    <group id="G"><primitive id="R1"/></group>
+                    <primitive id="R2"/>
+                </resources>
+            </configuration>
+        </cib>
+    """
+
+    def setUp(self):
+        utils.invalidate_cib_snapshot()
+        self.addCleanup(utils.invalidate_cib_snapshot)
+
+    def mock_popen(self, mock_popen):
+        process = mock.Mock(returncode=0)
+        process.communicate.return_value = (self.cib, None)
+        mock_popen.return_value = process
+
+    @staticmethod
+    def commands(mock_popen):
+        return [
+            call_args[0][0][1:] for call_args in mock_popen.call_args_list
+        ]
+
+    def test_cib_loaded_once(self, mock_popen):
+        self.mock_popen(mock_popen)
+        self.assertEqual(self.cib, utils.get_cib())
+        utils.get_cib_dom()
+        self.assertTrue(utils.does_exist("//group[@id='G']"))
+        self.assertFalse(utils.does_exist("//group[@id='R1']"))
+        self.assertEqual(
+            '<primitive id="R2"/>\n',
+            utils.get_cib_xpath("//primitive[@id='R2']")
+        )
+        self.assertEqual([["-l", "-Q"]], self.commands(mock_popen))
+
+    def test_multiple_matches_wrapped(self, mock_popen):
+        self.mock_popen(mock_popen)
+        self.assertEqual(
+            '<xpath-query><primitive id="R1"/><primitive id="R2"/>'
+                '</xpath-query>\n'
+            ,
+            utils.get_cib_xpath("//primitive")
+        )
+
+    def test_invalid_xpath(self, mock_popen):
+        self.mock_popen(mock_popen)
+        self.assertEqual("", utils.get_cib_xpath("//primitive["))
+
+    def test_scope_not_cached(self, mock_popen):
+        self.mock_popen(mock_popen)
+        utils.get_cib("configuration")
+        utils.get_cib("configuration")
+        self.assertEqual(
+            [["-l", "-Q", "--scope=configuration"]] * 2,
+            self.commands(mock_popen)
+        )
+
+    def test_queries_keep_snapshot(self, mock_popen):
+        self.mock_popen(mock_popen)
+        utils.get_cib()
+        utils.run(["cibadmin", "-Q", "--xpath", "//primitive"])
+        utils.run(["crm_mon", "--one-shot", "--as-xml"])
+        utils.get_cib()
+        self.assertEqual(
+            [
+                ["-l", "-Q"],
+                ["-Q", "--xpath", "//primitive"],
+                ["--one-shot", "--as-xml"],
+            ],
+            self.commands(mock_popen)
+        )
+
+    def test_replace_invalidates_snapshot(self, mock_popen):
+        self.mock_popen(mock_popen)
+        utils.get_cib()
+        utils.replace_cib_configuration("<configuration/>")
+        utils.get_cib()
+        self.assertEqual(
+            [
+                ["-l", "-Q"],
+                [
+                    "--replace", "-V", "--xml-pipe", "-o", "configuration"
+                ],
+                ["-l", "-Q"],
+            ],
+            self.commands(mock_popen)
+        )
+
+    def test_other_commands_invalidate_snapshot(self, mock_popen):
+        self.mock_popen(mock_popen)
+        utils.get_cib()
+        utils.run(["crm_resource", "--cleanup"])
+        utils.get_cib()
+        self.assertEqual(
+            [["-l", "-Q"], ["--cleanup"], ["-l", "-Q"]],
+            self.commands(mock_popen)
+        )
+
+    def test_cib_file_change_invalidates_snapshot(self, mock_popen):
+        self.mock_popen(mock_popen)
+        utils.get_cib()
+        with mock.patch("pcs.utils.usefile", True), \
+            mock.patch("pcs.utils.filename", "/fake/cib.xml"), \
+            mock.patch("pcs.utils.touch_cib_file"):
+            utils.get_cib()
+        self.assertEqual([["-l", "-Q"]] * 2, self.commands(mock_popen))
+
+    def test_library_command_invalidates_snapshot(self, mock_popen):
+        self.mock_popen(mock_popen)
+        utils.get_cib()
+        run = utils.get_middleware_factory().cib
+        run(lambda env: None, mock.Mock())
+        utils.get_cib()
+        self.assertEqual([["-l", "-Q"]] * 2, self.commands(mock_popen))
+
+
+@mock.patch("pcs.utils.sbd.get_sbd_service_name", lambda: "sbd")
+class PrintDaemonStatus(TestCase):
+    def test_success(self):
+        daemons_state = {
+            "corosync": ServiceState(True, False, True),
+            "pacemaker": ServiceState(True, True, False),
+            "pacemaker_remote": ServiceState(False, False, False),
+            "pcsd": ServiceState(True, True, True),
+            "sbd": ServiceState(True, True, False),
+        }
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            utils.print_daemon_status(daemons_state, "  ")
+        self.assertEqual(
+            stdout.getvalue(),
+            "Daemon Status:\n"
+            "  corosync: active/disabled\n"
+            "  pacemaker: inactive/enabled\n"
+            "  pcsd: active/enabled\n"
+            "  sbd: inactive/enabled\n"
+        )
+
+    def test_no_state(self):
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            utils.print_daemon_status({}, "  ")
+        self.assertEqual(stdout.getvalue(), "Daemon Status:\n")
+
+    @mock.patch("pcs.utils.cmd_runner", mock.Mock(return_value="runner"))
+    @mock.patch("pcs.utils.get_services_state")
+    def test_get_daemons_state(self, mock_get_state):
+        mock_get_state.return_value = "state"
+        self.assertEqual("state", utils.get_daemons_state())
+        mock_get_state.assert_called_once_with(
+            "runner", ["corosync", "pacemaker", "pacemaker_remote", "pcsd", "sbd"]
+        )
+
+
+class GetClusterNameFromCib(TestCase):
+    @mock.patch("pcs.utils.settings.corosync_conf_file", "/nonexistent")
+    @mock.patch("pcs.utils.get_set_properties")
+    def test_name_from_cib(self, mock_properties):
+        cib_dom = xml.dom.minidom.parseString("""
+            <cib><configuration><crm_config>
+                <cluster_property_set id="set">
+                    <nvpair id="n" name="cluster-name" value="cib-name"/>
+                </cluster_property_set>
+            </crm_config></configuration></cib>
+        """)
+        self.assertEqual("cib-name", utils.getClusterName(cib_dom))
+        mock_properties.assert_not_called()
@@ -182,7 +182,7 @@ class HostShortcuts:
     def check_pacemaker_started(
         self, pacemaker_started_node_list=(),
         pacemaker_not_started_node_list=(), communication_list=None,
-        name="http.host.check_pacemaker_started",
+        name="http.host.check_pacemaker_started", wait_timeout=None,
     ):
         """
         Create a call for checking pacemaker status on nodes.
@@ -193,6 +193,8 @@ class HostShortcuts:
             pacemaker is not fully started yet
         communication_list list -- create custom responses
         name string -- the key of this call
+        int wait_timeout -- if set, pcsd is asked to wait for pacemaker to start
+            at most this number of seconds
         """
         if (
             bool(pacemaker_started_node_list or pacemaker_not_started_node_list)
@@ -223,12 +225,21 @@ class HostShortcuts:
                 ) for node in pacemaker_not_started_node_list
             ]
 
-        place_communication(
-            self.__calls,
-            name,
-            communication_list,
-            action="remote/pacemaker_node_status",
-        )
+        if wait_timeout is None:
+            place_communication(
+                self.__calls,
+                name,
+                communication_list,
+                action="remote/pacemaker_node_status",
+            )
+        else:
+            place_communication(
+                self.__calls,
+                name,
+                communication_list,
+                action="remote/pacemaker_node_status_wait",
+                param_list=[("timeout", str(wait_timeout))],
+            )
 
     def get_quorum_status(
         self, node_list=None, node_labels=None, communication_list=None,
@@ -54,6 +54,9 @@ def get_push_cib(call_queue):
 
         if expected_call.exception:
             raise expected_call.exception
+        # a real push changes the cluster state, it must be loaded again
+        # pylint: disable=protected-access
+        lib_env._cluster_state = None
     return push_cib
 
 def is_push_cib_call_in(call_queue):
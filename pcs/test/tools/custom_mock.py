@@ -79,6 +79,8 @@ class MockCurl:
         self._error = error
         self._exception = exception
         self.request_obj = request
+        self.output_buffer = io.BytesIO()
+        self.debug_buffer = io.BytesIO()
 
     @property
     def opts(self):
@@ -214,3 +216,73 @@ class MockCurlMulti:
                 err_list.append((handle, errno, msg))
             self._proccessed_list.append(handle)
         return (0, ok_list, err_list)
+
+
+class MockCurlMultiSocket:
+    """
+    CurlMulti driven by socket_action calls. It sets a timer when a handle is
+    added and each socket_action call finishes the specified number of handles.
+    """
+    def __init__(self, number_of_performed_list):
+        self._number_of_performed_list = number_of_performed_list
+        self._opts = {}
+        self._handle_list = []
+        self._finished_list = []
+
+    @property
+    def opts(self):
+        return self._opts
+
+    def setopt(self, opt, val):
+        self._opts[opt] = val
+
+    def add_handle(self, handle):
+        if not isinstance(handle, MockCurl):
+            raise AssertionError("Only MockCurl objects are allowed")
+        if handle in self._handle_list:
+            # same error as real CurlMulti object
+            raise pycurl.error("curl object already on this multi-stack")
+        self._handle_list.append(handle)
+        self._opts[pycurl.M_TIMERFUNCTION](0)
+
+    def remove_handle(self, handle):
+        if handle not in self._handle_list:
+            # same error as real CurlMulti object
+            raise pycurl.error("curl object not on this multi-stack")
+        self._handle_list.remove(handle)
+
+    def assert_no_handle_left(self):
+        if self._handle_list:
+            raise AssertionError(
+                "{0} handle(s) left to process".format(len(self._handle_list))
+            )
+
+    def socket_action(self, socket_fd, event):
+        # pylint: disable=unused-argument
+        if not self._number_of_performed_list:
+            raise AssertionError("unexpected socket_action call")
+        number_to_perform = self._number_of_performed_list.pop(0)
+        running_list = [
+            handle for handle in self._handle_list
+            if handle not in self._finished_list
+        ]
+        if number_to_perform > len(running_list):
+            raise AssertionError("expecting more handles than prepared")
+        for handle in running_list[:number_to_perform]:
+            handle.perform()
+            self._finished_list.append(handle)
+        if number_to_perform < len(running_list):
+            # call again to process the rest
+            self._opts[pycurl.M_TIMERFUNCTION](0)
+        return (0, len(running_list) - number_to_perform)
+
+    def info_read(self):
+        ok_list = []
+        err_list = []
+        for handle in self._finished_list:
+            if handle.error:
+                err_list.append((handle, handle.error[0], handle.error[1]))
+            else:
+                ok_list.append(handle)
+        self._finished_list = []
+        return (0, ok_list, err_list)
@@ -0,0 +1,58 @@
+def knet_config(node_count, link_count=8):
+    """
+    Return text of corosync.conf of a knet cluster with all links configured
+
+    int node_count -- number of nodes in the cluster
+    int link_count -- number of links, each node has an address on each link
+    """
+    lines = [
+        "totem {",
+        "    version: 2",
+        "    cluster_name: benchmark",
+        "    transport: knet",
+        "    ip_version: ipv6-4",
+        "    crypto_cipher: aes256",
+        "    crypto_hash: sha256",
+    ]
+    for link in range(link_count):
+        lines.extend([
+            "",
+            "    interface {",
+            "        linknumber: {0}".format(link),
+            "        knet_link_priority: {0}".format(link),
+            "        knet_ping_interval: 1000",
+            "        knet_ping_timeout: 2000",
+            "        knet_transport: udp",
+            "    }",
+        ])
+    lines.extend(["}", "", "nodelist {"])
+    for node in range(1, node_count + 1):
+        if node > 1:
+            lines.append("")
+        lines.append("    node {")
+        for link in range(link_count):
+            lines.append(
+                "        ring{0}_addr: 10.{0}.{1}.{2}".format(
+                    link, node // 256, node % 256
+                )
+            )
+        lines.extend([
+            "        name: node-{0}".format(node),
+            "        nodeid: {0}".format(node),
+            "    }",
+        ])
+    lines.extend([
+        "}",
+        "",
+        "quorum {",
+        "    provider: corosync_votequorum",
+        "}",
+        "",
+        "logging {",
+        "    to_logfile: yes",
+        "    logfile: /var/log/cluster/corosync.log",
+        "    to_syslog: yes",
+        "    timestamp: on",
+        "}",
+    ])
+    return "\n".join(lines) + "\n"
@@ -22,6 +22,7 @@ def full_usage():
     out += strip_extras(host([], False))
     out += strip_extras(alert([], False))
     out += strip_extras(client([], False))
+    out += strip_extras(batch([], False))
     print(out.strip())
     print("Examples:\n" + examples.replace(r" \ ", ""))
 
@@ -123,6 +124,7 @@ def generate_completion_tree_from_usage():
     tree["alert"] = generate_tree(alert([], False))
     tree["booth"] = generate_tree(booth([], False))
     tree["client"] = generate_tree(client([], False))
+    tree["batch"] = generate_tree(batch([], False))
     return tree
 
 def generate_tree(usage_txt):
@@ -166,6 +168,8 @@ Options:
                        --full is specified.
     --request-timeout  Timeout for each outgoing request to another node in
                        seconds. Default is 60s.
+    --profile-startup  Print time spent and modules loaded before running
+                       a command to stderr.
     --force            Override checks and errors, the exact behavior depends on
                        the command. WARNING: Using the --force option is
                        strongly discouraged unless you know what you are doing.
@@ -187,6 +191,7 @@ Commands:
     node        Manage cluster nodes.
     alert       Manage pacemaker alerts.
     client      Manage pcsd client configuration.
+    batch       Run many CIB commands and push their changes at once.
 """
 # Advanced usage to possibly add later
 #  --corosync_conf=<corosync file> Specify alternative corosync.conf file
@@ -210,10 +215,11 @@ Commands:
         Show options of all currently configured resources or if resource ids
         are specified show the options for the specified resource ids.
 
-    list [filter] [--nodesc]
+    list [filter] [--nodesc] [--jobs=<n>]
         Show list of all available resource agents (if filter is provided then
         only resource agents matching the filter will be shown). If --nodesc is
-        used then descriptions of resource agents are not printed.
+        used then descriptions of resource agents are not printed. Descriptions
+        of up to 8 agents are loaded at once, use --jobs to change it.
 
     describe [<standard>:[<provider>:]]<type> [--full]
         Show options for the specified resource. If --full is specified, all
@@ -359,6 +365,12 @@ Commands:
     agents [standard[:provider]]
         List available agents optionally filtered by standard and provider.
 
+    metadata-cache <clear | warm-up>
+        Resource and stonith agents' metadata are cached on the local node
+        until the agents or pacemaker are updated. Use 'clear' to remove all
+        cached metadata. Use 'warm-up' to cache metadata of all available
+        agents.
+
     update <resource id> [resource options] [op [<operation action>
            <operation options>]...] [meta <meta operations>...] [--wait[=n]]
         Add/Change options to specified resource, clone or multi-state
@@ -930,10 +942,11 @@ Commands:
         Show options of all currently configured stonith devices or if stonith
         ids are specified show the options for the specified stonith device ids.
 
-    list [filter] [--nodesc]
+    list [filter] [--nodesc] [--jobs=<n>]
         Show list of all available stonith agents (if filter is provided then
         only stonith agents matching the filter will be shown). If --nodesc is
-        used then descriptions of stonith agents are not printed.
+        used then descriptions of stonith agents are not printed. Descriptions
+        of up to 8 agents are loaded at once, use --jobs to change it.
 
     describe <stonith agent> [--full]
         Show options for specified stonith agent. If --full is specified, all
@@ -1613,13 +1626,16 @@ Usage: pcs node <command>
 Manage cluster nodes
 
 Commands:
-    attribute [[<node>] [--name <name>] | <node> <name>=<value> ...]
+    attribute [[<node>] [--name <name>] | <node> <name>=<value> ...
+            [<node> <name>=<value> ...]...]
         Manage node attributes.  If no parameters are specified, show attributes
         of all nodes.  If one parameter is specified, show attributes
         of specified node.  If --name is specified, show specified attribute's
         value from all nodes.  If more parameters are specified, set attributes
         of specified node.  Attributes can be removed by setting an attribute
-        without a value.
+        without a value.  If more nodes are specified, attributes of all of
+        them are set at once in one CIB update.
+        Example: pcs node attribute node1 rack=1 node2 rack=2 zone=
 
     maintenance [--all | <node>...] [--wait[=n]]
         Put specified node(s) into maintenance mode, if no nodes or options are
@@ -1659,13 +1675,15 @@ Commands:
         the operation not succeeded yet. If 'n' is not specified it defaults
         to 60 minutes.
 
-    utilization [[<node>] [--name <name>] | <node> <name>=<value> ...]
+    utilization [[<node>] [--name <name>] | <node> <name>=<value> ...
+            [<node> <name>=<value> ...]...]
         Add specified utilization options to specified node.  If node is not
         specified, shows utilization of all nodes.  If --name is specified,
         shows specified utilization value from all nodes. If utilization options
         are not specified, shows utilization of specified node.  Utilization
         option should be in format name=value, value has to be integer.  Options
-        may be removed by setting an option without a value.
+        may be removed by setting an option without a value.  If more nodes are
+        specified, utilization of all of them is set at once in one CIB update.
         Example: pcs node utilization node1 cpu=4 ram=
 """
     if pout:
@@ -1949,10 +1967,39 @@ Commands:
     return output
 
 
+def batch(args=(), pout=True):
+    output = """
+Usage: pcs batch <command>
+Run many commands changing the CIB and push their changes at once.
+
+Commands:
+    run [<file>] [--all-or-nothing] [--wait[=n]]
+        Run pcs commands read from the specified file, one per line, or from
+        stdin if no file is specified or the file is '-'. Empty lines and lines
+        starting with '#' are skipped, the leading 'pcs' is optional. Only acl,
+        alert, constraint, node, property, resource and stonith commands can be
+        run. They work with one snapshot of the CIB, each command sees changes
+        made by the previous ones. Changes made by all the commands are pushed
+        to the cluster at once at the end. If -f is specified, the changes are
+        saved to the file instead. A command which fails does not change the
+        CIB, the batch continues with the next command and exits with an error
+        at the end. If --all-or-nothing is specified, the batch stops on the
+        first failed command and no changes are pushed. If --wait is
+        specified, pcs will wait up to 'n' seconds for the cluster to settle
+        after the changes are pushed. Options -f and --wait cannot be
+        specified in the commands.
+"""
+    if pout:
+        print(sub_usage(args, output))
+        return None
+    return output
+
+
 def show(main_usage_name, rest_usage_names):
     usage_map = {
         "acl": acl,
         "alert": alert,
+        "batch": batch,
         "booth": booth,
         "client": client,
         "cluster": cluster,
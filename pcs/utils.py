@@ -14,19 +14,25 @@ from io import BytesIO
 import tarfile
 import getpass
 import base64
-import threading
 import logging
-from functools import lru_cache
-from urllib.parse import urlencode
+from copy import deepcopy
+from functools import lru_cache, wraps
+from urllib.parse import parse_qsl, urlencode
+
+from lxml import etree
 
 from pcs import settings, usage
 
-from pcs.common import (
-    pcs_pycurl as pycurl,
-    report_codes,
-)
+from pcs.common import report_codes
 from pcs.common.host import PcsKnownHost
-from pcs.common.tools import join_multilines
+from pcs.common.node_communicator import (
+    CommunicatorLoggerInterface,
+    NodeCommunicatorFactory,
+    NodeTargetFactory,
+    Request,
+    RequestData,
+)
+from pcs.common.tools import join_multilines, xml_fromstring
 
 from pcs.cli.common import (
     console_report,
@@ -43,6 +49,7 @@ from pcs.cli.common.reports import (
 import pcs.cli.booth.env
 
 from pcs.lib import reports, sbd
+from pcs.lib.agent_metadata_cache import AgentMetadataCache
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import (
@@ -51,9 +58,8 @@ from pcs.lib.external import (
     DisableServiceError,
     enable_service,
     EnableServiceError,
+    get_services_state,
     is_proxy_set,
-    is_service_enabled,
-    is_service_running,
     is_systemctl,
     _service,
     _systemctl,
@@ -68,6 +74,7 @@ from pcs.lib.pacemaker.values import(
     timeout_to_seconds as get_timeout_seconds,
     validate_id,
 )
+from pcs.lib.resource_agent import CrmAgent
 
 # pylint: disable=invalid-name
 # pylint: disable=too-many-branches
@@ -80,11 +87,29 @@ from pcs.lib.pacemaker.values import(
 usefile = False
 filename = ""
 pcs_options = {}
+# CIB loaded once per pcs run, see get_cib and invalidate_cib_snapshot
+_cib_snapshot = {}
 
 
 class UnknownPropertyException(Exception):
     pass
 
+def node_http_action(build_request):
+    """
+    Make a node action sending an HTTP request out of a request builder
+
+    The builder gets arguments of the action except for the node and returns
+    keyword arguments for sendHTTPRequest. The action can be called for one node
+    or run for many nodes at once by run_for_nodes.
+
+    callable build_request -- request builder
+    """
+    @wraps(build_request)
+    def action(node, *args, **kwargs):
+        return sendHTTPRequest(node, **build_request(*args, **kwargs))
+    action.build_request = build_request
+    return action
+
 def getValidateWithVersion(dom):
     """
     Commandline options: no options
@@ -163,12 +188,15 @@ def checkStatus(node):
     return sendHTTPRequest(node, 'remote/status', None, False, False)
 
 # Check and see if we're authorized (faster than a status check)
-def checkAuthorization(node):
+@node_http_action
+def checkAuthorization():
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(node, 'remote/check_auth', None, False, False)
+    return dict(
+        request="remote/check_auth", printResult=False, printSuccess=False
+    )
 
 def get_uid_gid_file_name(uid, gid):
     """
@@ -304,21 +332,12 @@ def repeat_if_timeout(send_http_request_function, repeat_count=15):
     Commandline options: no options
     NOTE: callback send_http_request_function may use --request-timeout
     """
-    def repeater(node, *args, **kwargs):
-        repeats_left = repeat_count
-        while True:
-            retval, output = send_http_request_function(node, *args, **kwargs)
-            if (
-                retval != 2 or "Operation timed out" not in output
-                or
-                repeats_left < 1
-            ):
-                # did not timed out OR repeat limit exceeded
-                return retval, output
-            repeats_left = repeats_left - 1
-            if "--debug" in pcs_options:
-                print("{0}: {1}, trying again...". format(node, output))
-    return repeater
+    def build_request(*args, **kwargs):
+        return dict(
+            send_http_request_function.build_request(*args, **kwargs),
+            repeat_on_timeout=repeat_count
+        )
+    return node_http_action(build_request)
 
 # Set the corosync.conf file on the specified node
 def getCorosyncConfig(node):
@@ -338,47 +357,52 @@ def setCorosyncConfig(node, config):
     if status != 0:
         err("Unable to set corosync config: {0}".format(data))
 
-def getPacemakerNodeStatus(node):
+@node_http_action
+def getPacemakerNodeStatus():
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(
-        node, "remote/pacemaker_node_status", None, False, False
+    return dict(
+        request="remote/pacemaker_node_status", printResult=False,
+        printSuccess=False
     )
 
-def startCluster(node, quiet=False, timeout=None):
+@node_http_action
+def startCluster(quiet=False, timeout=None):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(
-        node,
-        "remote/cluster_start",
+    return dict(
+        request="remote/cluster_start",
         printResult=False,
         printSuccess=not quiet,
         timeout=timeout
     )
 
-def stopPacemaker(node, quiet=False, force=True):
+@node_http_action
+def stopPacemaker(quiet=False, force=True):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return stopCluster(
-        node, pacemaker=True, corosync=False, quiet=quiet, force=force
+    return stopCluster.build_request(
+        pacemaker=True, corosync=False, quiet=quiet, force=force
     )
 
-def stopCorosync(node, quiet=False, force=True):
+@node_http_action
+def stopCorosync(quiet=False, force=True):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return stopCluster(
-        node, pacemaker=False, corosync=True, quiet=quiet, force=force
+    return stopCluster.build_request(
+        pacemaker=False, corosync=True, quiet=quiet, force=force
     )
 
-def stopCluster(node, quiet=False, pacemaker=True, corosync=True, force=True):
+@node_http_action
+def stopCluster(quiet=False, pacemaker=True, corosync=True, force=True):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
@@ -392,37 +416,44 @@ def stopCluster(node, quiet=False, pacemaker=True, corosync=True, force=True):
         data["component"] = "corosync"
     if force:
         data["force"] = 1
-    data = urlencode(data)
-    return sendHTTPRequest(
-        node,
-        'remote/cluster_stop',
-        data,
+    return dict(
+        request="remote/cluster_stop",
+        data=urlencode(data),
         printResult=False,
         printSuccess=not quiet,
         timeout=timeout
     )
 
-def enableCluster(node):
+@node_http_action
+def enableCluster():
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(node, 'remote/cluster_enable', None, False, True)
+    return dict(
+        request="remote/cluster_enable", printResult=False, printSuccess=True
+    )
 
-def disableCluster(node):
+@node_http_action
+def disableCluster():
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(node, 'remote/cluster_disable', None, False, True)
+    return dict(
+        request="remote/cluster_disable", printResult=False, printSuccess=True
+    )
 
-def destroyCluster(node, quiet=False):
+@node_http_action
+def destroyCluster(quiet=False):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(
-        node, 'remote/cluster_destroy', None, not quiet, not quiet
+    return dict(
+        request="remote/cluster_destroy",
+        printResult=not quiet,
+        printSuccess=not quiet
     )
 
 def restoreConfig(node, tarball_data):
@@ -449,165 +480,204 @@ def resumeConfigSyncing(node):
     data = urlencode({"sync_thread_resume": 1})
     return sendHTTPRequest(node, "remote/set_sync_options", data, False, False)
 
-# Send an HTTP request to a node return a tuple with status, data
-# If status is 0 then data contains server response
-# Otherwise if non-zero then data contains error message
-# Returns a tuple (error, error message)
-# 0 = Success,
-# 1 = HTTP Error
-# 2 = No response,
-# 3 = Auth Error
-# 4 = Permission denied
-def sendHTTPRequest(
-    host, request, data=None, printResult=True, printSuccess=True, timeout=None
-):
+class _LegacyCommunicatorLogger(CommunicatorLoggerInterface):
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-      * --debug
+    Print communication details the way sendHTTPRequest always did
     """
-    port = None
-    addr = host
-    token = None
-    known_host = read_known_hosts_file().get(host, None)
-    # TODO: do not allow communication with unknown host
-    if known_host:
-        port = known_host.dest.port
-        addr = known_host.dest.addr
-        token = known_host.token
-    if port is None:
-        port = settings.pcsd_default_port
-    url = "https://{addr}:{port}/{request}".format(
-        addr=addr, request=request, port=port
-    )
-    if "--debug" in pcs_options:
-        print("Sending HTTP Request to: " + url)
-        print("Data: {0}".format(data))
-
-    def __debug_callback(data_type, debug_data):
-        prefixes = {
-            # pylint: disable=no-member
-            pycurl.DEBUG_TEXT: b"* ",
-            pycurl.DEBUG_HEADER_IN: b"< ",
-            pycurl.DEBUG_HEADER_OUT: b"> ",
-            pycurl.DEBUG_DATA_IN: b"<< ",
-            pycurl.DEBUG_DATA_OUT: b">> ",
-        }
-        if data_type in prefixes:
-            debug_output.write(prefixes[data_type])
-            debug_output.write(debug_data)
-            if not debug_data.endswith(b"\n"):
-                debug_output.write(b"\n")
-
-    output = BytesIO()
-    debug_output = BytesIO()
-    cookies = __get_cookie_list(token)
-    if not timeout:
-        timeout = settings.default_request_timeout
-    timeout = pcs_options.get("--request-timeout", timeout)
-
-    handler = pycurl.Curl()
-    handler.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
-    handler.setopt(pycurl.URL, url.encode("utf-8"))
-    handler.setopt(pycurl.WRITEFUNCTION, output.write)
-    handler.setopt(pycurl.VERBOSE, 1)
-    handler.setopt(pycurl.NOSIGNAL, 1) # required for multi-threading
-    handler.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
-    handler.setopt(pycurl.TIMEOUT_MS, int(timeout * 1000))
-    handler.setopt(pycurl.SSL_VERIFYHOST, 0)
-    handler.setopt(pycurl.SSL_VERIFYPEER, 0)
-    handler.setopt(pycurl.HTTPHEADER, ["Expect: "])
-    if cookies:
-        handler.setopt(pycurl.COOKIE, ";".join(cookies).encode("utf-8"))
-    if data:
-        handler.setopt(pycurl.COPYPOSTFIELDS, data.encode("utf-8"))
-    try:
-        handler.perform()
-        response_data = output.getvalue().decode("utf-8")
-        response_code = handler.getinfo(pycurl.RESPONSE_CODE)
-        if printResult or printSuccess:
-            print(host + ": " + response_data.strip())
+    def log_request_start(self, request):
         if "--debug" in pcs_options:
-            print("Response Code: {0}".format(response_code))
-            print("--Debug Response Start--\n{0}".format(response_data))
+            print("Sending HTTP Request to: " + request.url)
+            print("Data: {0}".format(request.data))
+
+    def log_response(self, response):
+        if "--debug" not in pcs_options:
+            return
+        if response.was_connected:
+            print("Response Code: {0}".format(response.response_code))
+            print("--Debug Response Start--\n{0}".format(response.data))
             print("--Debug Response End--")
-            print("Communication debug info for calling: {0}".format(url))
+            print(
+                "Communication debug info for calling: {0}".format(
+                    response.request.url
+                )
+            )
             print("--Debug Communication Output Start--")
-            print(debug_output.getvalue().decode("utf-8", "ignore"))
+            print(response.debug)
             print("--Debug Communication Output End--")
             print()
-
-        if response_code == 401:
-            output = (
-                3,
-                (
-                    "Unable to authenticate to {node} - (HTTP error: {code}), "
-                    "try running 'pcs host auth {node}'"
-                ).format(node=host, code=response_code)
-            )
-        elif response_code == 403:
-            output = (
-                4,
-                "{node}: Permission denied - (HTTP error: {code})".format(
-                    node=host, code=response_code
-                )
-            )
-        elif response_code >= 400:
-            output = (
-                1,
-                "Error connecting to {node} - (HTTP error: {code})".format(
-                    node=host, code=response_code
-                )
-            )
         else:
-            output = (0, response_data)
+            print("Response Reason: {0}".format(response.error_msg))
 
-        if printResult and output[0] != 0:
-            print(output[1])
+    def log_retry(self, response, previous_dest):
+        pass
 
-        return output
-    except pycurl.error as e:
+    def log_no_more_addresses(self, response):
+        pass
+
+@lru_cache()
+def _get_node_communicator_factory():
+    """
+    Commandline options:
+      * --debug
+    """
+    # One factory for the whole pcs run, so all requests share connections.
+    user, groups = get_cib_user_groups()
+    return NodeCommunicatorFactory(
+        _LegacyCommunicatorLogger(),
+        user,
+        groups,
+        settings.default_request_timeout,
+        debug=("--debug" in pcs_options),
+    )
+
+def _create_http_request(host, request, data=None):
+    """
+    Commandline options: no options
+
+    string host -- name of the node to send the request to
+    string request -- requested pcsd url path
+    string data -- urlencoded request data
+    """
+    # TODO: do not allow communication with unknown host
+    target = NodeTargetFactory(
+        read_known_hosts_file()
+    ).get_target_from_hostname(host)
+    # Data are urlencoded already, they are decoded to be encoded back when
+    # the request is created.
+    structured_data = parse_qsl(data, keep_blank_values=True) if data else ()
+    return Request(target, RequestData(request, structured_data))
+
+# Returns a tuple (error, error message)
+# 0 = Success,
+# 1 = HTTP Error
+# 2 = No response,
+# 3 = Auth Error
+# 4 = Permission denied
+def _process_http_response(response, printResult=True, printSuccess=True):
+    """
+    Commandline options: no options
+    """
+    host = response.request.host_label
+    if not response.was_connected:
         if is_proxy_set(os.environ):
             print(
                 "Warning: Proxy is set in environment variables, try "
                 "disabling it"
             )
-        # pylint: disable=unbalanced-tuple-unpacking
-        dummy_errno, reason = e.args
-        if "--debug" in pcs_options:
-            print("Response Reason: {0}".format(reason))
         msg = (
             "Unable to connect to {host}, try setting higher timeout in "
             "--request-timeout option ({reason})"
-        ).format(host=host, reason=reason)
+        ).format(host=host, reason=response.error_msg)
         if printResult:
             print(msg)
         return (2, msg)
 
+    response_data = response.data
+    response_code = response.response_code
+    if printResult or printSuccess:
+        print(host + ": " + response_data.strip())
+
+    if response_code == 401:
+        output = (
+            3,
+            (
+                "Unable to authenticate to {node} - (HTTP error: {code}), "
+                "try running 'pcs host auth {node}'"
+            ).format(node=host, code=response_code)
+        )
+    elif response_code == 403:
+        output = (
+            4,
+            "{node}: Permission denied - (HTTP error: {code})".format(
+                node=host, code=response_code
+            )
+        )
+    elif response_code >= 400:
+        output = (
+            1,
+            "Error connecting to {node} - (HTTP error: {code})".format(
+                node=host, code=response_code
+            )
+        )
+    else:
+        output = (0, response_data)
+
+    if printResult and output[0] != 0:
+        print(output[1])
+
+    return output
 
-def __get_cookie_list(token):
+def _send_http_requests(
+    report, node_list, request, data=None, printResult=True, printSuccess=True,
+    timeout=None, repeat_on_timeout=0
+):
     """
-    Commandline options: no options
+    Send an HTTP request to all nodes at once, report results as they come
+
+    Commandline options:
+      * --request-timeout - timeout for HTTP requests
+      * --debug
+
+    callable report -- gets a node, its return code and output
+    list node_list -- names of nodes to send the request to
+    int repeat_on_timeout -- how many times to send a timed out request again
     """
-    cookies = []
-    if token:
-        cookies.append("token=" + token)
-    if os.geteuid() == 0:
-        for name in ("CIB_user", "CIB_user_groups"):
-            if name in os.environ and os.environ[name].strip():
-                value = os.environ[name].strip()
-                # Let's be safe about characters in env variables and do base64.
-                # We cannot do it for CIB_user however to be backward compatible
-                # so we at least remove disallowed characters.
-                if name == "CIB_user":
-                    value = re.sub(r"[^!-~]", "", value).replace(";", "")
-                else:
-                    # python3 requires the value to be bytes not str
-                    value = base64.b64encode(
-                        value.encode("utf8")
-                    ).decode("utf-8")
-                cookies.append("{0}={1}".format(name, value))
-    return cookies
+    if not timeout:
+        timeout = settings.default_request_timeout
+    timeout = pcs_options.get("--request-timeout", timeout)
+    communicator = _get_node_communicator_factory().get_communicator(
+        request_timeout=timeout
+    )
+    communicator.add_requests([
+        _create_http_request(node, request, data) for node in node_list
+    ])
+    repeats_left = dict.fromkeys(node_list, repeat_on_timeout)
+    for response in communicator.start_loop():
+        node = response.request.host_label
+        retval, output = _process_http_response(
+            response, printResult, printSuccess
+        )
+        if (
+            retval == 2 and "Operation timed out" in output
+            and
+            repeats_left[node] > 0
+        ):
+            repeats_left[node] -= 1
+            if "--debug" in pcs_options:
+                print("{0}: {1}, trying again...". format(node, output))
+            communicator.add_requests([
+                _create_http_request(node, request, data)
+            ])
+            continue
+        report(node, retval, output)
+
+# Send an HTTP request to a node return a tuple with status, data
+# If status is 0 then data contains server response
+# Otherwise if non-zero then data contains error message
+# Returns a tuple (error, error message), see _process_http_response
+def sendHTTPRequest(
+    host, request, data=None, printResult=True, printSuccess=True, timeout=None,
+    repeat_on_timeout=0
+):
+    """
+    Commandline options:
+      * --request-timeout - timeout for HTTP requests
+      * --debug
+    """
+    result_list = []
+    _send_http_requests(
+        lambda node, returncode, output: result_list.append(
+            (returncode, output)
+        ),
+        [host],
+        request,
+        data=data,
+        printResult=printResult,
+        printSuccess=printSuccess,
+        timeout=timeout,
+        repeat_on_timeout=repeat_on_timeout,
+    )
+    return result_list[0]
 
 def get_corosync_conf_facade(conf_text=None):
     """
@@ -754,6 +824,9 @@ def run(
         env_var["CIB_file"] = filename
         touch_cib_file(filename)
 
+    if not _is_cib_read_only_command(args):
+        invalidate_cib_snapshot()
+
     command = args[0]
     if command[0:3] == "crm" or command in ["cibadmin", "iso8601"]:
         args[0] = settings.pacemaker_binaries + command
@@ -970,51 +1043,41 @@ def call_local_pcsd(argv, std_in=None):
     except KeyError:
         return [['Unable to communicate with pcsd'], 1, '', '']
 
-def map_for_error_list(callab, iterab):
+def map_for_error_list(action, node_list):
     """
+    Run a node action for all nodes at once, return errors of failed nodes
+
     Commandline options: no options
-    NOTE: callback 'callab' may use some options
+    NOTE: callback 'action' may use some options
+
+    callable action -- node action created by node_http_action
+    list node_list -- names of nodes to run the action for
     """
     error_list = []
-    for item in iterab:
-        retval, error = callab(item)
-        if retval != 0:
-            error_list.append(error)
+    def report(node, returncode, output):
+        del node
+        if returncode != 0:
+            error_list.append(output)
+    run_for_nodes(report, action, node_list)
     return error_list
 
-def run_parallel(worker_list, wait_seconds=1):
+def run_for_nodes(report, action, node_list, *args, **kwargs):
     """
-    Commandline options: no options
-    """
-    thread_list = []
-    for worker in worker_list:
-        thread = threading.Thread(target=worker)
-        thread.daemon = True
-        thread.start()
-        thread_list.append(thread)
+    Run a node action for all nodes at once, report results as they come
 
-    while thread_list:
-        for thread in thread_list:
-            thread.join(wait_seconds)
-            if not thread.is_alive():
-                thread_list.remove(thread)
+    Requests of all nodes are sent in parallel over shared connections and
+    each node is reported as soon as its response is processed.
 
-def create_task(report, action, node, *args, **kwargs):
-    """
     Commandline options: no options
-    """
-    def worker():
-        returncode, output = action(node, *args, **kwargs)
-        report(node, returncode, output)
-    return worker
+    NOTE: callback 'action' may use some cmd options
 
-def create_task_list(report, action, node_list, *args, **kwargs):
-    """
-    Commandline options: no options
+    callable report -- gets a node, its return code and output
+    callable action -- node action created by node_http_action
+    list node_list -- names of nodes to run the action for
     """
-    return [
-        create_task(report, action, node, *args, **kwargs) for node in node_list
-    ]
+    _send_http_requests(
+        report, node_list, **action.build_request(*args, **kwargs)
+    )
 
 def parallel_for_nodes(action, node_list, *args, **kwargs):
     """
@@ -1027,9 +1090,7 @@ def parallel_for_nodes(action, node_list, *args, **kwargs):
         print(message)
         if returncode != 0:
             node_errors[node] = message
-    run_parallel(
-        create_task_list(report, action, node_list, *args, **kwargs)
-    )
+    run_for_nodes(report, action, node_list, *args, **kwargs)
     return node_errors
 
 # Check if something exists in the CIB
@@ -1038,11 +1099,7 @@ def does_exist(xpath_query):
     Commandline options:
       * -f - CIB file
     """
-    args = ["cibadmin", "-Q", "--xpath", xpath_query]
-    dummy_output, retval = run(args)
-    if retval != 0:
-        return False
-    return True
+    return get_cib_xpath(xpath_query) != ""
 
 def get_group_children(group_id):
     """
@@ -1235,6 +1292,44 @@ def validate_constraint_resource(dom, resource_id):
     Commandline options:
       * --force - allow constraint on any resource
     """
+    if is_etree(dom):
+        found, clone_el = _etree_get_constraint_resource(dom, resource_id)
+    else:
+        found, clone_el = _dom_get_constraint_resource(dom, resource_id)
+    if not found:
+        return False, "Resource '%s' does not exist" % resource_id, None
+    if clone_el is None:
+        # clones, masters and bundles are always valid, a primitive and
+        # a group is valid if not in a clone nor a master nor a bundle
+        return True, "", resource_id
+
+    if is_etree(clone_el):
+        clone_tag, clone_id = clone_el.tag, clone_el.get("id")
+    else:
+        clone_tag, clone_id = clone_el.tagName, clone_el.getAttribute("id")
+
+    if "--force" in pcs_options:
+        return True, "", clone_id
+
+    if clone_tag in ["clone", "master"]:
+        return (
+            False,
+            "%s is a clone resource, you should use the clone id: %s "
+                "when adding constraints. Use --force to override."
+                % (resource_id, clone_id),
+            clone_id
+        )
+    if clone_tag == "bundle":
+        return (
+            False,
+            "%s is a bundle resource, you should use the bundle id: %s "
+                "when adding constraints. Use --force to override."
+                % (resource_id, clone_id),
+            clone_id
+        )
+    return True, "", resource_id
+
+def _dom_get_constraint_resource(dom, resource_id):
     resource_el = (
         dom_get_clone(dom, resource_id)
         or
@@ -1243,8 +1338,7 @@ def validate_constraint_resource(dom, resource_id):
         dom_get_bundle(dom, resource_id)
     )
     if resource_el:
-        # clones, masters and bundles are always valid
-        return True, "", resource_id
+        return True, None
 
     resource_el = (
         dom_get_resource(dom, resource_id)
@@ -1252,38 +1346,27 @@ def validate_constraint_resource(dom, resource_id):
         dom_get_group(dom, resource_id)
     )
     if not resource_el:
-        return False, "Resource '%s' does not exist" % resource_id, None
+        return False, None
 
-    clone_el = (
+    return True, (
         dom_get_resource_clone_ms_parent(dom, resource_id)
         or
         dom_get_resource_bundle_parent(dom, resource_id)
     )
-    if not clone_el:
-        # a primitive and a group is valid if not in a clone nor a master nor a
-        # bundle
-        return True, "", resource_id
-
-    if "--force" in pcs_options:
-        return True, "", clone_el.getAttribute("id")
 
-    if clone_el.tagName in ["clone", "master"]:
-        return (
-            False,
-            "%s is a clone resource, you should use the clone id: %s "
-                "when adding constraints. Use --force to override."
-                % (resource_id, clone_el.getAttribute("id")),
-            clone_el.getAttribute("id")
-        )
-    if clone_el.tagName == "bundle":
-        return (
-            False,
-            "%s is a bundle resource, you should use the bundle id: %s "
-                "when adding constraints. Use --force to override."
-                % (resource_id, clone_el.getAttribute("id")),
-            clone_el.getAttribute("id")
-        )
-    return True, "", resource_id
+def _etree_get_constraint_resource(cib, resource_id):
+    resource_el = etree_get_element_with_id(
+        cib, ("clone", "master", "bundle", "primitive", "group"), resource_id
+    )
+    if resource_el is None:
+        return False, None
+    if resource_el.tag not in ("primitive", "group"):
+        return True, None
+    # ancestors are returned in document order, the closest one is the last
+    parent_list = resource_el.xpath(
+        "ancestor::*[self::clone or self::master or self::bundle]"
+    )
+    return True, (parent_list[-1] if parent_list else None)
 
 
 def dom_get_resource_remote_node_name(dom_resource):
@@ -1358,12 +1441,18 @@ def dom_attrs_to_list(dom_el, with_id=False):
     """
     Commandline options: no options
     """
+    if is_etree(dom_el):
+        attribute_dict = dom_el.attrib
+        element_id = dom_el.get("id", "")
+    else:
+        attribute_dict = dom_el.attributes
+        element_id = dom_el.getAttribute("id")
     attributes = [
         "%s=%s" % (name, value)
-        for name, value in sorted(dom_el.attributes.items()) if name != "id"
+        for name, value in sorted(attribute_dict.items()) if name != "id"
     ]
     if with_id:
-        attributes.append("(id:%s)" % (dom_el.getAttribute("id")))
+        attributes.append("(id:%s)" % element_id)
     return attributes
 
 # moved to pcs.lib.pacemaker.state
@@ -1498,17 +1587,72 @@ def get_cib_xpath(xpath_query):
     Commandline options:
       * -f - CIB file
     """
-    args = ["cibadmin", "-Q", "--xpath", xpath_query]
-    output, retval = run(args)
-    if retval != 0:
+    try:
+        element_list = _get_cib_snapshot_tree().xpath(xpath_query)
+    except etree.XPathError:
         return ""
-    return output
+    if not isinstance(element_list, list) or not all(
+        etree.iselement(element) for element in element_list
+    ):
+        # not a query for elements, let cibadmin deal with it
+        args = ["cibadmin", "-Q", "--xpath", xpath_query]
+        output, retval = run(args)
+        if retval != 0:
+            return ""
+        return output
+    if not element_list:
+        return ""
+    # cibadmin wraps multiple matches in an xpath-query element
+    if len(element_list) > 1:
+        wrapper = etree.Element("xpath-query")
+        for element in element_list:
+            match = deepcopy(element)
+            match.tail = None
+            wrapper.append(match)
+        element_list = [wrapper]
+    return etree.tostring(
+        element_list[0], encoding="unicode", with_tail=False
+    ) + "\n"
+
+def invalidate_cib_snapshot():
+    """
+    Drop the CIB loaded by get_cib so the next read gets a fresh one
+
+    Commandline options: no options
+    """
+    _cib_snapshot.clear()
+
+def _get_cib_source():
+    return filename if usefile else None
+
+def _is_cib_read_only_command(args):
+    command = os.path.basename(args[0])
+    if command == "cibadmin":
+        return "-Q" in args or "--query" in args
+    return command in ("crm_mon", "crm_verify", "iso8601")
+
+def _get_cib_snapshot_tree():
+    if "tree" not in _cib_snapshot:
+        cib_xml = get_cib()
+        try:
+            tree = xml_fromstring(cib_xml)
+        except (etree.XMLSyntaxError, ValueError):
+            err("unable to get cib")
+        _cib_snapshot["tree"] = tree
+    return _cib_snapshot["tree"]
 
 def get_cib(scope=None):
     """
     Commandline options:
       * -f - CIB file
     """
+    # The whole CIB is read many times during one run of legacy commands. It
+    # is loaded once and kept until a command which may modify it is run.
+    if not scope:
+        if _cib_snapshot.get("source", False) != _get_cib_source():
+            invalidate_cib_snapshot()
+        if "xml" in _cib_snapshot:
+            return _cib_snapshot["xml"]
     command = ["cibadmin", "-l", "-Q"]
     if scope:
         command.append("--scope=%s" % scope)
@@ -1518,6 +1662,9 @@ def get_cib(scope=None):
             err("unable to get cib, scope '%s' not present in cib" % scope)
         else:
             err("unable to get cib")
+    if not scope:
+        _cib_snapshot["source"] = _get_cib_source()
+        _cib_snapshot["xml"] = output
     return output
 
 def get_cib_dom(cib_xml=None):
@@ -1539,20 +1686,39 @@ def get_cib_etree(cib_xml=None):
     Commandline options:
       * -f - CIB file
     """
-    # pylint: disable=bare-except
     if cib_xml is None:
         cib_xml = get_cib()
     try:
-        root = ET.fromstring(cib_xml)
-        return root
-    except:
+        return etree.fromstring(
+            cib_xml.encode("utf-8"),
+            # Comments are dropped so that iterating over children yields
+            # elements only.
+            etree.XMLParser(huge_tree=True, remove_comments=True)
+        )
+    except (etree.XMLSyntaxError, ValueError):
         err("unable to get cib")
 
 def is_etree(var):
     """
     Commandline options: no options
     """
-    return var.__class__ == xml.etree.ElementTree.Element
+    return etree.iselement(var)
+
+def etree_get_element_with_id(cib, tag_name_list, element_id):
+    """
+    Return the first element with one of the tags and the id or None
+
+    etree cib -- element to search in
+    iterable tag_name_list -- tags of the element to look for
+    string element_id -- id of the element to look for
+    """
+    element_list = cib.xpath(
+        ".//*[{tags}][@id=$element_id]".format(
+            tags=" or ".join(f"self::{tag}" for tag in tag_name_list)
+        ),
+        element_id=element_id
+    )
+    return element_list[0] if element_list else None
 
 # Replace only configuration section of cib with dom passed
 def replace_cib_configuration(dom):
@@ -1561,11 +1727,7 @@ def replace_cib_configuration(dom):
       * -f - CIB file
     """
     if is_etree(dom):
-        #etree returns string in bytes: b'xml'
-        #python 3 removed .encode() from byte strings
-        #run(...) calls subprocess.Popen.communicate which calls encode...
-        #so there is bytes to str conversion
-        new_dom = ET.tostring(dom).decode()
+        new_dom = etree.tostring(dom, encoding="unicode")
     elif hasattr(dom, "toxml"):
         new_dom = dom.toxml()
     else:
@@ -1587,17 +1749,23 @@ def is_valid_cib_scope(scope):
 # Checks to see if id exists in the xml dom passed
 # DEPRECATED use lxml version available in pcs.lib.cib.tools
 def does_id_exist(dom, check_id):
+    """
+    Commandline options: no options
+    """
+    return any(elem_id == check_id for elem_id in _iter_ids(dom))
+
+def _iter_ids(dom):
     """
     Commandline options: no options
     """
     # do not search in /cib/status, it may contain references to previously
     # existing and deleted resources and thus preventing creating them again
     if is_etree(dom):
-        for elem in dom.findall(str(
-            '(/cib/*[name()!="status"]|/*[name()!="cib"])/*'
-        )):
-            if elem.get("id") == check_id:
-                return True
+        root = dom.getroottree().getroot()
+        if root.tag == "cib":
+            yield from root.xpath('./*[name()!="status"]//@id')
+        else:
+            yield from root.xpath("//@id")
     else:
         document = (
             dom
@@ -1613,13 +1781,10 @@ def does_id_exist(dom, check_id):
                 if section.tagName == "status":
                     continue
                 for elem in section.getElementsByTagName("*"):
-                    if elem.getAttribute("id") == check_id:
-                        return True
+                    yield elem.getAttribute("id")
         if not cib_found:
             for elem in document.getElementsByTagName("*"):
-                if elem.getAttribute("id") == check_id:
-                    return True
-    return False
+                yield elem.getAttribute("id")
 
 # Returns check_id if it doesn't exist in the dom, otherwise it adds an integer
 # to the end of the id and increments it until a unique id is found
@@ -1628,9 +1793,14 @@ def find_unique_id(dom, check_id):
     """
     Commandline options: no options
     """
+    if not does_id_exist(dom, check_id):
+        return check_id
+    # The proposed id is taken. Collect all ids at once instead of searching
+    # the whole document for each candidate.
+    used_ids = set(_iter_ids(dom))
     counter = 1
     temp_id = check_id
-    while does_id_exist(dom, temp_id):
+    while temp_id in used_ids:
         temp_id = check_id + "-" + str(counter)
         counter += 1
     return temp_id
@@ -1864,12 +2034,15 @@ def getClusterStateXml():
         err("error running crm_mon, is pacemaker running?")
     return xml_string
 
-def getClusterName():
+def getClusterName(cib_dom=None):
     """
     Commandline options:
       * -f - CIB file if there is no corosync.conf
       * --corosync_conf - path to a mocked corosync.conf is set directly to
         settings
+
+    cib_dom -- already loaded CIB to get the name from if there is no
+        corosync.conf, the CIB is loaded if not specified
     """
     # pylint: disable=bare-except
     try:
@@ -1889,7 +2062,15 @@ def getClusterName():
     # there is no corosync.conf on remote nodes, we can try to
     # get cluster name from pacemaker
     try:
-        return get_set_properties("cluster-name")["cluster-name"]
+        if cib_dom is None:
+            return get_set_properties("cluster-name")["cluster-name"]
+        cluster_name = None
+        for crm_config in cib_dom.getElementsByTagName("crm_config"):
+            for nvpair in crm_config.getElementsByTagName("nvpair"):
+                if nvpair.getAttribute("name") == "cluster-name":
+                    cluster_name = nvpair.getAttribute("value")
+        if cluster_name is not None:
+            return cluster_name
     except:
         # we need to catch SystemExit (from utils.err), parse errors and so on
         pass
@@ -1987,12 +2168,8 @@ def err(errorText, exit_after_error=True):
         sys.exit(1)
 
 
-def serviceStatus(prefix):
-    """
-    Commandline options: no options
-    """
-    print("Daemon Status:")
-    service_def = [
+def _get_daemon_def():
+    return [
         # (
         #     service name,
         #     display even if not enabled nor running
@@ -2003,19 +2180,39 @@ def serviceStatus(prefix):
         ("pcsd", True),
         (sbd.get_sbd_service_name(), False),
     ]
-    for service, display_always in service_def:
-        try:
-            running = is_service_running(cmd_runner(), service)
-            enabled = is_service_enabled(cmd_runner(), service)
-            if display_always or enabled or running:
-                print("{prefix}{service}: {active}/{enabled}".format(
-                    prefix=prefix,
-                    service=service,
-                    active=("active" if running else "inactive"),
-                    enabled=("enabled" if enabled else "disabled")
-                ))
-        except LibraryError:
-            pass
+
+def get_daemons_state():
+    """
+    Return a dict service -> ServiceState of cluster daemons, empty on error
+
+    Commandline options: no options
+    """
+    try:
+        return get_services_state(
+            cmd_runner(), [service for service, _ in _get_daemon_def()]
+        )
+    except LibraryError:
+        return {}
+
+def print_daemon_status(daemons_state, prefix):
+    """
+    Commandline options: no options
+
+    dict daemons_state -- service -> ServiceState, from get_daemons_state
+    string prefix -- string to put at the beginning of each daemon's line
+    """
+    print("Daemon Status:")
+    for service, display_always in _get_daemon_def():
+        state = daemons_state.get(service)
+        if state is None:
+            continue
+        if display_always or state.enabled or state.running:
+            print("{prefix}{service}: {active}/{enabled}".format(
+                prefix=prefix,
+                service=service,
+                active=("active" if state.running else "inactive"),
+                enabled=("enabled" if state.enabled else "disabled")
+            ))
 
 def enableServices():
     """
@@ -2494,8 +2691,8 @@ def get_cluster_properties_definition():
         if retval != 0:
             err("unable to run {0}\n{1}".format(source["name"], stderr))
         try:
-            etree = ET.fromstring(stdout)
-            for e in etree.findall("./parameters/parameter"):
+            metadata = ET.fromstring(stdout)
+            for e in metadata.findall("./parameters/parameter"):
                 prop = get_cluster_property_from_xml(e)
                 if prop["name"] not in banned_props:
                     prop["source"] = source["name"]
@@ -2624,6 +2821,16 @@ def get_cli_env():
     env.request_timeout = pcs_options.get("--request-timeout")
     return env
 
+def _cib_middleware():
+    cib = middleware.cib(filename if usefile else None, touch_cib_file)
+    def apply(next_in_line, env, *args, **kwargs):
+        # library commands do not use run, the CIB may have been changed
+        try:
+            return cib(next_in_line, env, *args, **kwargs)
+        finally:
+            invalidate_cib_snapshot()
+    return apply
+
 def get_middleware_factory():
     """
     Commandline options:
@@ -2634,7 +2841,7 @@ def get_middleware_factory():
       * -f
     """
     return middleware.create_middleware_factory(
-        cib=middleware.cib(filename if usefile else None, touch_cib_file),
+        cib=_cib_middleware(),
         corosync_conf_existing=middleware.corosync_conf_existing(
             pcs_options.get("--corosync_conf", None)
         ),
@@ -2659,6 +2866,24 @@ def get_library_wrapper():
     """
     return Library(get_cli_env(), get_middleware_factory())
 
+def clear_run_caches():
+    """
+    Forget data cached for the duration of a single pcs run
+
+    Commandline options: no options
+    """
+    read_known_hosts_file.cache_clear()
+    _get_node_communicator_factory.cache_clear()
+    cmd_runner.cache_clear()
+
+def enable_agent_metadata_cache():
+    """
+    Make agents load their metadata from the on-disk cache and store them there
+    """
+    CrmAgent.set_metadata_cache(
+        AgentMetadataCache(settings.agent_metadata_cache_dir)
+    )
+
 def exit_on_cmdline_input_errror(error, main_name, usage_name):
     if error and error.message:
         err(error.message)
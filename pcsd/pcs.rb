@@ -1796,6 +1796,67 @@ def is_service_installed?(service)
   return get_service_installed_checker().is_installed?(service)
 end
 
+# states of a unit file for which 'systemctl is-enabled' exits with 0
+SYSTEMD_ENABLED_STATES = [
+  'alias', 'enabled', 'enabled-runtime', 'generated', 'indirect', 'static',
+  'transient',
+]
+# states of a unit for which 'systemctl status' exits with 0
+SYSTEMD_RUNNING_STATES = ['active', 'reloading']
+
+# Returns {service => {:installed, :enabled, :running}} for all the services.
+# On systemd systems the services are queried by one systemctl call instead of
+# running systemctl for each service and each state.
+def get_services_state(service_list)
+  if ISSYSTEMCTL and not service_list.empty?
+    state = get_systemd_services_state(service_list)
+    return state if state
+  end
+  service_checker = get_service_installed_checker()
+  state = {}
+  service_list.each { |service|
+    state[service] = {
+      :installed => service_checker.is_installed?(service),
+      :enabled => is_service_enabled?(service),
+      :running => is_service_running?(service),
+    }
+  }
+  return state
+end
+
+def get_systemd_services_state(service_list)
+  stdout, _, retcode = run_cmd(
+    PCSAuth.getSuperuserAuth(), 'systemctl', 'show',
+    '--property=LoadState,ActiveState,UnitFileState', '--',
+    *service_list.map { |service| "#{service}.service" }
+  )
+  return nil if retcode != 0
+  # Properties of each unit are printed in a block of "name=value" lines,
+  # blocks are separated by an empty line and follow the order of units.
+  property_hash_list = []
+  property_hash = {}
+  (stdout + ['']).each { |line|
+    line = line.strip()
+    if line.empty?
+      property_hash_list << property_hash unless property_hash.empty?
+      property_hash = {}
+      next
+    end
+    name, value = line.split('=', 2)
+    property_hash[name] = value.to_s
+  }
+  return nil if property_hash_list.length != service_list.length
+  state = {}
+  service_list.zip(property_hash_list).each { |service, properties|
+    state[service] = {
+      :installed => (properties['LoadState'] != 'not-found'),
+      :enabled => SYSTEMD_ENABLED_STATES.include?(properties['UnitFileState']),
+      :running => SYSTEMD_RUNNING_STATES.include?(properties['ActiveState']),
+    }
+  }
+  return state
+end
+
 def enable_service(service)
   if ISSYSTEMCTL
     # fails when the service is not installed
@@ -1925,15 +1986,6 @@ def get_alerts(auth_user)
   end
 end
 
-def get_service_info(service_name, service_checker)
-  return {
-    :installed => service_checker.is_installed?(service_name),
-    :enabled => is_service_enabled?(service_name),
-    :running => is_service_running?(service_name),
-    :version => nil,
-  }
-end
-
 def get_pcs_internal_output_format(status, status_msg=nil)
   return {
     :status => status,
@@ -1955,6 +2007,84 @@ def pcs_internal_proxy(auth_user, data, cmd)
   end
 end
 
+# Resident pcs_internal process serving requests of a long-lived pcsd worker,
+# so the pcs library is not loaded again for each request. Requests and
+# responses are framed as one json document per line.
+class PcsInternalWorker
+  def initialize(command, max_requests=0)
+    @command = command
+    @max_requests = max_requests
+    @io = nil
+    @served_requests = 0
+  end
+
+  # Returns serialized output of the command or nil if the worker failed.
+  def process(input_data)
+    start() if not alive?()
+    begin
+      @io.write(JSON.generate(input_data) + "\n")
+      @io.flush()
+      output = @io.gets()
+    rescue SystemCallError, IOError => e
+      $logger.error("pcs_internal worker failed: #{e}")
+      output = nil
+    end
+    @served_requests += 1
+    if output.nil? or (@max_requests > 0 and @served_requests >= @max_requests)
+      stop()
+    end
+    return output
+  end
+
+  def stop()
+    return if @io.nil?
+    begin
+      # The worker finishes its loop on the end of its input.
+      @io.close()
+    rescue SystemCallError, IOError
+    end
+    @io = nil
+  end
+
+  private
+
+  def alive?()
+    return false if @io.nil?
+    begin
+      return true if Process.waitpid(@io.pid, Process::WNOHANG).nil?
+    rescue SystemCallError
+    end
+    $logger.warn("pcs_internal worker (pid: #{@io.pid}) exited")
+    stop()
+    return false
+  end
+
+  def start()
+    @io = IO.popen({'LC_ALL' => 'C'}, [@command, '--worker'], 'r+')
+    @served_requests = 0
+    $logger.info("pcs_internal worker started, pid: #{@io.pid}")
+  end
+end
+
+def run_pcs_internal_in_worker(auth_user, input_data)
+  # Unlike one-shot processes, the worker serves various users, so the user
+  # is sent in the request instead of the environment.
+  input_data = input_data.merge({
+    :options => input_data[:options].merge({
+      :cib_user => auth_user[:username],
+      :cib_user_groups => auth_user[:usergroups] || [],
+    }),
+  })
+  $logger.info("Running in pcs_internal worker: #{input_data[:cmd]}")
+  $pcs_internal_worker ||= PcsInternalWorker.new(
+    PCS_INTERNAL, PCS_INTERNAL_WORKER_MAX_REQUESTS
+  )
+  start = Time.now
+  output = $pcs_internal_worker.process(input_data)
+  $logger.debug("Duration: " + (Time.now - start).to_s + "s")
+  return output
+end
+
 def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
   input_data = {
     :cmd => cmd,
@@ -1963,18 +2093,29 @@ def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
       :request_timeout => request_timeout,
     },
   }
-  stdout, stderr, return_val = run_cmd_options(
-    auth_user,
-    {'stdin' => JSON.generate(input_data)},
-    PCS_INTERNAL
-  )
-  if return_val != 0
-    return get_pcs_internal_output_format(
-      'exception', "Command failed: #{stderr.join("\n")}"
+  # A resident worker pays off only in a long-lived pcsd process.
+  if defined?(WORKER_MODE) and WORKER_MODE
+    stdout = run_pcs_internal_in_worker(auth_user, input_data)
+    if stdout.nil?
+      return get_pcs_internal_output_format(
+        'exception', "Command failed: pcs_internal worker terminated"
+      )
+    end
+  else
+    stdout, stderr, return_val = run_cmd_options(
+      auth_user,
+      {'stdin' => JSON.generate(input_data)},
+      PCS_INTERNAL
     )
+    if return_val != 0
+      return get_pcs_internal_output_format(
+        'exception', "Command failed: #{stderr.join("\n")}"
+      )
+    end
+    stdout = stdout.join("\n")
   end
   begin
-    parsed_output = JSON.parse(stdout.join("\n"))
+    parsed_output = JSON.parse(stdout)
     if (
       parsed_output.include?('report_list') \
       and \
@@ -2110,12 +2110,9 @@ def check_sbd(param, request, auth_user)
   unless allowed_for_local_cluster(auth_user, Permissions::READ)
     return 403, 'Permission denied'
   end
+  sbd_service = get_sbd_service_name()
   out = {
-    :sbd => {
-      :installed => is_service_installed?(get_sbd_service_name()),
-      :enabled => is_service_enabled?(get_sbd_service_name()),
-      :running => is_service_running?(get_sbd_service_name())
-    }
+    :sbd => get_services_state([sbd_service])[sbd_service]
   }
   watchdog = param[:watchdog]
   if not watchdog.to_s.empty?
@@ -2912,9 +2909,13 @@ def check_host(params, request, auth_user)
     )
   }
 
-  service_checker = get_service_installed_checker
+  services_state = get_services_state(
+    service_list.map { |service| service.to_s }
+  )
   service_list.each do |service|
-    output[:services][service] = get_service_info(service.to_s, service_checker)
+    output[:services][service] = services_state[service.to_s].merge(
+      {:version => nil}
+    )
   end
   service_version_getter.each do |service, version_getter|
     version = version_getter.call()
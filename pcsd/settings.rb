@@ -28,5 +28,8 @@ COROSYNC_QDEVICE_NET_SERVER_CA_FILE = (
 COROSYNC_QDEVICE_NET_CLIENT_CERTS_DIR = "/etc/corosync/qdevice/net/nssdb"
 COROSYNC_AUTHKEY = "/etc/corosync/authkey"
 
+# restart the resident pcs_internal worker after so many requests, 0 means never
+PCS_INTERNAL_WORKER_MAX_REQUESTS = 100
+
 SUPERUSER = 'hacluster'
 ADMIN_GROUP = 'haclient'
@@ -2,62 +2,107 @@ require "base64"
 require "date"
 require "json"
 
-request_json = ARGF.read()
+# When started with --worker, the wrapper stays alive and processes one request
+# per line read from stdin. Each response is written as one line of json to
+# the original stdout. Anything else printed by the loaded code goes to stderr
+# so it cannot corrupt the responses.
+WORKER_MODE = ARGV.include?("--worker")
+# Written to stderr when a request is finished, before its response is written,
+# so the daemon knows which request the stderr belongs to. Keep in sync with
+# pcs/daemon/ruby_worker_pool.py.
+WORKER_STDERR_BOUNDARY = "\0PCSD_WORKER_REQUEST_END\0"
 
-begin
-  request = JSON.parse(request_json)
-rescue => e
-  puts e
-  exit
-end
+def process_request(request)
+  if !request.include?("type")
+    return {:error => "Type not specified"}
+  end
 
-if !request.include?("type")
-  result = {:error => "Type not specified"}
-  print result.to_json
-  exit
-end
+  $tornado_logs = []
+  $tornado_username = nil
+  $tornado_groups = nil
+  $tornado_is_authenticated = nil
 
-$tornado_logs = []
+  require 'pcsd'
 
-require 'pcsd'
+  if ["sinatra_gui", "sinatra_remote"].include?(request["type"])
+    if request["type"] == "sinatra_gui"
+      $tornado_username = request["session"]["username"]
+      $tornado_groups = request["session"]["groups"]
+      $tornado_is_authenticated = request["session"]["is_authenticated"]
+    end
 
-if ["sinatra_gui", "sinatra_remote"].include?(request["type"])
-  if request["type"] == "sinatra_gui"
-    $tornado_username = request["session"]["username"]
-    $tornado_groups = request["session"]["groups"]
-    $tornado_is_authenticated = request["session"]["is_authenticated"]
-  end
+    set :logging, true
+    set :run, false
+    # Do not turn exceptions into fancy 100kB HTML pages and print them on
+    # stdout. Instead, rack.errors is logged and therefore returned in
+    # result[:log].
+    set :show_exceptions, false
+    app = [Sinatra::Application][0]
+
+    env = request["env"]
+    env["rack.input"] = StringIO.new(env["rack.input"])
+    env["rack.errors"] = StringIO.new()
+
+    status, headers, body = app.call(env)
+    rack_errors = env['rack.errors'].string()
+    if not rack_errors.empty?()
+      $logger.error(rack_errors)
+    end
+
+    result = {
+      :status => status,
+      :headers => headers,
+      :body => Base64.encode64(body.join("")),
+    }
 
-  set :logging, true
-  set :run, false
-  # Do not turn exceptions into fancy 100kB HTML pages and print them on stdout.
-  # Instead, rack.errors is logged and therefore returned in result[:log].
-  set :show_exceptions, false
-  app = [Sinatra::Application][0]
-
-  env = request["env"]
-  env["rack.input"] = StringIO.new(env["rack.input"])
-  env["rack.errors"] = StringIO.new()
-
-  status, headers, body = app.call(env)
-  rack_errors = env['rack.errors'].string()
-  if not rack_errors.empty?()
-    $logger.error(rack_errors)
+  elsif request["type"] == "sync_configs"
+    result = {
+      :next => Time.now.to_i + run_cfgsync()
+    }
+  else
+    result = {:error => "Unknown type: '#{request["type"]}'"}
   end
 
-  result = {
-    :status => status,
-    :headers => headers,
-    :body => Base64.encode64(body.join("")),
-  }
+  result[:logs] = $tornado_logs
+  return result
+end
+
+if WORKER_MODE
+  response_channel = $stdout.dup
+  response_channel.sync = true
+  $stdout.reopen($stderr)
+  $stdout.sync = true
+  $stderr.sync = true
 
-elsif request["type"] == "sync_configs"
-  result = {
-    :next => Time.now.to_i + run_cfgsync()
-  }
+  while (request_json = $stdin.gets)
+    # do not return logs of a previous request with an error response
+    $tornado_logs = []
+    begin
+      request = JSON.parse(request_json)
+    rescue => e
+      response = {:error => e.to_s, :logs => $tornado_logs}
+    else
+      begin
+        response = process_request(request)
+      rescue => e
+        # A failed request must not end the worker, other requests would fail
+        # with it.
+        $stderr.puts("#{e.class}: #{e}", e.backtrace)
+        response = {:error => e.to_s, :logs => $tornado_logs || []}
+      end
+    end
+    $stderr.write(WORKER_STDERR_BOUNDARY)
+    response_channel.write(response.to_json + "\n")
+  end
 else
-  result = {:error => "Unknown type: '#{request["type"]}'"}
-end
+  request_json = ARGF.read()
 
-result[:logs] = $tornado_logs
-print result.to_json
+  begin
+    request = JSON.parse(request_json)
+  rescue => e
+    puts e
+    exit
+  end
+
+  print process_request(request).to_json
+end